@@ -3,6 +3,7 @@ from typing import Union, Optional, Tuple, Any
 from itertools import combinations_with_replacement
 from functools import reduce, partial
 from math import factorial
+from threading import Lock
 
 try:
     import torch
@@ -23,6 +24,9 @@ from .base import (
 
 Tensor = torch.Tensor
 _device = torch.device
+# NOTE: functorch transforms keep global interpreter levels and are not
+# thread-safe, so the calls are serialized for threaded assembly.
+_FUNCTORCH_LOCK = Lock()
 
 def _dim_to_axis(func):
     def wrapper(*args, axis=None, **kwargs):
@@ -527,21 +531,24 @@ class PyTorchBackend(BackendProxy, backend_name='pytorch'):
         fn = vmap(
             partial(cls._simplex_shape_function_kernel, p=p, mi=mi)
         )
-        return fn(bcs)
+        with _FUNCTORCH_LOCK:
+            return fn(bcs)
 
     @classmethod
     def simplex_grad_shape_function(cls, bcs: Tensor, p: int, mi=None) -> Tensor:
         fn = vmap(jacfwd(
             partial(cls._simplex_shape_function_kernel, p=p, mi=mi)
         ))
-        return fn(bcs)
+        with _FUNCTORCH_LOCK:
+            return fn(bcs)
 
     @classmethod
     def simplex_hess_shape_function(cls, bcs: Tensor, p: int, mi=None) -> Tensor:
         fn = vmap(jacrev(jacfwd(
             partial(cls._simplex_shape_function_kernel, p=p, mi=mi)
         )))
-        return fn(bcs)
+        with _FUNCTORCH_LOCK:
+            return fn(bcs)
 
     @staticmethod
     def tensor_measure(entity: Tensor, node: Tensor) -> Tensor:
@@ -0,0 +1,17 @@
+"""Performance benchmarks of assembly, solvers and mesh operations
+
+Run `python -m fealpy.benchmark --help` for the command line interface.
+"""
+
+from .core import (
+    BenchmarkCase,
+    benchmark,
+    registry,
+    time_call,
+    run_benchmarks,
+    save_results,
+    load_results,
+    compare_results,
+    format_results,
+    format_comparison
+)
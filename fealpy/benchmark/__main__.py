@@ -0,0 +1,70 @@
+
+import argparse
+import sys
+
+from .core import (
+    SIZES, BACKENDS,
+    run_benchmarks,
+    save_results,
+    load_results,
+    compare_results,
+    format_comparison
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m fealpy.benchmark',
+        description="Run the FEALPy benchmarks and compare them with a baseline.")
+    parser.add_argument('-k', '--filter', default=None,
+                        help="comma-separated substrings of benchmark names to run")
+    parser.add_argument('-b', '--backend', nargs='+', default=list(BACKENDS),
+                        help="backends to run on, default: %(default)s")
+    parser.add_argument('-s', '--size', choices=SIZES, default='small',
+                        help="problem size, default: %(default)s")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="number of timed calls, default: %(default)s")
+    parser.add_argument('-w', '--warmup', type=int, default=1,
+                        help="number of untimed calls before, default: %(default)s")
+    parser.add_argument('-o', '--output', default=None,
+                        help="JSON file to save the results, e.g. a new baseline")
+    parser.add_argument('--baseline', default=None,
+                        help="JSON file of earlier results to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="relative slowdown reported as a regression, default: %(default)s")
+    parser.add_argument('-l', '--list', action='store_true',
+                        help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        from . import cases
+        from .core import registry
+        for name in sorted(registry):
+            print(name, registry[name].params)
+        return 0
+
+    results = run_benchmarks(args.filter, backends=args.backend, size=args.size,
+                             repeat=args.repeat, warmup=args.warmup, verbose=True)
+    for backend, info in results['meta']['backends'].items():
+        if info.startswith('unavailable'):
+            print(f"Skipped backend {backend}: {info}")
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if args.baseline is None:
+        return 0
+    comparison = compare_results(results, load_results(args.baseline), tolerance=args.tolerance)
+    print(format_comparison(comparison))
+    nregression = sum(item['status'] == 'regression' for item in comparison)
+    nbroken = sum((item['status'] in ('error', 'missing')) and (item['baseline'] is not None)
+                  for item in comparison)
+    if nregression > 0:
+        print(f"{nregression} benchmark(s) slower than the baseline by more than "
+              f"{args.tolerance:.0%}.")
+    if nbroken > 0:
+        print(f"{nbroken} benchmark(s) passing in the baseline failed or did not run.")
+    return 1 if (nregression + nbroken > 0) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+
+from ..backend import backend_manager as bm
+from ..mesh import TriangleMesh, TetrahedronMesh, HexahedronMesh
+from ..functionspace import LagrangeFESpace, TensorFunctionSpace
+from ..fem import (
+    BilinearForm,
+    ScalarDiffusionIntegrator,
+    ScalarMassIntegrator,
+    LinearElasticIntegrator
+)
+from ..material import LinearElasticMaterial
+from ..solver import cg, JacobiPreconditioner
+
+from .core import benchmark
+
+MESHES = {
+    'triangle': TriangleMesh,
+    'tetrahedron': TetrahedronMesh,
+    'hexahedron': HexahedronMesh
+}
+
+# cells in each direction of the unit box, for 2-d and 3-d meshes
+SEGMENTS = {
+    'small': (32, 8),
+    'medium': (128, 24),
+    'large': (512, 48)
+}
+
+
+def box_mesh(kind: str, size: str, p: int=1):
+    """The unit square or cube mesh of a benchmark, coarser for higher
+    degrees so that the number of dofs stays about the same."""
+    Mesh = MESHES[kind]
+    n2, n3 = SEGMENTS[size]
+    if kind == 'triangle':
+        n = max(n2 // p, 1)
+        return Mesh.from_box(nx=n, ny=n)
+    n = max(n3 // p, 1)
+    return Mesh.from_box(nx=n, ny=n, nz=n)
+
+
+def _copy(mesh):
+    node, cell = mesh.entity('node'), mesh.entity('cell')
+    return mesh.__class__(bm.copy(node), bm.copy(cell))
+
+
+def _poisson_matrix(space, mass=False):
+    q = space.p + 2
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=q))
+    if mass:
+        bform.add_integrator(ScalarMassIntegrator(q=q))
+    return bform.assembly()
+
+
+### Assembly
+
+@benchmark('assembly.poisson', mesh=list(MESHES), p=[1, 2, 3, 4])
+def poisson_assembly(mesh, p, size):
+    space = LagrangeFESpace(box_mesh(mesh, size, p), p=p)
+    return lambda: _poisson_matrix(space)
+
+
+@benchmark('assembly.elasticity', mesh=list(MESHES), p=[1, 2, 3, 4])
+def elasticity_assembly(mesh, p, size):
+    mesh = box_mesh(mesh, size, p)
+    GD = mesh.geo_dimension()
+    space = TensorFunctionSpace(LagrangeFESpace(mesh, p=p), shape=(GD, -1))
+    material = LinearElasticMaterial('benchmark', elastic_modulus=1.0, poisson_ratio=0.3,
+                                     hypo='3D' if GD == 3 else 'plane_strain')
+
+    def run():
+        bform = BilinearForm(space)
+        bform.add_integrator(LinearElasticIntegrator(material, q=p+2))
+        return bform.assembly()
+
+    return run
+
+
+### Mesh
+
+@benchmark('mesh.construct', mesh=list(MESHES))
+def construct(mesh, size):
+    mesh = box_mesh(mesh, size)
+    return lambda: mesh.construct()
+
+
+@benchmark('mesh.uniform_refine', mesh=list(MESHES))
+def uniform_refine(mesh, size):
+    mesh = box_mesh(mesh, size)
+    return (lambda: _copy(mesh), lambda m: m.uniform_refine())
+
+
+@benchmark('mesh.bisect', mesh=['triangle', 'tetrahedron'])
+def bisect(mesh, size):
+    mesh = box_mesh(mesh, size)
+    # refine cells around a corner, as adaptive methods do near a singularity
+    bc = mesh.entity_barycenter('cell')
+    isMarkedCell = bm.sum(bc**2, axis=-1) < 0.25
+
+    options = {'disp': False}
+    if mesh.TD == 3:
+        options['HB'] = None
+
+    def run(m):
+        m.bisect(isMarkedCell, options=dict(options))
+        return m.entity('cell')
+
+    return (lambda: _copy(mesh), run)
+
+
+### Linear algebra
+
+@benchmark('sparse.spmv', mesh=list(MESHES), p=[1, 2])
+def spmv(mesh, p, size):
+    space = LagrangeFESpace(box_mesh(mesh, size, p), p=p)
+    A = _poisson_matrix(space).tocsr()
+    x = bm.ones((A.shape[1],), **A.values_context())
+    return lambda: A @ x
+
+
+@benchmark('solver.cg', mesh=['triangle', 'tetrahedron'], precondition=[False, True])
+def conjugate_gradient(mesh, precondition, size):
+    space = LagrangeFESpace(box_mesh(mesh, size), p=1)
+    A = _poisson_matrix(space, mass=True).tocsr()
+    b = bm.ones((A.shape[1],), **A.values_context())
+    M = JacobiPreconditioner(A) if precondition else None
+    return lambda: cg(A, b, M=M, atol=0.0, rtol=1e-8, maxiter=2000)
@@ -0,0 +1,331 @@
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from itertools import product
+from statistics import mean, median, pstdev
+from timeit import default_timer
+import json
+import platform
+import time
+
+from ..backend import backend_manager as bm
+
+__all__ = [
+    'BenchmarkCase',
+    'benchmark',
+    'registry',
+    'time_call',
+    'run_benchmarks',
+    'save_results',
+    'load_results',
+    'compare_results',
+    'format_results',
+    'format_comparison'
+]
+
+SIZES = ('small', 'medium', 'large')
+BACKENDS = ('numpy', 'pytorch', 'jax')
+
+
+class BenchmarkCase():
+    """A parameterized benchmark.
+
+    The setup function takes the parameters and the problem size as keyword
+    arguments, and returns the callable to be timed. It may also return a
+    pair `(prepare, run)`, then `run(prepare())` is timed with `prepare`
+    called before every repetition, for operations modifying their input
+    like mesh refinement.
+
+    Parameters:
+        name (str): Name of the benchmark, dotted by its group, e.g. 'mesh.construct'.\n
+        setup (Callable): The setup function.\n
+        params (Dict[str, Sequence]): Values of every parameter. The case runs on\
+        their cartesian product.\n
+        skip (Callable, optional): A function of the parameters returning True for\
+        combinations to skip.
+    """
+    def __init__(self, name: str, setup: Callable[..., Any],
+                 params: Dict[str, Sequence[Any]],
+                 skip: Optional[Callable[..., bool]]=None) -> None:
+        self.name = name
+        self.setup = setup
+        self.params = params
+        self.skip = skip
+
+    def __repr__(self) -> str:
+        return f"BenchmarkCase({self.name!r}, params={self.params})"
+
+    def variants(self) -> List[Dict[str, Any]]:
+        """All combinations of parameters."""
+        keys = list(self.params)
+        out = []
+        for values in product(*(self.params[k] for k in keys)):
+            kwargs = dict(zip(keys, values))
+            if self.skip is None or not self.skip(**kwargs):
+                out.append(kwargs)
+        return out
+
+    @staticmethod
+    def key(name: str, params: Dict[str, Any], backend: str) -> str:
+        """Identifier of one run, used to match results with the baseline."""
+        args = ",".join(f"{k}={v}" for k, v in params.items())
+        return f"{name}[{args}]@{backend}"
+
+
+registry: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, *, skip: Optional[Callable[..., bool]]=None, **params: Sequence[Any]):
+    """Decorator registering a setup function as a benchmark case.
+
+    Examples:
+        >>> @benchmark('sparse.spmv', mesh=['triangle', 'tetrahedron'])
+        ... def spmv(mesh, size):
+        ...     A, x = ...
+        ...     return lambda: A @ x
+    """
+    def decorator(setup):
+        if name in registry:
+            raise ValueError(f"Benchmark '{name}' is already registered.")
+        registry[name] = BenchmarkCase(name, setup, params, skip)
+        return setup
+    return decorator
+
+
+def _synchronize(result: Any) -> None:
+    """Wait for asynchronous computations producing the result."""
+    name = bm.backend_name
+    if name == 'jax':
+        import jax
+        jax.block_until_ready(result)
+    elif name == 'pytorch':
+        import torch
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            torch.cuda.synchronize()
+
+
+def time_call(func: Union[Callable[[], Any], Tuple[Callable[[], Any], Callable[[Any], Any]]], *,
+              repeat: int=5, warmup: int=1) -> Dict[str, Any]:
+    """Wall-clock time of a call.
+
+    Parameters:
+        func (Callable | Tuple[Callable, Callable]): A callable without arguments, or\
+        a pair `(prepare, run)` as returned by setup functions.\n
+        repeat (int, optional): Number of timed calls. Defaults to 5.\n
+        warmup (int, optional): Number of untimed calls before, e.g. for JIT\
+        compilation and caches of the backend. Defaults to 1.
+
+    Returns:
+        Dict: Statistics 'min', 'median', 'mean' and 'std' in seconds, and 'times'.
+    """
+    if isinstance(func, tuple):
+        prepare, run = func
+    else:
+        prepare, run = None, func
+
+    times = []
+    for i in range(warmup + repeat):
+        arg = () if prepare is None else (prepare(),)
+        start = default_timer()
+        _synchronize(run(*arg))
+        if i >= warmup:
+            times.append(default_timer() - start)
+
+    return {'min': min(times), 'median': median(times), 'mean': mean(times),
+            'std': pstdev(times), 'times': times}
+
+
+def _select(pattern: Optional[str], name: str) -> bool:
+    if pattern is None:
+        return True
+    return any(p in name for p in pattern.split(','))
+
+
+def run_benchmarks(pattern: Optional[str]=None, *,
+                   backends: Iterable[str]=BACKENDS,
+                   size: str='small',
+                   repeat: int=5,
+                   warmup: int=1,
+                   verbose: bool=False) -> Dict[str, Any]:
+    """Run registered benchmarks on the backends.
+
+    Backends failing to load are reported as skipped, and errors of a case
+    are recorded in its result without stopping the others.
+
+    Parameters:
+        pattern (str, optional): Comma-separated substrings, running only cases\
+        whose names contain one of them. Defaults to all cases.\n
+        backends (Iterable[str], optional): Backends to run on. Defaults to\
+        numpy, pytorch and jax.\n
+        size (str, optional): Problem size, 'small', 'medium' or 'large'. Defaults to 'small'.\n
+        repeat (int, optional): Number of timed calls of each case. Defaults to 5.\n
+        warmup (int, optional): Number of untimed calls before. Defaults to 1.\n
+        verbose (bool, optional): Print every result when available. Defaults to False.
+
+    Returns:
+        Dict: The results with keys 'meta' for the environment, and 'results'\
+        mapping the identifier of every run to its record.
+    """
+    if size not in SIZES:
+        raise ValueError(f"Unknown size: {size}. Use one of {SIZES}.")
+    from . import cases # registers the built-in cases
+
+    current = bm.backend_name
+    results: Dict[str, Any] = {}
+    meta = _environment()
+    meta.update({'pattern': pattern, 'size': size, 'repeat': repeat, 'warmup': warmup,
+                 'backends': {}})
+
+    try:
+        for backend in backends:
+            try:
+                bm.set_backend(backend)
+            except (RuntimeError, ImportError) as e:
+                meta['backends'][backend] = f"unavailable: {e}"
+                continue
+            meta['backends'][backend] = _backend_version(backend)
+
+            for name in sorted(registry):
+                if not _select(pattern, name):
+                    continue
+                case = registry[name]
+                for params in case.variants():
+                    key = BenchmarkCase.key(name, params, backend)
+                    record = {'name': name, 'params': params, 'backend': backend}
+                    try:
+                        stats = time_call(case.setup(size=size, **params),
+                                          repeat=repeat, warmup=warmup)
+                        record.update(stats)
+                        record['status'] = 'ok'
+                    except NotImplementedError as e:
+                        record['status'] = 'skipped'
+                        record['message'] = str(e)
+                    except Exception as e:
+                        record['status'] = 'error'
+                        record['message'] = f"{type(e).__name__}: {e}"
+                    results[key] = record
+                    if verbose:
+                        print(_format_record(key, record), flush=True)
+    finally:
+        bm.set_backend(current)
+
+    return {'meta': meta, 'results': results}
+
+
+def _backend_version(backend: str) -> str:
+    module = {'numpy': 'numpy', 'pytorch': 'torch', 'jax': 'jax'}.get(backend)
+    try:
+        return __import__(module).__version__
+    except Exception:
+        return 'unknown'
+
+
+def _environment() -> Dict[str, Any]:
+    from .. import __version__
+    return {
+        'fealpy': __version__,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'node': platform.node(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    """Write results of `run_benchmarks` to a JSON file."""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Read results written by `save_results`."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], *,
+                    tolerance: float=0.2, stat: str='median') -> List[Dict[str, Any]]:
+    """Compare timings with a baseline.
+
+    A run is a regression when it is slower than the baseline by more than
+    the relative tolerance, and an improvement when the baseline is slower
+    by more than that. Runs missing in either side or failed are reported
+    with the status 'new', 'missing' or 'error'. Baseline runs of cases or
+    backends not selected for the results are left out.
+
+    Parameters:
+        results (Dict): Results of `run_benchmarks`.\n
+        baseline (Dict): Results of an earlier run, e.g. from `load_results`.\n
+        tolerance (float, optional): The relative tolerance. Defaults to 0.2.\n
+        stat (str, optional): The statistic compared, 'min' or 'median'. Defaults to 'median'.
+
+    Returns:
+        List[Dict]: Comparison of every run with keys 'key', 'status', 'time',\
+        'baseline' and 'ratio', sorted by the key. 'baseline' is the baseline\
+        time if the baseline run succeeded, otherwise None.
+    """
+    new, old = results['results'], baseline['results']
+    meta = results.get('meta', {})
+    pattern, backends = meta.get('pattern'), meta.get('backends')
+    out = []
+    for key in sorted(set(new) | set(old)):
+        item = {'key': key, 'time': None, 'baseline': None, 'ratio': None}
+        r, b = new.get(key), old.get(key)
+        if r is None and not _select(pattern, b.get('name', '')):
+            continue
+        if r is None and (backends is not None) and (b.get('backend') not in backends):
+            continue
+        if b is not None and b['status'] == 'ok':
+            item['baseline'] = b[stat]
+        if r is None:
+            item['status'] = 'missing'
+        elif r['status'] != 'ok':
+            item['status'] = r['status']
+        elif b is None or b['status'] != 'ok':
+            item['status'] = 'new'
+            item['time'] = r[stat]
+        else:
+            item['time'] = r[stat]
+            item['ratio'] = r[stat] / b[stat] if b[stat] > 0 else float('inf')
+            if item['ratio'] > 1 + tolerance:
+                item['status'] = 'regression'
+            elif item['ratio'] < 1 / (1 + tolerance):
+                item['status'] = 'improvement'
+            else:
+                item['status'] = 'ok'
+        out.append(item)
+    return out
+
+
+def _format_time(t: Optional[float]) -> str:
+    if t is None:
+        return '-'.rjust(10)
+    if t >= 1.0:
+        return f"{t:.3f} s".rjust(10)
+    if t >= 1e-3:
+        return f"{t*1e3:.3f} ms".rjust(10)
+    return f"{t*1e6:.3f} us".rjust(10)
+
+
+def _format_record(key: str, record: Dict[str, Any]) -> str:
+    if record['status'] == 'ok':
+        return f"{_format_time(record['median'])} {_format_time(record['min'])}  {key}"
+    return f"{record['status'].upper().rjust(10)} {''.rjust(10)}  {key}: {record.get('message', '')}"
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """A table of medians and minima of the results."""
+    lines = [f"{'median'.rjust(10)} {'min'.rjust(10)}  benchmark"]
+    for key, record in results['results'].items():
+        lines.append(_format_record(key, record))
+    return "\n".join(lines)
+
+
+def format_comparison(comparison: List[Dict[str, Any]]) -> str:
+    """A table of the comparison with a baseline."""
+    lines = [f"{'status'.ljust(12)}{'time'.rjust(10)} {'baseline'.rjust(10)} {'ratio'.rjust(7)}  benchmark"]
+    for item in comparison:
+        ratio = '-' if item['ratio'] is None else f"{item['ratio']:.2f}"
+        lines.append(f"{item['status'].ljust(12)}{_format_time(item['time'])} "
+                     f"{_format_time(item['baseline'])} {ratio.rjust(7)}  {item['key']}")
+    return "\n".join(lines)
@@ -1,2 +1 @@
-
-from .generator import EITDataGenerator
+from .generator import EITDataGenerator, EITDatasetGenerator, circles_levelset
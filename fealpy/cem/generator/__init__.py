@@ -1,2 +1,3 @@
 
 from .eit_data_generator import EITDataGenerator
+from .eit_dataset_generator import EITDatasetGenerator, circles_levelset
@@ -11,7 +11,7 @@ from fealpy.fem import (
     ScalarNeumannBCIntegrator
 )
 from fealpy.sparse import COOTensor
-from fealpy.solver import cg
+from fealpy.solver import cg, factorize
 
 
 class EITDataGenerator():
@@ -135,17 +135,24 @@ class EITDataGenerator():
 
         return current
 
-    def run(self, return_full=False) -> Tensor:
+    def run(self, return_full=False, *, solver: Optional[str]=None) -> Tensor:
         """Generate voltage on boundary nodes.
 
         Args:
             return_full (bool, optional): Whether return all dofs. Defaults to False.
+            solver (str | None, optional): Name of a direct solver, e.g. 'scipy'\
+                or 'mumps', to solve all currents with one factorization\
+                of the matrix. Use CG if None. Defaults to None.
 
         Returns:
             Tensor: gd Tensor, shaped (Boundary nodes, )\
                 or (Batch, Boundary nodes).
         """
-        uh = cg(self.A_n, self.b_, batch_first=True, atol=1e-12, rtol=0.)
+        if solver is None:
+            uh = cg(self.A_n, self.b_, batch_first=True, atol=1e-12, rtol=0.)
+        else:
+            # the matrix changes with the levelset, so the factorization is not cached
+            uh = factorize(self.A_n, solver, cache=False).solve(self.b_, batch_first=True)
 
         if return_full:
             return uh[:-1]
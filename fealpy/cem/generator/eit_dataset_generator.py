@@ -0,0 +1,264 @@
+
+import os
+import json
+from typing import Tuple, Callable, Union, Optional, Dict, Any
+from functools import partial
+from hashlib import blake2b
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+import numpy as np
+
+from fealpy.backend import backend_manager as bm
+from fealpy.backend import TensorLike as Tensor
+from fealpy.mesh import Mesh
+from fealpy import logger
+
+from .eit_data_generator import EITDataGenerator
+
+
+MANIFEST = 'manifest.json'
+
+
+def circles_levelset(p: Tensor, param: Tensor) -> Tensor:
+    """Level-set function of a union of discs.
+
+    Args:
+        p (Tensor): Points, shaped (..., 2).
+        param (Tensor): Centers and radii of the discs, shaped (NCir*3, ) as\
+            [x0, y0, r0, x1, y1, r1, ...].
+
+    Returns:
+        Tensor: Negative inside the discs, shaped (...).
+    """
+    param = bm.reshape(bm.tensor(param, **bm.context(p)), (-1, 3))
+    dis = bm.linalg.norm(p[..., None, :] - param[:, :2], axis=-1) # (..., NCir)
+    return bm.min(dis - param[:, 2], axis=-1)
+
+
+def _fingerprint(data: Union[Tensor, np.ndarray]) -> str:
+    """Digest of the content of a tensor."""
+    arr = np.ascontiguousarray(bm.to_numpy(data))
+    h = blake2b(str((arr.shape, arr.dtype.str)).encode(), digest_size=16)
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def _qualified_name(func: Callable) -> str:
+    while isinstance(func, partial):
+        func = func.func
+    return f"{getattr(func, '__module__', None)}.{getattr(func, '__qualname__', type(func).__name__)}"
+
+
+class _Worker():
+    """The generator of a process, with the Neumann data assembled once."""
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        gen = EITDataGenerator(config['mesh'], p=config['p'], q=config['q'])
+        self.current = gen.set_boundary(config['gn_source'], config['batch_size'],
+                                        zero_integral=config['zero_integral'])
+        self.generator = gen
+
+    def sample(self, param: np.ndarray) -> Tuple[Tensor, Tensor]:
+        config = self.config
+        levelset = partial(config['levelset'], param=param)
+        label = self.generator.set_levelset(config['sigma_vals'], levelset, config['pixel'])
+        gd = self.generator.run(solver=config['solver'])
+        return gd, label
+
+    def shard(self, directory: str, sid: int, start: int, params: np.ndarray):
+        gd, label = zip(*(self.sample(param) for param in params))
+        arrays = {
+            'index': np.arange(start, start + len(params)),
+            'param': params,
+            'gd': np.stack([bm.to_numpy(x) for x in gd]),
+            'label': np.stack([bm.to_numpy(x) for x in label])
+        }
+        name = f'shard_{sid:05d}.npz'
+        # write aside and rename, so that an interrupted run leaves no broken shard
+        tmp = os.path.join(directory, '.' + name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, os.path.join(directory, name))
+        return sid, {'file': name, 'start': start, 'stop': start + len(params)}
+
+
+_worker: Optional[_Worker] = None
+
+def _init_worker(backend: str, config: Dict[str, Any]) -> None:
+    global _worker
+    bm.set_backend(backend)
+    _worker = _Worker(config)
+
+def _run_shard(*args):
+    return _worker.shard(*args) + (bm.to_numpy(_worker.current), )
+
+
+class EITDatasetGenerator():
+    """Generate EIT datasets in parallel, into resumable shards on disk.
+
+    The level-set samples are split into shards of `shard_size` samples. Each
+    worker process builds its own EITDataGenerator on the mesh and assembles
+    the boundary currents only once; for every sample it assembles the
+    matrix and solves all currents with one factorization. A finished shard
+    is saved as `shard_XXXXX.npz` (arrays `index`, `param`, `gd` and `label`)
+    and recorded in `manifest.json`, so that an interrupted run continues
+    with the missing shards only.
+
+    All arguments are sent to the worker processes, so the functions must be
+    picklable, e.g. defined at the top level of a module.
+    """
+    def __init__(self, mesh: Mesh, sigma_vals: Tuple[float, float],
+                 levelset: Callable[[Tensor, Tensor], Tensor],
+                 gn_source: Union[Callable[[Tensor], Tensor], Tensor],
+                 pixel: Tensor, *, p: int=1, q: Optional[int]=None,
+                 batch_size: int=0, zero_integral: bool=False,
+                 solver: Optional[str]='scipy') -> None:
+        """Create a new EIT dataset generator.
+
+        Args:
+            mesh (Mesh): The mesh of the domain.
+            sigma_vals (Tuple[float, float]): Sigma value of inclusion and background.
+            levelset (Callable): Level-set function `levelset(points, param)` of\
+                a sample with parameters `param`, e.g. `circles_levelset`.
+            gn_source (Callable | Tensor): The current density on the boundary,\
+                see `EITDataGenerator.set_boundary`.
+            pixel (Tensor): Points on which the inclusion labels are output.
+            p (int, optional): Order of the Lagrange finite element space. Defaults to 1.
+            q (int | None, optional): Order of the quadrature. Defaults to None.
+            batch_size (int, optional): Number of currents of `gn_source`. Defaults to 0.
+            zero_integral (bool, optional): Whether zero the integral of the\
+                current density on the boundary. Defaults to False.
+            solver (str | None, optional): The direct solver, or None for CG.\
+                Defaults to 'scipy'.
+        """
+        self.config = {
+            'mesh': mesh, 'sigma_vals': tuple(sigma_vals), 'levelset': levelset,
+            'gn_source': gn_source, 'pixel': pixel, 'p': p, 'q': q,
+            'batch_size': batch_size, 'zero_integral': zero_integral, 'solver': solver
+        }
+
+    def run(self, params: np.ndarray, directory: str, *, shard_size: int=64,
+            num_workers: int=1, mp_context: str='spawn') -> Dict[str, Any]:
+        """Generate the samples of `params` into `directory`.
+
+        Args:
+            params (ndarray): Parameters of the samples, shaped (NS, ...).
+            directory (str): Output directory, created if missing.
+            shard_size (int, optional): Number of samples in a shard. Defaults to 64.
+            num_workers (int, optional): Number of processes. Run in the\
+                current process if 1. Defaults to 1.
+            mp_context (str, optional): Start method of the processes. Defaults to 'spawn'.
+
+        Returns:
+            Dict: The manifest.
+        """
+        if shard_size <= 0:
+            raise ValueError(f"shard_size must be positive, but got {shard_size}")
+        params = np.asarray(params)
+        os.makedirs(directory, exist_ok=True)
+        manifest = self._open_manifest(directory, params, shard_size)
+
+        todo = []
+        for sid, start in enumerate(range(0, len(params), shard_size)):
+            info = manifest['shards'].get(str(sid))
+            if info is not None and os.path.exists(os.path.join(directory, info['file'])):
+                continue
+            todo.append((directory, sid, start, params[start:start+shard_size]))
+        logger.info(f"EITDatasetGenerator: {len(todo)} of "
+                    f"{manifest['num_shards']} shards to generate.")
+
+        def record(sid, info, current):
+            if not os.path.exists(os.path.join(directory, 'current.npy')):
+                np.save(os.path.join(directory, 'current.npy'), current)
+            manifest['shards'][str(sid)] = info
+            manifest['complete'] = len(manifest['shards']) == manifest['num_shards']
+            self._write_manifest(directory, manifest)
+
+        if num_workers <= 1:
+            worker = _Worker(self.config)
+            for args in todo:
+                record(*worker.shard(*args), bm.to_numpy(worker.current))
+        elif len(todo) > 0:
+            ctx = multiprocessing.get_context(mp_context)
+            with ProcessPoolExecutor(num_workers, mp_context=ctx, initializer=_init_worker,
+                                     initargs=(bm.backend_name, self.config)) as pool:
+                futures = [pool.submit(_run_shard, *args) for args in todo]
+                for future in as_completed(futures):
+                    record(*future.result())
+
+        manifest['complete'] = len(manifest['shards']) == manifest['num_shards']
+        self._write_manifest(directory, manifest)
+        return manifest
+
+    def _open_manifest(self, directory: str, params: np.ndarray, shard_size: int):
+        """Load the manifest to resume, checking that it is the same dataset."""
+        config = self.config
+        manifest = {
+            'num_samples': len(params),
+            'shard_size': shard_size,
+            'num_shards': -(-len(params) // shard_size),
+            'params': blake2b(np.ascontiguousarray(params).tobytes(), digest_size=16).hexdigest(),
+            'config': {key: config[key] for key in
+                       ('sigma_vals', 'p', 'q', 'batch_size', 'zero_integral', 'solver')},
+            'shards': {},
+            'complete': False
+        }
+        manifest['config']['sigma_vals'] = list(config['sigma_vals'])
+        mesh, gn_source = config['mesh'], config['gn_source']
+        manifest['config'].update({
+            'node': _fingerprint(mesh.entity('node')),
+            'cell': _fingerprint(mesh.entity('cell')),
+            'pixel': _fingerprint(config['pixel']),
+            'levelset': _qualified_name(config['levelset']),
+            'gn_source': _qualified_name(gn_source) if callable(gn_source)
+                         else _fingerprint(gn_source)
+        })
+        path = os.path.join(directory, MANIFEST)
+        if not os.path.exists(path):
+            return manifest
+
+        with open(path, 'r') as f:
+            old = json.load(f)
+        for key in ('num_samples', 'shard_size', 'params', 'config'):
+            if old[key] != manifest[key]:
+                raise ValueError(f"{path} is of another dataset ({key} differs), "
+                                 "use another directory to generate a new one.")
+        manifest['shards'] = old['shards']
+        return manifest
+
+    @staticmethod
+    def _write_manifest(directory: str, manifest: Dict[str, Any]) -> None:
+        path = os.path.join(directory, MANIFEST)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def load(directory: str, *, allow_incomplete: bool=False) -> Dict[str, np.ndarray]:
+        """Load a generated dataset.
+
+        Args:
+            directory (str): The output directory of `run`.
+            allow_incomplete (bool, optional): Load the finished shards of an\
+                incomplete dataset. Defaults to False.
+
+        Returns:
+            Dict[str, ndarray]: `index`, `param`, `gd` and `label` of the\
+                samples in order, and the boundary `current`.
+        """
+        with open(os.path.join(directory, MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        if not (manifest['complete'] or allow_incomplete):
+            raise RuntimeError(f"The dataset in {directory} is incomplete, "
+                               "run the generator again to finish it.")
+        shards = [manifest['shards'][sid] for sid in
+                  sorted(manifest['shards'], key=int)]
+        data = {}
+        for info in shards:
+            with np.load(os.path.join(directory, info['file'])) as shard:
+                for key in shard.files:
+                    data.setdefault(key, []).append(shard[key])
+        data = {key: np.concatenate(val) for key, val in data.items()}
+        data['current'] = np.load(os.path.join(directory, 'current.npy'))
+        return data
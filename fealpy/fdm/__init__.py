@@ -0,0 +1,7 @@
+"""The FDM Module"""
+
+from .stencil_operator import StencilOperator
+from .laplace_operator import LaplaceOperator
+from .diffusion_operator import DiffusionOperator
+from .gradient_operator import GradientOperator
+from .divergence_operator import DivergenceOperator
@@ -0,0 +1,55 @@
+
+from typing import List, Union, Callable
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+from .stencil_operator import StencilOperator, Term
+
+CoefLike = Union[float, int, TensorLike, Callable[..., TensorLike]]
+
+
+def _part(a: TensorLike, axis: int, start: int, stop: int) -> TensorLike:
+    return a[(slice(None), ) * axis + (slice(start, stop), )]
+
+
+class DiffusionOperator(StencilOperator):
+    """The (2*GD+1)-point difference operator of -∇·(a∇u) on a uniform mesh.
+
+    The coefficient at the midpoint between two neighbouring nodes is the
+    mean of its values on them. As in LaplaceOperator the values out of the
+    grid are zeros, with the coefficient of the boundary node, so that a
+    constant coefficient `a` gives `a` times the Laplace operator.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): the uniform mesh.
+        coef (float | TensorLike | Callable): the coefficient `a`, a number,
+            its values on the nodes shaped (NN, ), or a function of the node
+            coordinates.
+    """
+    def __init__(self, mesh, coef: CoefLike=1.0):
+        self.coef = coef
+        super().__init__(mesh)
+
+    def stencil(self) -> List[Term]:
+        coef = self.coef
+        if callable(coef):
+            coef = coef(self.mesh.entity('node'))
+        if not isinstance(coef, TensorLike):
+            coef = bm.full(self.grid_shape, coef, dtype=self.ftype, device=self.device)
+        coef = bm.reshape(bm.astype(coef, self.ftype), self.grid_shape)
+
+        terms = []
+        center = 0.0
+        for d in range(self.GD):
+            n = self.grid_shape[d]
+            c = 1.0 / self.h[d]**2
+            # the coefficient extended by its boundary values along the axis
+            ext = bm.concatenate([_part(coef, d, 0, 1), coef, _part(coef, d, n-1, n)], axis=d)
+            mid = 0.5 * (_part(ext, d, 0, n+1) + _part(ext, d, 1, n+2))
+            left, right = _part(mid, d, 0, n), _part(mid, d, 1, n+1)
+            terms.append((0, 0, self._unit(d, -1), -c * left))
+            terms.append((0, 0, self._unit(d, 1), -c * right))
+            center = center + c * (left + right)
+        terms.append((0, 0, self._unit(0, 0), center))
+        return terms
@@ -0,0 +1,29 @@
+
+from typing import List
+
+from ..backend import backend_manager as bm
+
+from .stencil_operator import StencilOperator, Term, first_derivative_coef
+
+
+class DivergenceOperator(StencilOperator):
+    """The difference operator of ∇·v on a uniform mesh, maps vector grid
+    functions shaped (NN, GD) to (NN, ).
+
+    It uses the same differences as GradientOperator.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): the uniform mesh.
+    """
+    def __init__(self, mesh):
+        self.ncomp = (1, mesh.geo_dimension())
+        super().__init__(mesh)
+
+    def stencil(self) -> List[Term]:
+        terms = []
+        for d in range(self.GD):
+            coef = first_derivative_coef(self.grid_shape[d], self.h[d])
+            for o, val in coef.items():
+                val = bm.tensor(val, dtype=self.ftype, device=self.device)
+                terms.append((0, d, self._unit(d, o), self._axis_vector(d, val)))
+        return terms
@@ -0,0 +1,30 @@
+
+from typing import List
+
+from ..backend import backend_manager as bm
+
+from .stencil_operator import StencilOperator, Term, first_derivative_coef
+
+
+class GradientOperator(StencilOperator):
+    """The difference operator of ∇u on a uniform mesh, maps scalar grid
+    functions shaped (NN, ) to (NN, GD).
+
+    The partial derivatives are second order central differences inside and
+    second order one-sided differences on the boundary nodes.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): the uniform mesh.
+    """
+    def __init__(self, mesh):
+        self.ncomp = (mesh.geo_dimension(), 1)
+        super().__init__(mesh)
+
+    def stencil(self) -> List[Term]:
+        terms = []
+        for d in range(self.GD):
+            coef = first_derivative_coef(self.grid_shape[d], self.h[d])
+            for o, val in coef.items():
+                val = bm.tensor(val, dtype=self.ftype, device=self.device)
+                terms.append((d, 0, self._unit(d, o), self._axis_vector(d, val)))
+        return terms
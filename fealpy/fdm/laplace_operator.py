@@ -0,0 +1,23 @@
+
+from typing import List
+
+from .stencil_operator import StencilOperator, Term
+
+
+class LaplaceOperator(StencilOperator):
+    """The (2*GD+1)-point difference operator of -Δu on a uniform mesh.
+
+    The values out of the grid are taken as zeros, so the matrix is symmetric
+    positive definite; the rows of the Dirichlet nodes are usually replaced
+    by the boundary condition.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): the uniform mesh.
+    """
+    def stencil(self) -> List[Term]:
+        c = [1.0 / h**2 for h in self.h]
+        terms = [(0, 0, self._unit(0, 0), 2.0 * sum(c))]
+        for d in range(self.GD):
+            terms.append((0, 0, self._unit(d, -1), -c[d]))
+            terms.append((0, 0, self._unit(d, 1), -c[d]))
+        return terms
@@ -0,0 +1,199 @@
+
+from typing import Tuple, List, Union
+from math import prod
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+from ..sparse import CSRTensor
+
+Coef = Union[float, TensorLike]
+Term = Tuple[int, int, Tuple[int, ...], Coef]
+
+
+class StencilOperator():
+    """Base class of the finite difference operators on uniform meshes.
+
+    An operator maps grid functions given on the nodes of a UniformMesh2d or
+    UniformMesh3d, in the node order of the mesh, shaped (NN, ) for scalar
+    functions and (NN, ncomp) for vector ones. It is described by its stencil,
+    a list of terms `(co, ci, offset, coef)`: the component `co` of the result
+    at the node of grid index `i` gets `coef[i] * u[i + offset, ci]`. Values
+    out of the grid are taken as zeros.
+
+    Subclasses set `ncomp = (nout, nin)` and implement `stencil`.
+    """
+    ncomp: Tuple[int, int] = (1, 1)
+
+    def __init__(self, mesh):
+        if not all(hasattr(mesh, name) for name in ('nx', 'ny', 'h')):
+            raise TypeError(f"{self.__class__.__name__} works on uniform meshes, "
+                            f"but got {mesh.__class__.__name__}")
+        self.mesh = mesh
+        self.GD = mesh.geo_dimension()
+        segments = (mesh.nx, mesh.ny, getattr(mesh, 'nz', 0))[:self.GD]
+        self.grid_shape = tuple(n + 1 for n in segments)
+        # the grid index runs opposite to the coordinate on a flipped axis
+        flip = {'x': 0, 'y': 1, 'z': 2}.get(mesh.flip_direction, -1)
+        self.h = tuple(-h if d == flip else h for d, h in enumerate(mesh.h))
+        self.ftype = mesh.ftype
+        self.device = mesh.device
+        self.terms: List[Term] = self.stencil()
+
+    def stencil(self) -> List[Term]:
+        """Return the terms `(co, ci, offset, coef)` of the operator, where `coef`
+        is a number or a tensor broadcastable to the grid shape."""
+        raise NotImplementedError
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        NN = prod(self.grid_shape)
+        return (NN * self.ncomp[0], NN * self.ncomp[1])
+
+    def _axis_vector(self, axis: int, value: TensorLike) -> TensorLike:
+        """Reshape a 1-d tensor along `axis` to broadcast against the grid."""
+        shape = [1] * self.GD
+        shape[axis] = -1
+        return bm.reshape(value, shape)
+
+    def _unit(self, axis: int, step: int=1) -> Tuple[int, ...]:
+        return tuple(step if d == axis else 0 for d in range(self.GD))
+
+    def _pad(self, u: TensorLike, r: int) -> TensorLike:
+        """Pad the grid axes of `u` with `r` layers of zeros on both sides."""
+        for axis in range(self.GD):
+            shape = list(u.shape)
+            shape[axis] = r
+            zeros = bm.zeros(shape, dtype=u.dtype, device=bm.get_device(u))
+            u = bm.concatenate([zeros, u, zeros], axis=axis)
+        return u
+
+    def apply(self, u: TensorLike) -> TensorLike:
+        """Apply the operator to a grid function by shifted slices, without
+        building the matrix.
+
+        Parameters:
+            u (TensorLike): values on the nodes, shaped (NN, *batch) for scalar
+                inputs or (NN, nin, *batch).
+
+        Returns:
+            TensorLike: shaped (NN, *batch) or (NN, nout, *batch).
+        """
+        nout, nin = self.ncomp
+        shape = self.grid_shape
+        batch = tuple(u.shape[1:] if nin == 1 else u.shape[2:])
+        u = bm.reshape(u, shape + (nin, ) + batch)
+        r = max(max(abs(o) for o in offset) for _, _, offset, _ in self.terms)
+        u = self._pad(u, r)
+        expand = (Ellipsis, ) + (None, ) * len(batch)
+
+        out = [bm.zeros(shape + batch, dtype=u.dtype, device=bm.get_device(u))
+               for _ in range(nout)]
+        for co, ci, offset, coef in self.terms:
+            if isinstance(coef, TensorLike):
+                coef = coef[expand]
+            index = tuple(slice(r + o, r + o + n) for o, n in zip(offset, shape))
+            out[co] = out[co] + coef * u[index + (ci, )]
+
+        NN = prod(shape)
+        if nout == 1:
+            return bm.reshape(out[0], (NN, ) + batch)
+        return bm.reshape(bm.stack(out, axis=self.GD), (NN, nout) + batch)
+
+    def __matmul__(self, u: TensorLike) -> TensorLike:
+        return self.apply(u)
+
+    def diagonal(self) -> TensorLike:
+        """Diagonal of the matrix of the operator, in the layout of `apply`."""
+        nout, nin = self.ncomp
+        if nout != nin:
+            raise ValueError("the diagonal is only defined for operators with "
+                             f"the same input and output components, but got {self.ncomp}")
+        shape = self.grid_shape
+        diag = [bm.zeros(shape, dtype=self.ftype, device=self.device) for _ in range(nout)]
+        for co, ci, offset, coef in self.terms:
+            if co == ci and not any(offset):
+                diag[co] = diag[co] + coef
+        if nout == 1:
+            return bm.reshape(diag[0], (-1, ))
+        return bm.reshape(bm.stack(diag, axis=-1), (-1, ))
+
+    def assembly(self) -> CSRTensor:
+        """Build the sparse matrix of the operator directly in CSR format from
+        the stencil offsets, with sorted columns and without the entries out of
+        the grid or with zero coefficients.
+
+        Returns:
+            CSRTensor: shaped (NN*nout, NN*nin).
+        """
+        nout, nin = self.ncomp
+        shape = self.grid_shape
+        GD = self.GD
+        NN = prod(shape)
+        kwargs = {'dtype': bm.int64, 'device': self.device}
+        strides = [prod(shape[d+1:]) for d in range(GD)]
+        index = [self._axis_vector(d, bm.arange(n, **kwargs)) for d, n in enumerate(shape)]
+        node = bm.reshape(bm.arange(NN, **kwargs), shape)
+
+        cols, vals, flags = [], [], []
+        for co in range(nout):
+            # ordered by the column they hit, so that columns are sorted in rows
+            terms = sorted((t for t in self.terms if t[0] == co),
+                           key=lambda t: (sum(o*s for o, s in zip(t[2], strides)), t[1]))
+            col, val, flag = [], [], []
+            for _, ci, offset, coef in terms:
+                inside = bm.ones(shape, dtype=bm.bool, device=self.device)
+                for d, o in enumerate(offset):
+                    inside = inside & (index[d] + o >= 0) & (index[d] + o < shape[d])
+                shift = sum(o*s for o, s in zip(offset, strides))
+                if isinstance(coef, TensorLike):
+                    v = bm.broadcast_to(bm.astype(coef, self.ftype), shape)
+                else:
+                    v = bm.full(shape, coef, dtype=self.ftype, device=self.device)
+                col.append(bm.reshape(bm.where(inside, (node + shift) * nin + ci, 0), (-1, )))
+                val.append(bm.reshape(v, (-1, )))
+                flag.append(bm.reshape(inside & (v != 0), (-1, )))
+            cols.append(col)
+            vals.append(val)
+            flags.append(flag)
+
+        # pad the terms of all components to the same number
+        K = max(len(col) for col in cols)
+        zeros = bm.zeros((NN, ), **kwargs)
+        for col, val, flag in zip(cols, vals, flags):
+            col.extend([zeros] * (K - len(col)))
+            val.extend([bm.zeros((NN, ), dtype=self.ftype, device=self.device)] * (K - len(val)))
+            flag.extend([zeros != 0] * (K - len(flag)))
+
+        def table(data):
+            # (NN, nout, K) -> (NN*nout, K), rows in the layout of `apply`
+            data = bm.stack([bm.stack(d, axis=-1) for d in data], axis=1)
+            return bm.reshape(data, (NN * nout, K))
+
+        col, val, flag = table(cols), table(vals), table(flags)
+        crow = bm.concatenate([bm.zeros((1, ), **kwargs),
+                               bm.cumsum(bm.astype(bm.sum(flag, axis=1), bm.int64), axis=0)])
+        return CSRTensor(crow, col[flag], val[flag], spshape=self.shape)
+
+
+def first_derivative_coef(n: int, h: float):
+    """Coefficients of the second order difference of the first derivative
+    on `n` uniform points of step `h`: central inside and one-sided on the two
+    ends, first order if there are only two points.
+
+    Returns:
+        dict: offset -> coefficients shaped (n, ) as Python lists.
+    """
+    if n < 2:
+        raise ValueError(f"at least two points are needed along an axis, but got {n}")
+    coef = {o: [0.0] * n for o in range(-2, 3)}
+    if n == 2:
+        coef[0] = [-1/h, 1/h]
+        coef[1][0] = 1/h
+        coef[-1][1] = -1/h
+        return coef
+    for i in range(1, n - 1):
+        coef[-1][i] = -0.5/h
+        coef[1][i] = 0.5/h
+    coef[0][0], coef[1][0], coef[2][0] = -1.5/h, 2.0/h, -0.5/h
+    coef[0][-1], coef[-1][-1], coef[-2][-1] = 1.5/h, -2.0/h, 0.5/h
+    return coef
@@ -38,4 +38,5 @@ from .dirichlet_bc_operator import DirichletBCOperator
 from .recovery_alg import RecoveryAlg
 
 ### Other
-from .semilinear_wrapper import SemilinearWrapperInt
\ No newline at end of file
+from .semilinear_wrapper import SemilinearWrapperInt
+from .transfer_projector import TransferProjector
@@ -0,0 +1,256 @@
+from typing import Sequence, Tuple, Optional, Dict, Hashable, Any
+from collections import OrderedDict
+import weakref
+
+from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
+from .integrator import Integrator, CellInt, FaceInt
+
+
+__all__ = [
+    'AssemblyPlan',
+    'plan_key',
+    'get_assembly_plan',
+    'clear_assembly_plans'
+]
+
+_E2D = Tuple[TensorLike, TensorLike]
+
+
+class AssemblyPlan():
+    """The symbolic part of assembling a global CSR matrix.
+
+    An assembly plan holds the sparsity pattern (`crow`, `col`) of the global
+    matrix, and for each integrator group a scatter map from the flattened
+    local tensor entries (NC*vldof*uldof) to slots in the CSR value array.
+    With a plan, the numeric assembly is a single `index_add` per group,
+    without sorting or coalescing.
+
+    In the compact mode (`chunk_size > 0`), the pattern is built chunk by chunk
+    and the scatter maps are not stored. Instead, slots of local entries are
+    located by a binary search in the sorted pattern when values are added.
+    This keeps the memory of the plan O(nnz).
+
+    Parameters:
+        e2dofs (Sequence[Tuple[Tensor, Tensor]]): (ue2dof, ve2dof) pairs for each group.\n
+        spshape (Size): Sparse shape (nrow, ncol) of the output matrix.\n
+        transposed (bool, optional): Whether to swap the local row and column. Defaults to False.\n
+        chunk_size (int, optional): Number of entities processed at a time in the\
+        compact mode. Defaults to 0, building scatter maps of all entries at once.
+    """
+    def __init__(self, e2dofs: Sequence[_E2D], spshape: Size, *,
+                 transposed: bool=False, chunk_size: int=0) -> None:
+        if len(e2dofs) == 0:
+            raise ValueError("At least one integrator group is required to "
+                             "build an assembly plan.")
+        nrow, ncol = spshape
+        self.spshape = (nrow, ncol)
+        self.transposed = transposed
+        self.chunk_size = chunk_size
+        itype = e2dofs[0][0].dtype
+        device = bm.get_device(e2dofs[0][0])
+        self.local_shapes = tuple(
+            (ue2dof.shape[0], ve2dof.shape[1], ue2dof.shape[1])
+            for ue2dof, ve2dof in e2dofs
+        )
+
+        if chunk_size > 0:
+            self.e2dofs = tuple(e2dofs)
+            self.scatters = None
+            ukeys = []
+
+            for ue2dof, ve2dof in e2dofs:
+                NC = ue2dof.shape[0]
+                for start in range(0, NC, chunk_size):
+                    chunk = slice(start, min(start + chunk_size, NC))
+                    key = self._local_keys(ue2dof[chunk], ve2dof[chunk])
+                    ukeys.append(bm.unique(key))
+
+            ukey = bm.unique(bm.concat(ukeys, axis=0))
+            inverse = None
+        else:
+            self.e2dofs = None
+            keys = [self._local_keys(ue2dof, ve2dof) for ue2dof, ve2dof in e2dofs]
+            ukey, inverse = bm.unique(bm.concat(keys, axis=0), return_inverse=True)
+
+        row = ukey // ncol
+        counts = bm.zeros((nrow,), dtype=bm.int64, device=device)
+        counts = bm.index_add(counts, row, bm.ones_like(row))
+        ZERO = bm.zeros((1,), dtype=bm.int64, device=device)
+
+        self.keys = ukey
+        self.crow = bm.astype(bm.concat([ZERO, bm.cumsum(counts, axis=0)], axis=0), itype)
+        self.col = bm.astype(ukey % ncol, itype)
+
+        if inverse is not None:
+            self.scatters = []
+            cursor = 0
+
+            for NC, vldof, uldof in self.local_shapes:
+                size = NC * vldof * uldof
+                self.scatters.append(inverse[cursor:cursor+size])
+                cursor += size
+
+    def _local_keys(self, ue2dof: TensorLike, ve2dof: TensorLike) -> TensorLike:
+        """Flattened global positions (row*ncol + col) of local entries."""
+        local_shape = (ue2dof.shape[0], ve2dof.shape[1], ue2dof.shape[1])
+        I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
+        J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
+        if self.transposed:
+            I, J = J, I
+        I = bm.astype(bm.reshape(I, (-1,)), bm.int64)
+        J = bm.astype(bm.reshape(J, (-1,)), bm.int64)
+        return I * self.spshape[1] + J
+
+    @property
+    def nnz(self) -> int:
+        return self.col.shape[0]
+
+    def zeros(self, batch_size: int=0, *, dtype=None, device=None) -> TensorLike:
+        """Return a zero value array matching the pattern."""
+        shape = (self.nnz,) if batch_size == 0 else (batch_size, self.nnz)
+        return bm.zeros(shape, dtype=dtype, device=device)
+
+    def scatter(self, values: TensorLike, group_index: int, local_tensor: TensorLike, *,
+                index: Optional[slice]=None) -> TensorLike:
+        """Add the local tensors of a group (or a contiguous slice of its cells)
+        into the value array.
+
+        Parameters:
+            values (Tensor): CSR value array shaped ([batch, ]nnz).\n
+            group_index (int): Position of the group in the plan.\n
+            local_tensor (Tensor): Local tensors shaped ([batch, ]NC, vldof, uldof).\n
+            index (slice | None, optional): Range of cells that `local_tensor`
+                is evaluated on. Defaults to None, meaning all cells of the group.
+
+        Returns:
+            Tensor: The updated value array.
+        """
+        if self.scatters is None:
+            ue2dof, ve2dof = self.e2dofs[group_index]
+            if index is not None:
+                ue2dof, ve2dof = ue2dof[index], ve2dof[index]
+            scatter = bm.searchsorted(self.keys, self._local_keys(ue2dof, ve2dof))
+        else:
+            scatter = self.scatters[group_index]
+
+            if index is not None:
+                NC, vldof, uldof = self.local_shapes[group_index]
+                scatter = bm.reshape(scatter, (NC, vldof*uldof))[index]
+                scatter = bm.reshape(scatter, (-1,))
+
+        if values.ndim == 1:
+            src = bm.reshape(local_tensor, (-1,))
+        else:
+            src = bm.reshape(local_tensor, (values.shape[0], -1))
+
+        return bm.index_add(values, scatter, src, axis=-1)
+
+
+class _Ref():
+    """A hashable reference to an object, equal only to references of the same
+    living object. It does not keep the object alive."""
+    __slots__ = ('_ref', '_id')
+
+    def __init__(self, obj: Any) -> None:
+        self._ref = weakref.ref(obj)
+        self._id = id(obj)
+
+    def __hash__(self) -> int:
+        return self._id
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, _Ref):
+            return False
+        obj = self._ref()
+        return (obj is not None) and (obj is other._ref())
+
+
+def _region_key(region: Any) -> Hashable:
+    if (region is None) or isinstance(region, (bool, int, str)):
+        return region
+    if isinstance(region, slice) and all(isinstance(v, (int, type(None))) for v in
+                                         (region.start, region.stop, region.step)):
+        return ('slice', region.start, region.stop, region.step)
+    return _Ref(region) # tensors and callables, by identity
+
+
+def plan_key(spaces: Sequence[Any], integrators: Sequence[Integrator],
+             e2dofs: Sequence[_E2D]) -> Optional[Hashable]:
+    """Return the cache key of the assembly plan of a form, or None if the plan
+    should not be cached.
+
+    The key is made of the spaces, the topology version of their meshes and
+    their dof permutations, and for each group the kind of entities, the
+    integration region (`index` or `threshold`) of the integrator and the
+    shapes of the entity-to-dof maps. So it costs no device synchronization,
+    and is changed by modifying the mesh or reordering the dofs.
+
+    Parameters:
+        spaces (Sequence[FunctionSpace]): The spaces of the form.\n
+        integrators (Sequence[Integrator]): An integrator of each group.\n
+        e2dofs (Sequence[Tuple[Tensor, Tensor]]): (ue2dof, ve2dof) pairs for each group.
+    """
+    try:
+        space_keys = []
+        for space in spaces:
+            version = getattr(getattr(space, 'mesh', None), 'topology_version', None)
+            if version is None:
+                return None
+            dof = getattr(getattr(space, 'scalar_space', space), 'dof', None)
+            perm = getattr(dof, 'permutation', None)
+            space_keys.append((_Ref(space), version, None if perm is None else _Ref(perm)))
+
+        group_keys = []
+        for int_, (ue2dof, ve2dof) in zip(integrators, e2dofs):
+            if isinstance(int_, CellInt):
+                kind = 'cell'
+            elif isinstance(int_, FaceInt):
+                kind = 'face'
+            else:
+                kind = type(int_)
+            group_keys.append((kind, _region_key(getattr(int_, 'index', None)),
+                               _region_key(getattr(int_, 'threshold', None)),
+                               tuple(ue2dof.shape), tuple(ve2dof.shape)))
+    except TypeError: # objects not supporting weak references
+        return None
+
+    return (bm.backend_name, str(bm.get_device(e2dofs[0][0])),
+            tuple(space_keys), tuple(group_keys))
+
+
+_PLAN_CACHE: Dict[Hashable, AssemblyPlan] = OrderedDict()
+_PLAN_CACHE_SIZE = 8
+
+
+def get_assembly_plan(e2dofs: Sequence[_E2D], spshape: Size, *,
+                      key: Optional[Hashable]=None, transposed: bool=False,
+                      chunk_size: int=0) -> AssemblyPlan:
+    """Fetch the assembly plan from the cache, or build it if not found.
+
+    Plans are cached by `key`, see `plan_key`, so forms created again on the
+    same spaces (for example in every time step) share the sparsity pattern
+    instead of sorting it again. Plans without a key are not cached.
+    The least recently used plan is dropped when the cache is full.
+    """
+    if key is None:
+        return AssemblyPlan(e2dofs, spshape, transposed=transposed, chunk_size=chunk_size)
+
+    key = (key, tuple(spshape), transposed, chunk_size > 0)
+
+    if key in _PLAN_CACHE:
+        _PLAN_CACHE.move_to_end(key)
+        return _PLAN_CACHE[key]
+
+    plan = AssemblyPlan(e2dofs, spshape, transposed=transposed, chunk_size=chunk_size)
+    _PLAN_CACHE[key] = plan
+
+    while len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+        _PLAN_CACHE.popitem(last=False)
+
+    return plan
+
+
+def clear_assembly_plans() -> None:
+    """Clear all the cached assembly plans."""
+    _PLAN_CACHE.clear()
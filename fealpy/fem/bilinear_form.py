@@ -7,6 +7,7 @@ from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 from .form import Form
 from .integrator import LinearInt
+from .assembly_plan import get_assembly_plan, plan_key
 
 
 class BilinearForm(Form[LinearInt]):
@@ -73,29 +74,134 @@ class BilinearForm(Form[LinearInt]):
 
         return M
 
+    def _planned_assembly(self, retain_ints: bool, batch_size: int):
+        self.check_space()
+        space = self._spaces
+        groups = list(self.integrators.keys())
+        group_tensors = []
+        e2dof_pairs = []
+
+        for group in groups:
+            group_tensor, e2dofs = self._assembly_group(group, retain_ints)
+            ue2dof = e2dofs[0]
+            ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
+            group_tensors.append(group_tensor)
+            e2dof_pairs.append((ue2dof, ve2dof))
+
+        transposed = getattr(self, '_transposed', False)
+        spshape = self.sparse_shape
+        key = plan_key(space, [self.integrators[g][0] for g in groups], e2dof_pairs)
+        plan = get_assembly_plan(e2dof_pairs, spshape, key=key, transposed=transposed)
+        values = plan.zeros(batch_size, dtype=space[0].ftype,
+                            device=bm.get_device(space[0]))
+
+        for idx, group_tensor in enumerate(group_tensors):
+            if (batch_size > 0) and (group_tensor.ndim == 3):
+                group_tensor = bm.broadcast_to(group_tensor[None, ...],
+                                               (batch_size,) + group_tensor.shape)
+            values = plan.scatter(values, idx, group_tensor)
+
+        return CSRTensor(plan.crow, plan.col, values, spshape)
+
+    def _chunked_assembly(self, batch_size: int, chunk_size: int,
+                          num_threads: int=0, partition: Optional[TensorLike]=None):
+        self.check_space()
+        space = self._spaces
+        groups = list(self.integrators.keys())
+        e2dof_pairs = []
+
+        for group in groups:
+            int0 = self.integrators[group][0]
+            ue2dof = int0.to_global_dof(space[0])
+            ve2dof = int0.to_global_dof(space[1]) if (len(space) > 1) else ue2dof
+            e2dof_pairs.append((ue2dof, ve2dof))
+
+        transposed = getattr(self, '_transposed', False)
+        spshape = self.sparse_shape
+        key = plan_key(space, [self.integrators[g][0] for g in groups], e2dof_pairs)
+        plan = get_assembly_plan(e2dof_pairs, spshape, key=key, transposed=transposed,
+                                 chunk_size=chunk_size)
+        values = plan.zeros(batch_size, dtype=space[0].ftype,
+                            device=bm.get_device(space[0]))
+
+        for idx, group in enumerate(groups):
+            if not self._is_chunkable(group):
+                group_tensor, _ = self._assembly_group(group)
+                parts = [(None, (group_tensor, None))]
+            else:
+                size = chunk_size
+                if (size <= 0) and (num_threads > 1):
+                    NC = e2dof_pairs[idx][0].shape[0]
+                    size = -(-NC // num_threads)
+                chunks = self._group_chunks(group, size, partition)
+                parts = self._iter_group_chunks(group, chunks, num_threads)
+
+            for chunk, (group_tensor, _) in parts:
+                if (batch_size > 0) and (group_tensor.ndim == 3):
+                    group_tensor = bm.broadcast_to(group_tensor[None, ...],
+                                                   (batch_size,) + group_tensor.shape)
+                values = plan.scatter(values, idx, group_tensor, index=chunk)
+
+        return CSRTensor(plan.crow, plan.col, values, spshape)
+
     @overload
-    def assembly(self, *, retain_ints: bool=False) -> CSRTensor: ...
+    def assembly(self, *, retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> CSRTensor: ...
     @overload
-    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False) -> COOTensor: ...
+    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> COOTensor: ...
     @overload
-    def assembly(self, *, format: Literal['csr'], retain_ints: bool=False) -> CSRTensor: ...
-    def assembly(self, *, format='csr', retain_ints: bool=False):
+    def assembly(self, *, format: Literal['csr'], retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> CSRTensor: ...
+    def assembly(self, *, format='csr', retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None):
         """Assembly the bilinear form matrix.
 
+        The CSR output is assembled with a cached assembly plan: the sparsity
+        pattern and the scatter maps of local entries are built in the first call
+        and reused by later assemblies on the same spaces, in which only the
+        local tensors are computed.
+
+        If `chunk_size` is positive, integrators are evaluated on at most
+        `chunk_size` cells at a time and the local tensors are added to the
+        global values right away, so that the peak memory is bounded by the
+        non-zeros of the matrix and one chunk of local tensors.
+
+        If `num_threads > 1`, cell partitions are evaluated concurrently on a
+        thread pool and merged into the same CSR values. Partitions are
+        contiguous blocks of cells, or given by `partition` labels, e.g. the
+        output of a METIS partition of the mesh.
+
         Parameters:
             format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.\n
-            retain_ints (bool, optional): Whether to retain the integrator cache.csr
+            retain_ints (bool, optional): Whether to retain the integrator cache.\n
+            chunk_size (int, optional): Number of cells evaluated at a time.\
+            Defaults to 0, evaluating all cells at once.\n
+            num_threads (int, optional): Number of threads evaluating cell\
+            partitions. Defaults to 0, running in the current thread.\n
+            partition (Tensor | None, optional): Partition label of each mesh cell.\
+            Defaults to None.
 
         Returns:
             global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped ([batch, ]gdof, gdof).
         """
-        M = self._scalar_assembly(retain_ints, self.batch_size)
-        if getattr(self, '_transposed', False):
-            M = M.T
-
-        if format == 'csr':
-            self._M = M.coalesce().tocsr()
+        if (chunk_size > 0) or (num_threads > 1) or (partition is not None):
+            if retain_ints:
+                raise ValueError("Integrator results can not be retained in "
+                                 "the chunked assembly.")
+            M = self._chunked_assembly(self.batch_size, chunk_size, num_threads, partition)
+            if format == 'csr':
+                self._M = M
+            elif format == 'coo':
+                self._M = M.tocoo()
+            else:
+                raise ValueError(f"Unsupported format {format}.")
+        elif format == 'csr':
+            self._M = self._planned_assembly(retain_ints, self.batch_size)
         elif format == 'coo':
+            M = self._scalar_assembly(retain_ints, self.batch_size)
+            if getattr(self, '_transposed', False):
+                M = M.T
             self._M = M.coalesce()
         else:
             raise ValueError(f"Unsupported format {format}.")
@@ -103,58 +209,154 @@ class BilinearForm(Form[LinearInt]):
 
         return self._M
 
-    def mult(self, x: TensorLike, out: Optional[TensorLike]=None) -> TensorLike:
+    def _iter_local_tensors(self, group: str, retain_ints: bool=False, chunk_size: int=0):
+        """Yield the local tensors and entity-to-global maps of a group, in
+        chunks of at most `chunk_size` entities if the integrators support it.
+
+        Local tensors are dropped after use, unless they are already in the
+        memory of the form or `retain_ints` is True.
+        """
+        if (group in self.memory) or retain_ints or (not self._is_chunkable(group)):
+            yield self._assembly_group(group, retain_ints)
+            return
+
+        for _, result in self._iter_group_chunks(group, self._group_chunks(group, chunk_size)):
+            yield result
+
+    def mult(self, x: TensorLike, out: Optional[TensorLike]=None, *,
+             retain_ints: bool=False, chunk_size: int=0) -> TensorLike:
         """Maxtrix vector multiplication.
 
+        This is a matrix-free product: the local tensors of integrators are
+        contracted with the gathered `x` cell by cell and added to the output
+        through `entity_to_global`, without constructing the global sparse matrix.
+        Groups whose integrators all have matrix-free actions, e.g. those using
+        the 'sumfac' method, are applied without forming local tensors.
+
+        Local tensors are evaluated again in every product and are not kept,
+        unless `retain_ints` is True, which trades the memory of all local
+        tensors for faster repeated products.
+
         Parameters:
             x (TensorLike): Vector, accepts batch on the first dimension.\n
-            out (TensorLike, optional): Output vector. Defaults to None.
+            out (TensorLike, optional): Output vector. Defaults to None.\n
+            retain_ints (bool, optional): Whether to keep the local tensors in the\
+            memory of the form. Defaults to False.\n
+            chunk_size (int, optional): Number of cells whose local tensors are\
+            evaluated at a time. Defaults to 0, evaluating all cells at once.
 
         Returns:
             TensorLike: self @ x
         """
-        raise NotImplementedError
-
-    @property
-    def T(self):
-        transposed = self.copy()
-        transposed._transposed = True
-        transposed._M = self._M
-        return transposed
-
-    def __matmul__(self, u: TensorLike):
-        if self._M is not None:
-            return self._M @ u
-
         nrow = self.shape[-2]
-        kwargs = bm.context(u)
+        transposed = getattr(self, '_transposed', False)
 
         if self.batch_size > 0:
             shape = (self.batch_size, nrow)
-            out_subs = 'bci'
             gv_reshape = (self.batch_size, -1)
         else:
-            if u.ndim >= 2:
-                shape = (u.shape[0], nrow)
-                out_subs = 'bci'
-                gv_reshape = (u.shape[0], -1)
+            if x.ndim >= 2:
+                shape = (x.shape[0], nrow)
+                gv_reshape = (x.shape[0], -1)
             else:
                 shape = (nrow,)
-                out_subs = 'ci'
                 gv_reshape = (-1,)
 
-        v = bm.zeros(shape, **kwargs)
+        if out is None:
+            out = bm.zeros(shape, **bm.context(x))
+        else:
+            if tuple(out.shape) != shape:
+                raise ValueError(f"out.shape={tuple(out.shape)} != {shape}")
+            out = bm.set_at(out, ..., 0)
+
+        batched_out = len(shape) == 2
         gt_subs = 'bcij' if (self.batch_size > 0) else 'cij'
-        gu_subs = 'bcj' if (u.ndim >= 2) else 'cj'
+        gx_subs = ('bci' if transposed else 'bcj') if (x.ndim >= 2) else ('ci' if transposed else 'cj')
+        out_subs = ('bcj' if transposed else 'bci') if batched_out else ('cj' if transposed else 'ci')
 
         for group in self.integrators.keys():
-            group_tensor, e2dofs = self._assembly_group(group, True)
-            ue2dof = e2dofs[0]
-            ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
-            gu = u[..., ue2dof] # (..., NC, uldof)
-            gv = bm.einsum(f'{gt_subs}, {gu_subs} -> {out_subs}', group_tensor, gu)
-            v = bm.index_add(v, ve2dof.reshape(-1), gv.reshape(gv_reshape))
+            if self._is_matrix_free(group, transposed):
+                INTS = self.integrators[group]
+                e2dof = INTS[0].to_global_dof(self._spaces[0])
+                gx = x[..., e2dof] # (..., NC, ldof)
+                gv = INTS[0].apply(self.space, gx)
+                for int_ in INTS[1:]:
+                    gv = gv + int_.apply(self.space, gx)
+                out = bm.index_add(out, e2dof.reshape(-1), gv.reshape(gv_reshape), axis=-1)
+                continue
+
+            for group_tensor, e2dofs in self._iter_local_tensors(group, retain_ints, chunk_size):
+                ue2dof = e2dofs[0]
+                ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
+                if transposed:
+                    ue2dof, ve2dof = ve2dof, ue2dof
+                gx = x[..., ue2dof] # (..., NC, uldof)
+                gv = bm.einsum(f'{gt_subs}, {gx_subs} -> {out_subs}', group_tensor, gx)
+                out = bm.index_add(out, ve2dof.reshape(-1), gv.reshape(gv_reshape), axis=-1)
+
+        return out
+
+    def _is_matrix_free(self, group: str, transposed: bool=False) -> bool:
+        """Whether the group can be applied by the actions of its integrators.
+        This does not depend on the local tensors kept in the memory."""
+        if transposed or (self.batch_size > 0):
+            return False
+        if len(self._spaces) > 1:
+            return False
+        return all(int_.matrix_free for int_ in self.integrators[group])
+
+    def diagonal(self, *, retain_ints: bool=False, chunk_size: int=0) -> TensorLike:
+        """Diagonal of the bilinear form matrix, computed from the local tensors
+        without constructing the global sparse matrix. Groups whose integrators
+        all have local diagonal methods, e.g. those using the 'sumfac' method,
+        do not form local tensors.
+
+        Parameters:
+            retain_ints (bool, optional): Whether to keep the local tensors in the\
+            memory of the form. Defaults to False.\n
+            chunk_size (int, optional): Number of cells whose local tensors are\
+            evaluated at a time. Defaults to 0, evaluating all cells at once.
 
-        return v
+        Returns:
+            TensorLike: The diagonal shaped ([batch, ]gdof).
+        """
+        if len(self._spaces) > 1 and (self.sparse_shape[0] != self.sparse_shape[1]):
+            raise ValueError("Diagonal is only available for square bilinear forms.")
+        space = self._spaces[0]
+        gdof = self.sparse_shape[0]
+        shape = (gdof,) if self.batch_size == 0 else (self.batch_size, gdof)
+        diag = bm.zeros(shape, dtype=space.ftype, device=bm.get_device(space))
+
+        for group in self.integrators.keys():
+            INTS = self.integrators[group]
+            if (self.batch_size == 0) and all(int_.has_diagonal for int_ in INTS):
+                e2dof = INTS[0].to_global_dof(space)
+                local_diag = INTS[0].diagonal(self.space)
+                for int_ in INTS[1:]:
+                    local_diag = local_diag + int_.diagonal(self.space)
+                diag = bm.index_add(diag, e2dof.reshape(-1), local_diag.reshape(-1), axis=-1)
+                continue
 
+            for group_tensor, e2dofs in self._iter_local_tensors(group, retain_ints, chunk_size):
+                e2dof = e2dofs[0]
+                local_diag = bm.einsum('...ii -> ...i', group_tensor)
+                if (self.batch_size > 0) and (local_diag.ndim == 2):
+                    local_diag = bm.broadcast_to(local_diag[None, ...],
+                                                 (self.batch_size,) + local_diag.shape)
+                local_diag = bm.reshape(local_diag, self._values_ravel_shape)
+                diag = bm.index_add(diag, e2dof.reshape(-1), local_diag, axis=-1)
+
+        return diag
+
+    @property
+    def T(self):
+        transposed = self.copy()
+        transposed._transposed = True
+        transposed._M = self._M
+        return transposed
+
+    def __matmul__(self, u: TensorLike):
+        if self._M is not None:
+            return self._M @ u
 
+        return self.mult(u)
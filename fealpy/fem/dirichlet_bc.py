@@ -100,7 +100,7 @@ class DirichletBC():
 
     def apply(self, A: SparseTensor, f: TensorLike, uh: Optional[TensorLike]=None,
               gd: Optional[CoefLike]=None, *,
-              check=True) -> Tuple[TensorLike, TensorLike]:
+              check=True, inplace=False) -> Tuple[TensorLike, TensorLike]:
         """Apply Dirichlet boundary conditions.
 
         Parameters:
@@ -112,21 +112,30 @@ class DirichletBC():
             gd (CoefLike | None, optional): The Dirichlet boundary condition.\
                 Use the default gd passed in the __init__ if `None`. Default to None.
             check (bool, optional): _description_. Defaults to True.
+            inplace (bool, optional): Whether to modify values of `A` in place, keeping\
+                the sparsity pattern. See `apply_matrix()`. Defaults to False.
 
         Returns:
             out (SparseTensor, Tensor): New adjusted `A` and `f`.
         """
         f = self.apply_vector(f, A, uh, gd, check=check)
-        A = self.apply_matrix(A, check=check)
+        A = self.apply_matrix(A, check=check, inplace=inplace)
         return A, f
 
-    def apply_matrix(self, matrix: _ST, *, check=True) -> _ST:
+    def apply_matrix(self, matrix: _ST, *, check=True, inplace=False) -> _ST:
         """Apply Dirichlet boundary condition to left-hand-size matrix only.
 
         Parameters:
             matrix (SparseTensor): The original left-hand-size sparse matrix\
                 of the linear system.
             check (bool, optional): Whether to check the matrix. Defaults to True.
+            inplace (bool, optional): Keep the sparsity pattern and only modify the\
+                values: entries in Dirichlet rows and columns are set to zero and\
+                the diagonal of Dirichlet rows to one. Positions of these entries are\
+                cached and reused for matrices of the same pattern. Values of `matrix`\
+                are overwritten where the backend supports in-place operations.\
+                The pattern must be coalesced and contain the diagonal of Dirichlet rows.\
+                Defaults to False.
 
         Returns:
             SparseTensor: New adjusted left-hand-size matrix.
@@ -141,6 +150,9 @@ class DirichletBC():
         # ```
         # Here the adjustment is done by operating the sparse structure directly.
         A = self.check_matrix(matrix) if check else matrix
+        if inplace:
+            return self._apply_matrix_inplace(A)
+
         isDDof = self.is_boundary_dof
         kwargs = A.values_context()
         if isinstance(A, COOTensor):
@@ -180,7 +192,8 @@ class DirichletBC():
             non_diag = bm.set_at(non_diag, new_crow[:-1][loc_flag], False)
 
             new_col = bm.empty((NNZ,), **indices_context)
-            new_col = bm.set_at(new_col, new_crow[:-1][loc_flag], self.boundary_dof_index)
+            new_col = bm.set_at(new_col, new_crow[:-1][loc_flag],
+                                bm.astype(self.boundary_dof_index, col.dtype))
             new_col = bm.set_at(new_col, non_diag, col[remain_flag])
 
             new_values = bm.empty((NNZ,), **kwargs)
@@ -191,38 +204,90 @@ class DirichletBC():
 
         return A
 
-    def apply_vector(self, vector: TensorLike, matrix: SparseTensor,
-                     uh: Optional[TensorLike]=None,
-                     gd: Optional[CoefLike]=None, *, check=True) -> TensorLike:
-        """Apply Dirichlet boundary contition to right-hand-size vector only.
+    def _pattern_positions(self, A: SparseTensor) -> Tuple[TensorLike, TensorLike]:
+        """Positions in the value array of entries to be zeroed and of the
+        diagonal of Dirichlet rows, cached for the sparsity pattern of `A`."""
+        if isinstance(A, CSRTensor):
+            key = (A.crow(), A.col())
+        else:
+            key = (A.indices(), )
+
+        cache = getattr(self, '_pattern_cache', None)
+        if cache is not None and len(cache[0]) == len(key) and all(
+            a is b or (a.shape == b.shape and bool(bm.all(a == b)))
+            for a, b in zip(cache[0], key)
+        ):
+            return cache[1], cache[2]
+
+        if isinstance(A, CSRTensor):
+            row, col = A.row(), A.col()
+        else:
+            row, col = key[0][0], key[0][1]
+        isDDof = self.is_boundary_dof
+        diag_flag = isDDof[row] & (row == col)
+        zero_flag = (isDDof[row] | isDDof[col]) & ~diag_flag
+        diag_pos = bm.nonzero(diag_flag)[0]
+
+        if diag_pos.shape[0] != self.boundary_dof_index.shape[0]:
+            raise ValueError("The sparsity pattern must be coalesced and contain the "
+                             "diagonal entries of all Dirichlet dofs for in-place application.")
+
+        self._pattern_cache = (key, bm.nonzero(zero_flag)[0], diag_pos)
+        return self._pattern_cache[1], self._pattern_cache[2]
+
+    def _apply_matrix_inplace(self, A: _ST) -> _ST:
+        zero_pos, diag_pos = self._pattern_positions(A)
+        values = A.values()
+        values = bm.set_at(values, (..., zero_pos), 0.)
+        values = bm.set_at(values, (..., diag_pos), 1.)
+
+        if isinstance(A, CSRTensor):
+            return CSRTensor(A.crow(), A.col(), values, A.sparse_shape)
+        return COOTensor(A.indices(), values, A.sparse_shape, is_coalesced=A.is_coalesced)
+
+    def lifting(self, matrix: SparseTensor, gd: Optional[CoefLike]=None, *,
+                check=True) -> Tuple[TensorLike, TensorLike]:
+        """Symmetric lifting of the Dirichlet boundary condition.
+
+        With `u = u0 + ud`, where `ud` interpolates `gd` on Dirichlet dofs and vanishes
+        elsewhere, the interior equations become `A u0 = f - A ud`. This returns the
+        correction `A ud` (zero on Dirichlet dofs) and `ud` without modifying or copying
+        the matrix, so that it can be reused for right-hand sides of many steps:
+        ```
+        A = bc.apply_matrix(A, inplace=True)  # after the lifting
+        f = bm.set_at(f - correction, bc.boundary_dof_index, ud[bc.boundary_dof_index])
+        ```
 
         Parameters:
-            vector (TensorLike): The original right-hand-size vector.
-            matrix (COOTensor): The original COO/CSR sparse matrix.
-            uh (TensorLike | None, optional): The solution uh Tensor. Defuault to None.\
-                See `DirichletBC.apply()` for more details.
+            matrix (SparseTensor): The original left-hand-size sparse matrix.
             gd (CoefLike | None, optional): The Dirichlet boundary condition.\
                 Use the default gd passed in the __init__ if `None`. Default to None.
-            check (bool, optional): Whether to check the vector. Defaults to True.
+            check (bool, optional): Whether to check the matrix. Defaults to True.
 
         Raises:
             RuntimeError: If gd is `None` and no default gd exists.
 
         Returns:
-            TensorLike: New adjusted right-hand-size vector.
+            Tuple[TensorLike, TensorLike]: The correction vector and `ud`.
         """
         A = self.check_matrix(matrix) if check else matrix
-        f = self.check_vector(vector) if check else vector
+        ud = bm.zeros((A.sparse_shape[0], ), **A.values_context())
+        ud = self._boundary_values(ud, gd)
+        isDDof = self.is_boundary_dof
+        ud = bm.where(isDDof, ud, 0.)
+        correction = A.matmul(ud)
+        correction = bm.set_at(correction, self.boundary_dof_index, 0.)
+        return correction, ud
+
+    def _boundary_values(self, uh: Optional[TensorLike], gd: Optional[CoefLike]) -> TensorLike:
         gd = self.gd if gd is None else gd
-        
 
         if gd is None:
             raise RuntimeError("The boundary condition is None.")
-        
+
         if isinstance(self.space, tuple):
             if isinstance(gd, tuple):
                 assert len(gd) == len(self.space)
-                assert uh is None
                 uh = []
                 for i in range(len(gd)):
                     suh, sidDDdof = self.space[i].boundary_interpolate(gd=gd[i],
@@ -233,10 +298,40 @@ class DirichletBC():
                 assert len(gd) == self.gdof
                 uh = gd
         else:
-            if uh is None:
-                uh = bm.zeros_like(f)
             uh, _ = self.space.boundary_interpolate(gd=gd,uh=uh,
                                                 threshold=self.threshold, method=self.method)
+        return uh
+
+    def apply_vector(self, vector: TensorLike, matrix: SparseTensor,
+                     uh: Optional[TensorLike]=None,
+                     gd: Optional[CoefLike]=None, *, check=True) -> TensorLike:
+        """Apply Dirichlet boundary contition to right-hand-size vector only.
+
+        Parameters:
+            vector (TensorLike): The original right-hand-size vector.
+            matrix (COOTensor): The original COO/CSR sparse matrix.
+            uh (TensorLike | None, optional): The solution uh Tensor. Defuault to None.\
+                See `DirichletBC.apply()` for more details.
+            gd (CoefLike | None, optional): The Dirichlet boundary condition.\
+                Use the default gd passed in the __init__ if `None`. Default to None.
+            check (bool, optional): Whether to check the vector. Defaults to True.
+
+        Raises:
+            RuntimeError: If gd is `None` and no default gd exists.
+
+        Returns:
+            TensorLike: New adjusted right-hand-size vector.
+        """
+        A = self.check_matrix(matrix) if check else matrix
+        f = self.check_vector(vector) if check else vector
+        gd = self.gd if gd is None else gd
+
+        if isinstance(self.space, tuple):
+            if isinstance(gd, tuple):
+                assert uh is None
+        elif uh is None:
+            uh = bm.zeros_like(f)
+        uh = self._boundary_values(uh, gd)
         bd_idx = self.boundary_dof_index
         f = f - A.matmul(uh[:])
         f = bm.set_at(f, bd_idx, uh[bd_idx])
@@ -47,11 +47,20 @@ class DirichletBCOperator():
         F = bm.set_at(F, self.is_boundary_dof, uh[self.is_boundary_dof])
         return F
 
+    def diagonal(self) -> TensorLike:
+        """Diagonal of the operator, with ones on the Dirichlet dofs.
+
+        Returns:
+            TensorLike: The diagonal.
+        """
+        diag = self.form.diagonal()
+        return bm.set_at(diag, self.is_boundary_dof, 1.0)
+
     def __matmul__(self, u: TensorLike):
         """Apply the dirichlet boundary condition on the matrix-vetor multiply.
 
         Parameters:
-            u (TensorLike): the input vector.
+            u (TensorLike): the input vector, accepts batch on the first dimension.
 
         Returns:
             v (TensorLike): the result of matrix-vector multiply.
@@ -59,9 +68,10 @@ class DirichletBCOperator():
         TODO:
             1. support for v.shape[0] != u.shape[0]
         """
-        v = bm.copy(u) 
-        val = v[self.is_boundary_dof]
-        bm.set_at(v, self.is_boundary_dof, 0.0)
-        v = self.form @ v 
-        bm.set_at(v, self.is_boundary_dof, val) 
+        index = (..., self.is_boundary_dof)
+        v = bm.copy(u)
+        val = v[index]
+        v = bm.set_at(v, index, 0.0)
+        v = self.form @ v
+        v = bm.set_at(v, index, val)
         return v
@@ -1,7 +1,14 @@
 
-from typing import Sequence, overload, List, Dict, Tuple, Optional, TypeVar, Generic
+from typing import (
+    Sequence, overload, List, Dict, Tuple, Optional, TypeVar, Generic,
+    Union, Iterator
+)
+from copy import copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
 from ..functionspace import FunctionSpace as _FS
 from .integrator import Integrator
 
@@ -9,6 +16,7 @@ from .. import logger
 from abc import ABC
 
 _I = TypeVar('_IT', bound=Integrator)
+_Chunk = Union[slice, TensorLike]
 
 
 class Form(Generic[_I], ABC):
@@ -116,6 +124,20 @@ class Form(Generic[_I], ABC):
         else:
             self.memory.pop(group, None)
 
+    @staticmethod
+    def _merge_local(ct: TensorLike, new_ct: TensorLike, int_: Integrator, group: str):
+        fdim = min(ct.ndim, new_ct.ndim)
+        if ct.shape[:fdim] != new_ct.shape[:fdim]:
+            raise RuntimeError(f"The output of the integrator {int_.__class__.__name__} "
+                               f"has an incompatible shape {tuple(new_ct.shape)} "
+                               f"with the previous {tuple(ct.shape)} in the group '{group}'.")
+        if new_ct.ndim > ct.ndim:
+            return new_ct + ct[None, ...]
+        elif new_ct.ndim < ct.ndim:
+            return ct + new_ct[None, ...]
+        else:
+            return ct + new_ct
+
     def _assembly_group(self, group: str, retain_ints: bool=False):
         if group in self.memory:
             return self.memory[group]
@@ -126,19 +148,161 @@ class Form(Generic[_I], ABC):
 
         for int_ in INTS[1:]:
             new_ct = int_(self.space)
-            fdim = min(ct.ndim, new_ct.ndim)
-            if ct.shape[:fdim] != new_ct.shape[:fdim]:
-                raise RuntimeError(f"The output of the integrator {int_.__class__.__name__} "
-                                   f"has an incompatible shape {tuple(new_ct.shape)} "
-                                   f"with the previous {tuple(ct.shape)} in the group '{group}'.")
-            if new_ct.ndim > ct.ndim:
-                ct = new_ct + ct[None, ...]
-            elif new_ct.ndim < ct.ndim:
-                ct = ct + new_ct[None, ...]
-            else:
-                ct = ct + new_ct
+            ct = self._merge_local(ct, new_ct, int_, group)
 
         if retain_ints:
             self.memory[group] = (ct, etg)
 
         return ct, etg
+
+    def _is_chunkable(self, group: str) -> bool:
+        """Whether all integrators in the group can be evaluated on a part of
+        their entities through the `index` argument."""
+        return all(hasattr(int_, 'index') for int_ in self.integrators[group])
+
+    def _number_of_group_entities(self, group: str) -> int:
+        """Number of entities the integrators of a chunkable group work on."""
+        NE = self._spaces[0].mesh.number_of_cells()
+        return _index_size(self.integrators[group][0].index, NE)
+
+    def _assembly_group_chunk(self, group: str, chunk: _Chunk):
+        """Evaluate the integrators of a group on a part of the entities they
+        integrate over, without touching their caches.
+
+        Parameters:
+            group (str): Name of the integrator group.\n
+            chunk (slice | Tensor): Positions in the entities of the group, e.g.\
+            slice(0, 1000) for the first 1000 cells in the `index` of the integrators.
+
+        Returns:
+            Tuple[Tensor, List[Tensor]]: local tensors and entity-to-global maps of the chunk.
+        """
+        INTS = self.integrators[group]
+        ct = None
+
+        for int_ in INTS:
+            sub = _sub_integrator(int_, self._spaces[0], chunk)
+            new_ct = sub(self.space)
+            if ct is None:
+                ct = new_ct
+                etg = [sub.to_global_dof(s) for s in self._spaces]
+            else:
+                ct = self._merge_local(ct, new_ct, int_, group)
+
+        return ct, etg
+
+    def _group_chunks(self, group: str, chunk_size: int,
+                      partition: Optional[TensorLike]=None) -> List[_Chunk]:
+        """Split the entities of a group into chunks.
+
+        Parameters:
+            group (str): Name of the integrator group.\n
+            chunk_size (int): The maximum number of entities in a chunk.\
+            Not limited if `0`.\n
+            partition (Tensor | None, optional): Partition label of each mesh cell.\
+            If given, entities of every part are put in separate chunks.\
+            Otherwise chunks are contiguous blocks. Defaults to None.
+
+        Returns:
+            List[slice | Tensor]: Positions of chunks in the entities of the group.
+        """
+        space = self._spaces[0]
+        int0 = self.integrators[group][0]
+        NEG = self._number_of_group_entities(group)
+
+        if partition is None:
+            chunk_size = NEG if chunk_size <= 0 else chunk_size
+            return [slice(start, min(start + chunk_size, NEG))
+                    for start in range(0, NEG, chunk_size)]
+
+        NE = space.mesh.number_of_cells()
+        entity = _chunk_index(int0.index, slice(None), NE, space.itype, bm.get_device(space))
+        labels = partition[entity]
+        chunks = []
+
+        for label in bm.unique(labels):
+            loc = bm.nonzero(labels == label)[0]
+            size = loc.shape[0] if chunk_size <= 0 else chunk_size
+            chunks.extend(loc[start:start+size] for start in range(0, loc.shape[0], size))
+
+        return chunks
+
+    def _iter_group_chunks(self, group: str, chunks: Sequence[_Chunk],
+                           num_threads: int=0) -> Iterator[Tuple[_Chunk, Tuple[TensorLike, List[TensorLike]]]]:
+        """Evaluate the integrators of a group chunk by chunk, yielding the chunk
+        and its result in order.
+
+        If `num_threads > 1`, chunks are evaluated on a thread pool, as the
+        heavy computation in integrators (einsum, matmul) releases the GIL.
+        At most `2*num_threads` results are in flight to keep the memory bounded.
+        """
+        if num_threads <= 1:
+            for chunk in chunks:
+                yield chunk, self._assembly_group_chunk(group, chunk)
+            return
+
+        # NOTE: The backend is thread-local, so workers are set to the current one.
+        with ThreadPoolExecutor(max_workers=num_threads, initializer=bm.set_backend,
+                                initargs=(bm.backend_name,)) as pool:
+            futures = deque()
+
+            for chunk in chunks:
+                futures.append((chunk, pool.submit(self._assembly_group_chunk, group, chunk)))
+                if len(futures) >= 2 * num_threads:
+                    chunk_, future = futures.popleft()
+                    yield chunk_, future.result()
+
+            while futures:
+                chunk_, future = futures.popleft()
+                yield chunk_, future.result()
+
+
+def _chunk_index(index, chunk: _Chunk, NE: int, itype, device):
+    # NOTE: Index tensors are produced here as some meshes do not accept
+    # slices other than the full one.
+    if isinstance(index, slice):
+        if isinstance(chunk, slice):
+            rg = range(NE)[index][chunk]
+            return bm.arange(rg.start, rg.stop, rg.step, dtype=itype, device=device)
+        index = bm.arange(NE, dtype=itype, device=device)[index]
+    elif index.dtype == bm.bool:
+        index = bm.nonzero(index)[0]
+    return index[chunk]
+
+
+def _index_size(index, NE: int) -> int:
+    if isinstance(index, slice):
+        return len(range(NE)[index])
+    elif index.dtype == bm.bool:
+        return int(bm.sum(index))
+    return index.shape[0]
+
+
+def _chunk_coef(coef, chunk: _Chunk, NEG: int, batched: bool):
+    if isinstance(coef, TensorLike):
+        axis = 1 if batched else 0
+        if (coef.ndim > axis) and (coef.shape[axis] == NEG):
+            return coef[(slice(None),)*axis + (chunk,)]
+    return coef
+
+
+def _sub_integrator(int_: Integrator, space: _FS, chunk: _Chunk) -> Integrator:
+    """Make a shallow copy of the integrator working on a chunk of its entities.
+
+    Entity-to-dof maps already cached in the integrator are sliced for the chunk,
+    others are computed by the copy on its own entities only."""
+    NE = space.mesh.number_of_cells()
+    NEG = _index_size(int_.index, NE)
+    batched = getattr(int_, 'batched', False)
+    sub = copy(int_)
+    cache = getattr(int_, '_cache', None) or {}
+    sub._cache = {key: value[chunk] for key, value in cache.items()
+                  if key.startswith('to_global_dof_')}
+    sub._value = None
+    sub.index = _chunk_index(int_.index, chunk, NE, space.itype, bm.get_device(space))
+
+    for attr in ('coef', 'source'):
+        if hasattr(sub, attr):
+            setattr(sub, attr, _chunk_coef(getattr(sub, attr), chunk, NEG, batched))
+
+    return sub
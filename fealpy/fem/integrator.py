@@ -29,6 +29,10 @@ class IntegratorMeta(type):
                     if not hasattr(self, '_assembly_map'):
                         self._assembly_map = {}
                     self._assembly_map[call_name] = meth_name
+                if hasattr(meth, '__action_name__'):
+                    self._action_map[getattr(meth, '__action_name__')] = meth_name
+                if hasattr(meth, '__diagonal_name__'):
+                    self._diagonal_map[getattr(meth, '__diagonal_name__')] = meth_name
 
         return type.__init__(self, name, bases, dict, **kwds)
 
@@ -67,6 +71,48 @@ def assemblymethod(call_name: Optional[str]=None):
     return decorator
 
 
+def actionmethod(call_name: str):
+    """A decorator registering the method as the matrix-free action of the
+    assembly method named `call_name`.
+
+    The action method takes the space and the local vectors `x` shaped
+    (..., NC, ldof) gathered by `to_global_dof`, and returns the product of the
+    local operators with `x` in the same shape, without forming local tensors.
+    Integrators created with the assembly method `call_name` are then applied
+    matrix-free by `BilinearForm.mult`.
+
+    Example:
+    ```
+        class MyIntegrator(Integrator):
+            @assemblymethod('my')
+            def my_assembly(self, space: _FS) -> Tensor:
+                return local_tensor
+
+            @actionmethod('my')
+            def my_apply(self, space: _FS, x: Tensor) -> Tensor:
+                return local_product
+    ```
+    """
+    def decorator(meth: _Meth) -> _Meth:
+        meth.__action_name__ = call_name
+        return meth
+    return decorator
+
+
+def diagonalmethod(call_name: str):
+    """A decorator registering the method as the local diagonal of the
+    assembly method named `call_name`.
+
+    The method takes the space and returns the diagonals of the local tensors
+    shaped (NC, ldof), without forming the local tensors. It is used by
+    `BilinearForm.diagonal`.
+    """
+    def decorator(meth: _Meth) -> _Meth:
+        meth.__diagonal_name__ = call_name
+        return meth
+    return decorator
+
+
 def enable_cache(meth: _Meth) -> _Meth:
     """A decorator indicating that the method should be cached by its `space` arg.
 
@@ -92,11 +138,15 @@ class Integrator(metaclass=IntegratorMeta):
     """The base class for integrators on function spaces."""
     _value: Optional[TensorLike] = None
     _assembly_map: Dict[str, str] = {}
+    _action_map: Dict[str, str] = {}
+    _diagonal_map: Dict[str, str] = {}
 
     def __init__(self, method='assembly') -> None:
         if method not in self._assembly_map:
             raise ValueError(f"No assembly method is registered as '{method}'.")
         self._assembly = self._assembly_map[method]
+        self._action = self._action_map.get(method, None)
+        self._diagonal = self._diagonal_map.get(method, None)
 
     def __call__(self, space: _FS) -> TensorLike:
         if hasattr(self, '_value') and self._value is not None:
@@ -117,6 +167,34 @@ class Integrator(metaclass=IntegratorMeta):
         and the global dofs."""
         raise NotImplementedError
 
+    @property
+    def matrix_free(self) -> bool:
+        """Whether the assembly method in use has a matrix-free action."""
+        action = getattr(self, '_action', None)
+        return (action is not None) and hasattr(self, action)
+
+    def apply(self, space: _FS, x: TensorLike) -> TensorLike:
+        """Apply the local operators to local vectors `x` shaped (..., NC, ldof)
+        without forming local tensors. See `actionmethod`."""
+        if not self.matrix_free:
+            raise NotImplementedError(f"{self.__class__.__name__}({self._assembly}) "
+                                      "has no matrix-free action.")
+        return getattr(self, self._action)(space, x)
+
+    @property
+    def has_diagonal(self) -> bool:
+        """Whether the assembly method in use has a local diagonal method."""
+        diagonal = getattr(self, '_diagonal', None)
+        return (diagonal is not None) and hasattr(self, diagonal)
+
+    def diagonal(self, space: _FS) -> TensorLike:
+        """Diagonals of the local tensors shaped (NC, ldof), computed without
+        forming local tensors. See `diagonalmethod`."""
+        if not self.has_diagonal:
+            raise NotImplementedError(f"{self.__class__.__name__}({self._assembly}) "
+                                      "has no local diagonal method.")
+        return getattr(self, self._diagonal)(space)
+
     @assemblymethod('assembly')
     def assembly(self, space: _FS) -> TensorLike:
         raise NotImplementedError
@@ -58,22 +58,72 @@ class LinearForm(Form[LinearInt]):
 
         return M
 
+    def _chunked_assembly(self, batch_size: int, chunk_size: int,
+                          num_threads: int=0, partition: Optional[TensorLike]=None):
+        self.check_space()
+        space = self._spaces[0]
+        gdof = space.number_of_global_dofs()
+        shape = (gdof,) if (batch_size == 0) else (batch_size, gdof)
+        V = bm.zeros(shape, dtype=space.ftype, device=bm.get_device(space))
+
+        for group in self.integrators.keys():
+            if not self._is_chunkable(group):
+                parts = [(None, self._assembly_group(group))]
+            else:
+                size = chunk_size
+                if (size <= 0) and (num_threads > 1):
+                    NC = self._number_of_group_entities(group)
+                    size = -(-NC // num_threads)
+                chunks = self._group_chunks(group, size, partition)
+                parts = self._iter_group_chunks(group, chunks, num_threads)
+
+            for _, (group_tensor, e2dofs) in parts:
+                if (batch_size > 0) and (group_tensor.ndim == 2):
+                    group_tensor = bm.broadcast_to(group_tensor[None, ...],
+                                                   (batch_size,) + group_tensor.shape)
+                group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+                V = bm.index_add(V, e2dofs[0].reshape(-1), group_tensor, axis=-1)
+
+        return V
+
     @overload
-    def assembly(self, *, retain_ints: bool=False) -> TensorLike: ...
+    def assembly(self, *, retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> TensorLike: ...
     @overload
-    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False) -> COOTensor: ...
+    def assembly(self, *, format: Literal['coo'], retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> COOTensor: ...
     @overload
-    def assembly(self, *, format: Literal['dense'], retain_ints: bool=False) -> TensorLike: ...
-    def assembly(self, *, format='dense', retain_ints: bool=False):
+    def assembly(self, *, format: Literal['dense'], retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None) -> TensorLike: ...
+    def assembly(self, *, format='dense', retain_ints: bool=False, chunk_size: int=0,
+                 num_threads: int=0, partition: Optional[TensorLike]=None):
         """Assembly the linear form vector.
 
         Parameters:
             format (str, optional): Layout of the output ('dense', 'coo'). Defaults to 'dense'.\n
-            retain_ints (bool, optional): Whether to retain the integrator cache.
+            retain_ints (bool, optional): Whether to retain the integrator cache.\n
+            chunk_size (int, optional): Number of cells evaluated at a time, which\
+            bounds the memory of local tensors. Only available for the 'dense' format.\
+            Defaults to 0, evaluating all cells at once.\n
+            num_threads (int, optional): Number of threads evaluating cell\
+            partitions. Defaults to 0, running in the current thread.\n
+            partition (Tensor | None, optional): Partition label of each mesh cell.\
+            Defaults to None.
 
         Returns:
             global_vector (COOTensor | TensorLike): Global sparse vector shaped ([batch, ]gdof).
         """
+        if (chunk_size > 0) or (num_threads > 1) or (partition is not None):
+            if format != 'dense':
+                raise ValueError("Chunked assembly of linear forms only supports "
+                                 f"the 'dense' format, but got '{format}'.")
+            if retain_ints:
+                raise ValueError("Integrator results can not be retained in "
+                                 "the chunked assembly.")
+            self._V = self._chunked_assembly(self.batch_size, chunk_size, num_threads, partition)
+            logger.info(f"Linear form vector constructed, with shape {list(self._V.shape)}.")
+            return self._V
+
         V = self._scalar_assembly(retain_ints, self.batch_size)
 
         if format == 'dense':
@@ -12,8 +12,14 @@ from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
     assemblymethod,
+    actionmethod,
+    diagonalmethod,
     CoefLike
 )
+from .sum_factorization import (
+    tensor_tables, tensor_geometry, tensor_coef,
+    sf_integrate, sf_grad, sf_convection_matrix, sf_convection_diagonal
+)
 
 class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
     r"""The convection integrator for function spaces based on homogeneous meshes."""
@@ -30,7 +36,7 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return space.cell_to_dof(index=self.index)
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -61,3 +67,45 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
         else:
             raise TypeError(f"coef should be Tensor, but got {type(coef)}.")
         return result
+
+    @enable_cache
+    def sumfac_fetch(self, space: _FS):
+        index = self.index
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        B, D = tensor_tables(bcs, space.p)
+        detJ, Jinv = tensor_geometry(mesh, bcs, index)
+        W = ws.reshape(detJ.shape[1:]) * bm.abs(detJ) # (NC, NQ0, NQ1[, NQ2])
+        return bcs, B, D, W, Jinv
+
+    def _sumfac_weight(self, space: _FS):
+        if self.batched:
+            raise ValueError("Batched coefficients are not supported by sum factorization.")
+        mesh = getattr(space, 'mesh', None)
+        bcs, B, D, W, Jinv = self.sumfac_fetch(space)
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=self.index)
+        if not is_tensor(coef):
+            raise TypeError(f"coef should be Tensor, but got {type(coef)}.")
+        coef = tensor_coef(coef, W.shape, 1) # velocity
+        V = bm.einsum('...km, ...m -> ...k', Jinv, coef) * W[..., None]
+        return B, D, V
+
+    @assemblymethod('sumfac')
+    def sumfac_assembly(self, space: _FS) -> TensorLike:
+        """Sum-factorized assembly on quadrangle and hexahedron meshes."""
+        B, D, V = self._sumfac_weight(space)
+        return sf_convection_matrix(V, B, D)
+
+    @diagonalmethod('sumfac')
+    def sumfac_diagonal(self, space: _FS) -> TensorLike:
+        B, D, V = self._sumfac_weight(space)
+        return sf_convection_diagonal(V, B, D)
+
+    @actionmethod('sumfac')
+    def sumfac_apply(self, space: _FS, x: TensorLike) -> TensorLike:
+        B, D, V = self._sumfac_weight(space)
+        u = x.reshape(x.shape[:-1] + tuple(t.shape[-1] for t in B))
+        s = bm.sum(V * sf_grad(u, B, D), axis=-1)
+        return sf_integrate(s, B).reshape(x.shape)
@@ -11,8 +11,14 @@ from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
     assemblymethod,
+    actionmethod,
+    diagonalmethod,
     CoefLike
 )
+from .sum_factorization import (
+    tensor_tables, tensor_geometry, tensor_coef,
+    sf_grad, sf_grad_transpose, sf_stiffness_matrix, sf_stiffness_diagonal
+)
 
 
 class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
@@ -30,7 +36,7 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return space.cell_to_dof(index=self.index)
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -88,3 +94,49 @@ class ScalarDiffusionIntegrator(LinearInt, OpInt, CellInt):
         coef_F = get_semilinear_coef(val_F, coef)
         return bilinear_integral(gphi, gphi, ws, cm, coef, batched=self.batched),\
                linear_integral(gphi, ws, cm, coef_F, batched=self.batched)
+
+    @enable_cache
+    def sumfac_fetch(self, space: _FS):
+        index = self.index
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        B, D = tensor_tables(bcs, space.p)
+        detJ, Jinv = tensor_geometry(mesh, bcs, index)
+        W = ws.reshape(detJ.shape[1:]) * bm.abs(detJ) # (NC, NQ0, NQ1[, NQ2])
+        G = bm.einsum('...km, ...lm -> ...kl', Jinv, Jinv) * W[..., None, None]
+        return bcs, B, D, W, Jinv, G
+
+    def _sumfac_weight(self, space: _FS):
+        if self.batched:
+            raise ValueError("Batched coefficients are not supported by sum factorization.")
+        mesh = getattr(space, 'mesh', None)
+        bcs, B, D, W, Jinv, G = self.sumfac_fetch(space)
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=self.index)
+        if coef is None:
+            return B, D, G
+        if isinstance(coef, (int, float)) or coef.ndim <= 2:
+            coef = tensor_coef(coef, W.shape)
+            return B, D, G * (coef if isinstance(coef, (int, float)) else coef[..., None, None])
+        coef = tensor_coef(coef, W.shape, 2) # (NC, NQ0, NQ1[, NQ2], GD, GD)
+        G = bm.einsum('...km, ...mn, ...ln -> ...kl', Jinv, coef, Jinv) * W[..., None, None]
+        return B, D, G
+
+    @assemblymethod('sumfac')
+    def sumfac_assembly(self, space: _FS) -> TensorLike:
+        """Sum-factorized assembly on quadrangle and hexahedron meshes."""
+        B, D, G = self._sumfac_weight(space)
+        return sf_stiffness_matrix(G, B, D)
+
+    @diagonalmethod('sumfac')
+    def sumfac_diagonal(self, space: _FS) -> TensorLike:
+        B, D, G = self._sumfac_weight(space)
+        return sf_stiffness_diagonal(G, B, D)
+
+    @actionmethod('sumfac')
+    def sumfac_apply(self, space: _FS, x: TensorLike) -> TensorLike:
+        B, D, G = self._sumfac_weight(space)
+        u = x.reshape(x.shape[:-1] + tuple(t.shape[-1] for t in B))
+        g = bm.einsum('...kl, ...l -> ...k', G, sf_grad(u, B, D))
+        return sf_grad_transpose(g, B, D).reshape(x.shape)
@@ -11,8 +11,14 @@ from .integrator import (
     LinearInt, OpInt, CellInt,
     enable_cache,
     assemblymethod,
+    actionmethod,
+    diagonalmethod,
     CoefLike
 )
+from .sum_factorization import (
+    tensor_tables, tensor_geometry, tensor_coef,
+    sf_interpolate, sf_integrate, sf_mass_matrix, sf_mass_diagonal
+)
 
 
 class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
@@ -29,7 +35,7 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return space.cell_to_dof(index=self.index)
 
     @enable_cache
     def fetch(self, space: _FS):
@@ -71,3 +77,41 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
 
         return bilinear_integral(phi, phi, ws, cm, coef_A, batched=self.batched), \
                linear_integral(phi, ws, cm, coef_F, batched=self.batched)
+
+    @enable_cache
+    def sumfac_fetch(self, space: _FS):
+        index = self.index
+        mesh = getattr(space, 'mesh', None)
+        q = space.p+3 if self.q is None else self.q
+        qf = mesh.quadrature_formula(q, 'cell')
+        bcs, ws = qf.get_quadrature_points_and_weights()
+        B, _ = tensor_tables(bcs, space.p)
+        detJ, _ = tensor_geometry(mesh, bcs, index)
+        W = ws.reshape(detJ.shape[1:]) * bm.abs(detJ) # (NC, NQ0, NQ1[, NQ2])
+        return bcs, B, W
+
+    def _sumfac_weight(self, space: _FS):
+        if self.batched:
+            raise ValueError("Batched coefficients are not supported by sum factorization.")
+        mesh = getattr(space, 'mesh', None)
+        bcs, B, W = self.sumfac_fetch(space)
+        coef = process_coef_func(self.coef, bcs=bcs, mesh=mesh, etype='cell', index=self.index)
+        coef = tensor_coef(coef, W.shape)
+        return B, W if coef is None else W * coef
+
+    @assemblymethod('sumfac')
+    def sumfac_assembly(self, space: _FS) -> TensorLike:
+        """Sum-factorized assembly on quadrangle and hexahedron meshes."""
+        B, W = self._sumfac_weight(space)
+        return sf_mass_matrix(W, B)
+
+    @diagonalmethod('sumfac')
+    def sumfac_diagonal(self, space: _FS) -> TensorLike:
+        B, W = self._sumfac_weight(space)
+        return sf_mass_diagonal(W, B)
+
+    @actionmethod('sumfac')
+    def sumfac_apply(self, space: _FS, x: TensorLike) -> TensorLike:
+        B, W = self._sumfac_weight(space)
+        u = x.reshape(x.shape[:-1] + tuple(t.shape[-1] for t in B))
+        return sf_integrate(W * sf_interpolate(u, B), B).reshape(x.shape)
@@ -38,7 +38,7 @@ class ScalarSemilinearConvectionIntegrator(SemilinearInt, OpInt, CellInt):
 
     @enable_cache
     def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+        return space.cell_to_dof(index=self.index)
 
     @enable_cache
     def fetch(self, space: _FS):
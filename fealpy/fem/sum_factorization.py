@@ -0,0 +1,282 @@
+
+from typing import List, Optional, Sequence, Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike, Index, _S
+from ..mesh import QuadrangleMesh, HexahedronMesh
+from ..mesh.utils import simplex_tabulate
+
+__all__ = [
+    'tensor_tables',
+    'tensor_geometry',
+    'tensor_coef',
+    'sf_interpolate',
+    'sf_integrate',
+    'sf_grad',
+    'sf_grad_transpose',
+    'sf_bilinear',
+    'sf_mass_matrix',
+    'sf_stiffness_matrix',
+    'sf_convection_matrix',
+    'sf_diagonal',
+    'sf_mass_diagonal',
+    'sf_stiffness_diagonal',
+    'sf_convection_diagonal',
+]
+
+# Vertices of quadrangle and hexahedron cells in the tensor-product order of
+# the reference element, the same as in `jacobi_matrix` of the meshes.
+_TENSOR_VERTEX = {
+    2: [0, 3, 1, 2],
+    3: [0, 4, 3, 7, 1, 5, 2, 6]
+}
+_LETTERS = 'ijklmnop'
+
+
+def tensor_tables(bcs: Sequence[TensorLike], p: int) -> Tuple[List[TensorLike], List[TensorLike]]:
+    """1-D shape function tables of tensor-product Lagrange elements.
+
+    Parameters:
+        bcs (Sequence[Tensor]): 1-D barycentric points of each axis, as given by\
+        `TensorProductQuadrature`, each shaped (NQ, 2).\n
+        p (int): Degree of the element.
+
+    Returns:
+        Tuple[List[Tensor], List[Tensor]]: Values and derivatives of the 1-D basis\
+        on each axis, shaped (NQ, p+1).
+    """
+    B, D = [], []
+    for bc in bcs:
+        R = simplex_tabulate(bc, p, 1)
+        B.append(simplex_tabulate(bc, p, 0))
+        D.append(R[..., 1] - R[..., 0])
+    return B, D
+
+
+def _axis_subs(TD: int, axis: int, new: str) -> Tuple[str, str]:
+    src = _LETTERS[:TD]
+    return src, src[:axis] + new + src[axis+1:]
+
+
+def _apply_axis(u: TensorLike, table: TensorLike, axis: int, TD: int) -> TensorLike:
+    """out[..., m, ...] = sum_n table[m, n] u[..., n, ...] on the given axis
+    of the last TD axes."""
+    src, dst = _axis_subs(TD, axis, 'z')
+    return bm.einsum(f'z{src[axis]}, ...{src} -> ...{dst}', table, u)
+
+
+def sf_interpolate(u: TensorLike, tables: Sequence[TensorLike]) -> TensorLike:
+    """Evaluate tensor-product functions at tensor-product points.
+
+    Parameters:
+        u (Tensor): Coefficients shaped (..., n0, n1[, n2]).\n
+        tables (Sequence[Tensor]): 1-D tables of each axis shaped (NQ, n).
+
+    Returns:
+        Tensor: Values shaped (..., NQ0, NQ1[, NQ2]).
+    """
+    TD = len(tables)
+    for axis, table in enumerate(tables):
+        u = _apply_axis(u, table, axis, TD)
+    return u
+
+
+def sf_integrate(v: TensorLike, tables: Sequence[TensorLike]) -> TensorLike:
+    """Transpose of `sf_interpolate`, i.e. integrate the weighted values `v`
+    shaped (..., NQ0, NQ1[, NQ2]) against the tensor-product basis."""
+    TD = len(tables)
+    for axis, table in enumerate(tables):
+        v = _apply_axis(v, bm.swapaxes(table, 0, 1), axis, TD)
+    return v
+
+
+def sf_grad(u: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Reference gradient of tensor-product functions at tensor-product points,
+    shaped (..., NQ0, NQ1[, NQ2], TD)."""
+    TD = len(B)
+    grads = [sf_interpolate(u, [D[m] if m == k else B[m] for m in range(TD)])
+             for k in range(TD)]
+    return bm.stack(grads, axis=-1)
+
+
+def sf_grad_transpose(g: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Transpose of `sf_grad`, from (..., NQ0, NQ1[, NQ2], TD) to (..., n0, n1[, n2])."""
+    TD = len(B)
+    v = None
+    for k in range(TD):
+        vk = sf_integrate(g[..., k], [D[m] if m == k else B[m] for m in range(TD)])
+        v = vk if v is None else v + vk
+    return v
+
+
+def sf_bilinear(W: TensorLike, left: Sequence[TensorLike], right: Sequence[TensorLike]) -> TensorLike:
+    """Element matrices of a separable bilinear form by sum factorization,
+
+        M[c, I, J] = sum_q W[c, q] prod_m left[m][q_m, i_m] right[m][q_m, j_m],
+
+    contracting one axis at a time, at the cost O(NQ n^(2d)) per cell rather
+    than O(NQ^d n^(2d)).
+
+    Parameters:
+        W (Tensor): Weights at tensor-product points, shaped (NC, NQ0, NQ1[, NQ2]).\n
+        left (Sequence[Tensor]): 1-D tables of the test functions, shaped (NQ, n).\n
+        right (Sequence[Tensor]): 1-D tables of the trial functions, shaped (NQ, n).
+
+    Returns:
+        Tensor: Element matrices shaped (NC, ldof, ldof).
+    """
+    TD = len(left)
+    rows, cols = 'abcd'[:TD], 'efgh'[:TD]
+    qs = _LETTERS[:TD]
+    pairs = ''
+    T = W
+
+    for m in reversed(range(TD)):
+        pre = qs[:m]
+        T = bm.einsum(f'{qs[m]}{rows[m]}, {qs[m]}{cols[m]}, C{pre}{qs[m]}{pairs} '
+                      f'-> C{pre}{rows[m]}{cols[m]}{pairs}',
+                      left[m], right[m], T)
+        pairs = rows[m] + cols[m] + pairs
+
+    T = bm.einsum(f'C{pairs} -> C{rows}{cols}', T)
+    ldof = 1
+    for table in left:
+        ldof *= table.shape[-1]
+    return T.reshape(T.shape[0], ldof, -1)
+
+
+def sf_mass_matrix(W: TensorLike, B: Sequence[TensorLike]) -> TensorLike:
+    """Element mass matrices with weights W shaped (NC, NQ0, NQ1[, NQ2])."""
+    return sf_bilinear(W, B, B)
+
+
+def sf_stiffness_matrix(G: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Element stiffness matrices with reference weights G shaped
+    (NC, NQ0, NQ1[, NQ2], TD, TD)."""
+    TD = len(B)
+    M = None
+    for k in range(TD):
+        left = [D[m] if m == k else B[m] for m in range(TD)]
+        for l in range(TD):
+            right = [D[m] if m == l else B[m] for m in range(TD)]
+            Mkl = sf_bilinear(G[..., k, l], left, right)
+            M = Mkl if M is None else M + Mkl
+    return M
+
+
+def sf_convection_matrix(V: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Element convection matrices, test functions in rows, with reference
+    velocity weights V shaped (NC, NQ0, NQ1[, NQ2], TD)."""
+    TD = len(B)
+    M = None
+    for l in range(TD):
+        right = [D[m] if m == l else B[m] for m in range(TD)]
+        Ml = sf_bilinear(V[..., l], B, right)
+        M = Ml if M is None else M + Ml
+    return M
+
+
+def sf_diagonal(W: TensorLike, left: Sequence[TensorLike], right: Sequence[TensorLike]) -> TensorLike:
+    """Diagonals of the element matrices of `sf_bilinear`,
+
+        d[c, I] = sum_q W[c, q] prod_m left[m][q_m, i_m] right[m][q_m, i_m],
+
+    which is an integration against the products of the 1-D tables, at the
+    cost of one `sf_integrate`.
+
+    Returns:
+        Tensor: Diagonals shaped (NC, ldof).
+    """
+    d = sf_integrate(W, [l * r for l, r in zip(left, right)])
+    return d.reshape(d.shape[0], -1)
+
+
+def sf_mass_diagonal(W: TensorLike, B: Sequence[TensorLike]) -> TensorLike:
+    """Diagonals of `sf_mass_matrix`."""
+    return sf_diagonal(W, B, B)
+
+
+def sf_stiffness_diagonal(G: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Diagonals of `sf_stiffness_matrix`."""
+    TD = len(B)
+    d = None
+    for k in range(TD):
+        left = [D[m] if m == k else B[m] for m in range(TD)]
+        for l in range(TD):
+            right = [D[m] if m == l else B[m] for m in range(TD)]
+            dkl = sf_diagonal(G[..., k, l], left, right)
+            d = dkl if d is None else d + dkl
+    return d
+
+
+def sf_convection_diagonal(V: TensorLike, B: Sequence[TensorLike], D: Sequence[TensorLike]) -> TensorLike:
+    """Diagonals of `sf_convection_matrix`."""
+    TD = len(B)
+    d = None
+    for l in range(TD):
+        right = [D[m] if m == l else B[m] for m in range(TD)]
+        dl = sf_diagonal(V[..., l], B, right)
+        d = dl if d is None else d + dl
+    return d
+
+
+def tensor_geometry(mesh, bcs: Sequence[TensorLike], index: Index=_S):
+    """Determinant and inverse of the Jacobian of the bilinear (trilinear) map
+    at tensor-product points.
+
+    Parameters:
+        mesh (QuadrangleMesh | HexahedronMesh): The mesh.\n
+        bcs (Sequence[Tensor]): 1-D barycentric points of each axis.\n
+        index (Index, optional): Index of cells. Defaults to all cells.
+
+    Returns:
+        Tuple[Tensor, Tensor]: detJ shaped (NC, NQ0, NQ1[, NQ2]) and the inverse of J\
+        shaped (NC, NQ0, NQ1[, NQ2], TD, GD).
+    """
+    if not isinstance(mesh, (QuadrangleMesh, HexahedronMesh)):
+        raise ValueError("Sum factorization requires QuadrangleMesh or HexahedronMesh, "
+                         f"but got {type(mesh).__name__}.")
+    TD = len(bcs)
+    GD = mesh.geo_dimension()
+    if GD != TD:
+        raise ValueError(f"Sum factorization requires GD == TD, but got GD={GD}, TD={TD}.")
+
+    node = mesh.entity('node')
+    cell = mesh.entity('cell', index=index)
+    X = node[cell[:, _TENSOR_VERTEX[TD]]] # (NC, 2**TD, GD)
+    X = bm.swapaxes(X, -1, -2).reshape((X.shape[0], GD) + (2,)*TD)
+    B, D = tensor_tables(bcs, 1)
+    J = sf_grad(X, B, D) # (NC, GD, NQ..., TD)
+    J = bm.moveaxis(J, 1, -2) # (NC, NQ..., GD, TD)
+    return bm.linalg.det(J), bm.linalg.inv(J)
+
+
+def tensor_coef(coef: Optional[TensorLike], shape: Tuple[int, ...], value_ndim: int=0):
+    """Reshape coefficient values to tensor-product points.
+
+    Parameters:
+        coef (Tensor | Number | None): Coefficient values shaped (*value_shape),\
+        (NC, *value_shape) or (NC, NQ, *value_shape), where NQ is the number\
+        of points in the flattened tensor-product order.\n
+        shape (Tuple[int, ...]): The target shape (NC, NQ0, NQ1[, NQ2]).\n
+        value_ndim (int, optional): Number of value axes, e.g. 1 for vectors.\
+        Defaults to 0.
+
+    Returns:
+        Tensor | Number | None: Values broadcastable to (*shape, *value_shape).
+    """
+    if (coef is None) or isinstance(coef, (int, float)):
+        return coef
+    NC = shape[0]
+    TD = len(shape) - 1
+    vshape = tuple(coef.shape[coef.ndim-value_ndim:])
+    ndim = coef.ndim - value_ndim
+
+    if ndim == 0:
+        return coef
+    elif ndim == 1 and coef.shape[0] == NC:
+        return coef.reshape((NC, ) + (1, )*TD + vshape)
+    elif ndim == 2 and coef.shape[0] == NC:
+        return coef.reshape(tuple(shape) + vshape)
+    raise ValueError(f"Coefficient shaped {tuple(coef.shape)} is not supported by "
+                     f"sum factorization with {NC} cells.")
@@ -0,0 +1,204 @@
+
+from typing import Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..mesh import TriangleMesh, TetrahedronMesh
+from ..functionspace.space import FunctionSpace as _FS
+
+from .projector import Projector
+from .bilinear_form import BilinearForm
+from .scalar_mass_integrator import ScalarMassIntegrator
+
+__all__ = ['TransferProjector']
+
+
+class TransferProjector(Projector):
+    """Transfer finite element functions between Lagrange spaces on two
+    unrelated simplex meshes, e.g. before and after remeshing.
+
+    The transfer is a sparse matrix built once by locating points of the
+    target mesh in the source mesh, and reused for all functions and time
+    steps until the number of dofs of either space changes or `clear` is called.
+
+    - 'interp': interpolate the source function at the interpolation points\
+    of the target space.
+    - 'l2': the L2 projection M u1 = B u0, where B[i, j] is the integral of\
+    phi1_i * phi0_j computed by the quadrature of the target mesh. Since the\
+    target basis sums to one, the integral of the function is conserved up to\
+    the quadrature error on source cells cut by target cells, and exactly when\
+    the target mesh is a refinement of the source mesh and `q` is large enough.
+
+    Parameters:
+        space0 (LagrangeFESpace): The source space.\n
+        space1 (LagrangeFESpace): The target space.\n
+        method (str, optional): 'interp' or 'l2'. Defaults to 'interp'.\n
+        q (int, optional): Quadrature index on target cells for 'l2'.\
+        Defaults to p0 + p1 + 1.\n
+        lumped (bool, optional): Use the lumped mass for 'l2', making the\
+        transfer an explicit matrix. Only for linear target spaces, as the\
+        lumped mass is singular for higher degrees. Defaults to False.\n
+        extrapolate (bool, optional): Extrapolate from the cell with the nearest\
+        barycenter for points outside the source mesh. Otherwise these points\
+        get zero. Defaults to True.
+
+    Examples:
+        >>> P = TransferProjector(space0, space1, method='l2')
+        >>> uh1 = P(uh0)
+        >>> ph1 = P(ph0) # reuses the operator
+    """
+    def __init__(self, space0: _FS, space1: _FS, *, method: str='interp',
+                 q: Optional[int]=None, lumped: bool=False, extrapolate: bool=True) -> None:
+        super().__init__(space0, space1)
+        for space in (space0, space1):
+            if not isinstance(space.mesh, (TriangleMesh, TetrahedronMesh)):
+                raise ValueError("Mesh transfer requires triangle or tetrahedron meshes, "
+                                 f"but got {type(space.mesh).__name__}.")
+        if space0.mesh.geo_dimension() != space1.mesh.geo_dimension():
+            raise ValueError("The source and target meshes must have the same geometric dimension.")
+        if method not in {'interp', 'l2'}:
+            raise ValueError(f"Unknown transfer method: {method}. Use 'interp' or 'l2'.")
+        if lumped and (method != 'l2' or space1.p != 1):
+            raise ValueError("Lumped mass is only supported by 'l2' with a linear target space.")
+        self.method = method
+        self.q = space0.p + space1.p + 1 if q is None else q
+        self.lumped = lumped
+        self.extrapolate = extrapolate
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop the cached operator, e.g. after moving nodes of either mesh."""
+        self._matrix: Optional[CSRTensor] = None
+        self._mass: Optional[CSRTensor] = None
+        self._precond = None
+        self._key: Optional[Tuple[int, int]] = None
+
+    def _locate(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Cells of the source mesh containing the points and barycentric
+        coordinates, extrapolating points outside if required."""
+        mesh = self.space0.mesh
+        cell, bcs = mesh.location(points)
+        if not self.extrapolate:
+            return cell, bcs
+
+        missing = bm.nonzero(cell < 0)[0]
+        if missing.shape[0] == 0:
+            return cell, bcs
+
+        bary = mesh.entity_barycenter('cell')
+        chunk = max(1, 2**24 // bary.shape[0])
+        nearest = []
+        for start in range(0, missing.shape[0], chunk):
+            p = points[missing[start:start+chunk]]
+            dist = bm.sum((p[:, None, :] - bary[None, :, :])**2, axis=-1)
+            nearest.append(bm.argmin(dist, axis=-1))
+        nearest = bm.astype(bm.concat(nearest, axis=0), cell.dtype)
+
+        b = mesh.point_locator().barycentric(points[missing], nearest)
+        cell = bm.set_at(cell, missing, nearest)
+        bcs = bm.set_at(bcs, missing, b)
+        return cell, bcs
+
+    def _source_table(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Source basis values at the points shaped (NP, ldof0) and the
+        global dofs shaped (NP, ldof0), with zero values at points not found."""
+        cell, bcs = self._locate(points)
+        found = cell >= 0
+        phi = bm.simplex_shape_function(bcs, self.space0.p)
+        phi = phi * bm.astype(found, phi.dtype)[:, None]
+        cell2dof = self.space0.cell_to_dof()
+        cell = bm.where(found, cell, bm.zeros_like(cell))
+        return phi, cell2dof[cell]
+
+    def _assemble(self) -> None:
+        gdof0 = self.space0.number_of_global_dofs()
+        gdof1 = self.space1.number_of_global_dofs()
+        shape = (gdof1, gdof0)
+
+        if self.method == 'interp':
+            points = self.space1.interpolation_points()
+            phi, dof0 = self._source_table(points)
+            ldof0 = phi.shape[-1]
+            row = bm.repeat(bm.arange(gdof1, dtype=dof0.dtype, device=bm.get_device(dof0)), ldof0)
+            col = dof0.reshape(-1)
+            val = phi.reshape(-1)
+            flag = bm.abs(val) > 0.0
+            indices = bm.stack([row[flag], col[flag]], axis=0)
+            matrix = COOTensor(indices, val[flag], shape).coalesce().tocsr()
+        else:
+            # B = Phi1^T W Phi0 with the basis tables at all quadrature points
+            mesh1 = self.space1.mesh
+            qf = mesh1.quadrature_formula(self.q, 'cell')
+            bcs, ws = qf.get_quadrature_points_and_weights()
+            points = mesh1.bc_to_point(bcs) # (NC1, NQ, GD)
+            NC1, NQ, GD = points.shape
+            NP = NC1 * NQ
+            phi0, dof0 = self._source_table(points.reshape(-1, GD))
+            ldof0 = phi0.shape[-1]
+            kwargs = {'dtype': dof0.dtype, 'device': bm.get_device(dof0)}
+            Phi0 = CSRTensor(bm.arange(0, NP*ldof0+1, ldof0, **kwargs), dof0.reshape(-1),
+                             phi0.reshape(-1), (NP, gdof0))
+
+            phi1 = self.space1.basis(bcs)[0] # (NQ, ldof1)
+            cm = mesh1.entity_measure('cell')
+            val = bm.einsum('q, c, qi -> ciq', ws, cm, phi1)
+            cell2dof1 = bm.astype(self.space1.cell_to_dof(), dof0.dtype)
+            row = bm.broadcast_to(cell2dof1[:, :, None], val.shape)
+            col = bm.arange(NP, **kwargs).reshape(NC1, 1, NQ)
+            col = bm.broadcast_to(col, val.shape)
+            indices = bm.stack([row.reshape(-1), col.reshape(-1)], axis=0)
+            Phi1 = COOTensor(indices, val.reshape(-1), (gdof1, NP)).tocsr()
+
+            matrix = Phi1.matmul(Phi0)
+
+            if self.lumped:
+                # row sums of B are the lumped mass, as both bases sum to one
+                row, values = matrix.row(), matrix.values()
+                diag = bm.index_add(bm.zeros((gdof1, ), dtype=values.dtype,
+                                             device=bm.get_device(values)), row, values)
+                matrix = CSRTensor(matrix.crow(), matrix.col(), values / diag[row], shape)
+            else:
+                from ..solver import JacobiPreconditioner
+                bform = BilinearForm(self.space1)
+                bform.add_integrator(ScalarMassIntegrator(q=self.q))
+                self._mass = bform.assembly(format='csr')
+                self._precond = JacobiPreconditioner(self._mass)
+
+        self._matrix = matrix
+        self._key = (gdof0, gdof1)
+
+    @property
+    def matrix(self) -> CSRTensor:
+        """The transfer matrix shaped (gdof1, gdof0). For the consistent L2
+        projection, this is B and the mass matrix is to be inverted."""
+        key = (self.space0.number_of_global_dofs(), self.space1.number_of_global_dofs())
+        if self._matrix is None or self._key != key:
+            self._assemble()
+        return self._matrix
+
+    def __call__(self, uh: TensorLike, *, rtol: float=1e-12, maxiter: int=1000) -> TensorLike:
+        """Transfer functions of the source space to the target space.
+
+        Parameters:
+            uh (Tensor): Dof values shaped (..., gdof0).\n
+            rtol (float, optional): Relative tolerance of CG for the consistent\
+            L2 projection. Defaults to 1e-12.\n
+            maxiter (int, optional): Maximum number of CG iterations. Defaults to 1000.
+
+        Returns:
+            Tensor: Dof values in the target space shaped (..., gdof1).
+        """
+        P = self.matrix
+        gdof0 = P.shape[1]
+        if uh.shape[-1] != gdof0:
+            raise ValueError(f"The last axis of uh should be {gdof0}, but got {uh.shape[-1]}.")
+        batch = tuple(uh.shape[:-1])
+        x = bm.swapaxes(uh.reshape(-1, gdof0), 0, 1) # (gdof0, batch)
+        y = P.matmul(x)
+
+        if self._mass is not None:
+            from ..solver import cg
+            y = cg(self._mass, y, M=self._precond, atol=0.0, rtol=rtol, maxiter=maxiter)
+
+        return bm.swapaxes(y, 0, 1).reshape(batch + (P.shape[0], ))
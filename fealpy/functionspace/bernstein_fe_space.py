@@ -43,8 +43,8 @@ class BernsteinFESpace(FunctionSpace, Generic[_MT]):
     def interpolation_points(self) -> TensorLike:
         return self.dof.interpolation_points()
 
-    def cell_to_dof(self) -> TensorLike:
-        return self.dof.cell_to_dof()
+    def cell_to_dof(self, index: Index=_S) -> TensorLike:
+        return self.dof.cell_to_dof()[index]
 
     def face_to_dof(self) -> TensorLike:
         return self.dof.face_to_dof()
@@ -12,7 +12,6 @@ from fealpy.functionspace.bernstein_fe_space import BernsteinFESpace
 from .functional import symmetry_span_array, symmetry_index, span_array
 from scipy.special import factorial, comb
 from fealpy.decorator import barycentric
-import ipdb
 
 _MT = TypeVar('_MT', bound=Mesh)
 Index = Union[int, slice, TensorLike]
@@ -186,7 +185,7 @@ class CmConformingFESpace3d(FunctionSpace, Generic[_MT]):
         c2id = bm.arange(Ndof, Ndof + NC*cidof, dtype=self.itype).reshape(NC, cidof)
         return c2id
 
-    def cell_to_dof(self):
+    def cell_to_dof(self, index: Index=_S):
         p, m = self.p, self.m
         mesh = self.mesh
 
@@ -260,7 +259,7 @@ class CmConformingFESpace3d(FunctionSpace, Generic[_MT]):
                     n0 += n1
         ## cell
         c2dof[:, ldof-cidof:] = c2id
-        return c2dof
+        return c2dof[index]
 
     def boundary_interpolate(self, gd, uh, threshold=None, method="interp"):
         isDDof = self.is_boundary_dof(threshold=threshold)
@@ -413,11 +412,11 @@ class CmConformingFESpace3d(FunctionSpace, Generic[_MT]):
 
         # 边界面上点
         isBdNode = mesh.boundary_node_flag()
-        isBdFaceNode = isBdNode
+        isBdFaceNode = bm.copy(isBdNode)
         isBdFaceNode[isBdEdgeNode | isCornerNode] = False
 
         # 面上边界边
-        isBdFaceEdge = mesh.boundary_edge_flag()
+        isBdFaceEdge = bm.copy(mesh.boundary_edge_flag())
         isBdFaceEdge[isCornerEdge] = False
 
         return isCornerNode, isBdEdgeNode, isBdFaceNode,  isCornerEdge,isBdFaceEdge 
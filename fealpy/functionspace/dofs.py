@@ -6,6 +6,7 @@ from typing import Union, Generic, TypeVar
 from ..backend import TensorLike
 from ..backend import backend_manager as bm
 from ..mesh.mesh_base import Mesh
+from ..mesh.ordering import inverse_permutation
 
 
 _MT = TypeVar('_MT', bound=Mesh)
@@ -19,6 +20,30 @@ class LinearMeshCFEDof(Generic[_MT]):
         self.mesh = mesh
         self.p = p
         self.multiIndex = mesh.multi_index_matrix(p, TD)
+        self.permutation = None # new dof i is the ipoint permutation[i] of the mesh
+        self._inverse = None
+
+    def set_permutation(self, perm=None):
+        """Renumber the global dofs so that new dof i is the interpolation point
+        perm[i] of the mesh. Pass None to restore the mesh numbering."""
+        if perm is None:
+            self.permutation, self._inverse = None, None
+            return
+        gdof = self.mesh.number_of_global_ipoints(self.p)
+        if perm.shape[0] != gdof:
+            raise ValueError(f"The permutation should have {gdof} entries, but got {perm.shape[0]}.")
+        self.permutation = perm
+        self._inverse = inverse_permutation(perm)
+
+    def _check_permutation(self):
+        if self.permutation.shape[0] != self.mesh.number_of_global_ipoints(self.p):
+            raise RuntimeError("The mesh has changed since the dofs were reordered.")
+
+    def _renumber(self, ipoint: TensorLike) -> TensorLike:
+        if self._inverse is None:
+            return ipoint
+        self._check_permutation()
+        return bm.astype(self._inverse[ipoint], ipoint.dtype)
    
     def is_boundary_dof(self, threshold=None, method=None):
         TD = self.mesh.top_dimension()
@@ -43,7 +68,7 @@ class LinearMeshCFEDof(Generic[_MT]):
                 index_dof = face2dof.flatten()
                 if callable(threshold):
                     ##TODO, index_dof加插值点函数里
-                    ipoint = self.mesh.interpolation_points(p=self.p)[index_dof]
+                    ipoint = self.interpolation_points()[index_dof]
                     flag = threshold(ipoint)
                     index_dof = index_dof[flag]
                 isBdDof = bm.zeros(gdof, dtype=bm.bool, device=bm.get_device(self.mesh))
@@ -64,16 +89,20 @@ class LinearMeshCFEDof(Generic[_MT]):
             raise ValueError(f"Unknown entity type: {etype}")
 
     def edge_to_dof(self, index: Index=_S):
-        return self.mesh.edge_to_ipoint(self.p, index=index)
+        return self._renumber(self.mesh.edge_to_ipoint(self.p, index=index))
 
     def face_to_dof(self, index: Index=_S):
-        return self.mesh.face_to_ipoint(self.p, index=index)
+        return self._renumber(self.mesh.face_to_ipoint(self.p, index=index))
 
     def cell_to_dof(self, index: Index=_S):
-        return self.mesh.cell_to_ipoint(self.p, index=index)
+        return self._renumber(self.mesh.cell_to_ipoint(self.p, index=index))
 
     def interpolation_points(self, index: Index=_S) -> TensorLike:
-        return self.mesh.interpolation_points(self.p, index=index)
+        if self.permutation is None:
+            return self.mesh.interpolation_points(self.p, index=index)
+        self._check_permutation()
+        ipoints = self.mesh.interpolation_points(self.p)
+        return ipoints[self.permutation][index]
 
     def number_of_global_dofs(self) -> int:
         return self.mesh.number_of_global_ipoints(self.p)
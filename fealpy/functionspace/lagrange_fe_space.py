@@ -51,6 +51,8 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
         return self.dof.interpolation_points()
 
     def cell_to_dof(self, index: Index=_S) -> TensorLike:
+        if self.ctype == 'C':
+            return self.dof.cell_to_dof(index)
         return self.dof.cell_to_dof()[index]
 
     def face_to_dof(self, index: Index=_S) -> TensorLike:
@@ -59,6 +61,36 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
     def edge_to_dof(self, index=_S):
         return self.dof.edge_to_dof()[index]
 
+    def reorder(self, method: str='rcm') -> TensorLike:
+        """Renumber the global dofs for a smaller bandwidth of assembled
+        matrices, leaving the mesh unchanged. Functions of the space created
+        before should not be used afterwards.
+
+        Parameters:
+            method (str, optional): 'rcm' for the reverse Cuthill-McKee ordering of\
+            the dof graph, or 'hilbert' or 'morton' for space-filling curves through\
+            interpolation points. Defaults to 'rcm'.
+
+        Returns:
+            Tensor: The permutation of dofs, such that `new_uh = old_uh[perm]`.
+        """
+        from ..mesh.ordering import rcm_order, hilbert_order, morton_order, adjacency_graph
+
+        if self.ctype != 'C':
+            raise RuntimeError("Reordering is only supported by continuous spaces.")
+        self.dof.set_permutation(None)
+        if method == 'rcm':
+            perm = rcm_order(*adjacency_graph(self.cell_to_dof(), self.number_of_global_dofs()))
+        elif method == 'hilbert':
+            perm = hilbert_order(self.interpolation_points())
+        elif method == 'morton':
+            perm = morton_order(self.interpolation_points())
+        else:
+            raise ValueError(f"Unknown ordering method: {method}. "
+                             "Use 'rcm', 'hilbert' or 'morton'.")
+        self.dof.set_permutation(perm)
+        return perm
+
     def is_boundary_dof(self, threshold=None, method=None) -> TensorLike:
         if self.ctype == 'C':
             return self.dof.is_boundary_dof(threshold, method=method)
@@ -86,7 +86,7 @@ class HexahedronMesh(TensorMesh, Plotable):
         bcs, ws = qf.get_quadrature_points_and_weights()
         J = self.jacobi_matrix(bcs, index=index)
         detJ = bm.linalg.det(J)
-        val = bm.einsum('q, qc->c', ws, detJ)
+        val = bm.einsum('q, cq->c', ws, detJ)
         return val
 
     def face_area(self, index=_S):
@@ -100,7 +100,7 @@ class HexahedronMesh(TensorMesh, Plotable):
         J = self.jacobi_matrix(bcs, index=index)
         n = bm.cross(J[..., 0], J[..., 1], axis=-1)
         n = bm.sqrt(bm.sum(n**2, axis=-1))
-        val = bm.einsum('q, qi->i', ws, n)
+        val = bm.einsum('q, iq->i', ws, n)
         return val
     
     def jacobi_matrix(self, bc, index=_S):
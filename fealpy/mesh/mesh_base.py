@@ -1,5 +1,5 @@
 
-from typing import Union, Optional, Sequence, Tuple, Any
+from typing import Union, Optional, Sequence, Tuple, List, Any
 
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S
@@ -7,7 +7,8 @@ from .. import logger
 from ..quadrature import Quadrature
 from .mesh_data_structure import MeshDS
 from .utils import (
-    estr2dim, simplex_gdof, simplex_ldof, tensor_gdof, tensor_ldof
+    estr2dim, simplex_gdof, simplex_ldof, tensor_gdof, tensor_ldof,
+    simplex_tabulate
 )
 
 
@@ -373,6 +374,55 @@ class HomogeneousMesh(Mesh):
     def face_to_ipoint(self, p: int, index: Index=_S) -> TensorLike:
         raise NotImplementedError
 
+    # ordering
+    def reorder(self, method: str='rcm') -> Tuple[TensorLike, TensorLike]:
+        """Renumber nodes and cells in place for memory locality of gathers
+        like `cell_to_dof` and of sparse matrix-vector products.
+
+        Faces and edges are constructed again from the renumbered cells, and
+        arrays in `nodedata` and `celldata` are permuted.
+
+        Parameters:
+            method (str, optional): 'rcm' for the reverse Cuthill-McKee ordering of\
+            the node graph, with cells sorted by their first node in the new order,\
+            or 'hilbert' or 'morton' for space-filling curves through nodes and cell\
+            barycenters. Defaults to 'rcm'.
+
+        Returns:
+            Tuple[Tensor, Tensor]: Permutations of nodes and cells, such that\
+            `new_array = old_array[perm]` for node and cell data.
+        """
+        from .ordering import rcm_order, hilbert_order, morton_order, adjacency_graph, inverse_permutation
+
+        node = self.entity('node')
+        cell = self.entity('cell')
+        NN = node.shape[0]
+
+        if method == 'rcm':
+            node_perm = rcm_order(*adjacency_graph(cell, NN))
+            first = bm.min(inverse_permutation(node_perm)[cell], axis=-1)
+            cell_perm = bm.argsort(first, stable=True)
+        elif method in ('hilbert', 'morton'):
+            func = hilbert_order if method == 'hilbert' else morton_order
+            node_perm = func(node)
+            cell_perm = func(self.entity_barycenter('cell'))
+        else:
+            raise ValueError(f"Unknown ordering method: {method}. "
+                             "Use 'rcm', 'hilbert' or 'morton'.")
+
+        inv = bm.astype(inverse_permutation(node_perm), cell.dtype)
+        self.node = node[node_perm]
+        self.cell = inv[cell[cell_perm]]
+        self.construct()
+
+        for data, perm, N in ((getattr(self, 'nodedata', {}), node_perm, NN),
+                              (getattr(self, 'celldata', {}), cell_perm, cell.shape[0])):
+            for key, value in data.items():
+                if bm.is_tensor(value) and value.ndim > 0 and value.shape[0] == N:
+                    data[key] = value[perm]
+
+        return node_perm, cell_perm
+
     # tools
     def integral(self, f, q=3, celltype=False) -> TensorLike:
         """
@@ -473,18 +523,12 @@ class SimplexMesh(HomogeneousMesh):
 
     def shape_function(self, bcs: TensorLike, p: int=1, *, index: Index=_S,
                        mi: Optional[TensorLike]=None) -> TensorLike:
-        TD = bcs.shape[-1] - 1
-        if mi is None:
-            mi = bm.multi_index_matrix(p, TD, dtype=self.itype)
-        phi = bm.simplex_shape_function(bcs, p, mi)
+        phi = simplex_tabulate(bcs, p, 0, mi=mi)
         return phi
 
     def grad_shape_function(self, bcs: TensorLike, p: int=1, *, index: Index=_S,
                             variables: str='u', mi: Optional[TensorLike]=None) -> TensorLike:
-        TD = bcs.shape[-1] - 1
-        if mi is None:
-            mi = bm.multi_index_matrix(p, TD, dtype=self.itype)
-        R = bm.simplex_grad_shape_function(bcs, p, mi) # (NQ, ldof, bc)
+        R = simplex_tabulate(bcs, p, 1, mi=mi) # (NQ, ldof, bc)
         if variables == 'u':
             return R
         elif variables == 'x':
@@ -495,7 +539,43 @@ class SimplexMesh(HomogeneousMesh):
         else:
             raise ValueError("Variables type is expected to be 'u' or 'x', "
                              f"but got '{variables}'.")
-    
+
+    # point location
+    def point_locator(self):
+        """The point locator of the mesh, built on the first call and cached
+        with the topology relations. It is rebuilt when the nodes have been
+        changed, also in place. See `PointLocator`."""
+        from .point_location import PointLocator
+        cache = self.__dict__.setdefault('_relation_cache', {})
+        locator = cache.get('point_locator', None)
+        if (locator is None) or (not locator.is_valid()):
+            locator = PointLocator(self)
+            cache['point_locator'] = locator
+        return locator
+
+    def location(self, points: TensorLike, *,
+                 start: Optional[TensorLike]=None) -> Tuple[TensorLike, TensorLike]:
+        """Find cells containing the points and the barycentric coordinates.
+
+        Parameters:
+            points (Tensor): Points shaped (NP, GD).\n
+            start (Tensor, optional): Cells to start a walk from, e.g. the cells\
+            found in the previous step for moving points. Defaults to None,\
+            searching the bucket grid directly.
+
+        Returns:
+            Tuple[Tensor, Tensor]: Cell index shaped (NP,), -1 for points outside\
+            the mesh, and barycentric coordinates shaped (NP, TD+1).
+        """
+        locator = self.point_locator()
+        if start is None:
+            cell, bcs = locator.locate(points)
+        else:
+            cell, bcs = locator.walk(points, start)
+        return bm.astype(cell, self.itype), bcs
+
+    point_to_bc = location
+
 
 class TensorMesh(HomogeneousMesh):
     # ipoints
@@ -505,7 +585,7 @@ class TensorMesh(HomogeneousMesh):
         return tensor_ldof(p, iptype)
 
     def number_of_global_ipoints(self, p: int) -> int:
-        nums = [self.entity(i).shape[0] for i in range(self.TD+1)]
+        nums = [self.count(i) for i in range(self.TD+1)]
         return tensor_gdof(p, nums)
 
     def bc_to_point(self, bc, index=None):
@@ -551,9 +631,7 @@ class TensorMesh(HomogeneousMesh):
     def shape_function(self, bcs: Tuple[TensorLike], p: int=1, *, index: Index=_S,
                        variables: str='u', mi: Optional[TensorLike]=None) -> TensorLike:
         TD = len(bcs)
-        if mi is None:
-            mi = bm.multi_index_matrix(p, 1, dtype=self.itype)
-        raw_phi = [bm.simplex_shape_function(bc, p, mi) for bc in bcs]
+        raw_phi = [simplex_tabulate(bc, p, 0, mi=mi) for bc in bcs]
         phi = bm.tensorprod(*raw_phi)
         if variables == 'u':
             return phi
@@ -568,8 +646,8 @@ class TensorMesh(HomogeneousMesh):
         assert isinstance(bcs, tuple)
         TD = len(bcs)
         Dlambda = bm.array([-1, 1], dtype=self.ftype, device=bm.get_device(bcs[0]))
-        phi = bm.simplex_shape_function(bcs[0], p=p)
-        R = bm.simplex_grad_shape_function(bcs[0], p=p)
+        phi = simplex_tabulate(bcs[0], p, 0)
+        R = simplex_tabulate(bcs[0], p, 1)
         dphi = bm.einsum('...ij, j->...i', R, Dlambda)
 
         n = phi.shape[0]**TD
@@ -656,6 +734,106 @@ class TensorMesh(HomogeneousMesh):
     
 
 class StructuredMesh(HomogeneousMesh):
+    # In the implicit mode, entities are computed from their grid indices on
+    # every request, only for the requested index, and never stored.
+    implicit: bool = False
+
+    def __getattr__(self, name: str):
+        if (name in self._STORAGE_ATTR) and self.implicit:
+            return self.entity(name)
+        return super().__getattr__(name)
+
+    def entity(self, etype: Union[int, str], index: Optional[Index]=None) -> TensorLike:
+        if not self.implicit:
+            return super().entity(etype, index)
+        if isinstance(etype, str):
+            etype = estr2dim(self, etype)
+        if isinstance(index, int):
+            return self._implicit_entity(etype, [index])[0]
+        if bm.is_tensor(index) and (index.ndim > 1):
+            et = self._implicit_entity(etype, index.reshape(-1))
+            return et.reshape(index.shape + et.shape[1:])
+        return self._implicit_entity(etype, _S if index is None else index)
+
+    def count(self, etype: Union[int, str]) -> int:
+        if not self.implicit:
+            return super().count(etype)
+        if isinstance(etype, str):
+            etype = estr2dim(self, etype)
+        if etype == 0:
+            return self.NN
+        if etype == self.TD:
+            return self.NC
+        if etype == 1:
+            return self.NE
+        return self.NF
+
+    def _implicit_entity(self, etype: int, index: Index) -> TensorLike:
+        """Entities of the given top dimension computed from grid indices."""
+        raise NotImplementedError
+
+    def _grid_index(self, index: Index, N: int) -> TensorLike:
+        """The index of entities as a 1-d int64 tensor of positions in [0, N)."""
+        kwargs = {'dtype': bm.int64, 'device': self.device}
+        if isinstance(index, int):
+            index = [index]
+        if isinstance(index, slice):
+            rg = range(N)[index]
+            return bm.arange(rg.start, rg.stop, rg.step, **kwargs)
+        if not bm.is_tensor(index):
+            index = bm.tensor(index, **kwargs)
+        if index.dtype == bm.bool:
+            return bm.nonzero(index)[0]
+        return bm.astype(index, bm.int64)
+
+    @staticmethod
+    def _unravel(flat: TensorLike, shape: Sequence[int]) -> List[TensorLike]:
+        """Grid indices of positions in a C-ordered grid of the shape."""
+        out = []
+        for n in reversed(shape[1:]):
+            out.append(flat % n)
+            flat = flat // n
+        out.append(flat)
+        return out[::-1]
+
+    def _grid_entity(self, flat: TensorLike, blocks: Sequence[Tuple[Sequence[int], Sequence[int]]],
+                     strides: Sequence[int]) -> TensorLike:
+        """Vertices of entities numbered block by block, each block being a
+        C-ordered grid of entities.
+
+        Parameters:
+            flat (Tensor): Global numbers of the entities.\n
+            blocks (Sequence[Tuple[Sequence[int], Sequence[int]]]): The grid shape\
+            of every block, and offsets of the vertices from the first vertex.\n
+            strides (Sequence[int]): Strides of the grid indices in the numbering\
+            of vertices, such that the first vertex is `sum(i*s for i, s in ...)`.
+
+        Returns:
+            Tensor: Vertices of the entities in shape (N, len(offsets)).
+        """
+        NV = len(blocks[0][1])
+        kwargs = {'dtype': bm.int64, 'device': self.device}
+        out = bm.zeros((flat.shape[0], NV), **kwargs)
+        start = 0
+        for shape, offsets in blocks:
+            size = 1
+            for n in shape:
+                size *= n
+            if len(blocks) == 1:
+                loc, local = slice(None), flat
+            else:
+                loc = bm.nonzero((flat >= start) & (flat < start + size))[0]
+                local = flat[loc] - start
+            idx = self._unravel(local, shape)
+            first = sum(i * st for i, st in zip(idx, strides))
+            offsets = bm.tensor(offsets, **kwargs)
+            out = bm.set_at(out, loc, first[:, None] + offsets[None, :])
+            start += size
+        return bm.astype(out, self.itype)
+
+    def reorder(self, method: str='rcm'):
+        raise RuntimeError("Structured meshes number entities implicitly by their "
+                           "grid indices and can not be reordered.")
 
     # shape function
     def grad_lambda(self, index: Index=_S) -> TensorLike:
@@ -4,7 +4,7 @@ from typing import Union, Optional, Dict, overload, Callable, Any
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, EntityName, _S, _int_func
 from .. import logger
-from .utils import estr2dim, edim2entity, MeshMeta, flocc
+from .utils import estr2dim, edim2entity, MeshMeta, flocc, pack_rows, relationmethod
 
 
 ##################################################
@@ -14,6 +14,9 @@ from .utils import estr2dim, edim2entity, MeshMeta, flocc
 
 class MeshDS(metaclass=MeshMeta):
     _STORAGE_ATTR = ['cell', 'face', 'edge', 'node']
+    # Reassigning these invalidates the relation cache.
+    _TOPOLOGY_ATTR = {'face2cell', 'cell2face', 'cell2edge', 'edge2cell',
+                      'localEdge', 'localFace', 'localFace2edge'}
     cell: TensorLike
     face: TensorLike
     edge: TensorLike
@@ -23,6 +26,7 @@ class MeshDS(metaclass=MeshMeta):
     localEdge: TensorLike # only for homogeneous mesh
     localFace: TensorLike # only for homogeneous mesh
     localFace2Edge: TensorLike
+    construct_threads: int = 1 # default number of threads in `construct`
 
     def __init__(self, *, TD: int, itype, ftype) -> None:
         assert hasattr(self, '_entity_dim_method_name_map')
@@ -38,6 +42,9 @@ class MeshDS(metaclass=MeshMeta):
     @overload
     def __getattr__(self, name: EntityName) -> TensorLike: ...
     def __getattr__(self, name: str):
+        if name in ('edge', 'cell2edge') and self._edge_pending():
+            self._construct_edge()
+            return getattr(self, name)
         if name in self._STORAGE_ATTR:
             etype_dim = estr2dim(self, name)
             return edim2entity(self._entity_storage, self._entity_factory, etype_dim)
@@ -50,18 +57,56 @@ class MeshDS(metaclass=MeshMeta):
                 raise RuntimeError('please call super().__init__() before setting attributes.')
             etype_dim = estr2dim(self, name)
             self._entity_storage[etype_dim] = value
+            if etype_dim == 1:
+                self.__dict__.pop('_edge_threads', None)
+            self.clear_relations()
         else:
+            if name in self._TOPOLOGY_ATTR:
+                self.clear_relations()
             super().__setattr__(name, value)
 
     def __delattr__(self, name: str) -> None:
         if name in self._STORAGE_ATTR:
             del self._entity_storage[estr2dim(self, name)]
+            self.clear_relations()
         else:
+            if name in self._TOPOLOGY_ATTR:
+                self.clear_relations()
             super().__delattr__(name)
 
     def clear(self) -> None:
         """Remove all entities from the storage."""
         self._entity_storage.clear()
+        self.clear_relations()
+
+    ### relation cache
+    def clear_relations(self, name: Optional[str]=None) -> None:
+        """Evict cached topology relations, see `relationmethod`.
+
+        Parameters:
+            name (str | None, optional): Name of the relation method to evict,\
+            e.g. 'boundary_node_flag'. Defaults to None, evicting all.
+        """
+        if name is None:
+            self.__dict__['_topology_version'] = self.topology_version + 1
+        cache = self.__dict__.get('_relation_cache', None)
+        if cache is None:
+            return
+        if name is None:
+            cache.clear()
+        else:
+            cache.pop(name, None)
+
+    @property
+    def topology_version(self) -> int:
+        """A counter increased whenever the entities or the relations of the mesh
+        are changed, to key data derived from the topology, e.g. assembly plans."""
+        return self.__dict__.get('_topology_version', 0)
+
+    def relation_memory(self) -> Dict[str, int]:
+        """Memory in bytes of every cached topology relation."""
+        cache = self.__dict__.get('_relation_cache', {})
+        return {name: int(value.nbytes) for name, value in cache.items()}
 
     ### properties
     def top_dimension(self) -> int: return self.TD
@@ -118,6 +163,8 @@ class MeshDS(metaclass=MeshMeta):
         """
         if isinstance(etype, str):
             etype = estr2dim(self, etype)
+        if etype == 1 and self._edge_pending():
+            self._construct_edge()
         return edim2entity(self.storage(), self._entity_factory, etype, index)
 
     ### topology
@@ -136,6 +183,7 @@ class MeshDS(metaclass=MeshMeta):
                                'has been constructed.')
         return self.cell2edge[index]
 
+    @relationmethod
     def face_to_edge(self, index: Index=_S):
         assert self.TD == 3
         cell2edge = self.cell2edge
@@ -145,6 +193,7 @@ class MeshDS(metaclass=MeshMeta):
 
         return face2edge[index]
 
+    @relationmethod
     def cell_to_face(self, index: Index=_S) -> TensorLike:
         NC = self.number_of_cells()
         NF = self.number_of_faces()
@@ -169,6 +218,7 @@ class MeshDS(metaclass=MeshMeta):
         face2cell = self.face2cell[index]
         return face2cell
 
+    @relationmethod
     def cell_to_cell(self):
         NC = self.number_of_cells()
         face2cell = self.face2cell
@@ -179,6 +229,7 @@ class MeshDS(metaclass=MeshMeta):
         return cell2cell
 
     ### boundary
+    @relationmethod
     def boundary_node_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary nodes.
 
@@ -196,6 +247,7 @@ class MeshDS(metaclass=MeshMeta):
                 bd_node_flag[bd_face2node.ravel()] = True
         return bd_node_flag
 
+    @relationmethod
     def boundary_face_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary faces.
 
@@ -204,6 +256,7 @@ class MeshDS(metaclass=MeshMeta):
         """
         return self.face2cell[:, 0] == self.face2cell[:, 1]
 
+    @relationmethod
     def boundary_cell_flag(self) -> TensorLike:
         """Return a boolean tensor indicating the boundary cells.
 
@@ -221,12 +274,15 @@ class MeshDS(metaclass=MeshMeta):
             bd_cell_flag[bd_face2cell.ravel()] = True
         return bd_cell_flag
 
+    @relationmethod
     def boundary_node_index(self):
         return bm.nonzero(self.boundary_node_flag())[0]
     # TODO: finish this:
     # def boundary_edge_index(self):
+    @relationmethod
     def boundary_face_index(self):
         return bm.nonzero(self.boundary_face_flag())[0]
+    @relationmethod
     def boundary_cell_index(self):
         return bm.nonzero(self.boundary_cell_flag())[0]
 
@@ -256,12 +312,25 @@ class MeshDS(metaclass=MeshMeta):
         total_edge = cell[..., local_edge].reshape(-1, NVE)
         return total_edge
 
-    def construct(self):
+    def construct(self, *, lazy: bool=True, num_threads: Optional[int]=None):
+        """Construct faces, edges and their relations to cells.
+
+        Vertex tuples are packed into integer keys to find unique entities
+        with a single-key sort where possible, see `flocc`.
+
+        Parameters:
+            lazy (bool, optional): Build edges of 3-d meshes only when `edge` or\
+            `cell2edge` is first accessed. Defaults to True.\n
+            num_threads (int | None, optional): Number of threads to sort with\
+            the numpy backend. Defaults to `MeshDS.construct_threads`.
+        """
         if not self.is_homogeneous():
             raise RuntimeError('Can not construct for a non-homogeneous mesh.')
+        if num_threads is None:
+            num_threads = self.construct_threads
 
         totalFace = self.total_face()
-        i0, i1, j = flocc(bm.sort(totalFace, axis=1))
+        i0, i1, j = flocc(bm.sort(totalFace, axis=1), num_threads=num_threads)
 
         if self.TD > 1: # Do not add faces for interval mesh
             self.face = totalFace[i0, :] # this also adds the edge in 2-d meshes
@@ -276,12 +345,13 @@ class MeshDS(metaclass=MeshMeta):
         # NOTE: dtype must be specified here, as these tensors are the results of unique.
 
         if self.TD == 3:
-            NEC = self.number_of_edges_of_cells()
+            # drop edges of the old cells, if any
+            self._entity_storage.pop(1, None)
+            self.__dict__.pop('cell2edge', None)
+            self._edge_threads = num_threads
 
-            totalEdge = self.total_edge()
-            i2, _, j = flocc(bm.sort(totalEdge, axis=1))
-            self.edge = totalEdge[i2, :]
-            self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
+            if not lazy:
+                self._construct_edge()
 
         elif self.TD == 2:
             self.edge2cell = self.face2cell
@@ -292,3 +362,221 @@ class MeshDS(metaclass=MeshMeta):
         logger.info(f"Mesh toplogy relation constructed, with {NC} cells, {NF} "
                     f"faces, {NN} nodes "
                     f"on device ?")
+
+    def _edge_pending(self) -> bool:
+        return '_edge_threads' in self.__dict__
+
+    def _construct_edge(self):
+        """Build edges and cell2edge of 3-d meshes, deferred by `construct`."""
+        num_threads = self.__dict__.pop('_edge_threads', 1)
+        NC = self.number_of_cells()
+        NEC = self.number_of_edges_of_cells()
+
+        totalEdge = self.total_edge()
+        i2, _, j = flocc(bm.sort(totalEdge, axis=1), num_threads=num_threads)
+        # Adding edges does not change the cached relations.
+        cache = self.__dict__.pop('_relation_cache', None)
+        version = self.topology_version
+        self.edge = totalEdge[i2, :]
+        self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
+        self.__dict__['_topology_version'] = version
+        if cache is not None:
+            self.__dict__['_relation_cache'] = cache
+
+    def construct_patch(self, changed: TensorLike, *,
+                        touched_face: Optional[TensorLike]=None,
+                        touched_edge: Optional[TensorLike]=None) -> None:
+        """Update faces, edges and their relations to cells after some cells
+        are modified or appended, e.g. by local refinement, with the same
+        result as `construct`.
+
+        Only entities of the changed cells are sorted again, and the others are
+        merged in by their indices, so the cost does not involve sorting all
+        entities of the mesh. Falls back to `construct` if the keys of entities
+        do not fit a single int64, or most cells are changed.
+
+        Parameters:
+            changed (Tensor): Indices of cells modified or appended since the last\
+            construction. Faces and edges stored in the mesh must be valid for\
+            the other cells, in the current numbering of nodes and cells.\
+            Cells beyond the rows of `cell2face` are regarded as appended.\n
+            touched_face (Tensor, optional): Boolean flags of stored faces to\
+            discard besides those of the changed cells, e.g. faces of removed cells.\n
+            touched_edge (Tensor, optional): The same for edges of 3-d meshes.
+        """
+        NC = self.number_of_cells()
+        if (changed.shape[0] == 0) and (touched_face is None) and (touched_edge is None):
+            return
+        if (changed.shape[0] * 2 > NC) or ('face2cell' not in self.__dict__):
+            self.construct()
+            return
+
+        cell = self.entity(self.TD)
+        NN = self.number_of_nodes()
+        face = self._entity_storage[self.TD - 1]
+        out = _patch_entities(cell, changed, self.localFace, face, self.cell2face,
+                              self.face2cell, touched_face, NN)
+        if out is None:
+            self.construct()
+            return
+        face, cell2face, face2cell = out
+
+        if self.TD == 3:
+            pending = self._edge_pending() or (1 not in self._entity_storage)
+            if not pending:
+                edge_out = _patch_entities(cell, changed, self.localEdge, self._entity_storage[1],
+                                           self.__dict__['cell2edge'], None, touched_edge, NN)
+                if edge_out is None:
+                    self.construct()
+                    return
+
+        self.face = face
+        self.cell2face = cell2face
+        self.face2cell = face2cell
+
+        if self.TD == 3:
+            if pending:
+                self._entity_storage.pop(1, None)
+                self.__dict__.pop('cell2edge', None)
+                self._edge_threads = self.construct_threads
+            else:
+                self.edge, self.cell2edge, _ = edge_out
+        elif self.TD == 2:
+            self.edge2cell = self.face2cell
+            self.cell2edge = self.cell2face
+
+
+def _entity_key(rows: TensorLike, NN: int) -> Optional[TensorLike]:
+    """Keys ordering entities as the sorted rows in `flocc`, or None if they
+    do not fit a single int64."""
+    NV = rows.shape[1]
+    if NN ** NV > 2**63 - 1:
+        return None
+    return _column_key([bm.astype(rows[:, j], bm.int64) for j in range(NV)], NN)
+
+
+def _column_key(cols, NN: int) -> TensorLike:
+    if len(cols) == 2:
+        lo, hi = bm.minimum(cols[0], cols[1]), bm.maximum(cols[0], cols[1])
+        return lo * NN + hi
+    if len(cols) == 3:
+        lo = bm.minimum(bm.minimum(cols[0], cols[1]), cols[2])
+        hi = bm.maximum(bm.maximum(cols[0], cols[1]), cols[2])
+        return (lo * NN + (cols[0] + cols[1] + cols[2] - lo - hi)) * NN + hi
+    return pack_rows(bm.sort(bm.stack(cols, axis=1), axis=1), base=NN)[0]
+
+
+def _search_entity(entity: TensorLike, index: TensorLike, key: TensorLike, NN: int) -> TensorLike:
+    """Insertion points of sorted keys into entity[index], whose keys are
+    sorted, found by bisection without computing keys of all entities."""
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(key)}
+    cols = [entity[:, j] for j in range(entity.shape[1])]
+    lo = bm.zeros(key.shape, **kwargs)
+    hi = bm.full(key.shape, index.shape[0], **kwargs)
+    active = bm.nonzero(lo < hi)[0]
+    while active.shape[0] > 0:
+        l, h = lo[active], hi[active]
+        mid = (l + h) // 2
+        i = index[mid]
+        less = _column_key([bm.astype(c[i], bm.int64) for c in cols], NN) < key[active]
+        lo = bm.set_at(lo, active, bm.where(less, mid + 1, l))
+        hi = bm.set_at(hi, active, bm.where(less, h, mid))
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def _patch_entities(cell: TensorLike, changed: TensorLike, local: TensorLike,
+                    entity: TensorLike, cell2entity: TensorLike,
+                    entity2cell: Optional[TensorLike], touched: Optional[TensorLike], NN: int):
+    """Entities of cells, their numbering and relations as `construct` gives,
+    updated from those before the cells in `changed` were modified.
+
+    Returns:
+        Tuple[Tensor, Tensor, Tensor | None] | None: The entities, cell-to-entity\
+        and entity-to-cell (if `entity2cell` is given). None if the update can\
+        not be done locally.
+    """
+    device = bm.get_device(cell)
+    kwargs = {'dtype': bm.int64, 'device': device}
+    NC, NL = cell.shape[0], local.shape[0]
+    NE0, NC0 = entity.shape[0], cell2entity.shape[0]
+    itype = cell2entity.dtype
+    changed = bm.astype(changed, bm.int64)
+
+    isChanged = bm.zeros((NC,), dtype=bm.bool, device=device)
+    isChanged = bm.set_at(isChanged, changed, True)
+    if touched is None:
+        touched = bm.zeros((NE0,), dtype=bm.bool, device=device)
+    else:
+        touched = bm.copy(touched)
+    touched = bm.set_at(touched, cell2entity[changed[changed < NC0]].reshape(-1), True)
+
+    # incidences of the touched entities in unchanged cells
+    if entity2cell is not None:
+        e2c = bm.astype(entity2cell[bm.nonzero(touched)[0]], bm.int64)
+        c = bm.concat([e2c[:, 0], e2c[:, 1]], axis=0)
+        l = bm.concat([e2c[:, 2], e2c[:, 3]], axis=0)
+        single = (e2c[:, 0] == e2c[:, 1]) & (e2c[:, 2] == e2c[:, 3])
+        flag = (c >= 0) & ~isChanged[bm.where(c >= 0, c, 0)]
+        flag = flag & bm.concat([bm.ones_like(single), ~single], axis=0)
+        c, l = c[flag], l[flag]
+    else:
+        c, l = bm.nonzero(touched[cell2entity] & ~isChanged[:NC0, None])
+        c, l = bm.astype(c, bm.int64), bm.astype(l, bm.int64)
+
+    # and all incidences of the changed cells
+    c = bm.concat([c, bm.repeat(changed, NL)], axis=0)
+    l = bm.concat([l, bm.tile(bm.arange(NL, **kwargs), (changed.shape[0],))], axis=0)
+    rows = cell[c[:, None], local[l]]
+    key = _entity_key(rows, NN)
+    if key is None:
+        return None
+    tid = c * NL + l
+    order = bm.lexsort((tid, key))
+    key, tid, rows, c, l = key[order], tid[order], rows[order], c[order], l[order]
+
+    TRUE = bm.ones((1,), dtype=bm.bool, device=device)
+    diff = key[1:] != key[:-1]
+    first = bm.concat([TRUE, diff], axis=0)
+    last = bm.concat([diff, TRUE], axis=0)
+    group = bm.cumsum(bm.astype(first, bm.int64), axis=0) - 1
+    nkey, i0, i1 = key[first], tid[first], tid[last]
+
+    # merge with the untouched entities, keeping the order of keys
+    keep = bm.nonzero(~touched)[0]
+    NK, NNEW = keep.shape[0], nkey.shape[0]
+    ins = _search_entity(entity, keep, nkey, NN)
+    if NK > 0:
+        at = entity[keep[bm.where(ins < NK, ins, bm.zeros_like(ins))]]
+        if bm.any((ins < NK) & (_entity_key(at, NN) == nkey)):
+            return None
+    count = bm.zeros((NK + 1,), **kwargs)
+    count = bm.index_add(count, ins, bm.ones_like(ins))
+    kpos = bm.arange(NK, **kwargs) + bm.cumsum(count, axis=0)[:NK]
+    npos = ins + bm.arange(NNEW, **kwargs)
+
+    # new entities are gathered from the old ones followed by the added ones
+    NE = NK + NNEW
+    src = bm.zeros((NE,), **kwargs)
+    src = bm.set_at(src, kpos, keep)
+    src = bm.set_at(src, npos, NE0 + bm.arange(NNEW, **kwargs))
+
+    def merge(old, added):
+        added = bm.astype(added, old.dtype)
+        return bm.stack([bm.concat([old[:, j], added[:, j]], axis=0)[src]
+                         for j in range(old.shape[1])], axis=1)
+
+    new_entity = merge(entity, rows[first])
+
+    old2new = bm.full((NE0,), -1, dtype=itype, device=device)
+    old2new = bm.set_at(old2new, keep, bm.astype(kpos, itype))
+    c2e = bm.zeros((NC, NL), dtype=itype, device=device)
+    c2e = bm.set_at(c2e, slice(NC0), old2new[cell2entity])
+    c2e = bm.set_at(c2e, (c, l), bm.astype(npos[group], itype))
+
+    e2c = None
+    if entity2cell is not None:
+        val = bm.stack([i0 // NL, i1 // NL, i0 % NL, i1 % NL], axis=-1)
+        e2c = merge(entity2cell, val)
+
+    return new_entity, c2e, e2c
@@ -0,0 +1,230 @@
+
+from typing import Optional, Tuple, Union, Sequence
+from itertools import product
+from math import floor, prod
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+__all__ = [
+    'neighbor_search',
+    'VerletList'
+]
+
+_BoxSize = Union[float, Sequence[float], TensorLike, None]
+
+
+def _box_lengths(box_size: _BoxSize, GD: int) -> Optional[Tuple[float, ...]]:
+    if box_size is None:
+        return None
+    if bm.is_tensor(box_size):
+        box_size = bm.to_numpy(box_size).reshape(-1).tolist()
+    elif isinstance(box_size, (int, float)):
+        box_size = [box_size]
+    box_size = [float(b) for b in box_size]
+    if len(box_size) == 1:
+        box_size = box_size * GD
+    if len(box_size) != GD:
+        raise ValueError(f"box_size should have 1 or {GD} entries, but got {len(box_size)}.")
+    return tuple(box_size)
+
+
+def _displacement(x: TensorLike, y: TensorLike,
+                  box: Optional[Tuple[float, ...]]) -> TensorLike:
+    """x - y, by the minimum image convention in periodic boxes."""
+    d = x - y
+    if box is not None:
+        L = bm.tensor(box, dtype=d.dtype, device=bm.get_device(d))
+        d = d - L * bm.round(d / L)
+    return d
+
+
+def _pairs(points: TensorLike, cutoff: float, box: Optional[Tuple[float, ...]],
+           include_self: bool) -> Tuple[TensorLike, TensorLike]:
+    """All pairs (i, j) with |x_i - x_j| < cutoff found by a cell-linked list
+    with cells not smaller than the cutoff, grouped by i in ascending order.
+
+    Returns:
+        Tuple[Tensor, Tensor]: The row pointer shaped (NP+1,) and j of the pairs.
+    """
+    NP, GD = points.shape
+    device = bm.get_device(points)
+    kwargs = {'dtype': bm.int64, 'device': device}
+    if NP == 0:
+        return bm.zeros((1,), **kwargs), bm.zeros((0,), **kwargs)
+
+    if box is None:
+        origin = bm.min(points, axis=0)
+        lengths = [float(e) for e in bm.to_numpy(bm.max(points, axis=0) - origin)]
+    else:
+        origin = bm.zeros((GD,), dtype=points.dtype, device=device)
+        lengths = list(box)
+    shape = [max(int(floor(L / cutoff)), 1) for L in lengths]
+    size = bm.tensor([L / n if L > 0 else 1.0 for L, n in zip(lengths, shape)],
+                     dtype=points.dtype, device=device)
+    ncell = bm.tensor(shape, **kwargs)
+
+    coords = bm.astype(bm.floor((points - origin) / size), bm.int64)
+    if box is None:
+        coords = bm.clip(coords, bm.zeros_like(ncell), ncell - 1)
+    else:
+        coords = coords % ncell
+
+    def _linear(c):
+        cid = c[:, 0]
+        for d in range(1, GD):
+            cid = cid * shape[d] + c[:, d]
+        return cid
+
+    # the cell list: points sorted by cells, all work is done in the sorted
+    # order to gather points of a cell from contiguous memory
+    cid = _linear(coords)
+    order = bm.argsort(cid, stable=True)
+    coords, spoints = coords[order], points[order]
+    num = bm.zeros((prod(shape),), **kwargs)
+    num = bm.index_add(num, cid, bm.ones((NP,), **kwargs))
+    ptr = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(num, axis=0)], axis=0)
+
+    # In periodic boxes with less than 3 cells on an axis, the offsets -1, 0, 1
+    # alias each other, so every cell of the axis is visited once instead.
+    visit_all = [box is not None and n < 3 for n in shape]
+    offsets = [range(n) if a else (-1, 0, 1) for n, a in zip(shape, visit_all)]
+
+    pid = bm.arange(NP, **kwargs)
+    rows, cols, counts = [], [], []
+    for off in product(*offsets):
+        nb = []
+        for d in range(GD):
+            if visit_all[d]:
+                nb.append(bm.full((NP,), off[d], **kwargs))
+            elif box is None:
+                nb.append(coords[:, d] + off[d])
+            else:
+                nb.append((coords[:, d] + off[d]) % shape[d])
+        nb = bm.stack(nb, axis=-1)
+        src = pid
+        if box is None:
+            valid = bm.all((nb >= 0) & (nb < ncell), axis=-1)
+            src, nb = pid[valid], nb[valid]
+        cid = _linear(nb)
+        count = ptr[cid + 1] - ptr[cid]
+        i = bm.repeat(src, count) # ascending
+        start = bm.cumsum(count, axis=0) - count
+        j = bm.arange(i.shape[0], **kwargs) - bm.repeat(start - ptr[cid], count)
+
+        d = _displacement(spoints[i], spoints[j], box)
+        flag = bm.sum(d**2, axis=-1) < cutoff**2
+        if not include_self:
+            flag = flag & (i != j)
+        rows.append(i[flag])
+        cols.append(j[flag])
+        counts.append(bm.index_add(bm.zeros((NP,), **kwargs), rows[-1], bm.ones_like(rows[-1])))
+
+    # Scatter the pairs of every offset to the rows of the original points
+    # instead of sorting all pairs: pairs of a point from offset k follow
+    # those from offsets < k.
+    counts = bm.stack(counts, axis=0) # (NO, NP) in the sorted order
+    rowlen = bm.zeros((NP,), **kwargs)
+    rowlen = bm.set_at(rowlen, order, bm.sum(counts, axis=0))
+    indptr = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(rowlen, axis=0)], axis=0)
+    rowstart = indptr[order] # start of the row of each sorted point
+    before = bm.cumsum(counts, axis=0) - counts # pairs of preceding offsets in each row
+    index = bm.zeros((int(indptr[-1]),), **kwargs)
+    for k, (i, j) in enumerate(zip(rows, cols)):
+        first = bm.cumsum(counts[k], axis=0) - counts[k] # first pair of each row in this offset
+        rank = bm.arange(i.shape[0], **kwargs) - first[i]
+        index = bm.set_at(index, rowstart[i] + before[k, i] + rank, order[j])
+
+    return indptr, index
+
+
+def _to_csr(i: TensorLike, j: TensorLike, NP: int) -> Tuple[TensorLike, TensorLike]:
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(i)}
+    num = bm.zeros((NP,), **kwargs)
+    num = bm.index_add(num, i, bm.ones_like(i))
+    indptr = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(num, axis=0)], axis=0)
+    return j, indptr
+
+
+def neighbor_search(points: TensorLike, cutoff: float, box_size: _BoxSize=None, *,
+                    include_self: bool=True) -> Tuple[TensorLike, TensorLike]:
+    """Find neighbors of points within the cutoff radius by a cell-linked list.
+
+    Parameters:
+        points (Tensor): Positions shaped (NP, GD).\n
+        cutoff (float): The cutoff radius. Pairs closer than it are neighbors.\n
+        box_size (float | Sequence[float] | Tensor, optional): Lengths of the\
+        periodic box [0, L0) x [0, L1) ..., a number for a cube. Defaults to None,\
+        the domain being not periodic.\n
+        include_self (bool, optional): Whether a point is a neighbor of itself.\
+        Defaults to True.
+
+    Returns:
+        Tuple[Tensor, Tensor]: The CSR neighbor list (index, indptr), where the neighbors\
+        of point i are index[indptr[i]:indptr[i+1]], in no particular order.
+    """
+    box = _box_lengths(box_size, points.shape[-1])
+    indptr, index = _pairs(points, cutoff, box, include_self)
+    return index, indptr
+
+
+class VerletList():
+    """Neighbor lists reused across time steps with a skin distance.
+
+    Candidate pairs within `cutoff + skin` are found by a cell-linked list,
+    and filtered by the cutoff in every `update`. The candidates are searched
+    again only after some point has moved by more than half of the skin since
+    the last search, so that no pair entering the cutoff can be missed.
+
+    Parameters:
+        cutoff (float): The cutoff radius.\n
+        box_size (float | Sequence[float] | Tensor, optional): The periodic box,\
+        see `neighbor_search`. Defaults to None.\n
+        skin (float, optional): The skin distance. Defaults to 0.2 * cutoff.\n
+        include_self (bool, optional): Whether a point is a neighbor of itself.\
+        Defaults to True.
+
+    Examples:
+        >>> nlist = VerletList(h, box_size=1.0)
+        >>> for step in range(nsteps):
+        ...     index, indptr = nlist.update(position)
+        ...     position = position + dt * velocity
+    """
+    def __init__(self, cutoff: float, box_size: _BoxSize=None, *,
+                 skin: Optional[float]=None, include_self: bool=True) -> None:
+        self.cutoff = float(cutoff)
+        self.box_size = box_size
+        self.skin = 0.2 * self.cutoff if skin is None else float(skin)
+        self.include_self = include_self
+        self.num_builds = 0
+        self.reference: Optional[TensorLike] = None
+        self._candidates: Optional[Tuple[TensorLike, TensorLike]] = None
+
+    def needs_rebuild(self, points: TensorLike) -> bool:
+        """Whether the candidate pairs must be searched again for the points."""
+        if self.reference is None or tuple(self.reference.shape) != tuple(points.shape):
+            return True
+        box = _box_lengths(self.box_size, points.shape[-1])
+        d = _displacement(points, self.reference, box)
+        return float(bm.max(bm.sum(d**2, axis=-1))) > (0.5 * self.skin)**2
+
+    def build(self, points: TensorLike) -> None:
+        """Search candidate pairs within cutoff + skin."""
+        box = _box_lengths(self.box_size, points.shape[-1])
+        indptr, index = _pairs(points, self.cutoff + self.skin, box, self.include_self)
+        row = bm.repeat(bm.arange(points.shape[0], dtype=bm.int64, device=bm.get_device(index)),
+                        indptr[1:] - indptr[:-1])
+        self._candidates = (row, index)
+        self.reference = bm.copy(points)
+        self.num_builds += 1
+
+    def update(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Neighbor list of the current positions, in the same format as
+        `neighbor_search`."""
+        if self.needs_rebuild(points):
+            self.build(points)
+        i, j = self._candidates
+        box = _box_lengths(self.box_size, points.shape[-1])
+        d = _displacement(points[i], points[j], box)
+        flag = bm.sum(d**2, axis=-1) < self.cutoff**2
+        return _to_csr(i[flag], j[flag], points.shape[0])
@@ -5,18 +5,19 @@ from ..typing import TensorLike, Index, _S
 from .. import logger
 
 from .mesh_base import MeshDS 
+from .neighbor_search import neighbor_search
 
-import jax.numpy as jnp
-import jax
-from jax_md import space, partition
-from jax import vmap, lax
+try:
+    import jax.numpy as jnp
+except ImportError:
+    jnp = None
 
 class NodeMesh(MeshDS):
     def __init__(self, node: TensorLike, nodedata:Optional[Dict]=None) -> None: 
-        super().__init__(TD=0)
+        super().__init__(TD=0, itype=bm.int32, ftype=node.dtype)
         '''
-        note : Currently using jax's own jax_md, vmap, lax, vstack , ravel,
-               full, where, mgrid, column_stack, full_like, hstack.
+        note : The `from_*_domain` constructors currently use jax's own vstack,
+               ravel, full, where, mgrid, column_stack, full_like, hstack.
         '''
         self.node = node
 
@@ -49,24 +50,14 @@ class NodeMesh(MeshDS):
 
     def neighbors(self, box_size, h) -> TensorLike: 
         '''
-        @brief Find neighbor particles within the smoothing radius.
+        @brief Find neighbor particles within the smoothing radius, including
+               the particle itself, in the periodic box [0, box_size).
 
-        note : Currently using jax's own jax_md, vmap, lax
+        @return (index, indptr) in CSR format. See `neighbor_search`, and
+                `VerletList` for reusing lists across time steps.
         '''
-        displacement, shift = space.periodic(box_size)
-        neighbor_fn = partition.neighbor_list(displacement, box_size, h)
-
-        nbrs = neighbor_fn.allocate(self.node)
-        nbrs = neighbor_fn.update(self.node, nbrs)
-        neighbor = nbrs.idx
-        num = self.node.shape[0]
-        index = vmap(lambda idx, row: jnp.hstack([row, jnp.array([idx])]))(bm.arange(neighbor.shape[0]), neighbor)
-        row_len = bm.sum(index != num,axis=1)
-        indptr = lax.scan(lambda carry, x: (carry + x, carry + x), 0, row_len)[1]
-        indptr = bm.concatenate((bm.tensor([0]), indptr))
-        index = index[index != num]
-
-        return index, indptr
+        index, indptr = neighbor_search(self.node, h, box_size)
+        return bm.astype(index, self.itype), bm.astype(indptr, self.itype)
 
     @classmethod
     def from_tgv_domain(cls, box_size, dx=0.02, dy=0.02):
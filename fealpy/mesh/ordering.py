@@ -0,0 +1,210 @@
+
+from typing import Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+__all__ = [
+    'morton_order',
+    'hilbert_order',
+    'rcm_order',
+    'adjacency_graph',
+    'inverse_permutation'
+]
+
+
+def inverse_permutation(perm: TensorLike) -> TensorLike:
+    """The inverse of a permutation, i.e. inv[perm] = arange(n)."""
+    inv = bm.zeros_like(perm)
+    return bm.set_at(inv, perm, bm.arange(perm.shape[0], dtype=perm.dtype, device=bm.get_device(perm)))
+
+
+def _quantize(points: TensorLike, bits: Optional[int]) -> Tuple[TensorLike, int]:
+    """Integer coordinates in [0, 2**bits) on every axis."""
+    GD = points.shape[-1]
+    if bits is None:
+        bits = min(63 // GD, 31)
+    lower = bm.min(points, axis=0)
+    extent = bm.max(points, axis=0) - lower
+    extent = bm.where(extent > 0, extent, bm.ones_like(extent))
+    X = bm.floor((points - lower) / extent * (2**bits - 1))
+    return bm.astype(X, bm.int64), bits
+
+
+def morton_order(points: TensorLike, bits: Optional[int]=None) -> TensorLike:
+    """Order points along the Morton (Z-order) curve.
+
+    Parameters:
+        points (Tensor): Coordinates shaped (NP, GD).\n
+        bits (int, optional): Bits of the quantized coordinates on each axis.\
+        Defaults to the largest number fitting the key in 63 bits.
+
+    Returns:
+        Tensor: The permutation shaped (NP,), points[perm] being in the curve order.
+    """
+    X, bits = _quantize(points, bits)
+    GD = X.shape[-1]
+    key = bm.zeros_like(X[:, 0])
+    for j in range(bits - 1, -1, -1):
+        for i in range(GD):
+            key = (key << 1) | ((X[:, i] >> j) & 1)
+    return bm.argsort(key, stable=True)
+
+
+def hilbert_order(points: TensorLike, bits: Optional[int]=None) -> TensorLike:
+    """Order points along the Hilbert curve, which has better locality than
+    the Morton curve as consecutive points are always adjacent.
+
+    The Hilbert index is computed by the transpose algorithm of J. Skilling,
+    Programming the Hilbert curve, AIP Conf. Proc. 707 (2004).
+
+    Parameters:
+        points (Tensor): Coordinates shaped (NP, GD).\n
+        bits (int, optional): Bits of the quantized coordinates on each axis.\
+        Defaults to the largest number fitting the key in 63 bits.
+
+    Returns:
+        Tensor: The permutation shaped (NP,), points[perm] being in the curve order.
+    """
+    X, bits = _quantize(points, bits)
+    GD = X.shape[-1]
+    X = [X[:, i] for i in range(GD)]
+
+    # inverse undo excess work
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        P = Q - 1
+        for i in range(GD):
+            flag = (X[i] & Q) != 0
+            if i == 0:
+                X[0] = bm.where(flag, X[0] ^ P, X[0])
+            else:
+                t = (X[0] ^ X[i]) & P
+                t = bm.where(flag, bm.zeros_like(t), t)
+                X[0] = bm.where(flag, X[0] ^ P, X[0] ^ t)
+                X[i] = X[i] ^ t
+        Q >>= 1
+
+    # Gray encode
+    for i in range(1, GD):
+        X[i] = X[i] ^ X[i-1]
+    t = bm.zeros_like(X[0])
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        t = bm.where((X[GD-1] & Q) != 0, t ^ (Q - 1), t)
+        Q >>= 1
+    X = [x ^ t for x in X]
+
+    # interleave the transposed index
+    key = bm.zeros_like(X[0])
+    for j in range(bits - 1, -1, -1):
+        for i in range(GD):
+            key = (key << 1) | ((X[i] >> j) & 1)
+    return bm.argsort(key, stable=True)
+
+
+def adjacency_graph(entity: TensorLike, N: int) -> Tuple[TensorLike, TensorLike]:
+    """The graph connecting indices appearing in the same row of `entity`,
+    e.g. nodes of cells or dofs of cells.
+
+    Parameters:
+        entity (Tensor): Index array shaped (NE, k) with values in [0, N).\n
+        N (int): Number of vertices of the graph.
+
+    Returns:
+        Tuple[Tensor, Tensor]: The graph in CSR format (indptr, indices) without\
+        self loops, shaped (N+1,) and (nnz,).
+    """
+    entity = bm.astype(entity, bm.int64)
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(entity)}
+    key = bm.sort((entity[:, :, None] * N + entity[:, None, :]).reshape(-1))
+    # drop duplicates of the sorted keys, which is much faster than `unique`
+    flag = bm.concat([bm.ones((1,), dtype=bm.bool, device=kwargs['device']),
+                      key[1:] != key[:-1]], axis=0)
+    key = key[flag]
+    row, col = key // N, key % N
+    flag = row != col
+    row, col = row[flag], col[flag]
+    num = bm.zeros((N,), **kwargs)
+    num = bm.index_add(num, row, bm.ones_like(row))
+    indptr = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(num, axis=0)], axis=0)
+    return indptr, col
+
+
+def _neighbors(indptr: TensorLike, indices: TensorLike, frontier: TensorLike) -> Tuple[TensorLike, TensorLike]:
+    """Neighbors of the frontier vertices in order, and the position of their
+    parents in the frontier."""
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(indices)}
+    count = indptr[frontier + 1] - indptr[frontier]
+    parent = bm.repeat(bm.arange(frontier.shape[0], **kwargs), count)
+    start = bm.cumsum(count, axis=0) - count
+    pos = bm.arange(parent.shape[0], **kwargs) - bm.repeat(start - indptr[frontier], count)
+    return indices[pos], parent
+
+
+def _levels(indptr, indices, start, visited) -> Tuple[int, TensorLike]:
+    """Number of BFS levels from start and the last level."""
+    visited = bm.copy(visited)
+    frontier = bm.reshape(start, (1,))
+    visited = bm.set_at(visited, frontier, True)
+    nlevel, last = 0, frontier
+    while frontier.shape[0] > 0:
+        nlevel, last = nlevel + 1, frontier
+        nb, _ = _neighbors(indptr, indices, frontier)
+        frontier = bm.unique(nb[~visited[nb]])
+        visited = bm.set_at(visited, frontier, True)
+    return nlevel, last
+
+
+def rcm_order(indptr: TensorLike, indices: TensorLike) -> TensorLike:
+    """Reverse Cuthill-McKee ordering of a symmetric graph, reducing the
+    bandwidth of matrices with this sparsity pattern.
+
+    Every connected component starts from a pseudo-peripheral vertex found
+    by the George-Liu heuristic. The Cuthill-McKee traversal is done level by
+    level: the unvisited neighbors of a level are taken in the order of their
+    parents, then by increasing degree.
+
+    Parameters:
+        indptr (Tensor): The CSR row pointer shaped (N+1,).\n
+        indices (Tensor): Neighbors of the vertices shaped (nnz,).
+
+    Returns:
+        Tensor: The permutation shaped (N,), new vertex i being old vertex perm[i].
+    """
+    indptr = bm.astype(indptr, bm.int64)
+    indices = bm.astype(indices, bm.int64)
+    N = indptr.shape[0] - 1
+    device = bm.get_device(indptr)
+    degree = indptr[1:] - indptr[:-1]
+    visited = bm.zeros((N,), dtype=bm.bool, device=device)
+    order, nvisited = [], 0
+
+    while nvisited < N:
+        # start from the unvisited vertex of the minimum degree
+        cand = bm.nonzero(~visited)[0]
+        start = cand[bm.argmin(degree[cand])]
+        nlevel, last = _levels(indptr, indices, start, visited)
+        while True:
+            s = last[bm.argmin(degree[last])]
+            n, l = _levels(indptr, indices, s, visited)
+            if n <= nlevel:
+                break
+            start, nlevel, last = s, n, l
+
+        frontier = bm.reshape(start, (1,))
+        visited = bm.set_at(visited, frontier, True)
+        while frontier.shape[0] > 0:
+            order.append(frontier)
+            nvisited += frontier.shape[0]
+            nb, parent = _neighbors(indptr, indices, frontier)
+            flag = ~visited[nb]
+            nb, parent = nb[flag], parent[flag]
+            idx = bm.lexsort((nb, degree[nb], parent))
+            nb = nb[idx]
+            # keep the first occurrence of every vertex
+            _, first = bm.unique(nb, return_index=True)
+            frontier = nb[bm.sort(first)]
+            visited = bm.set_at(visited, frontier, True)
+
+    return bm.flip(bm.concat(order, axis=0), axis=0)
@@ -0,0 +1,224 @@
+
+from typing import Optional, Tuple
+from math import ceil, prod
+import hashlib
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+__all__ = ['PointLocator']
+
+
+class PointLocator():
+    """Batched point location in triangle and tetrahedron meshes.
+
+    Cells are registered in a uniform bucket grid by their bounding boxes.
+    A point is tested against the cells of its bucket by barycentric
+    coordinates, all in vectorized form. For coherent queries, e.g. particles
+    moving a little between steps, `walk` starts from known cells and moves
+    towards the points through neighboring cells.
+
+    Parameters:
+        mesh (TriangleMesh | TetrahedronMesh): The mesh with GD == TD.\n
+        density (float, optional): Average number of cells per bucket. Defaults to 1.0.\n
+        tol (float, optional): Tolerance of barycentric coordinates in the\
+        containment test, relative to 1. Defaults to 1e-10.
+
+    Examples:
+        >>> locator = PointLocator(mesh)
+        >>> cell, bcs = locator.locate(points)
+        >>> cell, bcs = locator.walk(new_points, cell)
+    """
+    def __init__(self, mesh, *, density: float=1.0, tol: float=1e-10) -> None:
+        TD = mesh.top_dimension()
+        GD = mesh.geo_dimension()
+        if GD != TD:
+            raise ValueError(f"Point location requires GD == TD, but got GD={GD}, TD={TD}.")
+        self.mesh = mesh
+        self.TD = TD
+        self.tol = tol
+
+        node = mesh.entity('node')
+        cell = mesh.entity('cell')
+        NC = cell.shape[0]
+        self.node_key = _node_key(node)
+        device = bm.get_device(cell)
+        kwargs = {'dtype': bm.int64, 'device': device}
+
+        # inverse affine maps: lambda[1:] = Ainv @ (x - v0)
+        vertex = node[cell] # (NC, TD+1, GD)
+        self.v0 = vertex[:, 0, :]
+        A = bm.swapaxes(vertex[:, 1:, :] - vertex[:, 0:1, :], -1, -2) # (NC, GD, TD)
+        self.Ainv = bm.linalg.inv(A)
+
+        # the bucket grid
+        lower = bm.min(node, axis=0)
+        upper = bm.max(node, axis=0)
+        extent = [float(e) for e in bm.to_numpy(upper - lower)]
+        h = (prod(extent) / max(NC, 1) * density) ** (1 / GD)
+        h = max(h, max(extent) * 1e-8, 1e-300)
+        self.shape = tuple(max(int(ceil(e / h)), 1) for e in extent)
+        self.lower = lower
+        self.h = bm.tensor([e / n if e > 0 else 1.0 for e, n in zip(extent, self.shape)],
+                           dtype=node.dtype, device=device)
+
+        # register cells to all buckets overlapped by their bounding boxes
+        lo = self._bucket_coords(bm.min(vertex, axis=1))
+        hi = self._bucket_coords(bm.max(vertex, axis=1))
+        span = hi - lo + 1 # (NC, GD)
+        count = bm.prod(span, axis=-1)
+        cid = bm.repeat(bm.arange(NC, **kwargs), count)
+        start = bm.cumsum(count, axis=0) - count
+        local = bm.arange(cid.shape[0], **kwargs) - bm.repeat(start, count)
+        bucket = bm.zeros_like(local)
+        for d in range(GD):
+            s = span[cid, d]
+            bucket = bucket * self.shape[d] + lo[cid, d] + local % s
+            local = local // s
+
+        order = bm.argsort(bucket, stable=True)
+        NB = prod(self.shape)
+        num = bm.zeros((NB,), **kwargs)
+        num = bm.index_add(num, bucket, bm.ones_like(bucket))
+        self.bucket_ptr = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(num, axis=0)], axis=0)
+        self.bucket_cell = cid[order]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory of the index in bytes."""
+        return int(self.v0.nbytes + self.Ainv.nbytes + self.bucket_ptr.nbytes
+                   + self.bucket_cell.nbytes)
+
+    def is_valid(self) -> bool:
+        """Whether the mesh still has the nodes the locator was built on,
+        which is not the case after the nodes are moved, also in place."""
+        return _node_key(self.mesh.entity('node')) == self.node_key
+
+    def _bucket_coords(self, points: TensorLike) -> TensorLike:
+        idx = bm.astype(bm.floor((points - self.lower) / self.h), bm.int64)
+        upper = bm.tensor(self.shape, dtype=bm.int64, device=bm.get_device(idx)) - 1
+        return bm.clip(idx, bm.zeros_like(upper), upper)
+
+    def _bucket(self, points: TensorLike) -> TensorLike:
+        coords = self._bucket_coords(points)
+        bucket = coords[:, 0]
+        for d in range(1, self.TD):
+            bucket = bucket * self.shape[d] + coords[:, d]
+        return bucket
+
+    def barycentric(self, points: TensorLike, cell: TensorLike) -> TensorLike:
+        """Barycentric coordinates of points shaped (NP, GD) in the given
+        cells shaped (NP,), returning (NP, TD+1)."""
+        lam = bm.einsum('nij, nj -> ni', self.Ainv[cell], points - self.v0[cell])
+        return bm.concat([1.0 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+
+    def _inside(self, bcs: TensorLike) -> TensorLike:
+        return bm.min(bcs, axis=-1) >= -self.tol
+
+    def locate(self, points: TensorLike, *, chunk_size: int=2**18) -> Tuple[TensorLike, TensorLike]:
+        """Find cells containing the points.
+
+        Parameters:
+            points (Tensor): Points shaped (NP, GD).\n
+            chunk_size (int, optional): Number of points processed at a time,\
+            bounding the memory of candidate pairs. Defaults to 2**18.
+
+        Returns:
+            Tuple[Tensor, Tensor]: Cell index shaped (NP,), -1 for points outside\
+            the mesh, and barycentric coordinates shaped (NP, TD+1), zeros outside.
+        """
+        NP = points.shape[0]
+        cells, bcs = [], []
+        for start in range(0, NP, chunk_size):
+            c, b = self._locate_chunk(points[start:start+chunk_size])
+            cells.append(c)
+            bcs.append(b)
+        if NP == 0:
+            return self._locate_chunk(points)
+        return bm.concat(cells, axis=0), bm.concat(bcs, axis=0)
+
+    def _locate_chunk(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        NP = points.shape[0]
+        device = bm.get_device(points)
+        kwargs = {'dtype': bm.int64, 'device': device}
+
+        # expand candidate (point, cell) pairs, grouped by points
+        bucket = self._bucket(points)
+        count = self.bucket_ptr[bucket + 1] - self.bucket_ptr[bucket]
+        pid = bm.repeat(bm.arange(NP, **kwargs), count)
+        start = bm.cumsum(count, axis=0) - count
+        pos = bm.arange(pid.shape[0], **kwargs) - bm.repeat(start - self.bucket_ptr[bucket], count)
+        cid = self.bucket_cell[pos]
+
+        bcs = self.barycentric(points[pid], cid)
+        inside = self._inside(bcs)
+
+        # take the first containing cell of every point
+        pid_in = pid[inside]
+        first = bm.concat([
+            bm.ones((min(pid_in.shape[0], 1),), dtype=bm.bool, device=device),
+            pid_in[1:] != pid_in[:-1]
+        ], axis=0)
+        found = pid_in[first]
+
+        cell = bm.full((NP,), -1, **kwargs)
+        cell = bm.set_at(cell, found, cid[inside][first])
+        out = bm.zeros((NP, self.TD+1), dtype=points.dtype, device=device)
+        out = bm.set_at(out, found, bcs[inside][first])
+        return cell, out
+
+    def walk(self, points: TensorLike, start: TensorLike, *,
+             maxit: int=50) -> Tuple[TensorLike, TensorLike]:
+        """Locate points by walking from the start cells through neighbors.
+
+        In each step, a point outside its current cell moves across the face
+        opposite to the most negative barycentric coordinate. Points that leave
+        the mesh, do not arrive within `maxit` steps, or have a negative start
+        cell are located by `locate`.
+
+        Parameters:
+            points (Tensor): Points shaped (NP, GD).\n
+            start (Tensor): Start cells shaped (NP,), e.g. the cells of the\
+            points in the previous time step.\n
+            maxit (int, optional): Maximum number of steps. Defaults to 50.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The same as `locate`.
+        """
+        NP = points.shape[0]
+        device = bm.get_device(points)
+        cell2cell = bm.astype(self.mesh.cell_to_cell(), bm.int64)
+        cell = bm.astype(bm.copy(start), bm.int64)
+        bcs = bm.zeros((NP, self.TD+1), dtype=points.dtype, device=device)
+
+        active = bm.nonzero(cell >= 0)[0]
+        lost = [bm.nonzero(cell < 0)[0]]
+
+        for _ in range(maxit):
+            if active.shape[0] == 0:
+                break
+            c = cell[active]
+            b = self.barycentric(points[active], c)
+            inside = self._inside(b)
+            bcs = bm.set_at(bcs, active[inside], b[inside])
+
+            active, c, b = active[~inside], c[~inside], b[~inside]
+            nxt = cell2cell[c, bm.argmin(b, axis=-1)]
+            leaving = nxt == c # boundary face
+            lost.append(active[leaving])
+            active = active[~leaving]
+            cell = bm.set_at(cell, active, nxt[~leaving])
+
+        lost.append(active)
+        lost = bm.concat(lost, axis=0)
+        if lost.shape[0] > 0:
+            c, b = self.locate(points[lost])
+            cell = bm.set_at(cell, lost, c)
+            bcs = bm.set_at(bcs, lost, b)
+
+        return bm.astype(cell, start.dtype), bcs
+
+
+def _node_key(node: TensorLike) -> Tuple:
+    data = bm.to_numpy(node)
+    return data.shape, hashlib.blake2b(data.tobytes(), digest_size=16).digest()
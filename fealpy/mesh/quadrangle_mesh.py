@@ -197,7 +197,7 @@ class QuadrangleMesh(TensorMesh, Plotable):
             return bm.arange(len(cell)).reshape((-1, 1))[index]
 
         if p == 1:
-            return cell[index, [0, 3, 1, 2]]  # 先排 y 方向，再排 x 方向
+            return cell[index][:, [0, 3, 1, 2]]  # 先排 y 方向，再排 x 方向
 
         edge2cell = self.edge2cell
         NN = self.number_of_nodes()
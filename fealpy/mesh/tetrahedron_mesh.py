@@ -3,6 +3,7 @@ from math import sqrt
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S
 from .mesh_base import SimplexMesh
+from .utils import relationmethod
 from .plot import Plotable
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
 from scipy.sparse import spdiags, eye, tril, triu, bmat
@@ -160,7 +161,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         v01 = node[cell[index, 1]] - node[cell[index, 0]]
         v02 = node[cell[index, 2]] - node[cell[index, 0]]
         v03 = node[cell[index, 3]] - node[cell[index, 0]]
-        volume = bm.sum(v03*bm.cross(v01, v02), axis=1)/6.0
+        volume = bm.sum(v03*bm.cross(v01, v02, axis=-1), axis=1)/6.0
         return volume
 
 
@@ -192,15 +193,15 @@ class TetrahedronMesh(SimplexMesh, Plotable):
     def grad_lambda(self, index=_S):
         localFace = self.localFace
         node = self.node
-        cell = self.cell
-        NC = self.number_of_cells() if index == _S else len(index)
+        cell = self.cell[index]
+        NC = cell.shape[0]
         Dlambda = bm.zeros((NC, 4, 3), device=self.device, dtype=self.ftype)
         volume = self.entity_measure('cell', index=index)
         for i in range(4):
             j,k,m = localFace[i]
-            vjk = node[cell[index, k],:] - node[cell[index, j],:]
-            vjm = node[cell[index, m],:] - node[cell[index, j],:]
-            Dlambda[:, i, :] = bm.cross(vjm, vjk)/(6*volume.reshape(-1, 1))
+            vjk = node[cell[:, k],:] - node[cell[:, j],:]
+            vjm = node[cell[:, m],:] - node[cell[:, j],:]
+            Dlambda[:, i, :] = bm.cross(vjm, vjk, axis=-1)/(6*volume.reshape(-1, 1))
         return Dlambda
     
     def grad_face_lambda(self, index=_S):
@@ -222,6 +223,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         Dlambda[:, 2] = bm.cross(n, v2) / length
         return Dlambda
 
+    @relationmethod
     def boundary_edge_flag(self):
         """
         @brief 判断边界边 
@@ -406,7 +408,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             isInCellIPoint = ~(isFaceIPoint[0] | isFaceIPoint[1] | isFaceIPoint[2] | isFaceIPoint[3])
             cell2ipoint[:, isInCellIPoint] = base + bm.arange(NC*idof,dtype=self.itype).reshape(NC, idof)
 
-        return cell2ipoint
+        return cell2ipoint[index]
 
     def direction(self,i):
         """
@@ -656,7 +658,11 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         # 非协调边的标记数组
         nonConforming = bm.ones(8*NN, dtype=bm.bool)
         IM = eye(NN)
+        # 记录被修改的单元，最后只更新它们附近的拓扑关系
+        NC0 = NC
+        changed = []
         while len(markedCell) != 0:
+            changed.append(bm.astype(markedCell, self.itype))
             # 标记最长边
             self.label(node, cell, markedCell)
 
@@ -782,9 +788,11 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             nonConforming = bm.set_at(nonConforming, checkEdge[j], True)
 
 
+        changed.append(bm.arange(NC0, NC, dtype=self.itype))
+        changed = bm.unique(bm.concatenate(changed))
         self.node = node[:NN]
         self.cell = cell[:NC]
-        self.construct()
+        self.construct_patch(changed)
         
 
         for key in self.celldata:
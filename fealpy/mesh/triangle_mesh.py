@@ -3,7 +3,7 @@ from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, _S
 from .. import logger
 
-from .utils import simplex_gdof, simplex_ldof
+from .utils import simplex_gdof, simplex_ldof, simplex_tabulate
 from .mesh_base import SimplexMesh, estr2dim
 from .plot import Plotable
 
@@ -111,7 +111,7 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         @berif 这里调用的是网格空间基函数的梯度
         """
-        R = bm.simplex_grad_shape_function(bc, p)
+        R = simplex_tabulate(bc, p, 1)
         if variables == 'x':
             Dlambda = self.grad_lambda(index=index)
             gphi = bm.einsum('...ij, kjm -> k...im', R, Dlambda)
@@ -300,18 +300,6 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         pass
     
-    def location(self, points):
-        """
-        @breif  给定一组点 p , 找到这些点所在的单元
-
-        这里假设：
-
-        1. 所有点在网格内部，
-        2. 网格中没有洞
-        3. 区域还要是凸的
-        """
-        pass
-
     def circumcenter(self, index: Index=_S, returnradius=False):
         """
         @brief 计算三角形外接圆的圆心和半径
@@ -453,44 +441,26 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         if 'IM' in options:
             nn = len(newNode)
-            IM = COOTensor( indices=bm.stack((bm.arange(NN), bm.arange(NN)), axis=0),
-                            values=bm.ones(NN), 
-                            shape=(NN + nn, NN))
-            # IM = coo_matrix((bm.ones(NN), (bm.arange(NN), bm.arange(NN))),
-            #                 shape=(NN + nn, NN))
-            val = bm.full((nn,), 0.5)
-            IM += COOTensor(indices=bm.stack((NN + bm.arange(nn), edge[isCutEdge, 0]), axis=0),
-                            values=val,
-                            shape=(NN + nn, NN))
-            # IM += coo_matrix(
-            #     (
-            #         val,
-            #         (
-            #             NN + bm.arange(nn),
-            #             edge[isCutEdge, 0]
-            #         )
-            #     ), shape=(NN + nn, NN))
-            IM += COOTensor(indices=bm.stack((NN + bm.arange(nn), edge[isCutEdge, 1]), axis=0),
-                            values=val,
-                            shape=(NN + nn, NN))
-            # IM += coo_matrix(
-            #     (
-            #         val,
-            #         (
-            #             NN + bm.arange(nn),
-            #             edge[isCutEdge, 1]
-            #         )
-            #     ), shape=(NN + nn, NN))
+            ikwargs = {'dtype': self.itype, 'device': self.device}
+            fkwargs = {'dtype': self.ftype, 'device': self.device}
+            I = bm.concatenate((bm.arange(NN, **ikwargs), NN + bm.arange(nn, **ikwargs),
+                                NN + bm.arange(nn, **ikwargs)))
+            J = bm.concatenate((bm.arange(NN, **ikwargs), edge[isCutEdge, 0], edge[isCutEdge, 1]))
+            val = bm.concatenate((bm.ones((NN,), **fkwargs), bm.full((2*nn,), 0.5, **fkwargs)))
+            IM = COOTensor(indices=bm.stack((I, J), axis=0), values=val, spshape=(NN + nn, NN))
             options['IM'] = IM.tocsr()
 
         if 'HB' in options:
             options['HB'] = bm.arange(NC)
 
+        NC0 = NC
+        changed = []
         for k in range(2):
             idx, = bm.nonzero(edge2newNode[cell2edge0] > 0)
             nc = len(idx)
             if nc == 0:
                 break
+            changed.append(idx)
 
             if 'HB' in options:
                 HB = options['HB']
@@ -557,11 +527,17 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         self.NN = self.node.shape[0]
         self.cell = cell
-        self.construct()
+        # update the topology in the refined patch only
+        changed.append(bm.arange(NC0, NC, dtype=self.itype, device=self.device))
+        changed = bm.unique(bm.concatenate([bm.astype(c, self.itype) for c in changed]))
+        self.construct_patch(changed)
 
     def coarsen(self, isMarkedCell=None, options={}):
         """
-        @brief
+        @brief 粗化由 bisect 加密得到的单元
+
+        若一个节点是其周围所有单元的最新顶点，且这些单元都被标记，则删除该节点，
+        并把其周围由同一单元二分得到的两个单元合并回去。
 
         https://lyc102.github.io/ifem/afem/coarsen/
         """
@@ -574,102 +550,76 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         cell = self.entity('cell')
         node = self.entity('node')
-
-        valence = bm.zeros(NN, dtype=self.itype, device=self.device)
-        bm.add_at(valence, cell, 1)
-
-        valenceNew = bm.zeros(NN, dtype=self.itype, device=self.device)
-        bm.add_at(valenceNew, cell[isMarkedCell][:, 0], 1)
-
-        isIGoodNode = (valence == valenceNew) & (valence == 4)
-        isBGoodNode = (valence == valenceNew) & (valence == 2)
-
-        node2cell = self.node_to_cell()
-
-        I, J = bm.nonzero(node2cell[isIGoodNode, :])
-        nodeStar = J.reshape(-1, 4)
-
-        ix = (cell[nodeStar[:, 0], 2] == cell[nodeStar[:, 3], 1])
-        iy = (cell[nodeStar[:, 1], 1] == cell[nodeStar[:, 2], 2])
-        nodeStar = bm.set_at(nodeStar , ix & (~iy) ,nodeStar[ix & (~iy), :][:, [0, 2, 1, 3]])
-        nodeStar = bm.set_at(nodeStar , (~ix) & iy ,nodeStar[(~ix) & iy, :][:, [0, 3, 1, 2]])
-
-        t0 = nodeStar[:, 0]
-        t1 = nodeStar[:, 1]
-        t2 = nodeStar[:, 2]
-        t3 = nodeStar[:, 3]
-
-        p1 = cell[t0, 2]
-        p2 = cell[t1, 1]
-        p3 = cell[t0, 1]
-        p4 = cell[t2, 1]
-
-        cell = bm.set_at(cell , (t0, 0) , p3)
-        cell = bm.set_at(cell , (t0, 1) , p1)
-        cell = bm.set_at(cell , (t0, 2) , p2)
-        cell = bm.set_at(cell , (t1, 0) , -1)
-
-        cell = bm.set_at(cell , (t2, 0) , p4)
-        cell = bm.set_at(cell , (t2, 1) , p2)
-        cell = bm.set_at(cell , (t2, 2) , p1)
-        cell = bm.set_at(cell , (t3, 0) , -1)
-
-        I, J = bm.nonzero(node2cell[isBGoodNode, :])
-        nodeStar = J.reshape(-1, 2)
-        idx = (cell[nodeStar[:, 0], 2] == cell[nodeStar[:, 1], 1])
-        nodeStar = bm.set_at(nodeStar , idx , nodeStar[idx, :][:, [0, 1]])
-
-        t4 = nodeStar[:, 0]
-        t5 = nodeStar[:, 1]
-        p0 = cell[t4, 0]
-        p1 = cell[t4, 2]
-        p2 = cell[t5, 1]
-        p3 = cell[t4, 1]
-        cell = bm.set_at(cell , (t4, 0) , p3)
-        cell = bm.set_at(cell , (t4, 1) , p1)
-        cell = bm.set_at(cell , (t4, 2) , p2)
-        cell = bm.set_at(cell , (t5, 0) , -1)
-
-        isKeepCell = cell[:, 0] > -1
+        kwargs = {'dtype': self.itype, 'device': self.device}
+
+        valence = bm.zeros(NN, **kwargs)
+        valence = bm.index_add(valence, cell.reshape(-1), bm.ones(3*NC, **kwargs))
+        valenceNew = bm.zeros(NN, **kwargs)
+        valenceNew = bm.index_add(valenceNew, cell[isMarkedCell, 0],
+                                  bm.ones(int(bm.sum(isMarkedCell)), **kwargs))
+        isGoodNode = (valence == valenceNew) & ((valence == 4) | (valence == 2))
+
+        # 二分单元 (p0, p1, p2) 得到左单元 (g, p0, p1) 和右单元 (g, p2, p0)，
+        # 左单元保留原编号，右单元编号在后
+        cidx = bm.nonzero(isMarkedCell & isGoodNode[cell[:, 0]])[0]
+        if cidx.shape[0] == 0:
+            return
+        g = bm.astype(cell[cidx, 0], bm.int64)
+        lkey = g * NN + cell[cidx, 1]
+        rkey = g * NN + cell[cidx, 2]
+        order = bm.argsort(rkey)
+        pos = bm.searchsorted(rkey[order], lkey)
+        pos = bm.where(pos < cidx.shape[0], pos, 0)
+        ridx = cidx[order[pos]]
+        isPair = (rkey[order[pos]] == lkey) & (cidx < ridx)
+
+        # 只粗化周围单元全部配对的节点
+        npair = bm.zeros(NN, **kwargs)
+        npair = bm.index_add(npair, g[isPair], bm.ones(int(bm.sum(isPair)), **kwargs))
+        isGoodNode = isGoodNode & (2*npair == valence)
+        isPair = isPair & isGoodNode[g]
+        lidx, ridx = cidx[isPair], ridx[isPair]
+
+        isKeepCell = bm.ones(NC, dtype=bm.bool, device=self.device)
+        isKeepCell = bm.set_at(isKeepCell, ridx, False)
         if ('data' in options) and (options['data'] is not None):
             # value.shape == (NC, (p+1)*(p+2)//2)
-            lidx = bm.concatenate((t0, t2, t4))
-            ridx = bm.concatenate((t1, t3, t5))
             for key, value in options['data'].items():
                 ldof = value.shape[1]
-                p = int((bm.sqrt(8 * ldof + 1) - 3) / 2)
-                bc = self.multi_index_matrix(p=p, etype=2) / p
-                bcl = bm.zeros_like(bc)
-                bcl = bm.set_at(bcl , (slice(None), 0) , 2 * bc[:, 2])
-                bcl = bm.set_at(bcl , (slice(None), 1) , bc[:, 0])
-                bcl = bm.set_at(bcl , (slice(None), 2) , bc[:, 1] - bc[:, 2])
- 
-                bcr = bm.zeros_like(bc)
-                bar = bm.set_at(bcr , (slice(None), 0) , 2 * bc[:, 1])
-                bar = bm.set_at(bcr , (slice(None), 1) , bc[:, 2] - bc[:, 1])
-                bar = bm.set_at(bcr , (slice(None), 2) , bc[:, 0])
-
-                phi = self.shape_function(bcl, p=p)  # (NQ, ldof)
-                value = bm.set_at(value , lidx , bm.einsum('ci, qi->cq', value[lidx, :], phi))
-
-                phi = self.shape_function(bcr, p=p)  # (NQ, ldof)
+                p = int(((8 * ldof + 1)**0.5 - 3) / 2)
+                bc = bm.astype(self.multi_index_matrix(p=p, etype=2), self.ftype) / p
+                bcl = bm.stack([2 * bc[:, 2], bc[:, 0], bc[:, 1] - bc[:, 2]], axis=1)
+                bcr = bm.stack([2 * bc[:, 1], bc[:, 2] - bc[:, 1], bc[:, 0]], axis=1)
+
+                phil = self.shape_function(bcl, p=p)  # (NQ, ldof)
+                phir = self.shape_function(bcr, p=p)  # (NQ, ldof)
+                val = bm.einsum('ci, qi->cq', value[lidx, :], phil)
+                val += bm.einsum('ci, qi->cq', value[ridx, :], phir)
+                value = bm.set_at(value, lidx, 0.5 * val)
+                options['data'][key] = value[isKeepCell]
+
+        newCell = bm.stack([cell[lidx, 1], cell[lidx, 2], cell[ridx, 1]], axis=1)
+        cell = bm.set_at(bm.copy(cell), lidx, newCell)
+
+        idxMap = bm.zeros(NN, **kwargs)
+        node = node[~isGoodNode]
+        idxMap = bm.set_at(idxMap, ~isGoodNode, bm.arange(node.shape[0], **kwargs))
+        cellMap = bm.full((NC, ), -1, **kwargs)
+        NC = int(bm.sum(isKeepCell))
+        cellMap = bm.set_at(cellMap, isKeepCell, bm.arange(NC, **kwargs))
+
+        # 保持其余边的编号，只更新被合并单元的边
+        face, face2cell, cell2face = self.face, self.face2cell, self.cell2face
+        touched = bm.zeros(face.shape[0], dtype=bm.bool, device=self.device)
+        touched = bm.set_at(touched, cell2face[lidx].reshape(-1), True)
+        touched = bm.set_at(touched, cell2face[ridx].reshape(-1), True)
 
-                value = bm.add_at(value , lidx , bm.einsum('ci, qi->cq', value[ridx, :], phi))
-                value = bm.set_at(value , lidx , 0.5 * value[lidx])
-                options['data'] = bm.set_at(options['data'],key , value[isKeepCell])
-
-        cell = cell[isKeepCell]
-        isGoodNode = (isIGoodNode | isBGoodNode)
-
-        idxMap = bm.zeros(NN, dtype=self.itype, device=self.device)
-        self.node = node[~isGoodNode]
-
-        NN = self.node.shape[0]
-        idxMap = bm.set_at(idxMap , ~isGoodNode , bm.arange(NN))
-        cell = idxMap[cell]
-
-        self.cell = cell
-        self.construct()
+        self.node = node
+        self.cell = idxMap[cell[isKeepCell]]
+        self.face = idxMap[face]
+        self.face2cell = bm.concat([cellMap[face2cell[:, :2]], face2cell[:, 2:]], axis=1)
+        self.cell2face = cell2face[isKeepCell]
+        self.construct_patch(cellMap[lidx], touched_face=touched)
 
     def label(self, node=None, cell=None, cellidx=None):
         """
@@ -1011,12 +961,6 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         return J
 
-    def point_to_bc(self, point):
-        """
-        @brief 找到定点 point 所在的单元，并计算其重心坐标 
-        """
-        pass
-
     def mark_interface_cell(self, phi):
         """
         @brief 标记穿过界面的单元
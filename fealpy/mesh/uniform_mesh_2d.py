@@ -74,9 +74,15 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
                 origin: Tuple[float, float] = (0.0, 0.0), 
                 ipoints_ordering='yx', 
                 flip_direction=None, 
-                *, itype=None, ftype=None, device=None):
+                *, itype=None, ftype=None, device=None, implicit: bool=False):
         """
         Initializes a 2D uniform structured mesh.
+
+        If `implicit` is True, nodes, edges, cells and the 'yx' interpolation
+        points are computed from their grid indices when requested, only for
+        the requested index, and never stored in the mesh. The memory of the
+        topology is then independent of the grid size, e.g. for assembling
+        chunk by chunk on very fine grids.
         """
         if itype is None:
             itype = bm.int32
@@ -85,6 +91,7 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         super().__init__(TD=2, itype=itype, ftype=ftype)
 
         self.device = device
+        self.implicit = implicit
 
         # Mesh properties
         self.extent = [int(e) for e in extent]
@@ -122,9 +129,10 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         # Specify the counterclockwise drawing
         self.ccw = bm.array([0, 2, 3, 1], dtype=self.itype, device=self.device)
 
-        self.edge2cell = self.edge_to_cell()
-        self.face2cell = self.edge2cell
-        self.cell2edge = self.cell_to_edge()
+        if not self.implicit:
+            self.edge2cell = self.edge_to_cell()
+            self.face2cell = self.edge2cell
+            self.cell2edge = self.cell_to_edge()
 
         self.localEdge = bm.array([(0, 2), (1, 3), 
                                    (0, 1), (2, 3)], dtype=self.itype, device=self.device)   
@@ -208,6 +216,28 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
 
         return cell
     
+    def _implicit_entity(self, etype: int, index: Index) -> TensorLike:
+        nx, ny = self.nx, self.ny
+        if etype == 0:
+            i, j = self._unravel(self._grid_index(index, self.NN), (nx + 1, ny + 1))
+            if self.flip_direction == 'x':
+                i = nx - i
+            elif self.flip_direction == 'y':
+                j = ny - j
+            i, j = bm.astype(i, self.ftype), bm.astype(j, self.ftype)
+            x = self.origin[0] + i * (nx * self.h[0] / nx)
+            y = self.origin[1] + j * (ny * self.h[1] / ny)
+            return bm.stack([x, y], axis=-1)
+        elif etype == 1:
+            index = self._grid_index(index, self.NE)
+            blocks = [((nx, ny + 1), (0, ny + 1)), ((nx + 1, ny), (0, 1))]
+        elif etype == 2:
+            index = self._grid_index(index, self.NC)
+            blocks = [((nx, ny), (0, 1, ny + 1, ny + 2))]
+        else:
+            raise ValueError(f"Unsupported entity or top-dimension: {etype}")
+        return self._grid_entity(index, blocks, (ny + 1, 1))
+
     # 实体拓扑
     def number_of_nodes_of_cells(self):
         return 4
@@ -360,10 +390,10 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         elif etype == 1:
             temp1 = bm.tensor([[self.h[0]], [self.h[1]]], dtype=self.ftype)
             temp2 = bm.broadcast_to(temp1, (2, int(self.NE/2)))
-            return temp2.reshape(-1)
+            return temp2.reshape(-1)[index]
         elif etype == 2:
             temp = bm.tensor(self.h[0] * self.h[1], dtype=self.ftype)
-            return bm.broadcast_to(temp, (NC,))
+            return bm.broadcast_to(temp, (NC,))[index]
         else:
             raise ValueError(f"Unsupported entity or top-dimension: {etype}")
         
@@ -436,7 +466,6 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         Returns
             TensorLike: (NC, NQ, GD) or (NE, NQ, GD)
         """
-        node = self.entity('node')
         if isinstance(bcs, tuple):
             assert len(bcs) == 2
             cell = self.entity('cell', index)
@@ -444,10 +473,10 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
             bcs0 = bcs[0].reshape(-1, 2)
             bcs1 = bcs[1].reshape(-1, 2)
             bcs = bm.einsum('im, jn -> ijmn', bcs0, bcs1).reshape(-1, 4)
-            p = bm.einsum('qj, cjk -> cqk', bcs, node[cell[:]])
+            p = bm.einsum('qj, cjk -> cqk', bcs, self.entity('node', index=cell))
         else:
             edge = self.entity('edge', index=index)
-            p = bm.einsum('qj, ejk -> eqk', bcs, node[edge]) 
+            p = bm.einsum('qj, ejk -> eqk', bcs, self.entity('node', index=edge))
 
         return p
 
@@ -540,11 +569,12 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
             length_x = nx * hx
             length_y = ny * hy
 
-            ix = bm.linspace(0, length_x, nix)
-            iy = bm.linspace(0, length_y, niy)
-
-            x, y = bm.meshgrid(ix, iy, indexing='ij')
-            ipoints = bm.stack([x.flatten(), y.flatten()], axis=-1)
+            # only the requested points are computed from their grid indices
+            ix, iy = self._unravel(self._grid_index(index, nix * niy), (nix, niy))
+            ix, iy = bm.astype(ix, self.ftype), bm.astype(iy, self.ftype)
+            x = self.origin[0] + ix * (length_x / (nix - 1))
+            y = self.origin[1] + iy * (length_y / (niy - 1))
+            return bm.stack([x, y], axis=-1)
         elif ordering == 'nec':
             GD = self.geo_dimension()
             NN = self.number_of_nodes()
@@ -660,19 +690,12 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
         ordering = self.ipoints_ordering
 
         if ordering == 'yx':
-            edge_to_ipoint = self.edge_to_ipoint(p)
-            cell2edge = self.cell_to_edge(index=index)
-
-            start_indices = edge_to_ipoint[cell2edge[:, 0]]
-            end_indices = edge_to_ipoint[cell2edge[:, 1]]
-
-            linspace_indices = bm.linspace(0, 1, p + 1, endpoint=True, dtype=self.ftype).reshape(1, -1)
-
-            cell_ipoints_interpolated = start_indices[:, :, None] * (1 - linspace_indices) + \
-                                        end_indices[:, :, None] * linspace_indices
-
-            cell2ipoint = cell_ipoints_interpolated.reshape(-1, (p+1)**2)
-            cell2ipoint = cell2ipoint.astype(self.itype)
+            # the local point (a, b) of cell (i, j) is the global (i*p + a, j*p + b)
+            nx, ny = self.nx, self.ny
+            niy = ny * p + 1
+            offsets = [a * niy + b for a in range(p + 1) for b in range(p + 1)]
+            index = self._grid_index(index, self.NC)
+            cell2ipoint = self._grid_entity(index, [((nx, ny), offsets)], (p * niy, p))
         elif ordering == 'nec':
             edge2cell = self.edge_to_cell()
             NN = self.number_of_nodes()
@@ -764,10 +787,9 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
 
         x(xi, eta) = phi_0 x_0 + phi_1 x_1 + ... + phi_{ldof-1} x_{ldof-1}
         """
-        node = self.entity('node')
         cell = self.entity('cell', index=index)
         gphi = self.grad_shape_function(bcs, p=1, variables='u', index=index)
-        J = bm.einsum( 'cim, ...in -> ...cmn', node[cell[:]], gphi)
+        J = bm.einsum( 'cim, ...in -> ...cmn', self.entity('node', index=cell), gphi)
 
         return J
     
@@ -840,9 +862,10 @@ class UniformMesh2d(StructuredMesh, TensorMesh, Plotable):
             self.NF = self.NE
             self.NN = (self.nx + 1) * (self.ny + 1)
 
-            self.edge2cell = self.edge_to_cell()
-            self.cell2edge = self.cell_to_edge()
-            self.face2cell = self.edge2cell
+            if not self.implicit:
+                self.edge2cell = self.edge_to_cell()
+                self.cell2edge = self.cell_to_edge()
+                self.face2cell = self.edge2cell
 
         self.clear() 
 
@@ -77,7 +77,7 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
              origin: Tuple[float, float, float] = (0.0, 0.0, 0.0), 
              ipoints_ordering='zyx', 
              flip_direction=None, 
-             itype=None, ftype=None):
+             itype=None, ftype=None, *, device=None, implicit: bool=False):
         """
         Initializes a 3D uniform structured mesh.
 
@@ -96,6 +96,14 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             Data type for integer values used in the mesh. Default is None, which is assigned as bm.int32.
         ftype : data type, optional
             Data type for floating-point values used in the mesh. Default is None, which is assigned as bm.float64.
+        device : optional
+            Device of the tensors of the mesh.
+        implicit : bool, optional
+            If True, nodes, edges, faces, cells and the 'zyx' interpolation points are
+            computed from their grid indices when requested, only for the requested
+            index, and never stored in the mesh. The memory of the topology is then
+            independent of the grid size, e.g. for assembling chunk by chunk on very
+            fine grids. Default is False.
         """
         if itype is None:
             itype = bm.int32
@@ -103,6 +111,9 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             ftype = bm.float64
         super().__init__(TD=3, itype=itype, ftype=ftype)
 
+        self.device = device
+        self.implicit = implicit
+
         # Mesh properties
         self.extent = [int(e) for e in extent]
         self.h = [float(val) for val in h]
@@ -147,10 +158,11 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         # Specify the counterclockwise drawing
         self.ccw = bm.array([0, 2, 3, 1], dtype=self.itype)
 
-        self.cell2edge = self.cell_to_edge()
-        self.cell2face = self.cell_to_face()
-        self.face2edge = self.face_to_edge()
-        self.face2cell = self.face_to_cell()
+        if not self.implicit:
+            self.cell2edge = self.cell_to_edge()
+            self.cell2face = self.cell_to_face()
+            self.face2edge = self.face_to_edge()
+            self.face2cell = self.face_to_cell()
 
         self.localEdge = bm.array([
         (0, 4), (1, 5), (2, 6), (3, 7),
@@ -333,6 +345,38 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         #     raise NotImplementedError("Backend is not yet implemented.")
     
     
+    def _implicit_entity(self, etype: int, index: Index) -> TensorLike:
+        nx, ny, nz = self.nx, self.ny, self.nz
+        nyz = (ny + 1) * (nz + 1)
+        if etype == 0:
+            i, j, k = self._unravel(self._grid_index(index, self.NN), (nx + 1, ny + 1, nz + 1))
+            if self.flip_direction == 'y':
+                j = ny - j
+            elif self.flip_direction == 'z':
+                k = nz - k
+            i, j, k = (bm.astype(t, self.ftype) for t in (i, j, k))
+            x = self.origin[0] + i * (nx * self.h[0] / nx)
+            y = self.origin[1] + j * (ny * self.h[1] / ny)
+            z = self.origin[2] + k * (nz * self.h[2] / nz)
+            return bm.stack([x, y, z], axis=-1)
+        elif etype == 1:
+            index = self._grid_index(index, self.NE)
+            blocks = [((nx, ny + 1, nz + 1), (0, nyz)),
+                      ((nx + 1, ny, nz + 1), (0, nz + 1)),
+                      ((nx + 1, ny + 1, nz), (0, 1))]
+        elif etype == 2:
+            index = self._grid_index(index, self.NF)
+            blocks = [((nx + 1, ny, nz), (0, 1, nz + 1, nz + 2)),
+                      ((nx, ny + 1, nz), (0, 1, nyz, nyz + 1)),
+                      ((nx, ny, nz + 1), (0, nz + 1, nyz, nyz + nz + 1))]
+        elif etype == 3:
+            index = self._grid_index(index, self.NC)
+            blocks = [((nx, ny, nz), (0, 1, nz + 1, nz + 2,
+                                      nyz, nyz + 1, nyz + nz + 1, nyz + nz + 2))]
+        else:
+            raise ValueError(f"Unsupported entity or top-dimension: {etype}")
+        return self._grid_entity(index, blocks, (nyz, nz + 1, 1))
+
     # 实体拓扑
     def number_of_nodes_of_cells(self):
         return 8
@@ -653,16 +697,16 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             # Measure of edges, assuming edges are along x, y, z directions
             temp1 = bm.tensor([[self.h[0]], [self.h[1]], [self.h[2]]], dtype=self.ftype)
             temp2 = bm.broadcast_to(temp1, (3, int(self.NE/3)))
-            return temp2.reshape(-1)
+            return temp2.reshape(-1)[index]
         elif etype == 2:
             # Measure of faces, assuming faces are aligned with the coordinate planes
             temp1 = bm.tensor([self.h[0] * self.h[1], self.h[0] * self.h[2], self.h[1] * self.h[2]], dtype=self.ftype)
             temp2 = bm.broadcast_to(temp1[:, None], (3, int(self.NF/3)))
-            return temp2.reshape(-1)
+            return temp2.reshape(-1)[index]
         elif etype == 3:
             # Measure of cells (volumes)
             temp = bm.tensor(self.h[0] * self.h[1] * self.h[2], dtype=self.ftype)
-            return bm.broadcast_to(temp, (NC,))
+            return bm.broadcast_to(temp, (NC,))[index]
         else:
             raise ValueError(f"Unsupported entity or top-dimension: {etype}")
         
@@ -834,7 +878,6 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         Returns
             TensorLike: (NC, NQ, GD), (NF, NQ, GD) or (NE, NQ, GD)
         """
-        node = self.entity('node')
         if isinstance(bcs, tuple) and len(bcs) == 3:
             cell = self.entity('cell', index)
 
@@ -843,7 +886,7 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             bcs2 = bcs[2].reshape(-1, 2)
             bcs = bm.einsum('im, jn, ko -> ijkmno', bcs0, bcs1, bcs2).reshape(-1, 8)
 
-            p = bm.einsum('qj, cjk -> cqk', bcs, node[cell[:]])
+            p = bm.einsum('qj, cjk -> cqk', bcs, self.entity('node', index=cell))
         elif isinstance(bcs, tuple) and len(bcs) == 2:
             face = self.entity('face', index)
 
@@ -851,10 +894,10 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             bcs1 = bcs[1].reshape(-1, 2)
             bcs = bm.einsum('im, jn -> ijmn', bcs0, bcs1).reshape(-1, 4)
 
-            p = bm.einsum('qj, fjk -> fqk', bcs, node[face[:]])
+            p = bm.einsum('qj, fjk -> fqk', bcs, self.entity('node', index=face))
         else:
             edge = self.entity('edge', index=index)
-            p = bm.einsum('qj, ejk -> eqk', bcs, node[edge]) 
+            p = bm.einsum('qj, ejk -> eqk', bcs, self.entity('node', index=edge))
 
         return p
 
@@ -988,12 +1031,13 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
             length_y = ny * hy
             length_z = nz * hz
 
-            ix = bm.linspace(0, length_x, nix)
-            iy = bm.linspace(0, length_y, niy)
-            iz = bm.linspace(0, length_z, niz)
-
-            x, y, z = bm.meshgrid(ix, iy, iz, indexing='ij')
-            ipoints = bm.stack([x.flatten(), y.flatten(), z.flatten()], axis=-1)
+            # only the requested points are computed from their grid indices
+            idx = self._unravel(self._grid_index(index, nix * niy * niz), (nix, niy, niz))
+            ix, iy, iz = (bm.astype(t, self.ftype) for t in idx)
+            x = self.origin[0] + ix * (length_x / (nix - 1))
+            y = self.origin[1] + iy * (length_y / (niy - 1))
+            z = self.origin[2] + iz * (length_z / (niz - 1))
+            return bm.stack([x, y, z], axis=-1)
         elif ordering == 'nefc':
             c2ip = self.cell_to_ipoint(p)
             gp = self.number_of_global_ipoints(p)
@@ -1165,22 +1209,14 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         ordering = self.ipoints_ordering
 
         if ordering == 'zyx':
-            face_to_ipoint = self.face_to_ipoint(p)
-            cell2face = self.cell_to_face(index=index)
-
-            start_indices = face_to_ipoint[cell2face[:, 0]]
-            end_indices = face_to_ipoint[cell2face[:, 1]]
-
-            linspace_indices = bm.linspace(0, 1, p + 1, endpoint=True, dtype=self.ftype).reshape(1, -1)
-            cell_ipoints_interpolated = start_indices[:, :, None] * (1 - linspace_indices) + \
-                                        end_indices[:, :, None] * linspace_indices
-            
-            # 首先，转换形状以便重新排列为列优先
-            reshaped = cell_ipoints_interpolated.reshape(-1, (p+1)**2, p+1)
-            # 然后，转置最后两个维度，这样插值点会按照 z, y, x 的顺序排列
-            transposed = reshaped.transpose(0, 2, 1)
-            # 最后，reshape 到最终的形状，确保插值点是列优先排序
-            cell2ipoint = transposed.reshape(-1, (p+1)**3).astype(self.itype)
+            # the local point (a, b, c) of cell (i, j, k) is the global (i*p + a, j*p + b, k*p + c)
+            nx, ny, nz = self.nx, self.ny, self.nz
+            niy, niz = ny * p + 1, nz * p + 1
+            offsets = [(a * niy + b) * niz + c for a in range(p + 1)
+                       for b in range(p + 1) for c in range(p + 1)]
+            index = self._grid_index(index, self.NC)
+            cell2ipoint = self._grid_entity(index, [((nx, ny, nz), offsets)],
+                                            (p * niy * niz, p * niz, p))
         elif ordering == 'nefc':
             NN = self.number_of_nodes()
             NE = self.number_of_edges()
@@ -1250,10 +1286,9 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
         """
         assert isinstance(bcs, tuple)
 
-        node = self.entity('node')
         cell = self.entity('cell', index=index)
         gphi = self.grad_shape_function(bcs, p=1, variables='u')
-        J = bm.einsum( 'cim, qin -> qcmn', node[cell[:]], gphi)
+        J = bm.einsum( 'cim, qin -> cqmn', self.entity('node', index=cell), gphi)
 
         return J
     
@@ -1298,17 +1333,18 @@ class UniformMesh3d(StructuredMesh, TensorMesh, Plotable):
 
             self.NN = (self.nx + 1) * (self.ny + 1) * (self.nz + 1)
             self.NE = (self.nx + 1) * (self.ny + 1) * self.nz + \
-                    (self.nx + 1) * (self.ny + 1) * self.nz + \
+                    (self.nx + 1) * self.ny * (self.nz + 1) + \
                     self.nx * (self.ny + 1) * (self.nz + 1)
             self.NF = self.nx * self.ny * (self.nz + 1) + \
                     self.nx * (self.ny + 1) * self.nz + \
                     (self.nx + 1) * self.ny * self.nz
             self.NC = self.nx * self.ny * self.nz
 
-            self.cell2edge = self.cell_to_edge()
-            self.cell2face = self.cell_to_face()
-            self.face2edge = self.face_to_edge()
-            self.face2cell = self.face_to_cell()
+            if not self.implicit:
+                self.cell2edge = self.cell_to_edge()
+                self.cell2face = self.cell_to_face()
+                self.face2edge = self.face_to_edge()
+                self.face2cell = self.face_to_cell()
 
         self.clear()
 
@@ -1,6 +1,9 @@
 
-from typing import Dict, Callable, TypeVar, Tuple, Any
+from typing import Dict, Callable, TypeVar, Tuple, Any, Optional, Hashable
 from math import comb
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
@@ -47,9 +50,86 @@ def edim2entity(storage: Dict, factory: Dict, edim: int, index=None):
         return et[index]
 
 
-def flocc(array: TensorLike, /):
+_INT64_MAX = 2**63 - 1
+
+
+def pack_rows(array: TensorLike, /, base: Optional[int]=None) -> Tuple[TensorLike, ...]:
+    """Pack rows of a non-negative integer array into as few int64 keys as possible.
+
+    Columns are combined in base `base` while the key fits in int64, so the
+    lexicographic order of the rows equals the order of the key tuples.
+    For example, triangles of a mesh with less than 2**21 nodes are packed
+    into a single key.
+
+    Parameters:
+        array (Tensor): A 2D integer array with entries in [0, base).\n
+        base (int, optional): Upper bound of the entries. Defaults to max + 1.
+
+    Returns:
+        Tuple[Tensor, ...]: Keys from the most significant to the least.
+    """
+    NV = array.shape[1]
+    if base is None:
+        base = int(bm.max(array)) + 1 if array.shape[0] > 0 else 1
+    base = max(base, 2)
+
+    per_key = 1
+    while base ** (per_key + 1) <= _INT64_MAX:
+        per_key += 1
+
+    keys = []
+    for start in range(0, NV, per_key):
+        key = bm.astype(array[:, start], bm.int64)
+        for k in range(start + 1, min(start + per_key, NV)):
+            key = key * base + bm.astype(array[:, k], bm.int64)
+        keys.append(key)
+    return tuple(keys)
+
+
+def _sort_keys(keys: Tuple[TensorLike, ...]) -> TensorLike:
+    if len(keys) == 1:
+        return bm.argsort(keys[0], stable=True)
+    return bm.lexsort(tuple(reversed(keys)), axis=0)
+
+
+def _sort_keys_parallel(keys: Tuple[TensorLike, ...], num_threads: int) -> TensorLike:
+    """Stable sort of the keys with numpy in threads. Rows are bucketed by
+    ranges of the leading key, so that sorting the buckets independently gives
+    the global order."""
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+
+    lead = keys[0]
+    NB = num_threads * 4
+    low, high = int(lead.min()), int(lead.max()) + 1
+    # NOTE: divide by the bucket width, as (lead - low) * NB may overflow int64
+    width = max(-(-(high - low) // NB), 1)
+    bucket = ((lead - low) // width).astype(np.int16)
+    perm = np.argsort(bucket, kind='stable') # radix sort for int16
+    offset = np.concatenate([[0], np.cumsum(np.bincount(bucket, minlength=NB))])
+    sorted_keys = tuple(k[perm] for k in keys)
+
+    def sort_bucket(b: int):
+        sl = slice(offset[b], offset[b+1])
+        return offset[b] + _sort_keys(tuple(k[sl] for k in sorted_keys))
+
+    with ThreadPoolExecutor(num_threads) as executor:
+        local = list(executor.map(sort_bucket, range(NB)))
+
+    return perm[np.concatenate(local)]
+
+
+def flocc(array: TensorLike, /, *, num_threads: int=1):
     """Find the first and last occurrence of each unique row in a 2D array.
 
+    Rows are packed into int64 keys by `pack_rows` to sort on as few keys as
+    possible. With the numpy backend and `num_threads > 1`, the sort runs in
+    threads on ranges of keys, giving the same result.
+
+    Parameters:
+        array (Tensor): A 2D non-negative integer array.\n
+        num_threads (int, optional): Number of threads to sort. Defaults to 1.
+
     Returns:
         out (TensorLike, TensorLike, TensorLike):
         - The first occurrence index of each unique row.
@@ -59,12 +139,16 @@ def flocc(array: TensorLike, /):
     if array.ndim != 2:
         raise ValueError("total_face must be a 2D array.")
 
-    indices = bm.lexsort(tuple(reversed(array.T)), axis=0)
-    sorted_array = array[indices]
-    diff_flag = bm.any(
-        sorted_array[1:] != sorted_array[:-1],
-        axis=1,
-    )
+    keys = pack_rows(array)
+    if (num_threads > 1) and (bm.backend_name == 'numpy') and (array.shape[0] > 0):
+        indices = _sort_keys_parallel(keys, num_threads)
+    else:
+        indices = _sort_keys(keys)
+
+    sorted_keys = [key[indices] for key in keys]
+    diff_flag = sorted_keys[0][1:] != sorted_keys[0][:-1]
+    for key in sorted_keys[1:]:
+        diff_flag = diff_flag | (key[1:] != key[:-1])
     TRUE = bm.ones((1,), dtype=bm.bool, device=bm.get_device(diff_flag))
     diff_flag = bm.concat([TRUE, diff_flag, TRUE])
     group_index = bm.cumsum(diff_flag[:-1], axis=0) - 1
@@ -124,6 +208,40 @@ def entitymethod(top_dim: int):
     return decorator
 
 
+def relationmethod(meth: _Meth) -> _Meth:
+    """A decorator caching a topological relation of the mesh.
+
+    The relation is computed for all entities on the first call and stored in
+    the relation cache of the mesh under the method name, and later calls,
+    with or without `index`, are served from the cache. The cache is cleared
+    when entities or topology relations of the mesh are reassigned, as in
+    `construct` and refinement. Call `clear_relations` after modifying them
+    in place.
+
+    The decorated method should take an optional `index` as the only argument.
+    Cached tensors are shared by callers and should not be modified in place,
+    so they are made read-only with the numpy backend. Use `bm.copy` to get
+    a writable one.
+    """
+    name = meth.__name__
+
+    @wraps(meth)
+    def wrapper(self, index=None):
+        cache = self.__dict__.setdefault('_relation_cache', {})
+        if name in cache:
+            value = cache[name]
+        else:
+            value = meth(self)
+            if hasattr(value, 'setflags'): # numpy: guard the shared tensor
+                value.setflags(write=False)
+            cache[name] = value
+        if (index is None) or (isinstance(index, slice) and index == slice(None)):
+            return value
+        return value[index]
+
+    return wrapper
+
+
 def simplex_ldof(p: int, iptype: int) -> int:
     """Number of local dofs in a simplex entity."""
     if iptype == 0:
@@ -155,3 +273,103 @@ def tensor_gdof(p: int, nums: Tuple[int, ...]) -> int:
         coef *= (p-1)
         count += coef * nums[i]
     return count
+
+
+##################################################
+### Reference tabulation cache
+##################################################
+
+class LRUCache():
+    """A thread-safe mapping with least-recently-used eviction.
+
+    Parameters:
+        maxsize (int, optional): Maximum number of items. Defaults to 128.
+    """
+    def __init__(self, maxsize: int=128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the item of `key`, creating it by `factory()` if missing."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize}
+
+
+tabulation_cache = LRUCache(maxsize=128)
+
+_SIMPLEX_TABULATORS = {
+    0: 'simplex_shape_function',
+    1: 'simplex_grad_shape_function',
+    2: 'simplex_hess_shape_function'
+}
+
+
+def simplex_tabulate(bcs: TensorLike, p: int, order: int=0, *,
+                     mi: Optional[TensorLike]=None) -> TensorLike:
+    """Tabulate simplex Lagrange shape functions on the reference element.
+
+    Tables are cached in `tabulation_cache` by (element type, p, points,
+    derivative order, dtype, device), so that repeated assembly with the same
+    quadrature does not recompute them. Returned tables are shared and must
+    not be modified in place.
+
+    Parameters:
+        bcs (Tensor): Barycentric coordinates of points, in shape (NQ, TD+1).\n
+        p (int): Degree of the shape functions.\n
+        order (int, optional): Derivative order with respect to the barycentric\
+        coordinates, 0, 1 or 2. Defaults to 0.\n
+        mi (Tensor, optional): The multi-index matrix. Defaults to None.
+
+    Returns:
+        Tensor: Table shaped (NQ, ldof), (NQ, ldof, TD+1) or (NQ, ldof, TD+1, TD+1).
+    """
+    if order not in _SIMPLEX_TABULATORS:
+        raise ValueError(f"Derivative order should be 0, 1 or 2, but got {order}.")
+    func = getattr(bm, _SIMPLEX_TABULATORS[order])
+
+    if getattr(bcs, 'requires_grad', False):
+        return func(bcs, p, mi)
+    try:
+        points = bm.to_numpy(bcs)
+        mi_key = None if mi is None else bm.to_numpy(mi).tobytes()
+    except TypeError: # abstract tensors in tracing
+        return func(bcs, p, mi)
+
+    key = ('simplex', bm.backend_name, p, order, points.shape, points.tobytes(),
+           mi_key, str(bcs.dtype), str(bm.get_device(bcs)))
+    return tabulation_cache.get(key, lambda: func(bcs, p, mi))
@@ -0,0 +1,5 @@
+"""Distributed-memory parallel computing on partitioned meshes"""
+
+from .communicator import Communicator, LocalCommunicator, MPICommunicator, run_local
+from .partition import rcb_partition, metis_partition, MeshPartition, partition_mesh
+from .halo import HaloExchange
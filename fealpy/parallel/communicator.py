@@ -0,0 +1,188 @@
+
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+from collections import deque
+import multiprocessing as mp
+
+__all__ = [
+    'Communicator',
+    'LocalCommunicator',
+    'MPICommunicator',
+    'run_local'
+]
+
+
+class Communicator():
+    """Point-to-point communication between the ranks of a parallel run.
+
+    Subclasses implement `exchange`, and the collective operations are built
+    on it, so a new transport only needs one method.
+    """
+    rank: int
+    size: int
+
+    def exchange(self, sends: Dict[int, Any], sources: Iterable[int], tag: int=0) -> Dict[int, Any]:
+        """Send objects to other ranks and receive objects from others.
+
+        Parameters:
+            sends (Dict[int, Any]): Objects to send, keyed by the destination rank.\n
+            sources (Iterable[int]): Ranks to receive objects from.\n
+            tag (int, optional): Tag distinguishing concurrent exchanges. Defaults to 0.
+
+        Returns:
+            Dict[int, Any]: Received objects keyed by the source rank.
+        """
+        raise NotImplementedError
+
+    def allgather(self, obj: Any) -> List[Any]:
+        """Gather an object from all ranks on all ranks."""
+        others = [r for r in range(self.size) if r != self.rank]
+        recv = self.exchange({r: obj for r in others}, others, tag=-1)
+        recv[self.rank] = obj
+        return [recv[r] for r in range(self.size)]
+
+    def allreduce(self, value: Any) -> Any:
+        """Sum of a value, e.g. a number or an array, over all ranks. The
+        sum is taken in the order of ranks, so all ranks get the same result."""
+        values = self.allgather(value)
+        total = values[0]
+        for v in values[1:]:
+            total = total + v
+        return total
+
+    def barrier(self) -> None:
+        self.allgather(None)
+
+
+class LocalCommunicator(Communicator):
+    """A stand-in of MPI for processes on one machine, created by `run_local`,
+    passing messages through multiprocessing queues. A communicator of size 1
+    works without other processes.
+
+    Parameters:
+        rank (int): Rank of this process.\n
+        size (int): Number of processes.\n
+        inboxes (List[Queue], optional): Incoming queues of all ranks.
+    """
+    def __init__(self, rank: int=0, size: int=1, inboxes: Optional[List[Any]]=None) -> None:
+        if size > 1 and inboxes is None:
+            raise ValueError("LocalCommunicator of size > 1 requires the queues of all ranks.")
+        self.rank = rank
+        self.size = size
+        self.inboxes = inboxes
+        self._pending: Dict[tuple, Deque[Any]] = {}
+
+    def exchange(self, sends: Dict[int, Any], sources: Iterable[int], tag: int=0) -> Dict[int, Any]:
+        for dst, obj in sends.items():
+            self.inboxes[dst].put((self.rank, tag, obj))
+
+        # NOTE: Messages received ahead are queued per (source, tag), so that
+        # messages from one source with the same tag are delivered in the order
+        # they were sent, as in MPI.
+        recv = {}
+        for src in sources:
+            key = (src, tag)
+            while not self._pending.get(key):
+                s, t, obj = self.inboxes[self.rank].get()
+                self._pending.setdefault((s, t), deque()).append(obj)
+            recv[src] = self._pending[key].popleft()
+        return recv
+
+
+_MPI_TAG_UB = 32767
+
+
+class MPICommunicator(Communicator):
+    """Communicator on mpi4py.
+
+    Parameters:
+        comm (mpi4py.MPI.Comm, optional): The MPI communicator. Defaults to COMM_WORLD.
+    """
+    def __init__(self, comm: Optional[Any]=None) -> None:
+        if comm is None:
+            try:
+                from mpi4py import MPI
+            except ImportError:
+                raise ImportError("MPICommunicator requires mpi4py. "
+                                  "Use LocalCommunicator to run on one machine without MPI.")
+            comm = MPI.COMM_WORLD
+        self.comm = comm
+        self.rank = comm.Get_rank()
+        self.size = comm.Get_size()
+
+    def exchange(self, sends: Dict[int, Any], sources: Iterable[int], tag: int=0) -> Dict[int, Any]:
+        # MPI tags must be in [0, MPI_TAG_UB], and MPI_TAG_UB is at least 32767.
+        # Negative tags of the internal collectives are mapped below the bound.
+        tag = tag if tag >= 0 else _MPI_TAG_UB + tag
+        requests = [self.comm.isend(obj, dest=dst, tag=tag) for dst, obj in sends.items()]
+        recv = {src: self.comm.recv(source=src, tag=tag) for src in sources}
+        for req in requests:
+            req.wait()
+        return recv
+
+    def allreduce(self, value: Any) -> Any:
+        return self.comm.allreduce(value)
+
+    def barrier(self) -> None:
+        self.comm.Barrier()
+
+
+def _local_worker(target, rank, size, inboxes, results, args):
+    comm = LocalCommunicator(rank, size, inboxes)
+    try:
+        results.put((rank, True, target(comm, *args)))
+    except BaseException:
+        import traceback
+        results.put((rank, False, traceback.format_exc()))
+
+
+def run_local(nprocs: int, target: Callable[..., Any], *args: Any,
+              start_method: Optional[str]=None) -> List[Any]:
+    """Run `target(comm, *args)` on `nprocs` local processes connected by
+    `LocalCommunicator`s, as `mpiexec -n nprocs` would with `MPICommunicator`.
+
+    Parameters:
+        nprocs (int): Number of processes.\n
+        target (Callable): The function run on every rank, taking the communicator\
+        as the first argument. It must be picklable, e.g. defined at the top level\
+        of a module, for start methods other than 'fork'.\n
+        *args: Other arguments of the target.\n
+        start_method (str, optional): The multiprocessing start method. Defaults to\
+        'fork' where available, otherwise 'spawn'.
+
+    Returns:
+        List[Any]: Return values of the target on each rank.
+
+    Raises:
+        RuntimeError: If the target raises on any rank.
+    """
+    if nprocs == 1:
+        return [target(LocalCommunicator(), *args)]
+
+    if start_method is None:
+        start_method = 'fork' if 'fork' in mp.get_all_start_methods() else 'spawn'
+    ctx = mp.get_context(start_method)
+    inboxes = [ctx.Queue() for _ in range(nprocs)]
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_local_worker,
+                         args=(target, rank, nprocs, inboxes, results, args))
+             for rank in range(nprocs)]
+    for p in procs:
+        p.start()
+
+    out, errors = [None] * nprocs, []
+    for _ in range(nprocs):
+        rank, ok, value = results.get()
+        if ok:
+            out[rank] = value
+        else:
+            errors.append(f"rank {rank}:\n{value}")
+            break # other ranks may wait for the failed one forever
+
+    if errors:
+        for p in procs:
+            p.terminate()
+    for p in procs:
+        p.join()
+    if errors:
+        raise RuntimeError("Local parallel run failed on " + "\n".join(errors))
+    return out
@@ -0,0 +1,79 @@
+
+from typing import Dict
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+from .communicator import Communicator
+
+__all__ = ['HaloExchange']
+
+
+class HaloExchange():
+    """Exchange of entity data between owners and ghosts of a partitioned mesh.
+
+    Data are local arrays whose first axis is the local entities. Values are
+    sent as NumPy arrays and converted back to the current backend, so any
+    communicator able to pickle NumPy arrays works.
+
+    Parameters:
+        send (Dict[int, Tensor]): Local indices of owned entities ghosted on each other rank.\n
+        recv (Dict[int, Tensor]): Local indices of ghost entities owned by each other rank,\
+        in the same order as `send` of that rank.\n
+        comm (Communicator): The communicator.\n
+        tag (int, optional): Base tag of messages. Exchanges of different data\
+        in flight at the same time need different tags. Defaults to 0.
+
+    Examples:
+        >>> halo = part.halo(comm)
+        >>> y = A_local @ x # A_local assembled on owned cells only
+        >>> y = halo.assemble(y)
+    """
+    def __init__(self, send: Dict[int, TensorLike], recv: Dict[int, TensorLike],
+                 comm: Communicator, *, tag: int=0) -> None:
+        self.send = send
+        self.recv = recv
+        self.comm = comm
+        self.tag = tag
+
+    def _exchange(self, array: TensorLike, src: Dict[int, TensorLike],
+                  dst_ranks, tag: int) -> Dict[int, TensorLike]:
+        sends = {r: bm.to_numpy(array[idx]) for r, idx in src.items()}
+        recv = self.comm.exchange(sends, dst_ranks, tag=tag)
+        device = bm.get_device(array)
+        return {r: bm.tensor(v, dtype=array.dtype, device=device) for r, v in recv.items()}
+
+    def update(self, array: TensorLike) -> TensorLike:
+        """Copy values of owned entities to their ghosts on other ranks.
+
+        Parameters:
+            array (Tensor): Local data shaped (N_local, ...).
+
+        Returns:
+            Tensor: The data with ghost values updated.
+        """
+        recv = self._exchange(array, self.send, self.recv.keys(), self.tag)
+        for r, val in recv.items():
+            array = bm.set_at(array, self.recv[r], val)
+        return array
+
+    def accumulate(self, array: TensorLike) -> TensorLike:
+        """Add values of ghosts to their owners on other ranks, e.g. partial
+        sums of assembly on the cells of each rank. Ghost values are left
+        unchanged, and are made consistent by a following `update`.
+
+        Parameters:
+            array (Tensor): Local data shaped (N_local, ...).
+
+        Returns:
+            Tensor: The data with the owned values summed.
+        """
+        recv = self._exchange(array, self.recv, self.send.keys(), self.tag + 1)
+        for r in sorted(recv):
+            array = bm.index_add(array, self.send[r], recv[r], axis=0)
+        return array
+
+    def assemble(self, array: TensorLike) -> TensorLike:
+        """Sum partial values over all ranks sharing each entity, i.e.
+        `accumulate` followed by `update`."""
+        return self.update(self.accumulate(array))
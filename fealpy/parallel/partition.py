@@ -0,0 +1,246 @@
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+
+__all__ = [
+    'rcb_partition',
+    'metis_partition',
+    'MeshPartition',
+    'partition_mesh'
+]
+
+
+def rcb_partition(points: TensorLike, nparts: int) -> TensorLike:
+    """Partition points by recursive coordinate bisection.
+
+    The point set is cut perpendicular to its longest extent, into two
+    halves with sizes proportional to the numbers of parts on each side,
+    recursively until every set is one part.
+
+    Parameters:
+        points (Tensor): Coordinates shaped (NP, GD), e.g. cell barycenters.\n
+        nparts (int): Number of parts.
+
+    Returns:
+        Tensor: Part of each point shaped (NP,).
+    """
+    NP = points.shape[0]
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(points)}
+    parts = bm.zeros((NP,), **kwargs)
+    stack = [(bm.arange(NP, **kwargs), 0, nparts)]
+
+    while stack:
+        index, first, n = stack.pop()
+        if n == 1 or index.shape[0] == 0:
+            parts = bm.set_at(parts, index, first)
+            continue
+        p = points[index]
+        extent = bm.max(p, axis=0) - bm.min(p, axis=0)
+        axis = int(bm.argmax(extent))
+        order = bm.argsort(p[:, axis], stable=True)
+        nleft = n // 2
+        cut = (index.shape[0] * nleft + n // 2) // n
+        stack.append((index[order[:cut]], first, nleft))
+        stack.append((index[order[cut:]], first + nleft, n - nleft))
+
+    return parts
+
+
+def metis_partition(mesh, nparts: int, **opts: Any) -> TensorLike:
+    """Partition cells of a mesh by METIS on the face adjacency graph.
+
+    Parameters:
+        mesh (Mesh): The mesh.\n
+        nparts (int): Number of parts.\n
+        **opts: METIS options passed to `fealpy.graph.metis.part_graph`.
+
+    Returns:
+        Tensor: Part of each cell shaped (NC,).
+    """
+    try:
+        from ..graph.metis import part_graph, array_to_metis
+    except (ImportError, RuntimeError) as e:
+        raise RuntimeError("METIS partitioning requires the METIS library, "
+                           "see fealpy.graph.metis. Use method='rcb' without it.") from e
+    import numpy as np
+
+    cell2cell = bm.to_numpy(mesh.cell_to_cell())
+    NC, NFC = cell2cell.shape
+    cid = np.repeat(np.arange(NC), NFC)
+    flag = cell2cell.reshape(-1) != cid # boundary faces point to the cell itself
+    adj = cell2cell.reshape(-1)[flag].astype(np.int32)
+    location = np.zeros(NC + 1, dtype=np.int32)
+    location[1:] = np.cumsum(flag.reshape(NC, NFC).sum(axis=1))
+
+    _, parts = part_graph(array_to_metis(adj, location), nparts=nparts, **opts)
+    return bm.tensor(np.asarray(parts, dtype=np.int64), device=bm.get_device(mesh.cell))
+
+
+class MeshPartition():
+    """One part of a partitioned mesh, with the local mesh covering the owned
+    cells and the halo layers around them.
+
+    Local entities are numbered with the owned ones first, each group in the
+    order of global indices. A node is owned by the lowest part among the
+    owners of the cells containing it.
+
+    Attributes:
+        rank (int): The part.\n
+        mesh (Mesh): The local mesh, of the same class as the global mesh.\n
+        node_l2g (Tensor): Global index of local nodes.\n
+        cell_l2g (Tensor): Global index of local cells.\n
+        node_owner (Tensor): Owning part of local nodes.\n
+        cell_owner (Tensor): Owning part of local cells.\n
+        NON (int): Number of owned nodes, i.e. local nodes [0, NON).\n
+        NOC (int): Number of owned cells, i.e. local cells [0, NOC).\n
+        node_pattern (Tuple[Dict, Dict]): Local indices of nodes to send to and\
+        receive from other parts, the first is owned nodes ghosted there, and the\
+        second is ghost nodes owned there.\n
+        cell_pattern (Tuple[Dict, Dict]): The same for cells.
+    """
+    def __init__(self, rank: int, mesh, node_l2g: TensorLike, cell_l2g: TensorLike,
+                 node_owner: TensorLike, cell_owner: TensorLike) -> None:
+        self.rank = rank
+        self.mesh = mesh
+        self.node_l2g = node_l2g
+        self.cell_l2g = cell_l2g
+        self.node_owner = node_owner
+        self.cell_owner = cell_owner
+        self.NON = int(bm.sum(node_owner == rank))
+        self.NOC = int(bm.sum(cell_owner == rank))
+        self.node_pattern: Tuple[Dict[int, TensorLike], Dict[int, TensorLike]] = ({}, {})
+        self.cell_pattern: Tuple[Dict[int, TensorLike], Dict[int, TensorLike]] = ({}, {})
+
+    def __repr__(self) -> str:
+        return (f"MeshPartition(rank={self.rank}, cells={self.NOC}+{self.cell_l2g.shape[0]-self.NOC}, "
+                f"nodes={self.NON}+{self.node_l2g.shape[0]-self.NON}, "
+                f"neighbors={sorted(set(self.node_pattern[0]) | set(self.node_pattern[1]))})")
+
+    def halo(self, comm, etype: str='node'):
+        """The halo exchange of node or cell data of this part.
+
+        Parameters:
+            comm (Communicator): The communicator, whose rank must be this part.\n
+            etype (str, optional): 'node' or 'cell'. Defaults to 'node'.
+
+        Returns:
+            HaloExchange: The halo exchange.
+        """
+        from .halo import HaloExchange
+        if comm.rank != self.rank:
+            raise ValueError(f"The communicator of rank {comm.rank} does not match part {self.rank}.")
+        if etype == 'node':
+            send, recv = self.node_pattern
+            tag = 0
+        elif etype == 'cell':
+            send, recv = self.cell_pattern
+            tag = 2
+        else:
+            raise ValueError(f"Unknown entity type: {etype}. Use 'node' or 'cell'.")
+        return HaloExchange(send, recv, comm, tag=tag)
+
+
+def _local_order(flag: TensorLike, owned: TensorLike) -> TensorLike:
+    """Global indices of flagged entities, owned ones first."""
+    index = bm.nonzero(flag)[0]
+    notowned = bm.astype(~owned[index], bm.int64)
+    return index[bm.argsort(notowned, stable=True)]
+
+
+def _patterns(l2g: List[TensorLike], owner: TensorLike, N: int, nparts: int):
+    """Send and receive lists of every part for entities with global owners."""
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(owner)}
+    g2l = []
+    for p in range(nparts):
+        m = bm.full((N,), -1, **kwargs)
+        g2l.append(bm.set_at(m, l2g[p], bm.arange(l2g[p].shape[0], **kwargs)))
+
+    sends = [dict() for _ in range(nparts)]
+    recvs = [dict() for _ in range(nparts)]
+    for p in range(nparts):
+        gowner = owner[l2g[p]]
+        for q in [int(q) for q in bm.unique(gowner)]:
+            if q == p:
+                continue
+            ghost = l2g[p][gowner == q] # ascending global indices of ghosts
+            recvs[p][q] = g2l[p][ghost]
+            sends[q][p] = g2l[q][ghost]
+    return sends, recvs
+
+
+def partition_mesh(mesh, nparts: int, *, method: str='rcb', layers: int=1,
+                   parts: Optional[TensorLike]=None, **opts: Any) -> List[MeshPartition]:
+    """Split a mesh into parts with halo layers.
+
+    Every rank of a parallel run may call this function on the same global
+    mesh and keep its own part, or one rank may distribute the parts.
+
+    Parameters:
+        mesh (Mesh): The global mesh, e.g. TriangleMesh or TetrahedronMesh.\n
+        nparts (int): Number of parts.\n
+        method (str, optional): 'rcb' for recursive coordinate bisection of cell\
+        barycenters, or 'metis'. Defaults to 'rcb'.\n
+        layers (int, optional): Number of halo layers of ghost cells, each being\
+        the cells sharing a node with the previous layers. Defaults to 1.\n
+        parts (Tensor, optional): Given part of each cell, overriding `method`.\n
+        **opts: Options of METIS.
+
+    Returns:
+        List[MeshPartition]: The parts.
+    """
+    cell = mesh.entity('cell')
+    node = mesh.entity('node')
+    NN, NC = node.shape[0], cell.shape[0]
+    device = bm.get_device(cell)
+    kwargs = {'dtype': bm.int64, 'device': device}
+
+    if parts is None:
+        if method == 'rcb':
+            parts = rcb_partition(mesh.entity_barycenter('cell'), nparts)
+        elif method == 'metis':
+            parts = metis_partition(mesh, nparts, **opts)
+        else:
+            raise ValueError(f"Unknown partition method: {method}. Use 'rcb' or 'metis'.")
+    parts = bm.astype(parts, bm.int64)
+    if parts.shape[0] != NC:
+        raise ValueError(f"parts should have {NC} entries, but got {parts.shape[0]}.")
+
+    # the owner of a node is the lowest part among its cells
+    NVC = cell.shape[1]
+    key = bm.astype(cell, bm.int64).reshape(-1) * nparts + bm.repeat(parts, NVC)
+    key = bm.unique(key)
+    gnode = key // nparts
+    first = bm.concat([bm.ones((1,), dtype=bm.bool, device=device), gnode[1:] != gnode[:-1]], axis=0)
+    node_owner = bm.full((NN,), -1, **kwargs)
+    node_owner = bm.set_at(node_owner, gnode[first], (key % nparts)[first])
+
+    cell_l2g, node_l2g = [], []
+    for p in range(nparts):
+        owned = parts == p
+        flag = owned
+        for _ in range(layers):
+            nflag = bm.zeros((NN,), dtype=bm.bool, device=device)
+            nflag = bm.set_at(nflag, cell[flag].reshape(-1), True)
+            flag = bm.any(nflag[cell], axis=1)
+        cell_l2g.append(_local_order(flag, owned))
+        nflag = bm.zeros((NN,), dtype=bm.bool, device=device)
+        nflag = bm.set_at(nflag, cell[cell_l2g[p]].reshape(-1), True)
+        node_l2g.append(_local_order(nflag, node_owner == p))
+
+    node_sends, node_recvs = _patterns(node_l2g, node_owner, NN, nparts)
+    cell_sends, cell_recvs = _patterns(cell_l2g, parts, NC, nparts)
+
+    out = []
+    for p in range(nparts):
+        g2l = bm.full((NN,), -1, dtype=cell.dtype, device=device)
+        g2l = bm.set_at(g2l, node_l2g[p], bm.arange(node_l2g[p].shape[0], dtype=cell.dtype, device=device))
+        lmesh = mesh.__class__(node[node_l2g[p]], g2l[cell[cell_l2g[p]]])
+        part = MeshPartition(p, lmesh, node_l2g[p], cell_l2g[p],
+                             node_owner[node_l2g[p]], parts[cell_l2g[p]])
+        part.node_pattern = (node_sends[p], node_recvs[p])
+        part.cell_pattern = (cell_sends[p], cell_recvs[p])
+        out.append(part)
+
+    return out
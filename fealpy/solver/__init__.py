@@ -1,3 +1,16 @@
 
 from .conjugate_gradient import cg
-from .direct_solver import spsolve
+from .minres import minres
+from .bicgstab import bicgstab
+from .direct_solver import spsolve, factorize, Factorization, factorization_cache
+from .preconditioner import (
+    Preconditioner,
+    JacobiPreconditioner,
+    SSORPreconditioner,
+    ILU0Preconditioner,
+    IC0Preconditioner,
+    BlockDiagonalPreconditioner
+)
+from .multigrid import Multigrid, JacobiSmoother, GaussSeidelSmoother, ChebyshevSmoother
+from .amg import AMGSolver
+from .gmg import GMGSolver, lagrange_prolongation
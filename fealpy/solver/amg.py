@@ -0,0 +1,383 @@
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+
+from .preconditioner import _csr_arrays, _to_device
+from .multigrid import Multigrid, csr_transpose, estimate_spectral_radius
+
+
+__all__ = ['AMGSolver']
+
+_Edges = Tuple[np.ndarray, np.ndarray]
+
+
+def _segment_max(values: np.ndarray, crow: np.ndarray, fill: float=-np.inf) -> np.ndarray:
+    """Maximum of values in each row segment of a CSR pattern."""
+    n = crow.shape[0] - 1
+    out = np.full(n, fill, dtype=values.dtype)
+    nonempty = crow[1:] > crow[:-1]
+    if np.any(nonempty):
+        out[nonempty] = np.maximum.reduceat(values, crow[:-1][nonempty])
+    return out
+
+
+def _neighbor_max(v: np.ndarray, edges: _Edges) -> np.ndarray:
+    """max(v[i], max_{(i, j) in edges} v[j]) for every vertex i."""
+    row, col = edges
+    m = v.copy()
+    np.maximum.at(m, row, v[col])
+    return m
+
+
+def _host_csr(row: np.ndarray, col: np.ndarray, val: np.ndarray, shape, device) -> CSRTensor:
+    """Build a CSRTensor on the device from COO arrays on the host.
+    Entries must not duplicate."""
+    order = np.lexsort((col, row))
+    crow = np.zeros(shape[0] + 1, dtype=np.int64)
+    crow[1:] = np.cumsum(np.bincount(row, minlength=shape[0]))
+    return CSRTensor(_to_device(crow, device), _to_device(col[order], device),
+                     _to_device(val[order], device), shape)
+
+
+### Classical (Ruge-Stuben) AMG ###
+
+def _classical_strength(crow, col, val, theta: float) -> np.ndarray:
+    """Mask of strong connections: -a_ij >= theta * max_{k != i} (-a_ik)."""
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    offd = row != col
+    m = _segment_max(np.where(offd, -val, -np.inf), crow)
+    return offd & (m[row] > 0) & (-val >= theta * m[row])
+
+
+def _pmis(crow, col, strong: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """C/F splitting by the parallel modified independent set (PMIS) algorithm.
+    Returns a boolean array marking C-points."""
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    s_row, s_col = row[strong], col[strong] # s_row strongly depends on s_col
+    edges = (np.concatenate([s_row, s_col]), np.concatenate([s_col, s_row]))
+    weight = np.bincount(s_col, minlength=n) + rng.random(n)
+    state = np.zeros(n, dtype=np.int8) # 0: undecided, 1: C, -1: F
+    state[weight < 1] = -1
+
+    while np.any(state == 0):
+        undecided = state == 0
+        w = np.where(undecided, weight, -np.inf)
+        m = np.full(n, -np.inf)
+        np.maximum.at(m, edges[0], w[edges[1]])
+        new_c = undecided & (weight > m)
+        state[new_c] = 1
+        # points strongly depending on new C-points become F-points
+        depends = np.zeros(n, dtype=np.bool_)
+        depends[s_row[new_c[s_col]]] = True
+        state[(state == 0) & depends] = -1
+
+    # F-points with strong dependencies but no C-point to interpolate from
+    has_dep = np.bincount(s_row, minlength=n) > 0
+    has_c = np.bincount(s_row[state[s_col] == 1], minlength=n) > 0
+    state[(state == -1) & has_dep & ~has_c] = 1
+
+    return state == 1
+
+
+def _expand_rows(i: np.ndarray, k: np.ndarray, crow: np.ndarray):
+    """For every pair (i[e], k[e]), enumerate the entries of row k[e] of a CSR
+    pattern. Returns the pair index and the entry position of each item."""
+    count = crow[k + 1] - crow[k]
+    end = np.cumsum(count)
+    pair = np.repeat(np.arange(i.shape[0]), count)
+    pos = np.arange(end[-1] if end.shape[0] > 0 else 0) + np.repeat(crow[k] - end + count, count)
+    return pair, pos
+
+
+def _standard_interpolation(crow, col, val, strong: np.ndarray, is_c: np.ndarray,
+                            device, trunc: float=0.2) -> CSRTensor:
+    """Ruge-Stuben standard interpolation with truncation.
+
+    In the row of every F-point i, the strongly connected F-points k are
+    eliminated by their own rows, a_ik e_k = -a_ik/a_kk sum_{j != k} a_kj e_j.
+    Then i interpolates from the C-points strongly connected to i or to such
+    k, as in direct interpolation. This keeps the interpolation accurate
+    for PMIS splittings, where F-points often have F-neighbors only.
+
+    Weights smaller than `trunc` times the largest one of a row are dropped,
+    and the others are scaled to keep the row sum, to limit the operator
+    complexity of the coarse levels.
+    """
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    diag = np.bincount(row[row == col], weights=val[row == col], minlength=n)
+    coarse_index = np.cumsum(is_c) - 1
+    NC = int(np.sum(is_c))
+    is_f = ~is_c
+
+    # eliminate strong F-F connections (i, k) by the rows of k
+    sff = strong & is_f[row] & is_f[col]
+    i, k, a_ik = row[sff], col[sff], val[sff]
+    pair, pos = _expand_rows(i, k, crow)
+    inner = col[pos] != k[pair]
+    pair, pos = pair[inner], pos[inner]
+    h_row = np.concatenate([row[~sff], i[pair]])
+    h_col = np.concatenate([col[~sff], col[pos]])
+    h_val = np.concatenate([val[~sff], -a_ik[pair] * val[pos] / diag[k[pair]]])
+    key, inverse = np.unique(h_row * n + h_col, return_inverse=True)
+    h_row, h_col = key // n, key % n
+    h_val = np.bincount(inverse.reshape(-1), weights=h_val)
+
+    # C-points strongly connected to i, or to strong F-neighbors of i
+    sc = strong & is_c[col]
+    pair, pos = _expand_rows(i, k, crow)
+    far = sc[pos]
+    c_key = np.concatenate([row[sc] * n + col[sc], i[pair[far]] * n + col[pos[far]]])
+    c_key = np.unique(c_key)
+
+    offd = h_row != h_col
+    h_diag = np.bincount(h_row[~offd], weights=h_val[~offd], minlength=n)
+    neg = offd & (h_val < 0)
+    pos_off = offd & (h_val > 0)
+    neg_sum = np.bincount(h_row[neg], weights=h_val[neg], minlength=n)
+    pos_sum = np.bincount(h_row[pos_off], weights=h_val[pos_off], minlength=n)
+    loc = np.minimum(np.searchsorted(c_key, key), max(c_key.shape[0] - 1, 0))
+    interp = neg & is_f[h_row] & (c_key[loc] == key) if c_key.shape[0] > 0 \
+             else np.zeros_like(neg)
+    c_sum = np.bincount(h_row[interp], weights=h_val[interp], minlength=n)
+
+    alpha = np.zeros(n)
+    flag = c_sum != 0
+    alpha[flag] = neg_sum[flag] / c_sum[flag]
+    d = h_diag + pos_sum
+
+    f_row, f_col = h_row[interp], coarse_index[h_col[interp]]
+    f_val = -alpha[f_row] * h_val[interp] / d[f_row]
+
+    if trunc > 0 and f_row.shape[0] > 0:
+        mag = np.abs(f_val)
+        top = np.zeros(n)
+        np.maximum.at(top, f_row, mag)
+        keep = mag >= trunc * top[f_row]
+        total = np.bincount(f_row, weights=f_val, minlength=n)
+        kept = np.bincount(f_row[keep], weights=f_val[keep], minlength=n)
+        scale = np.ones(n)
+        scale[kept != 0] = total[kept != 0] / kept[kept != 0]
+        f_row, f_col = f_row[keep], f_col[keep]
+        f_val = f_val[keep] * scale[f_row]
+
+    c_row = np.nonzero(is_c)[0]
+
+    return _host_csr(np.concatenate([f_row, c_row]),
+                     np.concatenate([f_col, coarse_index[c_row]]),
+                     np.concatenate([f_val, np.ones(NC, dtype=val.dtype)]),
+                     (n, NC), device)
+
+
+### Smoothed aggregation AMG ###
+
+def _amalgamate(crow, col, val, block_size: int):
+    """Node-level matrix of a matrix with `block_size` dofs per node, taking the
+    Frobenius norm of each block."""
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    NN = n // block_size
+    key = (row // block_size) * NN + col // block_size
+    ukey, inverse = np.unique(key, return_inverse=True)
+    nval = np.sqrt(np.bincount(inverse, weights=np.abs(val)**2))
+    ncrow = np.zeros(NN + 1, dtype=np.int64)
+    ncrow[1:] = np.cumsum(np.bincount(ukey // NN, minlength=NN))
+    return ncrow, ukey % NN, nval
+
+
+def _symmetric_strength(crow, col, val, theta: float) -> np.ndarray:
+    """Mask of strong connections: |a_ij| >= theta * sqrt(|a_ii a_jj|)."""
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    offd = row != col
+    diag = np.abs(np.bincount(row[~offd], weights=val[~offd], minlength=n))
+    return offd & (np.abs(val) >= theta * np.sqrt(diag[row] * diag[col])) & (val != 0)
+
+
+def _aggregate(crow, col, strong: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Aggregate nodes around the roots of a distance-2 maximal independent set.
+    Returns the aggregate of each node, or -1 for isolated nodes."""
+    n = crow.shape[0] - 1
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    s_row, s_col = row[strong], col[strong]
+    edges = (np.concatenate([s_row, s_col]), np.concatenate([s_col, s_row]))
+    undecided = np.bincount(edges[0], minlength=n) > 0
+    rand = rng.random(n)
+    root = np.zeros(n, dtype=np.bool_)
+
+    while np.any(undecided):
+        v = np.where(undecided, rand, -1.0)
+        m = _neighbor_max(_neighbor_max(v, edges), edges)
+        selected = undecided & (rand >= m)
+        root |= selected
+        covered = _neighbor_max(_neighbor_max(selected.astype(np.int8), edges), edges)
+        undecided &= covered == 0
+
+    agg = np.full(n, -1, dtype=np.int64)
+    agg[root] = np.arange(np.sum(root))
+
+    # the first pass attaches neighbors of roots, and the second pass attaches
+    # the nodes at distance 2.
+    for _ in range(2):
+        candidate = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(candidate, edges[0], agg[edges[1]])
+        join = (agg < 0) & (candidate >= 0)
+        agg[join] = candidate[join]
+
+    return agg
+
+
+def _tentative_prolongation(agg: np.ndarray, B: np.ndarray, device):
+    """Fit the near null space B in each aggregate by a (vectorized) modified
+    Gram-Schmidt process. Returns P0 and the coarse near null space."""
+    n, k = B.shape
+    NA = int(agg.max()) + 1 if agg.shape[0] > 0 else 0
+    valid = agg >= 0
+    a = np.where(valid, agg, 0)
+    Q = np.where(valid[:, None], B, 0.0)
+    R = np.zeros((NA, k, k), dtype=B.dtype)
+
+    for j in range(k):
+        v = Q[:, j].copy()
+        for l in range(j):
+            c = np.bincount(a, weights=Q[:, l] * v, minlength=NA)
+            R[:, l, j] = c
+            v -= c[a] * Q[:, l]
+        norm = np.sqrt(np.bincount(a, weights=v**2, minlength=NA))
+        R[:, j, j] = norm
+        scale = np.zeros(NA)
+        scale[norm > 0] = 1.0 / norm[norm > 0]
+        Q[:, j] = v * scale[a]
+
+    row = np.repeat(np.arange(n, dtype=np.int64), k)
+    col = (a[:, None] * k + np.arange(k)).reshape(-1)
+    val = Q.reshape(-1)
+    flag = (val != 0) & np.repeat(valid, k)
+    P0 = _host_csr(row[flag], col[flag], val[flag], (n, NA * k), device)
+
+    return P0, R.reshape(NA * k, k)
+
+
+class AMGSolver(Multigrid):
+    """Algebraic multigrid solver on CSRTensor.
+
+    Two setups are available:
+    - 'rs': classical Ruge-Stuben AMG, with PMIS C/F splitting and truncated
+      standard interpolation.
+    - 'sa': smoothed aggregation AMG, which fits a near null space (e.g. the
+      rigid body modes of elasticity) in each aggregate and smooths the
+      tentative prolongation by damped Jacobi.
+
+    Coarse matrices are computed by the Galerkin triple product R A P with
+    sparse-sparse matrix multiplication on the device of A. Graph algorithms
+    of the setup (strength, splitting and aggregation) run on the host.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The symmetric positive definite matrix.\n
+        method (str, optional): 'sa' or 'rs'. Defaults to 'sa'.\n
+        theta (float | None, optional): The strength threshold. Defaults to 0.08
+            for 'sa' and 0.25 for 'rs'.\n
+        trunc (float, optional): Interpolation weights smaller than this times
+            the largest one of a row are dropped. Only for 'rs'. Defaults to 0.2.\n
+        block_size (int, optional): Number of dofs per node for systems of PDEs,
+            in the 'gd-priority' layout. Nodes are aggregated as a whole.
+            Only for 'sa'. Defaults to 1.\n
+        B (Tensor | None, optional): The near null space shaped (dof, k), e.g. the
+            rigid body modes. Only for 'sa'. Defaults to constants of each
+            component.\n
+        max_levels (int, optional): Maximum number of levels. Defaults to 10.\n
+        max_coarse (int, optional): Coarsening stops when the number of unknowns
+            is not greater than this. Defaults to 100.\n
+        smoother (str, optional): 'gs' or 'jacobi'. Defaults to 'gs'.\n
+        presmooth (int, optional): Number of pre-smoothing sweeps. Defaults to 1.\n
+        postsmooth (int, optional): Number of post-smoothing sweeps. Defaults to 1.\n
+        cycle (str, optional): 'V' or 'W'. Defaults to 'V'.\n
+        seed (int, optional): Seed of the randomized splitting and aggregation. Defaults to 0.
+
+    Examples:
+        >>> M = AMGSolver(A)
+        >>> x = M.solve(b)                 # standalone
+        >>> x = cg(A, b, M=M)              # as a preconditioner
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], *,
+                 method: str='sa', theta: Optional[float]=None, trunc: float=0.2,
+                 block_size: int=1, B: Optional[TensorLike]=None,
+                 max_levels: int=10, max_coarse: int=100,
+                 smoother: str='gs', presmooth: int=1, postsmooth: int=1,
+                 cycle: str='V', seed: int=0) -> None:
+        if method not in ('sa', 'rs'):
+            raise ValueError(f"Unknown AMG method '{method}', should be 'sa' or 'rs'.")
+        if isinstance(A, COOTensor):
+            A = A.coalesce().tocsr()
+        if method == 'rs' and (block_size != 1 or B is not None):
+            raise ValueError("block_size and B are only supported by smoothed aggregation.")
+
+        self.method = method
+        self.theta = (0.08 if method == 'sa' else 0.25) if theta is None else theta
+        self.trunc = trunc
+        rng = np.random.default_rng(seed)
+        device = bm.get_device(A.values())
+        n = A.sparse_shape[0]
+
+        if method == 'sa':
+            if B is None:
+                B = np.kron(np.ones((n // block_size, 1)), np.eye(block_size))
+            else:
+                B = bm.to_numpy(B).reshape(n, -1).astype(np.float64)
+
+        self.A, self.P, self.R = [A], [], []
+
+        while len(self.A) < max_levels and self.A[-1].sparse_shape[0] > max_coarse:
+            Al = self.A[-1]
+            crow, col, val, _ = _csr_arrays(Al)
+
+            if method == 'rs':
+                strong = _classical_strength(crow, col, val, self.theta)
+                is_c = _pmis(crow, col, strong, rng)
+                P = _standard_interpolation(crow, col, val, strong, is_c, device, self.trunc)
+            else:
+                ncrow, ncol, nval = _amalgamate(crow, col, val, block_size) \
+                                    if block_size > 1 else (crow, col, val)
+                strong = _symmetric_strength(ncrow, ncol, nval, self.theta)
+                agg = _aggregate(ncrow, ncol, strong, rng)
+                agg = np.repeat(agg, block_size)
+                P0, Bc = _tentative_prolongation(agg, B, device)
+                P = self._smooth_prolongation(Al, P0, crow, col, val, rng, device)
+                B, block_size = Bc, B.shape[1]
+
+            NC = P.sparse_shape[1]
+            if NC == 0 or NC >= Al.sparse_shape[0]:
+                break
+
+            R = csr_transpose(P)
+            self.P.append(P)
+            self.R.append(R)
+            self.A.append(R @ (Al @ P))
+
+        self.setup_cycle(smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, cycle=cycle)
+
+    @staticmethod
+    def _smooth_prolongation(A: CSRTensor, P0: CSRTensor, crow, col, val,
+                             rng, device) -> CSRTensor:
+        """P = (I - w D^{-1} A) P0 with w = 4/(3 rho(D^{-1} A))."""
+        n = crow.shape[0] - 1
+        row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+        diag = np.bincount(row[row == col], weights=val[row == col], minlength=n)
+        inv_diag = np.zeros(n)
+        inv_diag[diag != 0] = 1.0 / diag[diag != 0]
+        rho = estimate_spectral_radius(A, _to_device(inv_diag, device), seed=rng)
+        if rho == 0.0:
+            return P0
+        omega = 4.0 / (3.0 * rho)
+        sval = -omega * inv_diag[row] * val + (row == col)
+        S = CSRTensor(_to_device(crow, device), _to_device(col, device),
+                      _to_device(sval, device), (n, n))
+        return S @ P0
@@ -0,0 +1,93 @@
+
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+from .conjugate_gradient import SupportsMatmul, _check_convergence, _prepare_system
+from .minres import _safe_div
+
+
+def bicgstab(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+             batch_first: bool=False,
+             atol: float=1e-12, rtol: float=1e-8,
+             maxiter: Optional[int]=10000,
+             M: Optional[SupportsMatmul]=None,
+             returninfo: bool=False):
+    """Solve a linear system Ax = b using the Biconjugate Gradient Stabilized
+    (BiCGStab) method.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix of the linear system, not necessarily symmetric.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (SupportsMatmul, optional): The preconditioner approximating the inverse of A,\
+        applied from the right. Defaults to None, without preconditioning.
+        returninfo (bool, optional): Whether to return the solver information. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: Solver information including 'niter', 'residual' (history of the residual norm)\
+        and 'converged'. Only returned when `returninfo` is True.
+    """
+    b, x0, restore = _prepare_system(b, x0, batch_first, as_column=True)
+    sol, info = _bicgstab_impl(A, b, x0, M, atol, rtol, maxiter)
+    sol = restore(sol)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _bicgstab_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: Optional[SupportsMatmul],
+                   atol, rtol, maxiter):
+    precond = (lambda r: r) if M is None else (lambda r: M @ r)
+    sum_func = bm.sum
+
+    # initialize
+    x = x0                  # (dof, batch)
+    r = b - A @ x           # (dof, batch)
+    r_hat = r
+    b_norm = bm.linalg.norm(b)
+    ONE = bm.ones((b.shape[-1],), dtype=b.dtype, device=bm.get_device(b))
+    rho, alpha, omega = ONE, ONE, ONE
+    v = bm.zeros_like(x)
+    p = bm.zeros_like(x)
+    n_iter = 0
+    history = []
+    converged = False
+
+    if bm.linalg.norm(r) < atol:
+        return x, {'niter': 0, 'residual': history, 'converged': True}
+
+    # iterate
+    while True:
+        rho_new = sum_func(r_hat*r, axis=0)
+        beta = _safe_div(rho_new, rho) * _safe_div(alpha, omega)
+        p = r + beta[None, ...] * (p - omega[None, ...] * v)
+        p_hat = precond(p)
+        v = A @ p_hat
+        alpha = _safe_div(rho_new, sum_func(r_hat*v, axis=0))
+        s = r - alpha[None, ...] * v
+        s_hat = precond(s)
+        t = A @ s_hat
+        omega = _safe_div(sum_func(t*s, axis=0), sum_func(t*t, axis=0))
+        x = x + alpha[None, ...] * p_hat + omega[None, ...] * s_hat
+        r = s - omega[None, ...] * t
+        rho = rho_new
+
+        r_norm = bm.linalg.norm(r)
+        n_iter += 1
+        history.append(float(r_norm))
+        stop, converged = _check_convergence("BiCGStab", r_norm, b_norm, n_iter,
+                                             atol, rtol, maxiter)
+        if stop:
+            break
+
+    return x, {'niter': n_iter, 'residual': history, 'converged': converged}
@@ -1,5 +1,5 @@
 
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Tuple, Callable
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
@@ -14,7 +14,9 @@ class SupportsMatmul(Protocol):
 def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
        batch_first: bool=False,
        atol: float=1e-12, rtol: float=1e-8,
-       maxiter: Optional[int]=10000) -> TensorLike:
+       maxiter: Optional[int]=10000,
+       M: Optional[SupportsMatmul]=None,
+       returninfo: bool=False):
     """Solve a linear system Ax = b using the Conjugate Gradient (CG) method.
 
     Parameters:
@@ -28,9 +30,14 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
         maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.\
         If not provided, the method will continue until convergence based on the given tolerances.
+        M (SupportsMatmul, optional): The preconditioner approximating the inverse of A,\
+        applied by `M @ r` to residuals shaped (dof, batch). Defaults to None, without preconditioning.
+        returninfo (bool, optional): Whether to return the solver information. Default is False.
 
     Returns:
         Tensor: The approximate solution to the system Ax = b.
+        dict: Solver information including 'niter', 'residual' (history of the residual norm)\
+        and 'converged'. Only returned when `returninfo` is True.
 
     Raises:
         ValueError: If inputs do not meet the specified conditions (e.g., A is not sparse, dimensions mismatch).
@@ -38,6 +45,37 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
     Note:
         This implementation assumes that A is a symmetric positive-definite matrix,
         which is a common requirement for the Conjugate Gradient method to work correctly.
+        The preconditioner M should be symmetric positive-definite as well.
+    """
+    b, x0, restore = _prepare_system(b, x0, batch_first)
+
+    if M is None:
+        sol, info = _cg_impl(A, b, x0, atol, rtol, maxiter)
+    else:
+        sol, info = _pcg_impl(A, b, x0, M, atol, rtol, maxiter)
+
+    sol = restore(sol)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _prepare_system(b: TensorLike, x0: Optional[TensorLike], batch_first: bool, *,
+                    as_column: bool=False) -> Tuple[TensorLike, TensorLike, Callable]:
+    """Check the right-hand side and the initial guess of an iterative solver,
+    and lay them out as (dof, batch).
+
+    Parameters:
+        b (TensorLike): The right-hand side, a 1D or 2D tensor.
+        x0 (TensorLike | None): Initial guess in the shape of b, or None for zeros.
+        batch_first (bool): Whether the batch dimension of a 2D `b` is the first.
+        as_column (bool, optional): Whether to make a 1D `b` a single column.\
+        Defaults to False.
+
+    Returns:
+        Tuple: `b` and `x0` in the layout of the solver, and a function\
+        returning the solution in the layout of the input `b`.
     """
     assert isinstance(b, TensorLike), "b must be a Tensor"
     if x0 is not None:
@@ -53,16 +91,38 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         if x0.shape != b.shape:
             raise ValueError("x0 and b must have the same shape")
 
-    if (not single_vector) and batch_first:
+    if single_vector:
+        if as_column:
+            b, x0 = b[:, None], x0[:, None]
+    elif batch_first:
         b = bm.swapaxes(b, 0, 1)
         x0 = bm.swapaxes(x0, 0, 1)
 
-    sol = _cg_impl(A, b, x0, atol, rtol, maxiter)
+    def restore(sol: TensorLike) -> TensorLike:
+        if single_vector:
+            return sol[:, 0] if as_column else sol
+        return bm.swapaxes(sol, 0, 1) if batch_first else sol
 
-    if (not single_vector) and batch_first:
-        sol = bm.swapaxes(sol, 0, 1)
+    return b, x0, restore
 
-    return sol
+
+def _check_convergence(name: str, r_norm, b_norm, n_iter: int, atol, rtol, maxiter):
+    """Return (stop, converged) of an iterative solver, logging the reason."""
+    if r_norm < atol:
+        logger.info(f"{name}: converged in {n_iter} iterations, "
+                    "stopped by absolute tolerance.")
+        return True, True
+
+    if r_norm < rtol * b_norm:
+        logger.info(f"{name}: converged in {n_iter} iterations, "
+                    "stopped by relative tolerance.")
+        return True, True
+
+    if (maxiter is not None) and (n_iter >= maxiter):
+        logger.info(f"{name}: failed, stopped by maxiter ({maxiter}).")
+        return True, False
+
+    return False, False
 
 
 def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxiter):
@@ -74,6 +134,7 @@ def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxit
     b_norm = bm.linalg.norm(b)
     sum_func = bm.sum
     sqrt_func = bm.sqrt
+    history = []
 
     # iterate
     while True:
@@ -86,26 +147,53 @@ def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxit
         r_norm_new = sqrt_func(sum_func(rTr_new))
 
         n_iter += 1
-
-        if r_norm_new < atol:
-            logger.info(f"CG: converged in {n_iter} iterations, "
-                        "stopped by absolute tolerance.")
-            break
-
-        if r_norm_new < rtol * b_norm:
-            logger.info(f"CG: converged in {n_iter} iterations, "
-                        "stopped by relative tolerance.")
-            break
-
-        if (maxiter is not None) and (n_iter >= maxiter):
-            logger.info(f"CG: failed, stopped by maxiter ({maxiter}).")
+        history.append(float(r_norm_new))
+        stop, converged = _check_convergence("CG", r_norm_new, b_norm, n_iter,
+                                             atol, rtol, maxiter)
+        if stop:
             break
 
         beta = rTr_new / rTr # (batch,)
         p = r_new + beta[None, ...] * p
         r = r_new
 
-    return x
+    return x, {'niter': n_iter, 'residual': history, 'converged': converged}
+
+
+def _pcg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: SupportsMatmul,
+              atol, rtol, maxiter):
+    # initialize
+    x = x0              # (dof, batch)
+    r = b - A @ x       # (dof, batch)
+    z = M @ r           # (dof, batch)
+    p = z
+    rTz = bm.sum(r*z, axis=0)  # (batch,)
+    n_iter = 0
+    b_norm = bm.linalg.norm(b)
+    history = []
+
+    # iterate
+    while True:
+        Ap = A @ p
+        alpha = rTz / bm.sum(p*Ap, axis=0)
+        x = x + alpha[None, ...] * p
+        r = r - alpha[None, ...] * Ap
+        r_norm = bm.linalg.norm(r)
+
+        n_iter += 1
+        history.append(float(r_norm))
+        stop, converged = _check_convergence("PCG", r_norm, b_norm, n_iter,
+                                             atol, rtol, maxiter)
+        if stop:
+            break
+
+        z = M @ r
+        rTz_new = bm.sum(r*z, axis=0)
+        beta = rTz_new / rTz
+        p = z + beta[None, ...] * p
+        rTz = rTz_new
+
+    return x, {'niter': n_iter, 'residual': history, 'converged': converged}
 
     # @staticmethod
     # def setup_context(ctx, inputs, output):
@@ -1,57 +1,155 @@
 
+from typing import Hashable
+from hashlib import blake2b
+
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
+from ..mesh.utils import LRUCache
 import numpy as np
 
-def _mumps_solve(A, b):
-    """Solve a linear system using MUMPS.
+
+class Factorization():
+    """A sparse factorization of a matrix, reused for any number of solves.
 
     Parameters:
-        A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
+        A (scipy.sparse.csr_matrix): The matrix, with sorted and summed entries.
+    """
+    def __init__(self, A) -> None:
+        self.shape = A.shape
+        self.dtype = A.dtype
+
+    def _solve(self, b: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def solve(self, b, *, batch_first: bool=False):
+        """Solve with one or several right-hand sides at once.
+
+        Parameters:
+            b (Tensor): The right-hand sides, shaped (n, ) or (n, batch),\
+                or (batch, n) if `batch_first`.
+            batch_first (bool, optional): Whether the batch is the first axis.\
+                Defaults to False.
+
+        Returns:
+            Tensor: The solutions in the shape and device of `b`, with the\
+                floating dtype promoted from the matrix and `b`.
+        """
+        device = bm.get_device(b)
+        b = bm.to_numpy(b)
+        if b.shape[0 if (b.ndim == 1 or not batch_first) else -1] != self.shape[0]:
+            raise ValueError(f"The right-hand side of shape {b.shape} does not "
+                             f"match the matrix of shape {self.shape}.")
+        # an integer right-hand side must not truncate the solution
+        dtype = np.result_type(self.dtype, b.dtype, np.float32)
+        if batch_first and b.ndim == 2:
+            x = self._solve(b.T).T
+        else:
+            x = self._solve(b)
+        return bm.tensor(x.astype(dtype, copy=False), device=device)
 
-    Returns:
-        Tensor: The solution of the linear system.
+
+class SuperLUFactorization(Factorization):
+    """LU factorization by `scipy.sparse.linalg.splu`."""
+    def __init__(self, A) -> None:
+        from scipy.sparse.linalg import splu
+        super().__init__(A)
+        self._lu = splu(A.tocsc())
+
+    def _solve(self, b):
+        return self._lu.solve(b)
+
+
+class CholmodFactorization(Factorization):
+    """Cholesky factorization of a symmetric positive definite matrix by
+    `sksparse.cholmod`."""
+    def __init__(self, A) -> None:
+        from sksparse.cholmod import cholesky
+        super().__init__(A)
+        self._factor = cholesky(A.tocsc())
+
+    def _solve(self, b):
+        return self._factor(b)
+
+
+class MumpsFactorization(Factorization):
+    """LU factorization by MUMPS, kept alive until the object is deleted.
 
     Note:
-        The matrix `A` must be on the CPU.
-        This function requires the `mumps` package to be installed.
-        A simple way to install it is
+        This requires the `mumps` package. A simple way to install it is
         ```
         sudo apt install libmumps64-scotch-dev
         pip3 install PyMUMPS
         ```
     """
-    from mumps import DMumpsContext
-    from scipy.sparse import coo_matrix
-    A = A.to_scipy()
-    x = bm.to_numpy(b).copy()
-
-    ctx = DMumpsContext()
-    ctx.set_silent()
-    ctx.set_centralized_sparse(A)
-
-    ctx.set_rhs(x)
-    ctx.run(job=6)
-    ctx.destroy()
-    return x
-
-def _scipy_solve(A, b):
-    """Solve a linear system using cupy.
+    def __init__(self, A) -> None:
+        from mumps import DMumpsContext
+        super().__init__(A)
+        self._ctx = DMumpsContext()
+        self._ctx.set_silent()
+        self._ctx.set_centralized_sparse(A.tocoo())
+        self._ctx.run(job=4) # analysis and factorization
+
+    def _solve(self, b):
+        x = np.array(b, dtype=np.float64, order='F')
+        for i in range(1 if x.ndim == 1 else x.shape[1]):
+            xi = x if x.ndim == 1 else np.ascontiguousarray(x[:, i])
+            self._ctx.set_rhs(xi)
+            self._ctx.run(job=3) # solve with the factors
+            if x.ndim == 2:
+                x[:, i] = xi
+        return x
+
+    def __del__(self):
+        ctx = getattr(self, '_ctx', None)
+        if ctx is not None:
+            ctx.destroy()
+
+
+FACTORIZATIONS = {
+    'scipy': SuperLUFactorization,
+    'cholmod': CholmodFactorization,
+    'mumps': MumpsFactorization
+}
+
+# Factorizations are large, so only a few are kept.
+factorization_cache = LRUCache(maxsize=4)
+
+
+def _matrix_key(solver: str, A) -> Hashable:
+    """Return a key depending on the content of a scipy CSR matrix."""
+    h = blake2b(digest_size=16)
+    for arr in (A.indptr, A.indices, A.data):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return (solver, A.shape, str(A.dtype), h.hexdigest())
+
+
+def factorize(A: [COOTensor, CSRTensor], solver: str="scipy", *,
+              cache: bool=True) -> Factorization:
+    """Factorize a sparse matrix for repeated direct solves.
+
+    With `cache`, factorizations are kept in `factorization_cache` by the
+    content of the matrix, so that factorizing an equal matrix again, for
+    example in a loop of `spsolve` calls, returns the same object.
 
     Parameters:
-        A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
+        A (COOTensor | CSRTensor): The matrix of the linear system.
+        solver (str, optional): "scipy" (SuperLU), "cholmod" for symmetric\
+            positive definite matrices, or "mumps". Defaults to "scipy".
+        cache (bool, optional): Whether to use the cache. Defaults to True.
 
     Returns:
-        Tensor: The solution of the linear system.
+        Factorization: Solves with `solve(b)`.
     """
-    from scipy.sparse.linalg import spsolve as spsol 
-    from scipy.sparse import csr_matrix
+    if solver not in FACTORIZATIONS:
+        raise ValueError(f"Unknown solver: {solver}, "
+                         f"should be one of {list(FACTORIZATIONS)}")
+    Fact = FACTORIZATIONS[solver]
+    A = A.to_scipy().tocsr()
+    A.sum_duplicates()
+    if not cache:
+        return Fact(A)
+    return factorization_cache.get(_matrix_key(solver, A), lambda: Fact(A))
 
-    A = A.to_scipy()
-    b = bm.to_numpy(b)
-    return spsol(A, b)
 
 def _to_cupy_data(A, b):
     """Convert the input tensors to cupy tensors.
@@ -104,26 +202,25 @@ def _cupy_solve(A, b):
         x = cp.asnumpy(x)
     return x
 
-def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
+def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps", *, cache: bool=False):
     """Solve a linear system using a direct solver.
 
+    With `cache`, the "scipy", "cholmod" and "mumps" solvers reuse the
+    factorization of an equal matrix from `factorization_cache`, see `factorize`.
+
     Parameters:
         A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
-        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        b(Tensor): The right-hand side, shaped (n, ) or (n, batch).
+        solver(str): The solver to use. It can be "mumps", "scipy", "cholmod" or "cupy".
+        cache(bool, optional): Whether to cache the factorization. Defaults to False.
 
     Returns:
         Tensor: The solution of the linear system.
     """
-    if solver == "mumps":
-        return bm.tensor(_mumps_solve(A, b))
-    elif solver == "scipy":
-        return bm.tensor(_scipy_solve(A, b))
+    if solver in FACTORIZATIONS:
+        return factorize(A, solver, cache=cache).solve(b)
     elif solver == "cupy":
         A = A.tocoo()
         return bm.tensor(_cupy_solve(A, b))
     else:
         raise ValueError(f"Unknown solver: {solver}")
-
-
-
@@ -0,0 +1,195 @@
+
+from typing import Any, Callable, List, Optional, Sequence
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..mesh import TriangleMesh, TetrahedronMesh
+
+from .multigrid import Multigrid, csr_transpose
+
+__all__ = [
+    'lagrange_prolongation',
+    'GMGSolver'
+]
+
+
+def lagrange_prolongation(coarse_space, fine_space, *,
+                          parent: Optional[TensorLike]=None,
+                          dirichlet: bool=False) -> CSRTensor:
+    """Prolongation matrix from a Lagrange space on a simplex mesh to the same
+    space on its uniform refinement, by interpolating coarse basis functions
+    at the interpolation points of the fine space.
+
+    Parameters:
+        coarse_space (LagrangeFESpace): The space on the coarse mesh.\n
+        fine_space (LagrangeFESpace): The space of the same degree on the fine mesh.\n
+        parent (Tensor, optional): Index of the coarse cell containing each fine cell.\
+        Defaults to `arange(NCf) % NCc`, the cell ordering produced by\
+        `uniform_refine` of TriangleMesh and TetrahedronMesh.\n
+        dirichlet (bool, optional): Remove boundary dofs from the transfer, i.e. zero\
+        rows of fine boundary dofs and columns of coarse boundary dofs. Defaults to False.
+
+    Returns:
+        CSRTensor: The prolongation shaped (fine gdof, coarse gdof).
+    """
+    cmesh, fmesh = coarse_space.mesh, fine_space.mesh
+    p = coarse_space.p
+    if fine_space.p != p:
+        raise ValueError("The coarse and fine spaces must have the same degree.")
+    if not (isinstance(cmesh, (TriangleMesh, TetrahedronMesh)) and type(fmesh) is type(cmesh)):
+        raise ValueError("Lagrange prolongation requires triangle or tetrahedron meshes, "
+                         f"but got {type(cmesh).__name__} and {type(fmesh).__name__}.")
+
+    NCc, NCf = cmesh.number_of_cells(), fmesh.number_of_cells()
+    device = bm.get_device(fmesh.node)
+    if parent is None:
+        if NCf % NCc != 0:
+            raise ValueError("The fine mesh is not a uniform refinement of the coarse mesh.")
+        parent = bm.arange(NCf, device=device) % NCc
+
+    # pick a fine cell containing each fine dof, then its coarse parent
+    cell2dof_f = fine_space.cell_to_dof()
+    gdof_f, ldof = fine_space.number_of_global_dofs(), cell2dof_f.shape[1]
+    cell_idx = bm.zeros((gdof_f,), dtype=cell2dof_f.dtype, device=device)
+    cell_idx = bm.set_at(cell_idx, cell2dof_f.reshape(-1),
+                         bm.repeat(bm.arange(NCf, dtype=cell2dof_f.dtype, device=device), ldof))
+    pcell = parent[cell_idx]
+
+    # barycentric coordinates of the fine interpolation points in parent cells
+    ipoints = fine_space.interpolation_points()
+    vertex = cmesh.node[cmesh.entity('cell')[pcell]] # (gdof_f, TD+1, GD)
+    J = bm.swapaxes(vertex[:, 1:, :] - vertex[:, 0:1, :], -1, -2) # (gdof_f, GD, TD)
+    lam = bm.einsum('nij, nj -> ni', bm.linalg.inv(J), ipoints - vertex[:, 0, :])
+    bcs = bm.concat([1.0 - bm.sum(lam, axis=-1, keepdims=True), lam], axis=-1)
+    phi = cmesh.shape_function(bcs, p) # (gdof_f, ldof)
+
+    cell2dof_c = coarse_space.cell_to_dof()
+    row = bm.repeat(bm.arange(gdof_f, device=device), ldof)
+    col = bm.astype(cell2dof_c[pcell].reshape(-1), row.dtype)
+    val = phi.reshape(-1)
+
+    flag = bm.abs(val) > 1e-12
+    if dirichlet:
+        flag = flag & ~fine_space.is_boundary_dof()[row] & ~coarse_space.is_boundary_dof()[col]
+    indices = bm.stack([row[flag], col[flag]], axis=0)
+    shape = (gdof_f, coarse_space.number_of_global_dofs())
+
+    return COOTensor(indices, val[flag], shape).tocsr()
+
+
+class _MatrixFreeLevel():
+    """Adapt a matrix-free operator accepting batch on the first dimension, like
+    BilinearForm, to the (dof, batch) layout used in multigrid cycles."""
+    def __init__(self, op: Any) -> None:
+        self.op = op
+        self.shape = tuple(op.shape[-2:])
+
+    def __matmul__(self, x: TensorLike) -> TensorLike:
+        if x.ndim == 1:
+            return self.op @ x
+        # apply to the whole block at once
+        return bm.swapaxes(self.op @ bm.swapaxes(x, 0, 1), 0, 1)
+
+    def diagonal(self) -> TensorLike:
+        return self.op.diagonal()
+
+
+def _as_level(op: Any):
+    if isinstance(op, COOTensor):
+        return op.tocsr()
+    if isinstance(op, CSRTensor):
+        return op
+    if not hasattr(op, '__matmul__'):
+        raise TypeError(f"Level operator must be a sparse matrix or support `@`, "
+                        f"but got {type(op).__name__}.")
+    return _MatrixFreeLevel(op)
+
+
+class GMGSolver(Multigrid):
+    """Geometric multigrid solver on a hierarchy of uniformly refined meshes.
+
+    Level matrices can be assembled (COOTensor or CSRTensor), or matrix-free
+    operators such as BilinearForm and DirichletBCOperator that support `@`
+    with batch on the first dimension and `diagonal()`. Gauss-Seidel smoothing
+    needs assembled matrices, while 'jacobi' and 'chebyshev' smoothers work in
+    both cases.
+
+    Parameters:
+        A (Sequence): Operators of all levels, from the finest to the coarsest.\n
+        P (Sequence[CSRTensor]): Prolongations, P[l] maps level l+1 to level l.\n
+        R (Sequence[CSRTensor], optional): Restrictions. Defaults to transposes of P.\n
+        smoother (str, optional): 'chebyshev', 'jacobi' or 'gs'. Defaults to 'chebyshev'.\n
+        presmooth (int, optional): Number of pre-smoothing sweeps. Defaults to 1.\n
+        postsmooth (int, optional): Number of post-smoothing sweeps. Defaults to 1.\n
+        cycle (str, optional): 'V', 'W' or 'F'. Defaults to 'V'.\n
+        **smoother_kwargs: Other arguments of the smoother.
+
+    Examples:
+        >>> mesh = TriangleMesh.from_box(nx=4, ny=4)
+        >>> def assemble(space):
+        ...     bform = BilinearForm(space)
+        ...     bform.add_integrator(ScalarDiffusionIntegrator())
+        ...     return DirichletBC(space, gd=0.0).apply_matrix(bform.assembly(format='csr'))
+        >>> solver = GMGSolver.from_mesh(mesh, 4, assemble, p=1)
+        >>> x = cg(solver.A[0], b, M=solver)
+    """
+    def __init__(self, A: Sequence[Any], P: Sequence[CSRTensor],
+                 R: Optional[Sequence[CSRTensor]]=None, *,
+                 smoother: str='chebyshev', presmooth: int=1, postsmooth: int=1,
+                 cycle: str='V', **smoother_kwargs) -> None:
+        if len(P) != len(A) - 1:
+            raise ValueError(f"Expected {len(A) - 1} prolongations for {len(A)} levels, "
+                             f"but got {len(P)}.")
+        self.A: List[Any] = [_as_level(a) for a in A]
+        self.P: List[CSRTensor] = list(P)
+        if R is None:
+            self.R = [csr_transpose(p) for p in self.P]
+        else:
+            self.R = list(R)
+        self.setup_cycle(smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, cycle=cycle, **smoother_kwargs)
+
+    @classmethod
+    def from_mesh(cls, mesh, nlevels: int, assemble: Callable[[Any], Any], *,
+                  p: int=1, dirichlet: bool=True, **kwargs) -> 'GMGSolver':
+        """Build the solver from a coarse simplex mesh refined uniformly.
+
+        The input mesh is not modified; refined copies are stored in `meshes`
+        and the Lagrange spaces in `spaces`, both from the finest to the coarsest.
+
+        Parameters:
+            mesh (TriangleMesh | TetrahedronMesh): The coarsest mesh.\n
+            nlevels (int): Number of levels.\n
+            assemble (Callable): Function taking a LagrangeFESpace and returning\
+            the operator of the level.\n
+            p (int, optional): Degree of the Lagrange spaces. Defaults to 1.\n
+            dirichlet (bool, optional): Remove boundary dofs from transfers, suitable for\
+            operators with Dirichlet conditions applied. Defaults to True.\n
+            **kwargs: Other arguments of the GMGSolver.
+
+        Returns:
+            GMGSolver: The solver. Use `spaces[0]` to assemble the right-hand side.
+        """
+        from ..functionspace import LagrangeFESpace
+
+        if nlevels < 1:
+            raise ValueError("At least one level is required.")
+
+        meshes = [mesh.__class__(bm.copy(mesh.node), bm.copy(mesh.entity('cell')))]
+        for _ in range(nlevels - 1):
+            m = meshes[-1]
+            fmesh = m.__class__(bm.copy(m.node), bm.copy(m.entity('cell')))
+            fmesh.uniform_refine()
+            meshes.append(fmesh)
+        meshes.reverse()
+
+        spaces = [LagrangeFESpace(m, p=p) for m in meshes]
+        A = [assemble(space) for space in spaces]
+        P = [lagrange_prolongation(spaces[l+1], spaces[l], dirichlet=dirichlet)
+             for l in range(nlevels - 1)]
+
+        solver = cls(A, P, **kwargs)
+        solver.meshes = meshes
+        solver.spaces = spaces
+        return solver
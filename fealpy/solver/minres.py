@@ -0,0 +1,123 @@
+
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+from .conjugate_gradient import SupportsMatmul, _check_convergence, _prepare_system
+
+
+def _safe_div(a: TensorLike, b: TensorLike) -> TensorLike:
+    """Element-wise a/b, giving 0 where b is 0 (columns that already converged)."""
+    nonzero = b != 0
+    return bm.where(nonzero, a / bm.where(nonzero, b, 1.0), 0.0)
+
+
+def minres(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+           batch_first: bool=False,
+           atol: float=1e-12, rtol: float=1e-8,
+           maxiter: Optional[int]=10000,
+           M: Optional[SupportsMatmul]=None,
+           returninfo: bool=False):
+    """Solve a linear system Ax = b using the Minimal Residual (MINRES) method.
+
+    Parameters:
+        A (SupportsMatmul): The symmetric coefficient matrix of the linear system,\
+        which can be indefinite, e.g. a saddle point system.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (SupportsMatmul, optional): The symmetric positive-definite preconditioner\
+        approximating the inverse of A. Defaults to None, without preconditioning.
+        returninfo (bool, optional): Whether to return the solver information. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: Solver information including 'niter', 'residual' (history of the residual norm)\
+        and 'converged'. Only returned when `returninfo` is True.
+
+    Note:
+        The residual norm is estimated by the short recurrence of MINRES without
+        extra matrix-vector products. With a preconditioner, it is measured in
+        the M-norm, sqrt(r^T M r), and so is the norm of b in the relative tolerance.
+    """
+    b, x0, restore = _prepare_system(b, x0, batch_first, as_column=True)
+    sol, info = _minres_impl(A, b, x0, M, atol, rtol, maxiter)
+    sol = restore(sol)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _minres_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M: Optional[SupportsMatmul],
+                 atol, rtol, maxiter):
+    precond = (lambda r: r) if M is None else (lambda r: M @ r)
+    sum_func = bm.sum
+    sqrt_func = bm.sqrt
+
+    # initialize the preconditioned Lanczos process
+    x = x0                  # (dof, batch)
+    r1 = b - A @ x          # (dof, batch)
+    y = precond(r1)
+    beta1 = sqrt_func(sum_func(r1*y, axis=0))   # (batch,)
+    b_norm = sqrt_func(sum_func(b*precond(b)))
+
+    ZERO = bm.zeros_like(beta1)
+    oldb, beta, dbar, epsln = ZERO, beta1, ZERO, ZERO
+    phibar = beta1
+    cs, sn = ZERO - 1.0, ZERO
+    w = bm.zeros_like(x)
+    w2 = bm.zeros_like(x)
+    r2 = r1
+    n_iter = 0
+    history = []
+    converged = False
+
+    if sqrt_func(sum_func(phibar**2)) < atol:
+        return x, {'niter': 0, 'residual': history, 'converged': True}
+
+    # iterate
+    while True:
+        v = _safe_div(1.0, beta)[None, ...] * y
+        y = A @ v
+        if n_iter > 0:
+            y = y - _safe_div(beta, oldb)[None, ...] * r1
+        alpha = sum_func(v*y, axis=0)
+        y = y - _safe_div(alpha, beta)[None, ...] * r2
+        r1, r2 = r2, y
+        y = precond(r2)
+        oldb = beta
+        beta = sqrt_func(bm.abs(sum_func(r2*y, axis=0)))
+
+        # apply the previous rotation and compute the new one
+        oldeps = epsln
+        delta = cs*dbar + sn*alpha
+        gbar = sn*dbar - cs*alpha
+        epsln = sn*beta
+        dbar = -cs*beta
+        gamma = sqrt_func(gbar**2 + beta**2)
+        cs = _safe_div(gbar, gamma)
+        sn = _safe_div(beta, gamma)
+        phi = cs*phibar
+        phibar = sn*phibar
+
+        # update the solution
+        w1, w2 = w2, w
+        w = _safe_div(1.0, gamma)[None, ...] * (v - oldeps[None, ...]*w1 - delta[None, ...]*w2)
+        x = x + phi[None, ...] * w
+
+        r_norm = sqrt_func(sum_func(phibar**2))
+        n_iter += 1
+        history.append(float(r_norm))
+        stop, converged = _check_convergence("MINRES", r_norm, b_norm, n_iter,
+                                             atol, rtol, maxiter)
+        if stop:
+            break
+
+    return x, {'niter': n_iter, 'residual': history, 'converged': converged}
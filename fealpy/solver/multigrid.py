@@ -0,0 +1,393 @@
+
+from typing import Optional, List, Union
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor, COOTensor
+
+from .conjugate_gradient import _check_convergence
+from .preconditioner import Preconditioner, _TriangularSolver, _csr_arrays, _to_device
+
+
+__all__ = [
+    'Smoother',
+    'JacobiSmoother',
+    'GaussSeidelSmoother',
+    'ChebyshevSmoother',
+    'Multigrid'
+]
+
+
+def csr_transpose(A: CSRTensor) -> CSRTensor:
+    """Return the transpose of a 2D CSRTensor, with sorted columns in rows."""
+    nrow, ncol = A.sparse_shape
+    row, col = A.row(), A.col()
+    key = bm.astype(col, bm.int64) * nrow + bm.astype(row, bm.int64)
+    order = bm.argsort(key, stable=True)
+    counts = bm.zeros((ncol,), dtype=bm.int64, device=bm.get_device(col))
+    counts = bm.index_add(counts, bm.astype(col, bm.int64), bm.ones_like(counts[col]))
+    ZERO = bm.zeros((1,), dtype=bm.int64, device=bm.get_device(col))
+    crow = bm.concat([ZERO, bm.cumsum(counts, axis=0)], axis=0)
+    return CSRTensor(crow, row[order], A.values()[..., order], (ncol, nrow))
+
+
+def operator_diagonal(A) -> TensorLike:
+    """Diagonal of a sparse matrix, or of a matrix-free operator providing
+    a `diagonal()` method."""
+    if isinstance(A, (CSRTensor, COOTensor)):
+        crow, col, val, shape = _csr_arrays(A)
+        row = np.repeat(np.arange(shape[0], dtype=np.int64), np.diff(crow))
+        flag = row == col
+        diag = np.bincount(row[flag], weights=val[flag], minlength=shape[0])
+        return _to_device(diag.astype(val.dtype), bm.get_device(A.values()))
+
+    if hasattr(A, 'diagonal'):
+        return A.diagonal()
+
+    raise TypeError(f"Can not get the diagonal of {type(A).__name__}, "
+                    "a sparse matrix or an operator with `diagonal()` is required.")
+
+
+def estimate_spectral_radius(A, inv_diag: TensorLike, *, maxiter: int=15,
+                             seed=0) -> float:
+    """Estimate the spectral radius of D^{-1} A by power iteration.
+
+    Parameters:
+        A (SupportsMatmul): The matrix or operator.\n
+        inv_diag (TensorLike): Inverse of the diagonal of A.\n
+        maxiter (int, optional): Number of power iterations. Defaults to 15.\n
+        seed (int | np.random.Generator, optional): Seed of the start vector. Defaults to 0.
+
+    Returns:
+        float: The estimated spectral radius.
+    """
+    n = inv_diag.shape[0]
+    rng = np.random.default_rng(seed)
+    v = bm.astype(_to_device(rng.random(n), bm.get_device(inv_diag)), inv_diag.dtype)
+    rho = 0.0
+    for _ in range(maxiter):
+        w = inv_diag * (A @ v)
+        rho = float(bm.linalg.norm(w))
+        if rho == 0.0:
+            break
+        v = w / rho
+    return rho
+
+
+def _safe_inverse(diag: TensorLike, scale: float=1.0) -> TensorLike:
+    nonzero = diag != 0
+    return bm.where(nonzero, scale / bm.where(nonzero, diag, 1.0), 0.0)
+
+
+class Smoother():
+    """Base class of multigrid smoothers.
+
+    A smoother improves an approximation `x` of `A x = b` on one level,
+    where `b` and `x` are shaped (dof, batch).
+    """
+    def __init__(self, A: CSRTensor, *, sweeps: int=1) -> None:
+        self.A = A
+        self.sweeps = sweeps
+
+    def smooth(self, b: TensorLike, x: TensorLike, *, forward: bool=True) -> TensorLike:
+        raise NotImplementedError
+
+
+class JacobiSmoother(Smoother):
+    """The damped Jacobi smoother, x <- x + w D^{-1} (b - A x).
+
+    Parameters:
+        A (CSRTensor | SupportsMatmul): Matrix of the level, or a matrix-free\
+        operator with a `diagonal()` method.\n
+        omega (float, optional): The damping factor. Defaults to 2/3.\n
+        sweeps (int, optional): Number of sweeps in each smoothing. Defaults to 1.
+    """
+    def __init__(self, A, *, omega: float=2/3, sweeps: int=1) -> None:
+        super().__init__(A, sweeps=sweeps)
+        self.inv_diag = _safe_inverse(operator_diagonal(A), omega)
+
+    def smooth(self, b: TensorLike, x: TensorLike, *, forward: bool=True) -> TensorLike:
+        for _ in range(self.sweeps):
+            x = x + self.inv_diag[:, None] * (b - self.A @ x)
+        return x
+
+
+class GaussSeidelSmoother(Smoother):
+    """The Gauss-Seidel smoother, x <- x + (D + L)^{-1} (b - A x) in the forward
+    sweep and x <- x + (D + U)^{-1} (b - A x) in the backward sweep.
+
+    The triangular solves are level-scheduled. Using forward sweeps for
+    pre-smoothing and backward sweeps for post-smoothing gives a symmetric
+    cycle, which can be used as a preconditioner of CG.
+
+    Parameters:
+        A (CSRTensor): Matrix of the level.\n
+        sweeps (int, optional): Number of sweeps in each smoothing. Defaults to 1.
+    """
+    def __init__(self, A: CSRTensor, *, sweeps: int=1) -> None:
+        super().__init__(A, sweeps=sweeps)
+        crow, col, val, shape = _csr_arrays(A)
+        row = np.repeat(np.arange(shape[0], dtype=np.int64), np.diff(crow))
+        device = bm.get_device(A.values())
+        diag = np.zeros(shape[0], dtype=val.dtype)
+        flag = row == col
+        np.add.at(diag, row[flag], val[flag])
+        # empty rows (e.g. from dropped coarse unknowns) are left unchanged
+        empty = np.bincount(row[val != 0], minlength=shape[0]) == 0
+        diag[empty] = 1.0
+        if np.any(diag == 0):
+            raise ValueError("Gauss-Seidel smoother requires a non-zero diagonal.")
+        lower, upper = row > col, row < col
+        self.lower = _TriangularSolver(row[lower], col[lower], val[lower], diag, device)
+        self.upper = _TriangularSolver(row[upper], col[upper], val[upper], diag, device)
+
+    def smooth(self, b: TensorLike, x: TensorLike, *, forward: bool=True) -> TensorLike:
+        solver = self.lower if forward else self.upper
+        for _ in range(self.sweeps):
+            x = x + solver.solve(b - self.A @ x)
+        return x
+
+
+class ChebyshevSmoother(Smoother):
+    """The Chebyshev polynomial smoother preconditioned by the diagonal.
+
+    It damps the eigenmodes of D^{-1} A in [lmax/ratio, 1.1 lmax], where lmax is
+    estimated by power iteration. The smoother is a polynomial of D^{-1} A,
+    so it is symmetric and only needs matrix-vector products and the diagonal.
+
+    Parameters:
+        A (CSRTensor | SupportsMatmul): Matrix of the level, or a matrix-free\
+        operator with a `diagonal()` method.\n
+        degree (int, optional): Degree of the polynomial, i.e. the number of
+            matrix-vector products in a sweep. Defaults to 2.\n
+        ratio (float, optional): Ratio of the upper and lower bounds of the
+            eigenvalues to damp. Defaults to 30.\n
+        sweeps (int, optional): Number of sweeps in each smoothing. Defaults to 1.
+    """
+    def __init__(self, A, *, degree: int=2, ratio: float=30.0, sweeps: int=1) -> None:
+        super().__init__(A, sweeps=sweeps)
+        self.inv_diag = _safe_inverse(operator_diagonal(A))
+        lmax = 1.1 * estimate_spectral_radius(A, self.inv_diag)
+        self.degree = degree
+        self.theta = (lmax + lmax / ratio) / 2
+        self.delta = (lmax - lmax / ratio) / 2
+
+    def smooth(self, b: TensorLike, x: TensorLike, *, forward: bool=True) -> TensorLike:
+        inv_diag = self.inv_diag[:, None]
+        theta, delta = self.theta, self.delta
+        sigma = theta / delta
+
+        for _ in range(self.sweeps):
+            rho = 1.0 / sigma
+            r = inv_diag * (b - self.A @ x)
+            d = r / theta
+
+            for k in range(self.degree):
+                x = x + d
+                if k == self.degree - 1:
+                    break
+                r = r - inv_diag * (self.A @ d)
+                rho_new = 1.0 / (2.0 * sigma - rho)
+                d = (rho_new * rho) * d + (2.0 * rho_new / delta) * r
+                rho = rho_new
+
+        return x
+
+
+_SMOOTHERS = {
+    'jacobi': JacobiSmoother,
+    'gs': GaussSeidelSmoother,
+    'chebyshev': ChebyshevSmoother
+}
+
+
+class Multigrid(Preconditioner):
+    """Base class of multigrid solvers.
+
+    Subclasses build the hierarchy of matrices `A[l]`, prolongations `P[l]`
+    (from level l+1 to level l) and restrictions `R[l]`, then call
+    `setup_cycle` to create smoothers and the coarsest solver.
+    Level 0 is the finest.
+
+    A multigrid object can be used standalone by `solve`, or as a
+    preconditioner (one cycle from the zero initial guess) by `M @ r`.
+
+    Level matrices can also be matrix-free operators applied to tensors
+    shaped (dof, batch) by `@`, if the smoother only needs products and the
+    diagonal ('jacobi' and 'chebyshev').
+    """
+    A: List[CSRTensor]
+    P: List[CSRTensor]
+    R: List[CSRTensor]
+
+    def setup_cycle(self, *, smoother: str='gs', presmooth: int=1, postsmooth: int=1,
+                    cycle: str='V', max_dense: int=500, coarse_sweeps: int=10,
+                    **smoother_kwargs) -> None:
+        """Create smoothers on all levels except the coarsest one, and
+        the solver of the coarsest level.
+
+        The coarsest matrix is inverted densely if it has at most `max_dense`
+        rows, so that singular matrices (e.g. pure Neumann problems) are
+        handled by the pseudo-inverse. A larger sparse matrix is factorized
+        by SuperLU. A larger matrix-free operator, or a singular sparse matrix,
+        is approximately solved by `coarse_sweeps` smoothing sweeps.
+
+        Parameters:
+            smoother (str, optional): 'gs' for Gauss-Seidel, 'jacobi' for damped Jacobi
+                or 'chebyshev' for the Chebyshev polynomial smoother. Defaults to 'gs'.\n
+            presmooth (int, optional): Number of pre-smoothing sweeps. Defaults to 1.\n
+            postsmooth (int, optional): Number of post-smoothing sweeps. Defaults to 1.\n
+            cycle (str, optional): 'V', 'W' or 'F'. Defaults to 'V'.\n
+            max_dense (int, optional): Maximum size of the coarsest level to invert
+                densely. Defaults to 500.\n
+            coarse_sweeps (int, optional): Number of smoothing sweeps on the coarsest
+                level if it is not solved directly. Defaults to 10.
+        """
+        if smoother not in _SMOOTHERS:
+            raise ValueError(f"Unknown smoother '{smoother}', "
+                             f"should be one of {tuple(_SMOOTHERS.keys())}.")
+        if cycle not in ('V', 'W', 'F'):
+            raise ValueError(f"Unknown cycle '{cycle}', should be 'V', 'W' or 'F'.")
+
+        self.shape = tuple(self.A[0].shape)
+        self.cycle_type = cycle
+        self.presmooth = presmooth
+        self.postsmooth = postsmooth
+        self.smoothers = [
+            _SMOOTHERS[smoother](A, **smoother_kwargs) for A in self.A[:-1]
+        ]
+
+        Ac = self.A[-1]
+        sparse = isinstance(Ac, (CSRTensor, COOTensor))
+        self.coarse_inv = None
+        self.coarse_factor = None
+        self.coarse_smoother = None
+        self.coarse_sweeps = coarse_sweeps
+
+        if Ac.shape[0] <= max_dense:
+            if sparse:
+                dense = Ac.to_dense()
+            else:
+                # apply the matrix-free operator to the columns of the identity
+                device = bm.get_device(operator_diagonal(Ac))
+                dense = Ac @ bm.eye(Ac.shape[0], dtype=bm.float64, device=device)
+            self.coarse_inv = _to_device(np.linalg.pinv(bm.to_numpy(dense)), bm.get_device(dense))
+            return
+
+        if sparse:
+            from .direct_solver import factorize
+            try:
+                self.coarse_factor = factorize(Ac, 'scipy', cache=False)
+                return
+            except RuntimeError: # singular
+                pass
+        self.coarse_smoother = _SMOOTHERS[smoother](Ac, **smoother_kwargs)
+
+    def number_of_levels(self) -> int:
+        return len(self.A)
+
+    def operator_complexity(self) -> float:
+        """Total number of non-zeros of all levels relative to the finest level,
+        or NaN if a level is a matrix-free operator."""
+        if not all(isinstance(A, (CSRTensor, COOTensor)) for A in self.A):
+            return float('nan')
+        return sum(A.nnz for A in self.A) / self.A[0].nnz
+
+    def grid_complexity(self) -> float:
+        """Total number of unknowns of all levels relative to the finest level."""
+        return sum(A.shape[0] for A in self.A) / self.A[0].shape[0]
+
+    def _cycle(self, level: int, b: TensorLike, x: Optional[TensorLike],
+               cycle: Optional[str]=None) -> TensorLike:
+        cycle = self.cycle_type if cycle is None else cycle
+
+        if level == len(self.A) - 1:
+            return self._coarse_solve(b)
+
+        A = self.A[level]
+        smoother = self.smoothers[level]
+
+        if x is None:
+            x = bm.zeros_like(b)
+        for _ in range(self.presmooth):
+            x = smoother.smooth(b, x, forward=True)
+
+        rc = self.R[level] @ (b - A @ x)
+        if level + 1 == len(self.A) - 1:
+            ec = self._cycle(level + 1, rc, None)
+        elif cycle == 'V':
+            ec = self._cycle(level + 1, rc, None, 'V')
+        elif cycle == 'W':
+            ec = self._cycle(level + 1, rc, None, 'W')
+            ec = self._cycle(level + 1, rc, ec, 'W')
+        else: # F-cycle: an F-cycle followed by a V-cycle on the coarse level
+            ec = self._cycle(level + 1, rc, None, 'F')
+            ec = self._cycle(level + 1, rc, ec, 'V')
+        x = x + self.P[level] @ ec
+
+        for _ in range(self.postsmooth):
+            x = smoother.smooth(b, x, forward=False)
+
+        return x
+
+    def _coarse_solve(self, b: TensorLike) -> TensorLike:
+        if self.coarse_inv is not None:
+            return self.coarse_inv @ b
+        if self.coarse_factor is not None:
+            return self.coarse_factor.solve(b)
+        # alternate the sweep directions to keep the cycle symmetric
+        x = bm.zeros_like(b)
+        for k in range(self.coarse_sweeps):
+            x = self.coarse_smoother.smooth(b, x, forward=(k % 2 == 0))
+        return x
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        return self._cycle(0, r, None)
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None, *,
+              atol: float=1e-12, rtol: float=1e-8,
+              maxiter: Optional[int]=200,
+              returninfo: bool=False):
+        """Solve A x = b by multigrid cycles.
+
+        Parameters:
+            b (Tensor): The right-hand side, a 1D tensor or a 2D tensor shaped (dof, batch).\n
+            x0 (Tensor | None, optional): Initial guess. Defaults to zeros.\n
+            atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.\n
+            rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.\n
+            maxiter (int, optional): Maximum number of cycles. Default is 200.\n
+            returninfo (bool, optional): Whether to return the solver information. Default is False.
+
+        Returns:
+            Tensor: The approximate solution.
+            dict: Solver information including 'niter', 'residual' (history of the residual norm)\
+            and 'converged'. Only returned when `returninfo` is True.
+        """
+        single_vector = b.ndim == 1
+        if single_vector:
+            b = b[:, None]
+        x = bm.zeros_like(b) if x0 is None else bm.reshape(x0, b.shape)
+        b_norm = bm.linalg.norm(b)
+        name = self.__class__.__name__
+        n_iter = 0
+        history = []
+        converged = False
+
+        while True:
+            x = self._cycle(0, b, x)
+            r_norm = bm.linalg.norm(b - self.A[0] @ x)
+            n_iter += 1
+            history.append(float(r_norm))
+            stop, converged = _check_convergence(name, r_norm, b_norm, n_iter,
+                                                 atol, rtol, maxiter)
+            if stop:
+                break
+
+        if single_vector:
+            x = x[:, 0]
+
+        if returninfo:
+            return x, {'niter': n_iter, 'residual': history, 'converged': converged}
+        return x
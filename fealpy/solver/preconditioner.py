@@ -0,0 +1,415 @@
+
+from typing import Optional, Sequence, Tuple, Union, Callable
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+
+
+__all__ = [
+    'Preconditioner',
+    'JacobiPreconditioner',
+    'SSORPreconditioner',
+    'ILU0Preconditioner',
+    'IC0Preconditioner',
+    'BlockDiagonalPreconditioner'
+]
+
+_SparseMatrix = Union[COOTensor, CSRTensor]
+
+
+def _csr_arrays(A: _SparseMatrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[int, int]]:
+    """Fetch (crow, col, values, shape) of a sparse matrix as numpy arrays,
+    with column indices sorted in each row."""
+    if isinstance(A, COOTensor):
+        A = A.coalesce().tocsr()
+    elif not isinstance(A, CSRTensor):
+        raise TypeError(f"A must be a COOTensor or CSRTensor, but got {type(A).__name__}")
+
+    if A.values() is None:
+        raise ValueError("A sparse matrix with values is required to build a preconditioner.")
+    if A.dense_ndim != 0:
+        raise ValueError("Batched sparse matrices are not supported by preconditioners.")
+
+    crow = bm.to_numpy(A.crow()).astype(np.int64)
+    col = bm.to_numpy(A.col()).astype(np.int64)
+    val = bm.to_numpy(A.values())
+    nrow, ncol = A.sparse_shape
+    row = np.repeat(np.arange(nrow, dtype=np.int64), np.diff(crow))
+    order = np.lexsort((col, row))
+
+    return crow, col[order], val[order], (nrow, ncol)
+
+
+def _to_device(arr: np.ndarray, device) -> TensorLike:
+    return bm.device_put(bm.from_numpy(np.ascontiguousarray(arr)), device)
+
+
+class Preconditioner():
+    """Base class of preconditioners.
+
+    A preconditioner is an operator approximating the inverse of a matrix.
+    It is applied to a residual by `M @ r`, where `r` is a 1D tensor or
+    a 2D tensor shaped (dof, batch), so it can be passed to any solver
+    accepting `SupportsMatmul` objects.
+    """
+    shape: Tuple[int, int]
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        raise NotImplementedError
+
+    def __matmul__(self, r: TensorLike) -> TensorLike:
+        if r.ndim == 1:
+            return self.apply(r[:, None])[:, 0]
+        return self.apply(r)
+
+
+class _TriangularSolver():
+    """Solve (D + N) x = b, where N is strictly triangular (after an
+    unknown permutation), by level scheduling.
+
+    Rows are grouped into levels such that each row depends only on the rows
+    of the previous levels. Rows in a level are then solved together by
+    vectorized operations, so the Python overhead is proportional to the
+    number of levels rather than the number of rows.
+    """
+    def __init__(self, row: np.ndarray, col: np.ndarray, val: np.ndarray,
+                 diag: np.ndarray, device=None) -> None:
+        n = diag.shape[0]
+        levels = self._levels(row, col, n)
+        rank = np.empty(n, dtype=np.int64)
+        level_of = np.empty(n, dtype=np.int64)
+        self.levels = []
+
+        for k, rows in enumerate(levels):
+            rank[rows] = np.arange(rows.shape[0])
+            level_of[rows] = k
+
+        order = np.argsort(level_of[row], kind='stable')
+        bounds = np.searchsorted(level_of[row][order], np.arange(len(levels) + 1))
+        inv_diag = 1.0 / diag
+
+        for k, rows in enumerate(levels):
+            entry = order[bounds[k]:bounds[k+1]]
+            self.levels.append((
+                _to_device(rows, device),
+                _to_device(inv_diag[rows], device),
+                _to_device(rank[row[entry]], device),
+                _to_device(col[entry], device),
+                _to_device(val[entry], device)
+            ))
+
+    @staticmethod
+    def _levels(row: np.ndarray, col: np.ndarray, n: int):
+        """Group the rows into levels by a breadth-first topological sort
+        (Kahn's algorithm) on the dependency graph `row <- col`."""
+        indegree = np.bincount(row, minlength=n)
+        order = np.argsort(col, kind='stable')
+        dependent = row[order]
+        tptr = np.zeros(n + 1, dtype=np.int64)
+        tptr[1:] = np.cumsum(np.bincount(col, minlength=n))
+        frontier = np.nonzero(indegree == 0)[0]
+        levels = []
+        visited = 0
+
+        while frontier.shape[0] > 0:
+            levels.append(frontier)
+            visited += frontier.shape[0]
+            start, stop = tptr[frontier], tptr[frontier + 1]
+            count = stop - start
+            total = np.sum(count)
+            if total == 0:
+                break
+            offset = np.repeat(start - np.cumsum(count) + count, count)
+            affected = dependent[offset + np.arange(total)]
+            indegree -= np.bincount(affected, minlength=n)
+            affected = np.unique(affected)
+            frontier = affected[indegree[affected] == 0]
+
+        if visited != n:
+            raise ValueError("The off-diagonal part of a triangular factor "
+                             "must not contain cycles.")
+
+        return levels
+
+    def solve(self, b: TensorLike) -> TensorLike:
+        x = bm.zeros_like(b)
+
+        for rows, inv_diag, local, col, val in self.levels:
+            s = b[rows]
+            if col.shape[0] > 0:
+                contrib = val[:, None] * x[col]
+                s = s - bm.index_add(bm.zeros_like(s), local, contrib, axis=0)
+            x = bm.set_at(x, rows, s * inv_diag[:, None])
+
+        return x
+
+
+class JacobiPreconditioner(Preconditioner):
+    """The (point-block) Jacobi preconditioner.
+
+    Parameters:
+        A (COOTensor | CSRTensor): The matrix to be preconditioned.\n
+        block_size (int, optional): Size of the diagonal blocks. The dofs
+            `i*block_size, ..., (i+1)*block_size - 1` form the i-th block,
+            which is the case of vector spaces with the 'gd-priority' layout.
+            Defaults to 1, using the scalar diagonal.
+    """
+    def __init__(self, A: _SparseMatrix, block_size: int=1) -> None:
+        crow, col, val, shape = _csr_arrays(A)
+        n = shape[0]
+        row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+        device = bm.get_device(A.values())
+        self.shape = shape
+        self.block_size = block_size
+
+        if block_size == 1:
+            diag = np.zeros(n, dtype=val.dtype)
+            flag = row == col
+            np.add.at(diag, row[flag], val[flag])
+            if np.any(diag == 0):
+                raise ValueError("Jacobi preconditioner requires a non-zero diagonal.")
+            self.inv_diag = _to_device(1.0 / diag, device)
+
+        else:
+            if n % block_size != 0:
+                raise ValueError(f"The size of matrix ({n}) is not a multiple of "
+                                 f"block_size ({block_size}).")
+            NB = n // block_size
+            flag = (row // block_size) == (col // block_size)
+            blocks = np.zeros((NB, block_size, block_size), dtype=val.dtype)
+            np.add.at(blocks, (row[flag] // block_size, row[flag] % block_size,
+                               col[flag] % block_size), val[flag])
+            self.inv_blocks = _to_device(np.linalg.inv(blocks), device)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        if self.block_size == 1:
+            return self.inv_diag[:, None] * r
+
+        k = self.block_size
+        r = bm.reshape(r, (-1, k, r.shape[-1]))
+        z = bm.einsum('bij, bjn -> bin', self.inv_blocks, r)
+        return bm.reshape(z, (-1, r.shape[-1]))
+
+
+class SSORPreconditioner(Preconditioner):
+    """The symmetric successive over-relaxation (SSOR) preconditioner
+
+        M = w/(2-w) (D/w + L) (D/w)^{-1} (D/w + U),
+
+    where D, L and U are the diagonal, strictly lower and strictly upper parts
+    of A. M is symmetric positive definite if A is, so it can be used in PCG.
+
+    Parameters:
+        A (COOTensor | CSRTensor): The matrix to be preconditioned.\n
+        omega (float, optional): The relaxation factor in (0, 2). Defaults to 1.0,
+            which is the symmetric Gauss-Seidel preconditioner.
+    """
+    def __init__(self, A: _SparseMatrix, omega: float=1.0) -> None:
+        if not (0.0 < omega < 2.0):
+            raise ValueError(f"omega must be in (0, 2), but got {omega}.")
+
+        crow, col, val, shape = _csr_arrays(A)
+        n = shape[0]
+        row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+        device = bm.get_device(A.values())
+        self.shape = shape
+        self.omega = omega
+
+        diag = np.zeros(n, dtype=val.dtype)
+        flag = row == col
+        np.add.at(diag, row[flag], val[flag])
+        if np.any(diag == 0):
+            raise ValueError("SSOR preconditioner requires a non-zero diagonal.")
+
+        diag = diag / omega
+        lower, upper = row > col, row < col
+        self.lower = _TriangularSolver(row[lower], col[lower], val[lower], diag, device)
+        self.upper = _TriangularSolver(row[upper], col[upper], val[upper], diag, device)
+        self.diag = _to_device(diag * (2.0 - omega) / omega, device)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        y = self.lower.solve(r)
+        return self.upper.solve(self.diag[:, None] * y)
+
+
+def _ilu0(crow: np.ndarray, col: np.ndarray, val: np.ndarray, n: int) -> np.ndarray:
+    """Incomplete LU factorization with zero fill-in (IKJ variant).
+
+    Returns the values of L (unit lower, strict part) and U (upper with the
+    diagonal) in the pattern of A. Column indices must be sorted in rows.
+
+    Rows are factorized level by level, grouped like the rows of the lower
+    triangular solve, as a row only reads the rows of its lower part. In a
+    level, the t-th lower entries of all rows are eliminated together, so
+    the Python overhead is proportional to the number of levels times the
+    number of lower entries in a row.
+    """
+    lu = val.astype(np.result_type(val.dtype, np.float64), copy=True)
+    row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+    key = row * n + col # sorted, as columns are sorted in rows
+    diag_ptr = np.full(n, -1, dtype=np.int64)
+    flag = row == col
+    diag_ptr[row[flag]] = np.nonzero(flag)[0]
+    if np.any(diag_ptr < 0):
+        i = int(np.argmax(diag_ptr < 0))
+        raise ValueError(f"Zero pivot in row {i} of the incomplete factorization.")
+
+    lower = row > col
+    # the lower entries come first in a row
+    nlower = np.bincount(row[lower], minlength=n)
+
+    for rows in _TriangularSolver._levels(row[lower], col[lower], n):
+        for t in range(int(np.max(nlower[rows], initial=0))):
+            rows_t = rows[nlower[rows] > t]
+            p = crow[rows_t] + t
+            k = col[p]
+            lu[p] /= lu[diag_ptr[k]]
+            # update row i with the upper part of row k, inside the pattern of row i
+            start, stop = diag_ptr[k] + 1, crow[k + 1]
+            count = stop - start
+            total = np.sum(count)
+            if total == 0:
+                continue
+            pair = np.repeat(np.arange(p.shape[0]), count)
+            src = np.arange(total) + np.repeat(start - np.cumsum(count) + count, count)
+            target = rows_t[pair] * n + col[src]
+            pos = np.minimum(np.searchsorted(key, target), key.shape[0] - 1)
+            hit = key[pos] == target
+            lu[pos[hit]] -= lu[p[pair[hit]]] * lu[src[hit]]
+
+        zero = lu[diag_ptr[rows]] == 0
+        if np.any(zero):
+            raise ValueError(f"Zero pivot in row {rows[zero][0]} of the incomplete factorization.")
+
+    return lu
+
+
+class ILU0Preconditioner(Preconditioner):
+    """The incomplete LU preconditioner without fill-in, ILU(0).
+
+    The factors L and U share the sparsity pattern of A. The factorization
+    is done on the host once, and the triangular solves are level-scheduled
+    on the device of A.
+
+    Parameters:
+        A (COOTensor | CSRTensor): The matrix to be preconditioned.
+    """
+    def __init__(self, A: _SparseMatrix) -> None:
+        crow, col, val, shape = _csr_arrays(A)
+        n = shape[0]
+        row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+        device = bm.get_device(A.values())
+        self.shape = shape
+
+        lu = _ilu0(crow, col, val, n)
+        diag = lu[row == col]
+        lower, upper = row > col, row < col
+        self.lower = _TriangularSolver(row[lower], col[lower], lu[lower],
+                                       np.ones_like(diag), device)
+        self.upper = _TriangularSolver(row[upper], col[upper], lu[upper], diag, device)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        return self.upper.solve(self.lower.solve(r))
+
+
+class IC0Preconditioner(Preconditioner):
+    """The incomplete Cholesky preconditioner without fill-in, IC(0),
+    for symmetric positive definite matrices.
+
+    It is applied in the form M = L D L^T, where L is unit lower triangular,
+    so that the preconditioner is symmetric and can be used in PCG and MINRES.
+
+    Parameters:
+        A (COOTensor | CSRTensor): The symmetric matrix to be preconditioned.
+    """
+    def __init__(self, A: _SparseMatrix) -> None:
+        crow, col, val, shape = _csr_arrays(A)
+        n = shape[0]
+        row = np.repeat(np.arange(n, dtype=np.int64), np.diff(crow))
+        device = bm.get_device(A.values())
+        self.shape = shape
+
+        # For a symmetric A, ILU(0) gives U = D L^T in the same pattern.
+        lu = _ilu0(crow, col, val, n)
+        diag = lu[row == col]
+        if np.any(diag <= 0):
+            raise ValueError("Incomplete Cholesky factorization breaks down, "
+                             "the matrix may not be positive definite.")
+        lower = row > col
+        ones = np.ones_like(diag)
+        self.lower = _TriangularSolver(row[lower], col[lower], lu[lower], ones, device)
+        self.upper = _TriangularSolver(col[lower], row[lower], lu[lower], ones, device)
+        self.inv_diag = _to_device(1.0 / diag, device)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        y = self.lower.solve(r)
+        return self.upper.solve(self.inv_diag[:, None] * y)
+
+
+class BlockDiagonalPreconditioner(Preconditioner):
+    """The block-diagonal preconditioner diag(M_1, M_2, ..., M_k).
+
+    Each block acts on a consecutive segment of the dofs, for example the
+    velocity and pressure unknowns of a saddle point system.
+
+    Parameters:
+        blocks (Sequence[SupportsMatmul]): Operators approximating the inverse
+            of each diagonal block, applied by `@`.\n
+        sizes (Sequence[int]): Number of dofs of each block.
+    """
+    def __init__(self, blocks: Sequence, sizes: Sequence[int]) -> None:
+        if len(blocks) != len(sizes):
+            raise ValueError(f"Number of blocks ({len(blocks)}) and sizes "
+                             f"({len(sizes)}) do not match.")
+        self.blocks = tuple(blocks)
+        self.sizes = tuple(int(s) for s in sizes)
+        self.offsets = tuple(np.cumsum((0,) + self.sizes).tolist())
+        n = self.offsets[-1]
+        self.shape = (n, n)
+
+    @classmethod
+    def from_matrix(cls, A: _SparseMatrix, sizes: Sequence[int],
+                    factory: Callable[..., Preconditioner]=JacobiPreconditioner,
+                    **kwargs) -> 'BlockDiagonalPreconditioner':
+        """Build the preconditioner from the diagonal blocks of A.
+
+        Parameters:
+            A (COOTensor | CSRTensor): The block matrix.\n
+            sizes (Sequence[int]): Number of dofs of each block.\n
+            factory (Callable, optional): Constructor of the preconditioner of
+                each block, called as `factory(A_ii, **kwargs)`.
+                Defaults to JacobiPreconditioner.
+
+        Returns:
+            BlockDiagonalPreconditioner: The preconditioner.
+        """
+        crow, col, val, shape = _csr_arrays(A)
+        row = np.repeat(np.arange(shape[0], dtype=np.int64), np.diff(crow))
+        offsets = np.cumsum((0,) + tuple(sizes))
+        if offsets[-1] != shape[0]:
+            raise ValueError(f"Sum of sizes ({offsets[-1]}) does not match "
+                             f"the size of the matrix ({shape[0]}).")
+        device = bm.get_device(A.values())
+        blocks = []
+
+        for k in range(len(sizes)):
+            lo, hi = offsets[k], offsets[k+1]
+            flag = (row >= lo) & (row < hi) & (col >= lo) & (col < hi)
+            indices = np.stack([row[flag] - lo, col[flag] - lo], axis=0)
+            sub = COOTensor(_to_device(indices, device), _to_device(val[flag], device),
+                            spshape=(hi - lo, hi - lo))
+            blocks.append(factory(sub, **kwargs))
+
+        return cls(blocks, sizes)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        parts = []
+
+        for k, block in enumerate(self.blocks):
+            lo, hi = self.offsets[k], self.offsets[k+1]
+            parts.append(block @ r[lo:hi])
+
+        return bm.concat(parts, axis=0)
@@ -0,0 +1,103 @@
+
+from typing import Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike as _DT
+
+_Size = Tuple[int, ...]
+
+
+def same_pattern(index1: Tuple[_DT, ...], index2: Tuple[_DT, ...]) -> bool:
+    """Whether two sparse index structures (e.g. (crow, col) or (indices,))
+    are identical, checking object identity before the content."""
+    if all(a is b for a, b in zip(index1, index2)):
+        return True
+    for a, b in zip(index1, index2):
+        if tuple(a.shape) != tuple(b.shape):
+            return False
+    return all(bool(bm.all(a == b)) for a, b in zip(index1, index2))
+
+
+def _strictly_increasing(key: _DT) -> bool:
+    if key.shape[0] < 2:
+        return True
+    return bool(bm.all(key[1:] > key[:-1]))
+
+
+def _merge_slots(key1: _DT, key2: _DT) -> Tuple[_DT, _DT, _DT]:
+    """Merge two strictly increasing key arrays in O(nnz) memory.
+
+    Returns the merged unique keys and the slots of key1 and key2 in it.
+    """
+    n1, n2 = key1.shape[0], key2.shape[0]
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(key1)}
+    # Positions in the merged sequence: entries of key1 go before equal
+    # entries of key2, so duplicates end up adjacent.
+    pos1 = bm.arange(n1, **kwargs) + bm.astype(bm.searchsorted(key2, key1, side='left'), bm.int64)
+    pos2 = bm.arange(n2, **kwargs) + bm.astype(bm.searchsorted(key1, key2, side='right'), bm.int64)
+
+    merged = bm.zeros((n1 + n2,), dtype=key1.dtype, device=bm.get_device(key1))
+    merged = bm.set_at(merged, pos1, key1)
+    merged = bm.set_at(merged, pos2, key2)
+
+    is_new = bm.concat([
+        bm.ones((min(n1 + n2, 1),), dtype=bm.bool, device=bm.get_device(key1)),
+        merged[1:] != merged[:-1]
+    ], axis=0)
+    slot = bm.cumsum(bm.astype(is_new, bm.int64), axis=0) - 1
+
+    return merged[is_new], slot[pos1], slot[pos2]
+
+
+def spadd_csr(crow1: _DT, col1: _DT, values1: Optional[_DT],
+              crow2: _DT, col2: _DT, values2: Optional[_DT],
+              spshape: _Size, alpha=1) -> Tuple[_DT, _DT, Optional[_DT]]:
+    """Sum of two CSR matrices, matrix1 + alpha * matrix2.
+
+    Identical patterns are added value by value. Otherwise, if both matrices
+    have sorted and unique columns in each row, the patterns are merged
+    without a global sort. Other inputs fall back to sorting all entries.
+
+    Returns:
+        Tuple[Tensor, Tensor, Tensor | None]: crow, col and values of the sum.
+    """
+    if same_pattern((crow1, col1), (crow2, col2)):
+        if values1 is None:
+            return bm.copy(crow1), bm.copy(col1), None
+        return bm.copy(crow1), bm.copy(col1), values1 + alpha * values2
+
+    nrow, ncol = spshape
+    device = bm.get_device(crow1)
+    kwargs = {'dtype': bm.int64, 'device': device}
+    itype = col1.dtype
+
+    def _keys(crow, col):
+        crow = bm.astype(crow, bm.int64)
+        row = bm.repeat(bm.arange(nrow, **kwargs), crow[1:] - crow[:-1])
+        return row * ncol + bm.astype(col, bm.int64)
+
+    key1, key2 = _keys(crow1, col1), _keys(crow2, col2)
+
+    if _strictly_increasing(key1) and _strictly_increasing(key2):
+        ukey, slot1, slot2 = _merge_slots(key1, key2)
+    else:
+        ukey, inverse = bm.unique(bm.concat([key1, key2], axis=0), return_inverse=True)
+        slot1, slot2 = inverse[:key1.shape[0]], inverse[key1.shape[0]:]
+
+    row = ukey // ncol
+    counts = bm.zeros((nrow,), **kwargs)
+    counts = bm.index_add(counts, row, bm.ones_like(row))
+    crow = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(counts, axis=0)], axis=0)
+    crow = bm.astype(crow, crow1.dtype)
+    col = bm.astype(ukey % ncol, itype)
+
+    if values1 is None:
+        return crow, col, None
+
+    shape = values1.shape[:-1] + (ukey.shape[0],)
+    dtype = (values1[..., :0] + values2[..., :0]).dtype
+    values = bm.zeros(shape, dtype=dtype, device=bm.get_device(values1))
+    values = bm.index_add(values, slot1, values1, axis=-1)
+    values = bm.index_add(values, slot2, alpha * values2, axis=-1)
+
+    return crow, col, values
@@ -1,5 +1,5 @@
 
-from typing import Tuple
+from typing import Tuple, Optional
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike as _DT
@@ -17,97 +17,148 @@ def _shape_check(spshape1: _Size, spshape2: _Size):
                         f"got shape {spshape1} and {spshape2}.")
 
 
-def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
-               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+class SpspmmPlan():
+    """The symbolic part of a sparse-sparse matrix product C = A @ B.
+
+    The plan holds the coalesced pattern of C in both CSR (`crow`, `col`) and
+    COO (`indices`) forms, and for every elementary product A[i, k] * B[k, j]
+    the positions of its two factors in the value arrays of A and B and its
+    slot in C. With a plan, the numeric product is a gather, a multiplication
+    and a single `index_add`, so products of matrices sharing the patterns of
+    A and B (for example in Newton or time steps) skip the sorting.
+
+    Use `spspmm_symbolic_csr` or `spspmm_symbolic_coo` to build a plan.
+
+    Parameters:
+        left (Tensor): Positions in the values of A of all elementary products.\n
+        right (Tensor): Positions in the values of B of all elementary products.\n
+        key (Tensor): Sorted unique flattened positions (row*ncol + col) in C.\n
+        inverse (Tensor): Slots in C of all elementary products.\n
+        spshape (Tuple[int, int]): Sparse shape of C.\n
+        nnz1 (int): Number of entries of A.\n
+        nnz2 (int): Number of entries of B.
+    """
+    def __init__(self, left: _DT, right: _DT, key: _DT, inverse: _DT,
+                 spshape: _Size, nnz1: int, nnz2: int) -> None:
+        nrow, ncol = spshape
+        device = bm.get_device(key)
+        self.left = left
+        self.right = right
+        self.inverse = inverse
+        self.spshape = (nrow, ncol)
+        self.nnz1, self.nnz2 = nnz1, nnz2
+
+        row = key // ncol
+        counts = bm.zeros((nrow,), dtype=bm.int64, device=device)
+        counts = bm.index_add(counts, row, bm.ones_like(row))
+        ZERO = bm.zeros((1,), dtype=bm.int64, device=device)
+        self.crow = bm.concat([ZERO, bm.cumsum(counts, axis=0)], axis=0)
+        self.col = key % ncol
+        self.indices = bm.stack([row, self.col], axis=0)
+
+    @property
+    def nnz(self) -> int:
+        return self.col.shape[0]
+
+    def numeric(self, values1: _DT, values2: _DT) -> _DT:
+        """Values of C in the order of the pattern.
+
+        Parameters:
+            values1 (Tensor): Values of A shaped (*dense, nnz1).\n
+            values2 (Tensor): Values of B shaped (*dense, nnz2), with the same dense shape.
+
+        Returns:
+            Tensor: Values of C shaped (*dense, nnz).
+        """
+        if values1.shape[-1] != self.nnz1 or values2.shape[-1] != self.nnz2:
+            raise ValueError(f"the plan expects {self.nnz1} and {self.nnz2} entries, "
+                             f"but got {values1.shape[-1]} and {values2.shape[-1]}.")
+        structure = values1.shape[:-1]
+        if values2.shape[:-1] != structure:
+            raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
+                             f"must match that of matrix1 {structure}")
+
+        values = values1[..., self.left] * values2[..., self.right]
+        new_values = bm.zeros(structure + (self.nnz,), dtype=values.dtype,
+                              device=bm.get_device(values))
+        return bm.index_add(new_values, self.inverse, values, axis=-1)
+
+
+def _expand_compress(row1: _DT, col1: _DT, crow2: _DT, col2: _DT,
+                     spshape1: _Size, spshape2: _Size):
+    """Expand-sort-compress on the patterns. Matrix1 is given by the row and
+    column of every entry in any order, and matrix2 in the CSR layout."""
+    ncol = spshape2[1]
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(crow2)}
+
+    # Expand: every entry (i, k) of matrix1 meets all entries of the k-th row
+    # of matrix2, giving products at (i, j).
+    count = (crow2[1:] - crow2[:-1])[col1]
+    end = bm.cumsum(count, axis=0)
+    total = int(end[-1]) if end.shape[0] > 0 else 0
+    left = bm.repeat(bm.arange(col1.shape[0], **kwargs), count)
+    right = bm.arange(total, **kwargs) + bm.repeat(crow2[:-1][col1] - end + count, count)
+
+    # Sort & compress: merge the products at the same position.
+    key = row1[left] * ncol + col2[right]
+    ukey, inverse = bm.unique(key, return_inverse=True)
+    return left, right, ukey, inverse
+
+
+def spspmm_symbolic_csr(crow1: _DT, col1: _DT, spshape1: _Size,
+                        crow2: _DT, col2: _DT, spshape2: _Size) -> SpspmmPlan:
+    """Symbolic phase of the product of two CSR matrices."""
     _shape_check(spshape1, spshape2)
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(crow1)}
+    crow1, col1 = bm.astype(crow1, bm.int64), bm.astype(col1, bm.int64)
+    crow2, col2 = bm.astype(crow2, bm.int64), bm.astype(col2, bm.int64)
+    row1 = bm.repeat(bm.arange(spshape1[0], **kwargs), crow1[1:] - crow1[:-1])
+    left, right, ukey, inverse = _expand_compress(row1, col1, crow2, col2, spshape1, spshape2)
 
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
-
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-
-    for i in range(size):
-        left_col_flag = (indices1[1, :] == i)
-
-        if not bm.any(left_col_flag, axis=0):
-            continue
-
-        right_row_flag = (indices2[0, :] == i)
+    return SpspmmPlan(left, right, ukey, inverse, (spshape1[0], spshape2[1]),
+                      col1.shape[0], col2.shape[0])
 
-        if not bm.any(right_row_flag, axis=0):
-            continue
 
-        row = indices1[0, left_col_flag]
-        col = indices2[1, right_row_flag]
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.meshgrid(row, col, indexing='ij')
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., right_row_flag]
-
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-        indices_list.append(idx)
-        values_list.append(val)
-
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-    return indices, values, (spshape1[0], spshape2[1])
-
-
-def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
-               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+def spspmm_symbolic_coo(indices1: _DT, spshape1: _Size,
+                        indices2: _DT, spshape2: _Size) -> SpspmmPlan:
+    """Symbolic phase of the product of two COO matrices, which need not be
+    sorted or coalesced."""
     _shape_check(spshape1, spshape2)
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(indices1)}
+    indices1 = bm.astype(indices1, bm.int64)
+    indices2 = bm.astype(indices2, bm.int64)
 
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
+    # Bucket the entries of matrix2 by rows.
+    order = bm.argsort(indices2[0], stable=True)
+    counts = bm.zeros((spshape2[0],), **kwargs)
+    counts = bm.index_add(counts, indices2[0], bm.ones_like(indices2[0]))
+    crow2 = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(counts, axis=0)], axis=0)
+    col2 = indices2[1, order]
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-    new_crow = bm.zeros(size+1,dtype=bm.int64)
+    left, right, ukey, inverse = _expand_compress(indices1[0], indices1[1], crow2, col2,
+                                                  spshape1, spshape2)
 
-    for i in range(size):
-        row = bm.array([],dtype=bm.int64)
-        left_col_flag = (col1 == i)
+    return SpspmmPlan(left, order[right], ukey, inverse, (spshape1[0], spshape2[1]),
+                      indices1.shape[1], indices2.shape[1])
 
-        for x in bm.where(left_col_flag == True)[0]+1:
-            flag = ~(x>crow1[:-1])^(x<=crow1[1:])
-            row = bm.concat((row,(bm.where(flag == True))[0]))
 
-        col = col2[crow2[i]:crow2[i+1]]
-
-        if not bm.any(row, axis=0):
-            continue
-
-        if not bm.any(col, axis=0):
-            continue
-
-        idx = bm.meshgrid(row, col, indexing='ij')
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., crow2[i]:crow2[i+1]]
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-
-        indices_list.append(idx)
-        values_list.append(val)
-
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-
-    unique_indices, inverse_indices = bm.unique(indices, return_inverse=True, axis=1)
-    new_values = bm.zeros(unique_indices.shape[1])
-    new_values = bm.index_add(new_values, inverse_indices, values, axis=-1)
-
-    for x in unique_indices[0,:]:
-        new_crow[x+1]+=1
+def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
+               indices2: _DT, values2: _DT, spshape2: _Size, *,
+               plan: Optional[SpspmmPlan]=None) -> Tuple[_DT, _DT, _Size]:
+    """Product of two COO matrices, returning the coalesced indices and values.
+    The `plan` from `spspmm_symbolic_coo` skips the symbolic phase."""
+    if plan is None:
+        plan = spspmm_symbolic_coo(indices1, spshape1, indices2, spshape2)
+    values = plan.numeric(values1, values2)
+    return bm.astype(plan.indices, indices1.dtype), values, plan.spshape
 
-    new_crow=bm.cumsum(new_crow)
 
-    return new_crow, unique_indices[1,:], new_values,(spshape1[0], spshape2[1])
+def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
+               crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size, *,
+               plan: Optional[SpspmmPlan]=None) -> Tuple[_DT, _DT, _DT, _Size]:
+    """Product of two CSR matrices. The `plan` from `spspmm_symbolic_csr`
+    skips the symbolic phase."""
+    if plan is None:
+        plan = spspmm_symbolic_csr(crow1, col1, spshape1, crow2, col2, spshape2)
+    values = plan.numeric(values1, values2)
+    return plan.crow, plan.col, values, plan.spshape
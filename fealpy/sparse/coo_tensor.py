@@ -9,7 +9,8 @@ from .utils import (
     flatten_indices, tril_coo,
     check_shape_match, check_spshape_match
 )
-from ._spspmm import spspmm_coo
+from ._spadd import same_pattern
+from ._spspmm import spspmm_coo, spspmm_symbolic_coo, SpspmmPlan
 from ._spmm import spmm_coo
 
 
@@ -304,6 +305,10 @@ class COOTensor(SparseTensor):
     def add(self, other: Union[Number, 'COOTensor', TensorLike], alpha: Number=1) -> Union['COOTensor', TensorLike]:
         """Adds another tensor or scalar to this COOTensor, with an optional scaling factor.
 
+        Two COOTensors with the same indices are added value by value, keeping
+        the pattern and the coalesced flag. Otherwise indices are concatenated
+        and left uncoalesced.
+
         Parameters:
             other (Number | COOTensor | Tensor): The tensor or scalar to be added.\n
             alpha (int | float, optional): The scaling factor for the other tensor. Defaults to 1.
@@ -320,15 +325,19 @@ class COOTensor(SparseTensor):
         if isinstance(other, COOTensor):
             check_shape_match(self.shape, other.shape)
             check_spshape_match(self.sparse_shape, other.sparse_shape)
+            if (self._values is None) != (other._values is None):
+                raise ValueError("self has no value while other does" if self._values is None
+                                 else "self has value while other does not")
+
+            if same_pattern((self._indices,), (other._indices,)):
+                new_values = None if (self._values is None) else self._values + other._values*alpha
+                return COOTensor(bm.copy(self._indices), new_values, self.sparse_shape,
+                                 is_coalesced=self.is_coalesced)
+
             new_indices = bm.concat((self._indices, other._indices), axis=1)
             if self._values is None:
-                if other._values is None:
-                    new_values = None
-                else:
-                    raise ValueError("self has no value while other does")
+                new_values = None
             else:
-                if other._values is None:
-                    raise ValueError("self has value while other does not")
                 new_values = bm.concat((self._values, other._values*alpha), axis=-1)
             return COOTensor(new_indices, new_values, self.sparse_shape)
 
@@ -420,11 +429,28 @@ class COOTensor(SparseTensor):
         else:
             raise TypeError(f'Unsupported type {type(other).__name__} in power')
 
+    def matmul_plan(self, other: 'COOTensor') -> SpspmmPlan:
+        """Symbolic phase of the product with another COOTensor.
+
+        The plan only depends on the sparsity patterns, and can be passed to
+        `matmul` for products of matrices with the same patterns.
+
+        Parameters:
+            other (COOTensor): The right matrix.
+
+        Returns:
+            SpspmmPlan: The plan of the product.
+        """
+        if not isinstance(other, COOTensor):
+            raise TypeError(f"Unsupported type {type(other).__name__} in matmul_plan")
+        return spspmm_symbolic_coo(self._indices, self.sparse_shape,
+                                   other._indices, other.sparse_shape)
+
     @overload
-    def matmul(self, other: 'COOTensor') -> 'COOTensor': ...
+    def matmul(self, other: 'COOTensor', *, plan: Optional[SpspmmPlan]=None) -> 'COOTensor': ...
     @overload
     def matmul(self, other: TensorLike) -> TensorLike: ...
-    def matmul(self, other: Union['COOTensor', TensorLike]):
+    def matmul(self, other: Union['COOTensor', TensorLike], *, plan: Optional[SpspmmPlan]=None):
         """Matrix-multiply this COOTensor with another tensor.
 
         Parameters:
@@ -432,6 +458,8 @@ class COOTensor(SparseTensor):
                 or a 2-D tensor for matrix-matrix multiply.
                 Batched matrix-matrix multiply is available for dimensions
                 (*B, M, K) and (*B, K, N). *B means any number of batch dimensions.
+            plan (SpspmmPlan, optional): Symbolic phase from `matmul_plan`, reused
+                when `other` is a COOTensor. Defaults to None.
 
         Raises:
             TypeError: If the type of `other` is not supported for matmul.
@@ -447,8 +475,9 @@ class COOTensor(SparseTensor):
             indices, values, spshape = spspmm_coo(
                 self.indices(), self.values(), self.sparse_shape,
                 other.indices(), other.values(), other.sparse_shape,
+                plan=plan
             )
-            return COOTensor(indices, values, spshape).coalesce()
+            return COOTensor(indices, values, spshape, is_coalesced=True)
 
         elif isinstance(other, TensorLike):
             if self.values() is None:
@@ -9,7 +9,8 @@ from .utils import (
     flatten_indices,
     check_shape_match, check_spshape_match
 )
-from ._spspmm import spspmm_csr
+from ._spadd import spadd_csr
+from ._spspmm import spspmm_csr, spspmm_symbolic_csr, SpspmmPlan
 from ._spmm import spmm_csr
 
 
@@ -252,6 +253,10 @@ class CSRTensor(SparseTensor):
     def add(self, other: Union[Number, 'CSRTensor', TensorLike], alpha: Number=1) -> Union['CSRTensor', TensorLike]:
         """Adds another tensor or scalar to this CSRTensor, with an optional scaling factor.
 
+        Two CSRTensors with the same `crow` and `col` are added value by value,
+        keeping the pattern. Otherwise sorted patterns are merged row by row
+        in a vectorized way, without a global sort.
+
         Parameters:
             other (Number | CSRTensor | Tensor): The tensor or scalar to be added.\n
             alpha (float, optional): The scaling factor for the other tensor. Defaults to 1.0.
@@ -274,27 +279,12 @@ class CSRTensor(SparseTensor):
             elif (not self._values is None) and (other._values is None):
                 raise ValueError("self has value while other does not")
 
-            new_crow = bm.array([0],dtype=bm.int64)
-            new_col = bm.array([],dtype=bm.int64)
-            new_values = bm.array([],dtype=bm.int64)
-
-            for i in range(0, self._crow.shape[0]-1): 
-                indices1 = self._col[self._crow[i]:self._crow[i+1]]
-                indices2 = other._col[other._crow[i]:other._crow[i+1]]
-                col, inverse_indices = bm.unique(bm.concat((indices1,indices2)), return_inverse=True)
-
-                if self._values is None:
-                    new_values = None
-                else:
-                    value1 = self._values[self._crow[i]:self._crow[i+1]]
-                    value2 = other._values[other._crow[i]:other._crow[i+1]]
-                    values = bm.zeros(col.shape[0],dtype=value2.dtype)
-                    values = bm.index_add(values, inverse_indices, bm.concat((value1,alpha*value2)), axis=-1)
-                    new_values = bm.concat((new_values,values))
-                new_crow = bm.concat((new_crow,bm.tensor([len(col)+new_crow[-1]])))
-                new_col = bm.concat((new_col,col))
-
-            return CSRTensor(new_crow, new_col,new_values ,self.sparse_shape)
+            crow, col, values = spadd_csr(
+                self._crow, self._col, self._values,
+                other._crow, other._col, other._values,
+                self.sparse_shape, alpha
+            )
+            return CSRTensor(crow, col, values, self.sparse_shape)
 
         elif isinstance(other, TensorLike):
             check_shape_match(self.shape, other.shape)
@@ -395,11 +385,28 @@ class CSRTensor(SparseTensor):
         else:
             raise TypeError(f'Unsupported type {type(other).__name__} in power')
 
+    def matmul_plan(self, other: 'CSRTensor') -> SpspmmPlan:
+        """Symbolic phase of the product with another CSRTensor.
+
+        The plan only depends on the sparsity patterns, and can be passed to
+        `matmul` for products of matrices with the same patterns.
+
+        Parameters:
+            other (CSRTensor): The right matrix.
+
+        Returns:
+            SpspmmPlan: The plan of the product.
+        """
+        if not isinstance(other, CSRTensor):
+            raise TypeError(f"Unsupported type {type(other).__name__} in matmul_plan")
+        return spspmm_symbolic_csr(self._crow, self._col, self.sparse_shape,
+                                   other._crow, other._col, other.sparse_shape)
+
     @overload
-    def matmul(self, other: 'CSRTensor') -> 'CSRTensor': ...
+    def matmul(self, other: 'CSRTensor', *, plan: Optional[SpspmmPlan]=None) -> 'CSRTensor': ...
     @overload
     def matmul(self, other: TensorLike) -> TensorLike: ...
-    def matmul(self, other: Union['CSRTensor', TensorLike]):
+    def matmul(self, other: Union['CSRTensor', TensorLike], *, plan: Optional[SpspmmPlan]=None):
         """Matrix-multiply this CSRTensor with another tensor.
 
         Parameters:
@@ -407,6 +414,8 @@ class CSRTensor(SparseTensor):
                 or a 2-D tensor for matrix-matrix multiply.
                 Batched matrix-matrix multiply is available for dimensions
                 (*B, M, K) and (*B, K, N). *B means any number of batch dimensions.
+            plan (SpspmmPlan, optional): Symbolic phase from `matmul_plan`, reused
+                when `other` is a CSRTensor. Defaults to None.
 
         Raises:
             TypeError: If the type of `other` is not supported for matmul.
@@ -419,9 +428,10 @@ class CSRTensor(SparseTensor):
             if (self.values() is None) or (other.values() is None):
                 raise ValueError("Matrix multiplication between CSRTensor without "
                                  "value is not implemented now")
-            crow, col,values, spshape = spspmm_csr(
-                self._crow,self._col ,self._values, self.sparse_shape,
-                other._crow, other._col,other._values, other.sparse_shape,
+            crow, col, values, spshape = spspmm_csr(
+                self._crow, self._col, self._values, self.sparse_shape,
+                other._crow, other._col, other._values, other.sparse_shape,
+                plan=plan
             )
             return CSRTensor(crow, col,values, spshape)
 
@@ -0,0 +1,103 @@
+
+import json
+
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.benchmark import (
+    BenchmarkCase, registry, time_call, run_benchmarks,
+    save_results, load_results, compare_results, format_results, format_comparison
+)
+from fealpy.benchmark.__main__ import main
+
+
+def _record(t, status='ok'):
+    return {'status': status, 'median': t, 'min': t}
+
+
+class TestBenchmark:
+    def test_time_call(self):
+        calls = []
+        stats = time_call(lambda: calls.append(1), repeat=3, warmup=2)
+        assert len(calls) == 5
+        assert len(stats['times']) == 3
+        assert stats['min'] <= stats['median'] <= max(stats['times'])
+
+        # prepare is called before every run and is not modified by it
+        prepared = []
+        time_call((lambda: prepared.append(0) or prepared, lambda x: x.pop()), repeat=2, warmup=0)
+        assert prepared == []
+
+    def test_case(self):
+        case = BenchmarkCase('x', None, {'a': [1, 2], 'b': ['u', 'v']},
+                             skip=lambda a, b: a == 2 and b == 'v')
+        assert case.variants() == [{'a': 1, 'b': 'u'}, {'a': 1, 'b': 'v'}, {'a': 2, 'b': 'u'}]
+        assert BenchmarkCase.key('x', {'a': 1, 'b': 'u'}, 'numpy') == 'x[a=1,b=u]@numpy'
+
+    def test_run(self, tmp_path):
+        bm.set_backend('numpy')
+        results = run_benchmarks('sparse.spmv,mesh.construct', backends=['numpy', 'pytorch', 'nothing'],
+                                 repeat=1, warmup=0)
+        assert bm.backend_name == 'numpy'
+        assert 'assembly.poisson' in registry
+        meta, records = results['meta'], results['results']
+        assert meta['backends']['nothing'].startswith('unavailable')
+        assert 'sparse.spmv[mesh=tetrahedron,p=2]@pytorch' in records
+        assert 'mesh.construct[mesh=hexahedron]@numpy' in records
+        assert all(r['status'] == 'ok' for r in records.values())
+        assert all(not k.startswith('assembly') for k in records)
+        assert 'sparse.spmv[mesh=triangle,p=1]@numpy' in format_results(results)
+
+        path = str(tmp_path / 'results.json')
+        save_results(results, path)
+        assert load_results(path) == json.loads(json.dumps(results))
+
+    def test_compare(self):
+        baseline = {'results': {'a@numpy': _record(1.0), 'b@numpy': _record(1.0),
+                                'c@numpy': _record(1.0), 'd@numpy': _record(1.0)}}
+        results = {'results': {'a@numpy': _record(1.1), 'b@numpy': _record(1.5),
+                               'c@numpy': _record(0.5), 'e@numpy': _record(1.0),
+                               'd@numpy': _record(None, 'error')}}
+        comparison = compare_results(results, baseline, tolerance=0.2)
+        status = {item['key']: item['status'] for item in comparison}
+        assert status == {'a@numpy': 'ok', 'b@numpy': 'regression', 'c@numpy': 'improvement',
+                          'd@numpy': 'error', 'e@numpy': 'new'}
+        assert comparison[1]['ratio'] == pytest.approx(1.5)
+        assert comparison[3]['baseline'] == 1.0
+        assert 'regression' in format_comparison(comparison)
+
+        # runs not selected for the results are not missing
+        baseline['results']['f@numpy'] = dict(_record(1.0), name='f', backend='numpy')
+        baseline['results']['a@jax'] = dict(_record(1.0), name='a', backend='jax')
+        results['meta'] = {'pattern': 'a,b,c,d,e', 'backends': {'numpy': '2.0'}}
+        comparison = compare_results(results, baseline, tolerance=0.2)
+        assert [item['key'] for item in comparison] == ['a@numpy', 'b@numpy', 'c@numpy',
+                                                        'd@numpy', 'e@numpy']
+
+    def test_main(self, tmp_path, capsys):
+        bm.set_backend('numpy')
+        path = str(tmp_path / 'baseline.json')
+        argv = ['-k', 'mesh.construct', '-b', 'numpy', '-r', '1', '-w', '0']
+        assert main(argv + ['-o', path]) == 0
+
+        # make the baseline much faster to report regressions
+        baseline = load_results(path)
+        for record in baseline['results'].values():
+            record['median'] *= 1e-6
+        save_results(baseline, path)
+        assert main(argv + ['--baseline', path]) == 1
+        assert 'regression' in capsys.readouterr().out
+
+        # a run passing in the baseline is gone, while the others are fast enough
+        for record in baseline['results'].values():
+            record['median'] *= 1e12
+        record = dict(next(iter(baseline['results'].values())))
+        baseline['results']['mesh.construct[mesh=removed]@numpy'] = record
+        save_results(baseline, path)
+        assert main(argv + ['--baseline', path]) == 1
+        out = capsys.readouterr().out
+        assert 'regression' not in out
+        assert 'missing' in out
+        del baseline['results']['mesh.construct[mesh=removed]@numpy']
+        save_results(baseline, path)
+        assert main(argv + ['--baseline', path]) == 0
@@ -0,0 +1,86 @@
+
+import os
+import json
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.cem import EITDataGenerator, EITDatasetGenerator, circles_levelset
+
+
+FREQ = [1, 2, 3]
+
+def neumann(p, *args):
+    angle = bm.atan2(p[..., 1], p[..., 0])
+    freq = bm.tensor(FREQ, **bm.context(p))
+    return bm.sin(bm.tensordot(freq, angle, axes=0))
+
+
+def _setup():
+    mesh = TriangleMesh.from_box([-1, 1, -1, 1], nx=12, ny=12)
+    pixel = mesh.entity('node')
+    rng = np.random.default_rng(0)
+    params = np.concatenate([rng.uniform(-0.5, 0.5, (7, 2)),
+                             rng.uniform(0.1, 0.3, (7, 1))], axis=-1)
+    gen = EITDatasetGenerator(mesh, (10., 1.), circles_levelset, neumann, pixel,
+                              batch_size=len(FREQ))
+    return mesh, pixel, params, gen
+
+
+class TestEITDatasetGenerator:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_run(self, backend, tmp_path):
+        bm.set_backend(backend)
+        mesh, pixel, params, gen = _setup()
+        directory = str(tmp_path / 'data')
+        manifest = gen.run(params, directory, shard_size=3)
+        assert manifest['complete'] and manifest['num_shards'] == 3
+        data = EITDatasetGenerator.load(directory)
+        assert data['gd'].shape == (7, 3, mesh.boundary_node_index().shape[0])
+        np.testing.assert_array_equal(data['index'], np.arange(7))
+
+        # the same as a single generator with CG
+        single = EITDataGenerator(mesh, p=1)
+        current = single.set_boundary(neumann, batch_size=len(FREQ))
+        label = single.set_levelset((10., 1.), lambda p: circles_levelset(p, params[4]), pixel)
+        np.testing.assert_allclose(data['gd'][4], bm.to_numpy(single.run()), atol=1e-8)
+        np.testing.assert_array_equal(data['label'][4], bm.to_numpy(label))
+        np.testing.assert_allclose(data['current'], bm.to_numpy(current))
+
+        # resume after an interruption: only the missing shard is generated
+        os.remove(os.path.join(directory, 'shard_00001.npz'))
+        mtime = os.path.getmtime(os.path.join(directory, 'shard_00002.npz'))
+        gen.run(params, directory, shard_size=3)
+        assert os.path.getmtime(os.path.join(directory, 'shard_00002.npz')) == mtime
+        resumed = EITDatasetGenerator.load(directory)
+        np.testing.assert_allclose(resumed['gd'], data['gd'])
+
+        with pytest.raises(ValueError):
+            gen.run(params[:5], directory, shard_size=3)
+        # another pixel, mesh or levelset is another dataset
+        others = [
+            EITDatasetGenerator(mesh, (10., 1.), circles_levelset, neumann, pixel[::2],
+                                batch_size=len(FREQ)),
+            EITDatasetGenerator(TriangleMesh.from_box([-1, 1, -1, 1], nx=10, ny=10),
+                                (10., 1.), circles_levelset, neumann, pixel,
+                                batch_size=len(FREQ)),
+            EITDatasetGenerator(mesh, (10., 1.), neumann, neumann, pixel,
+                                batch_size=len(FREQ))
+        ]
+        for other in others:
+            with pytest.raises(ValueError):
+                other.run(params, directory, shard_size=3)
+
+    def test_parallel(self, tmp_path):
+        bm.set_backend('numpy')
+        mesh, pixel, params, gen = _setup()
+        gen.run(params, str(tmp_path / 'serial'), shard_size=2)
+        manifest = gen.run(params, str(tmp_path / 'parallel'), shard_size=2, num_workers=2)
+        with open(tmp_path / 'parallel' / 'manifest.json') as f:
+            assert json.load(f) == manifest
+        serial = EITDatasetGenerator.load(str(tmp_path / 'serial'))
+        parallel = EITDatasetGenerator.load(str(tmp_path / 'parallel'))
+        for key in serial:
+            np.testing.assert_allclose(parallel[key], serial[key])
@@ -0,0 +1,113 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d
+from fealpy.fdm import (
+    LaplaceOperator, DiffusionOperator, GradientOperator, DivergenceOperator
+)
+
+
+def _meshes():
+    return [UniformMesh2d((0, 5, 0, 4), h=(0.2, 0.25), origin=(-1.0, 0.5)),
+            UniformMesh2d((0, 5, 0, 4), h=(0.2, 0.25), flip_direction='y'),
+            UniformMesh3d((0, 3, 0, 4, 0, 2), h=(0.5, 0.25, 0.5), origin=(0.0, 1.0, -1.0))]
+
+
+def _check_matrix(op, u):
+    A = op.assembly()
+    assert A.shape == op.shape
+    crow, col = bm.to_numpy(A.crow()), bm.to_numpy(A.col())
+    for i in range(A.shape[0]):
+        assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+    v = bm.reshape(A @ bm.reshape(u, (-1, )), (-1, ))
+    np.testing.assert_allclose(bm.to_numpy(v), bm.to_numpy(bm.reshape(op @ u, (-1, ))),
+                               atol=1e-10)
+    return A
+
+
+class TestStencilOperator:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_laplace(self, backend):
+        bm.set_backend(backend)
+        for mesh in _meshes():
+            node = mesh.entity('node')
+            GD = mesh.geo_dimension()
+            op = LaplaceOperator(mesh)
+            u = bm.sum(node**2, axis=-1)
+            A = _check_matrix(op, u)
+
+            # exact for quadratics on the interior nodes
+            isInNode = ~bm.to_numpy(mesh.boundary_node_flag())
+            np.testing.assert_allclose(bm.to_numpy(op @ u)[isInNode], -2.0 * GD, atol=1e-10)
+
+            dense = bm.to_numpy(A.to_dense())
+            np.testing.assert_allclose(dense, dense.T, atol=1e-12)
+            np.testing.assert_allclose(bm.to_numpy(op.diagonal()), np.diag(dense), atol=1e-12)
+            assert A.nnz == (2*GD + 1) * mesh.number_of_nodes() - 2 * sum(
+                mesh.number_of_nodes() // n for n in op.grid_shape)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_diffusion(self, backend):
+        bm.set_backend(backend)
+        for mesh in _meshes():
+            node = mesh.entity('node')
+            op = DiffusionOperator(mesh, coef=3.0)
+            u = bm.sin(node[:, 0]) * bm.cos(node[:, 1])
+            np.testing.assert_allclose(bm.to_numpy(op @ u),
+                                       3.0 * bm.to_numpy(LaplaceOperator(mesh) @ u), atol=1e-10)
+
+            # -∇·(a∇v) = -2 - 4x for a = 1 + x and v = x^2, exact on the interior nodes
+            op = DiffusionOperator(mesh, coef=lambda p: 1.0 + p[..., 0])
+            A = _check_matrix(op, u)
+            dense = bm.to_numpy(A.to_dense())
+            np.testing.assert_allclose(dense, dense.T, atol=1e-12)
+            isInNode = ~bm.to_numpy(mesh.boundary_node_flag())
+            v = node[:, 0]**2
+            np.testing.assert_allclose(bm.to_numpy(op @ v)[isInNode],
+                                       -bm.to_numpy(2.0 + 4.0 * node[:, 0])[isInNode], atol=1e-10)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_gradient_divergence(self, backend):
+        bm.set_backend(backend)
+        for mesh in _meshes():
+            node = mesh.entity('node')
+            GD = mesh.geo_dimension()
+            u = node[:, 0]**2 + 3.0 * node[:, 0] * node[:, 1] - node[:, -1]
+            grad = bm.stack([2.0 * node[:, 0] + 3.0 * node[:, 1],
+                             3.0 * node[:, 0] - float(GD == 2)] +
+                            ([-bm.ones_like(node[:, 0])] if GD == 3 else []), axis=-1)
+
+            # exact for quadratics, also on the boundary
+            op = GradientOperator(mesh)
+            np.testing.assert_allclose(bm.to_numpy(op @ u), bm.to_numpy(grad), atol=1e-10)
+            _check_matrix(op, u)
+
+            div = DivergenceOperator(mesh)
+            np.testing.assert_allclose(bm.to_numpy(div @ grad), 2.0, atol=1e-10)
+            _check_matrix(div, grad)
+            with pytest.raises(ValueError):
+                div.diagonal()
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_batch_and_solve(self, backend):
+        from fealpy.solver import cg
+        bm.set_backend(backend)
+        mesh = UniformMesh2d((0, 8, 0, 8), h=(0.125, 0.125))
+        NN = mesh.number_of_nodes()
+        u = bm.reshape(bm.arange(3 * NN, dtype=bm.float64), (NN, 3))
+        op = LaplaceOperator(mesh)
+        v = op @ u
+        assert v.shape == (NN, 3)
+        np.testing.assert_allclose(bm.to_numpy(v[:, 1]), bm.to_numpy(op @ u[:, 1]), atol=1e-10)
+
+        grad = GradientOperator(mesh) @ u
+        assert grad.shape == (NN, 2, 3)
+        np.testing.assert_allclose(bm.to_numpy(DivergenceOperator(mesh) @ grad)[:, 2],
+                                   bm.to_numpy(DivergenceOperator(mesh) @ grad[..., 2]), atol=1e-10)
+
+        # the matrix-free operator is a SupportsMatmul for the Krylov solvers
+        b = bm.ones((NN, ), dtype=bm.float64)
+        x = cg(op, b, atol=1e-12, rtol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(op.assembly() @ x), 1.0, atol=1e-8)
@@ -5,7 +5,8 @@ from fealpy.backend import backend_manager as bm
 from fealpy.mesh import TriangleMesh
 from fealpy.functionspace import LagrangeFESpace
 from fealpy.fem import (
-        BilinearForm, ScalarDiffusionIntegrator
+        BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator,
+        LinearForm, ScalarSourceIntegrator
     )
 
 from bilinear_form_data import *
@@ -43,6 +44,164 @@ class TestBilinearFormInterface:
         z = bm.to_numpy(bform @ x)
         assert np.linalg.norm(y-z) < 1e-12 
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("data", mesh_data)
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_assembly_plan(self, backend, data, p):
+        bm.set_backend(backend)
+
+        Mesh = mesh_map[data["class"]]
+        node = bm.from_numpy(data['node'])
+        cell = bm.from_numpy(data['cell'])
+        mesh = Mesh(node, cell)
+        space = LagrangeFESpace(mesh, p)
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator())
+        A = bform.assembly(format='csr')
+        B = bform.assembly(format='coo')
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense()),
+                                   bm.to_numpy(B.to_dense()), atol=1e-12)
+
+        # A new form on the same space reuses the sparsity pattern.
+        bform2 = BilinearForm(space)
+        bform2.add_integrator(ScalarMassIntegrator(coef=2.0))
+        bform2.add_integrator(ScalarDiffusionIntegrator())
+        C = bform2.assembly()
+        assert C.crow() is A.crow()
+        assert C.col() is A.col()
+
+        # Changing the mesh or renumbering the dofs builds a new one.
+        for change in (mesh.uniform_refine, space.reorder):
+            change()
+            bform3 = BilinearForm(space)
+            bform3.add_integrator(ScalarMassIntegrator())
+            D = bform3.assembly(format='csr')
+            E = bform3.assembly(format='coo')
+            assert D.col() is not A.col()
+            A = D
+            np.testing.assert_allclose(bm.to_numpy(D.to_dense()),
+                                       bm.to_numpy(E.to_dense()), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_mult(self, backend, p):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=3, ny=3)
+        space = LagrangeFESpace(mesh, p)
+        gdof = space.number_of_global_dofs()
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator())
+        x = bm.from_numpy(np.random.rand(gdof))
+        y = bm.to_numpy(bform.mult(x))
+        d = bm.to_numpy(bform.diagonal())
+        assert bform._M is None
+        assert len(bform.memory) == 0 # local tensors are not kept by default
+        np.testing.assert_allclose(bm.to_numpy(bform.mult(x, chunk_size=5)), y, atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(bform.diagonal(chunk_size=5)), d, atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(bform.mult(x, retain_ints=True)), y, atol=1e-12)
+        assert len(bform.memory) == 2
+
+        A = bm.to_numpy(bform.assembly().to_dense())
+        np.testing.assert_allclose(y, A @ bm.to_numpy(x), atol=1e-12)
+        np.testing.assert_allclose(d, np.diag(A), atol=1e-12)
+
+        X = bm.from_numpy(np.random.rand(2, gdof))
+        Y = bm.to_numpy(bform.mult(X))
+        np.testing.assert_allclose(Y, bm.to_numpy(X) @ A.T, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_matrix_free_cg(self, backend):
+        from fealpy.solver import cg
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        gdof = space.number_of_global_dofs()
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator())
+        f = bm.from_numpy(np.random.rand(gdof))
+        u = cg(bform, f, atol=1e-14, rtol=1e-12)
+        assert bform._M is None
+
+        A = bform.assembly()
+        np.testing.assert_allclose(bm.to_numpy(A @ u), bm.to_numpy(f), atol=1e-8)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("chunk_size", [1, 5, 100])
+    def test_chunked_assembly(self, backend, chunk_size):
+        from fealpy.mesh import TetrahedronMesh
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        space = LagrangeFESpace(mesh, 2)
+        NC = mesh.number_of_cells()
+        coef = bm.from_numpy(np.random.rand(NC))
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=coef))
+        bform.add_integrator(ScalarMassIntegrator(index=bm.arange(0, NC, 2)))
+        A = bm.to_numpy(bform.assembly().to_dense())
+        B = bm.to_numpy(bform.assembly(chunk_size=chunk_size).to_dense())
+        np.testing.assert_allclose(A, B, atol=1e-12)
+
+        lform = LinearForm(space)
+        lform.add_integrator(ScalarSourceIntegrator(source=coef))
+        F = bm.to_numpy(lform.assembly())
+        G = bm.to_numpy(lform.assembly(chunk_size=chunk_size))
+        np.testing.assert_allclose(F, G, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("num_threads", [0, 2])
+    def test_chunked_cell_to_dof(self, backend, num_threads):
+        from fealpy.mesh import TetrahedronMesh
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        space = LagrangeFESpace(mesh, 2)
+        NC = mesh.number_of_cells()
+        rows = []
+        cell_to_dof = space.dof.cell_to_dof
+
+        def recorded(index=slice(None)):
+            c2d = cell_to_dof(index)
+            rows.append(c2d.shape[0])
+            return c2d
+
+        space.dof.cell_to_dof = recorded
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.assembly(chunk_size=5, num_threads=num_threads)
+        # the map built for the sparsity pattern is sliced for the chunks
+        assert rows == [NC]
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("num_threads", [2, 4])
+    @pytest.mark.parametrize("use_partition", [False, True])
+    def test_parallel_assembly(self, backend, num_threads, use_partition):
+        from fealpy.mesh import TetrahedronMesh
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        space = LagrangeFESpace(mesh, 2)
+        NC = mesh.number_of_cells()
+        coef = bm.from_numpy(np.random.rand(NC))
+        partition = bm.from_numpy(np.arange(NC) % 3) if use_partition else None
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(coef=coef))
+        bform.add_integrator(ScalarMassIntegrator())
+        A = bm.to_numpy(bform.assembly().to_dense())
+        B = bform.assembly(num_threads=num_threads, partition=partition)
+        np.testing.assert_allclose(A, bm.to_numpy(B.to_dense()), atol=1e-12)
+
+        lform = LinearForm(space)
+        lform.add_integrator(ScalarSourceIntegrator(source=coef))
+        F = bm.to_numpy(lform.assembly())
+        G = bm.to_numpy(lform.assembly(num_threads=num_threads, partition=partition))
+        np.testing.assert_allclose(F, G, atol=1e-12)
+
 
 if __name__ == "__main__":
     pytest.main(['./test_bilinear_form.py', '-k', 'test_matmul'])
@@ -0,0 +1,64 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, DirichletBC
+
+
+class TestDirichletBC:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_apply_csr(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        A = bform.assembly(format='csr')
+        F = bm.ones((A.shape[0], ), dtype=bm.float64)
+
+        bc = DirichletBC(space, gd=0.0)
+        A1, F1 = bc.apply(A, F)
+
+        isDDof = bm.to_numpy(space.is_boundary_dof())
+        A0 = bm.to_numpy(A.to_dense())
+        A1 = bm.to_numpy(A1.to_dense())
+        np.testing.assert_allclose(A1[np.ix_(~isDDof, ~isDDof)], A0[np.ix_(~isDDof, ~isDDof)])
+        np.testing.assert_allclose(A1[isDDof][:, isDDof], np.eye(isDDof.sum()))
+        np.testing.assert_allclose(A1[isDDof][:, ~isDDof], 0.)
+        np.testing.assert_allclose(bm.to_numpy(F1)[isDDof], 0.)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("format", ['csr', 'coo'])
+    def test_apply_inplace(self, backend, format):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bc = DirichletBC(space, gd=lambda p: p[..., 0] + p[..., 1])
+
+        A = bform.assembly(format=format)
+        if format == 'coo':
+            A = A.coalesce()
+        A0 = bm.to_numpy(A.to_dense())
+        expected = bm.to_numpy(bc.apply_matrix(A).to_dense())
+        F = bm.ones((A.shape[0], ), dtype=bm.float64)
+        F_expected = bm.to_numpy(bc.apply_vector(F, A))
+
+        correction, ud = bc.lifting(A)
+        nnz = A.nnz
+        for _ in range(2): # the second call reuses the cached positions
+            A1 = bc.apply_matrix(A.copy(), inplace=True)
+            assert A1.nnz == nnz
+            np.testing.assert_allclose(bm.to_numpy(A1.to_dense()), expected)
+
+        F1 = bm.set_at(F - correction, bc.boundary_dof_index, ud[bc.boundary_dof_index])
+        np.testing.assert_allclose(bm.to_numpy(F1), F_expected)
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense()), A0)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -0,0 +1,99 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.decorator import cartesian
+from fealpy.mesh import QuadrangleMesh, HexahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import (
+    BilinearForm,
+    ScalarMassIntegrator,
+    ScalarDiffusionIntegrator,
+    ScalarConvectionIntegrator
+)
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _mesh(TD):
+    if TD == 2:
+        return QuadrangleMesh.from_box([0, 1, 0, 2], nx=3, ny=2)
+    return HexahedronMesh.from_box([0, 1, 0, 2, 0, 1], nx=2, ny=2, nz=1)
+
+
+@cartesian
+def velocity(p):
+    return bm.stack([1.0 + p[..., 1], -2.0 * p[..., 0], 0.5 + p[..., 0]][:p.shape[-1]], axis=-1)
+
+
+def _integrators(TD, method=None):
+    b = velocity
+    return [
+        ScalarMassIntegrator(2.0, method=method),
+        ScalarDiffusionIntegrator(method=method),
+        ScalarConvectionIntegrator(b, method=method),
+    ]
+
+
+class TestSumFactorization:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("TD, p", [(2, 1), (2, 2), (2, 4), (3, 1), (3, 2)])
+    def test_element_matrix(self, backend, TD, p):
+        _set_backend(backend)
+        space = LagrangeFESpace(_mesh(TD), p=p)
+        for default, sumfac in zip(_integrators(TD), _integrators(TD, 'sumfac')):
+            np.testing.assert_allclose(bm.to_numpy(sumfac(space)),
+                                       bm.to_numpy(default(space)), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("TD, p", [(2, 3), (3, 2)])
+    def test_matrix_free(self, backend, TD, p):
+        _set_backend(backend)
+        space = LagrangeFESpace(_mesh(TD), p=p)
+        gdof = space.number_of_global_dofs()
+
+        bform = BilinearForm(space)
+        bform.add_integrator(_integrators(TD))
+        A = bform.assembly(format='csr')
+
+        mform = BilinearForm(space)
+        mform.add_integrator(_integrators(TD, 'sumfac'))
+        assert all(int_.matrix_free for int_ in _integrators(TD, 'sumfac'))
+        x = bm.sin(bm.arange(gdof, dtype=bm.float64))
+        np.testing.assert_allclose(bm.to_numpy(mform @ x), bm.to_numpy(A @ x), atol=1e-12)
+        assert len(mform.memory) == 0
+
+        X = bm.stack([x, bm.cos(x)], axis=0)
+        np.testing.assert_allclose(bm.to_numpy(mform.mult(X)[1]),
+                                   bm.to_numpy(A @ bm.cos(x)), atol=1e-12)
+
+        # the diagonal is computed without local tensors, keeping mult matrix-free
+        diag = np.diag(bm.to_numpy(A.to_dense()))
+        np.testing.assert_allclose(bm.to_numpy(mform.diagonal()), diag, atol=1e-12)
+        assert len(mform.memory) == 0
+        mform._assembly_group('_group_0', True)
+        assert mform._is_matrix_free('_group_0')
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_curved_geometry(self, backend):
+        _set_backend(backend)
+        mesh = QuadrangleMesh.from_box([0, 1, 0, 1], nx=2, ny=2)
+        node = bm.to_numpy(mesh.node).copy()
+        node[4] += [0.1, 0.05] # the center node, making cells non-affine
+        mesh = QuadrangleMesh(bm.tensor(node), mesh.cell)
+        space = LagrangeFESpace(mesh, p=2)
+        M = ScalarMassIntegrator(method='sumfac')(space)
+        # the mass matrix integrates 1 exactly: total area is still 1
+        assert abs(float(bm.sum(M)) - 1.0) < 1e-12
+
+        with pytest.raises(ValueError):
+            ScalarMassIntegrator(method='sumfac', batched=True, coef=bm.ones((2, 1)))(space)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
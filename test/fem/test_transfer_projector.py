@@ -0,0 +1,82 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import TransferProjector
+
+
+def _integral(space, uh, q=5):
+    mesh = space.mesh
+    bcs, ws = mesh.quadrature_formula(q).get_quadrature_points_and_weights()
+    val = space.value(uh, bcs)
+    return float(bm.sum(val * ws[None, :] * mesh.entity_measure('cell')[:, None]))
+
+
+class TestTransferProjector:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("method", ['interp', 'l2'])
+    def test_triangle(self, backend, method):
+        bm.set_backend(backend)
+        mesh0 = TriangleMesh.from_box(nx=5, ny=4)
+        mesh1 = TriangleMesh.from_box(nx=7, ny=9)
+        space0, space1 = LagrangeFESpace(mesh0, 2), LagrangeFESpace(mesh1, 2)
+        f = lambda p: p[..., 0]**2 - p[..., 0]*p[..., 1] + 1.0
+        u0 = space0.interpolate(f)
+
+        P = TransferProjector(space0, space1, method=method)
+        u1 = P(bm.stack([u0, 2*u0], axis=0))
+        assert tuple(u1.shape) == (2, space1.number_of_global_dofs())
+        np.testing.assert_allclose(bm.to_numpy(u1[0]), bm.to_numpy(space1.interpolate(f)), atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(u1[1]), 2*bm.to_numpy(u1[0]), atol=1e-10)
+
+        matrix = P.matrix
+        P(u0)
+        assert P.matrix is matrix
+        mesh0.uniform_refine() # the number of dofs changes
+        assert P.matrix is not matrix
+        assert P.matrix.shape[1] == space0.number_of_global_dofs()
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_lumped_conservation(self, backend):
+        bm.set_backend(backend)
+        mesh0 = TetrahedronMesh.from_box(nx=3, ny=3, nz=3)
+        mesh1 = TetrahedronMesh.from_box(nx=2, ny=4, nz=3)
+        space0, space1 = LagrangeFESpace(mesh0, 2), LagrangeFESpace(mesh1, 1)
+        u0 = space0.interpolate(lambda p: bm.sin(3*p[..., 0]) * p[..., 1] + p[..., 2])
+
+        P = TransferProjector(space0, space1, method='l2', lumped=True)
+        u1 = P(u0)
+        # refined target cells resolve the source cells exactly
+        mesh2 = TetrahedronMesh.from_box(nx=3, ny=3, nz=3)
+        mesh2.uniform_refine()
+        u2 = TransferProjector(space0, LagrangeFESpace(mesh2, 1), method='l2', lumped=True)(u0)
+        I0 = _integral(space0, u0)
+        assert abs(_integral(LagrangeFESpace(mesh2, 1), u2) - I0) < 1e-12
+        assert abs(_integral(space1, u1) - I0) < 1e-3
+
+        with pytest.raises(ValueError):
+            TransferProjector(space0, space0, method='l2', lumped=True)
+
+    @pytest.mark.parametrize("extrapolate", [True, False])
+    def test_extrapolate(self, extrapolate):
+        bm.set_backend('numpy')
+        mesh0 = TriangleMesh.from_box([0, 1, 0, 1], nx=4, ny=4)
+        mesh1 = TriangleMesh.from_box([-0.25, 1.25, 0, 1], nx=6, ny=4)
+        space0, space1 = LagrangeFESpace(mesh0, 1), LagrangeFESpace(mesh1, 1)
+        f = lambda p: 2*p[..., 0] + p[..., 1]
+        P = TransferProjector(space0, space1, extrapolate=extrapolate)
+        u1 = bm.to_numpy(P(space0.interpolate(f)))
+        expected = bm.to_numpy(space1.interpolate(f))
+        outside = np.abs(bm.to_numpy(space1.interpolation_points())[:, 0] - 0.5) > 0.5
+        np.testing.assert_allclose(u1[~outside], expected[~outside], atol=1e-12)
+        if extrapolate:
+            np.testing.assert_allclose(u1[outside], expected[outside], atol=1e-12)
+        else:
+            np.testing.assert_allclose(u1[outside], 0.0)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
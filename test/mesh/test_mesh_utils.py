@@ -0,0 +1,155 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.mesh.utils import LRUCache, simplex_tabulate, tabulation_cache, flocc, pack_rows
+
+
+class TestTabulationCache:
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        assert cache.get('a', lambda: -1) == 1
+        cache.get('c', lambda: 3) # evicts 'b', the least recently used
+        assert cache.get('b', lambda: -2) == -2
+        assert cache.get('c', lambda: -3) == 3
+        assert cache.info() == {'hits': 2, 'misses': 4, 'size': 2, 'maxsize': 2}
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("order", [0, 1])
+    def test_simplex_tabulate(self, backend, order):
+        bm.set_backend(backend)
+        tabulation_cache.clear()
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        bcs, _ = mesh.quadrature_formula(4).get_quadrature_points_and_weights()
+        func = bm.simplex_shape_function if order == 0 else bm.simplex_grad_shape_function
+
+        t0 = simplex_tabulate(bcs, 3, order)
+        t1 = simplex_tabulate(bm.copy(bcs), 3, order)
+        assert t1 is t0
+        assert tabulation_cache.info()['hits'] == 1
+        np.testing.assert_allclose(bm.to_numpy(t0), bm.to_numpy(func(bcs, 3)))
+
+        t2 = simplex_tabulate(bcs, 2, order)
+        assert t2 is not t0
+        assert tabulation_cache.info()['misses'] == 2
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_grad_shape_function(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        bcs, _ = mesh.quadrature_formula(3).get_quadrature_points_and_weights()
+        gphi = mesh.grad_shape_function(bcs, 2, variables='x')
+        R = bm.simplex_grad_shape_function(bcs, 2)
+        expected = bm.einsum('qjb, cbm -> cqjm', R, mesh.grad_lambda())
+        np.testing.assert_allclose(bm.to_numpy(gphi), bm.to_numpy(expected))
+
+
+class TestConstruct:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("base", [7, 2**25])
+    @pytest.mark.parametrize("num_threads", [1, 3])
+    def test_flocc(self, backend, base, num_threads):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(0)
+        array = np.sort(rng.integers(0, min(base, 6), (200, 3)), axis=1)
+        if base > 7:
+            array = array * (base // 6) # too large to pack into one key
+            assert len(pack_rows(bm.tensor(array))) == 2
+        i0, i1, j = flocc(bm.tensor(array), num_threads=num_threads)
+        i0, i1, j = bm.to_numpy(i0), bm.to_numpy(i1), bm.to_numpy(j)
+
+        _, first, inverse = np.unique(array, axis=0, return_index=True, return_inverse=True)
+        last = len(array) - 1 - np.unique(array[::-1], axis=0, return_index=True)[1]
+        np.testing.assert_array_equal(i0, first)
+        np.testing.assert_array_equal(i1, last)
+        np.testing.assert_array_equal(j, inverse.reshape(-1))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("high", [2**20, 2**62])
+    def test_flocc_large_keys(self, backend, high):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(1)
+        array = np.sort(rng.integers(0, high, (200000, 3)), axis=1)
+        array[::3] = array[1::3] # with duplicated rows
+        expected = flocc(bm.tensor(array), num_threads=1)
+        result = flocc(bm.tensor(array), num_threads=4)
+        for a, b in zip(result, expected):
+            np.testing.assert_array_equal(bm.to_numpy(a), bm.to_numpy(b))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_lazy_edge(self, backend):
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        assert 1 not in mesh.storage()
+        cell2edge = mesh.cell_to_edge()
+        assert 1 in mesh.storage()
+
+        eager = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        eager.construct(lazy=False, num_threads=2)
+        np.testing.assert_array_equal(bm.to_numpy(cell2edge), bm.to_numpy(eager.cell2edge))
+        np.testing.assert_array_equal(bm.to_numpy(mesh.edge), bm.to_numpy(eager.edge))
+
+        # edges of the old cells are dropped when constructing again
+        NE = mesh.number_of_edges()
+        mesh.uniform_refine()
+        assert mesh.number_of_edges() > NE
+        assert mesh.cell2edge.shape[0] == mesh.number_of_cells()
+
+
+class TestRelationCache:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_cache_and_invalidation(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        flag = mesh.boundary_node_flag()
+        assert mesh.boundary_node_flag() is flag
+        c2f = mesh.cell_to_face()
+        np.testing.assert_array_equal(bm.to_numpy(mesh.cell_to_face(index=bm.tensor([1, 3]))),
+                                      bm.to_numpy(c2f)[[1, 3]])
+        assert mesh.relation_memory()['cell_to_face'] == c2f.nbytes
+
+        mesh.clear_relations('cell_to_face')
+        assert 'cell_to_face' not in mesh.relation_memory()
+        assert 'boundary_node_flag' in mesh.relation_memory()
+
+        NN = mesh.number_of_nodes()
+        mesh.uniform_refine()
+        assert mesh.relation_memory() == {}
+        flag = mesh.boundary_node_flag()
+        assert flag.shape[0] > NN
+        assert int(bm.sum(flag)) == 16
+
+    def test_readonly(self):
+        bm.set_backend('numpy')
+        mesh = TetrahedronMesh.from_box(nx=1, ny=1, nz=1)
+        mesh.boundary_face_flag()
+        flag = mesh.boundary_edge_flag()
+        with pytest.raises(ValueError):
+            flag[0] = False
+        # lazy edges built by the query above keep the other relations
+        assert 'boundary_face_flag' in mesh.relation_memory()
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_cached_flags_in_space(self, backend):
+        from fealpy.functionspace.cm_conforming_fe_space3d import CmConformingFESpace3d
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2)
+        node = bm.to_numpy(mesh.entity('node'))
+        corner = np.all((node == 0) | (node == 1), axis=1)
+        space = CmConformingFESpace3d(mesh, 9, 1, bm.tensor(corner))
+        flag = bm.to_numpy(mesh.boundary_node_flag()).copy()
+
+        is_corner, is_edge_node, is_face_node, _, _ = space.get_corner()
+        np.testing.assert_array_equal(bm.to_numpy(is_corner), corner)
+        # the cached relation is not modified through the returned flags
+        np.testing.assert_array_equal(bm.to_numpy(mesh.boundary_node_flag()), flag)
+        np.testing.assert_array_equal(bm.to_numpy(is_face_node | is_edge_node | is_corner), flag)
+        assert not np.any(bm.to_numpy(is_face_node & (is_edge_node | is_corner)))
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -0,0 +1,66 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh.neighbor_search import neighbor_search, VerletList
+
+
+def _sorted_rows(index, indptr):
+    index, indptr = bm.to_numpy(index), bm.to_numpy(indptr)
+    return np.concatenate([np.sort(index[indptr[i]:indptr[i+1]]) for i in range(len(indptr)-1)])
+
+
+def _brute_force(node, cutoff, box=None, include_self=True):
+    d = node[:, None, :] - node[None, :, :]
+    if box is not None:
+        d -= box * np.round(d / box)
+    adj = np.sum(d**2, axis=-1) < cutoff**2
+    if not include_self:
+        np.fill_diagonal(adj, False)
+    indptr = np.concatenate([[0], np.cumsum(adj.sum(1))])
+    return np.nonzero(adj)[1], indptr
+
+
+class TestNeighborSearch:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("GD", [2, 3])
+    @pytest.mark.parametrize("box", [None, 1.0, (1.0, 0.25, 0.6)])
+    @pytest.mark.parametrize("include_self", [True, False])
+    def test_cell_list(self, backend, GD, box, include_self):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(GD)
+        if isinstance(box, tuple):
+            box = np.array(box[:GD])
+        scale = 1.0 if box is None else box
+        node = rng.uniform(0, 1, (300, GD)) * scale
+        cutoff = 0.12
+
+        index, indptr = neighbor_search(bm.tensor(node), cutoff,
+                                        None if box is None else bm.tensor(box),
+                                        include_self=include_self)
+        index_bf, indptr_bf = _brute_force(node, cutoff, box, include_self)
+        np.testing.assert_array_equal(bm.to_numpy(indptr), indptr_bf)
+        np.testing.assert_array_equal(_sorted_rows(index, indptr), index_bf)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_verlet_list(self, backend):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(0)
+        node = rng.uniform(0, 1, (400, 2))
+        velocity = rng.standard_normal((400, 2))
+        cutoff, dt = 0.1, 1e-3
+        nlist = VerletList(cutoff, box_size=1.0, skin=0.03)
+
+        nsteps = 40
+        for _ in range(nsteps):
+            index, indptr = nlist.update(bm.tensor(node))
+            index_bf, indptr_bf = _brute_force(node, cutoff, 1.0)
+            np.testing.assert_array_equal(bm.to_numpy(indptr), indptr_bf)
+            np.testing.assert_array_equal(_sorted_rows(index, indptr), index_bf)
+            node = (node + dt * velocity) % 1.0
+        assert 1 < nlist.num_builds < nsteps
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -1,9 +1,7 @@
 
-import ipdb
 import matplotlib.pyplot as plt
 import pytest
 import numpy as np
-import jax.numpy as jnp
 from fealpy.mesh.node_mesh import NodeMesh
 from fealpy.backend import backend_manager as bm
 from node_mesh_data import *
@@ -36,17 +34,24 @@ class TestNodeMeshInterfaces:
         top = node_mesh.top_dimension()
         assert top == meshdata["top"]
     
-    @pytest.mark.parametrize("backend", ['numpy','jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_neighbors(self, meshdata, backend):
         bm.set_backend(backend)
         nodes = bm.from_numpy(meshdata["node_box"])
         node_mesh = NodeMesh(nodes)
-        index, indptr = node_mesh.neighbors(meshdata["box_size"], meshdata["cutoff"])
-        assert jnp.array_equal(index, meshdata["index"])
-        assert np.array_equal(index, meshdata["index"])
-        assert jnp.array_equal(indptr, meshdata["indptr"])
-        assert np.array_equal(indptr, meshdata["indptr"])
+        cutoff, box_size = meshdata["cutoff"], meshdata["box_size"]
+        index, indptr = node_mesh.neighbors(box_size, cutoff)
+        index, indptr = bm.to_numpy(index), bm.to_numpy(indptr)
+
+        # brute force with the minimum image convention
+        node = meshdata["node_box"]
+        d = node[:, None, :] - node[None, :, :]
+        d -= box_size * np.round(d / box_size)
+        adj = np.sum(d**2, axis=-1) < cutoff**2
+        np.testing.assert_array_equal(indptr, np.concatenate([[0], np.cumsum(adj.sum(1))]))
+        index = np.concatenate([np.sort(index[indptr[i]:indptr[i+1]]) for i in range(len(indptr)-1)])
+        np.testing.assert_array_equal(index, np.nonzero(adj)[1])
 
     @pytest.mark.parametrize("backend", ['numpy', 'jax'])
     @pytest.mark.parametrize("meshdata", mesh_data)
@@ -0,0 +1,120 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.mesh.ordering import (morton_order, hilbert_order, rcm_order,
+                                  adjacency_graph, inverse_permutation)
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+
+
+def _shuffled_mesh(mesh_type, seed=0, **kwargs):
+    mesh = mesh_type.from_box(**kwargs)
+    rng = np.random.default_rng(seed)
+    node, cell = bm.to_numpy(mesh.node), bm.to_numpy(mesh.cell)
+    perm = rng.permutation(node.shape[0])
+    inv = np.argsort(perm)
+    cell = inv[cell][rng.permutation(cell.shape[0])]
+    return mesh_type(bm.tensor(node[perm]), bm.tensor(cell, dtype=mesh.itype))
+
+
+def _bandwidth(entity):
+    entity = bm.to_numpy(entity)
+    return int(np.max(entity.max(axis=1) - entity.min(axis=1)))
+
+
+def _stiffness(space):
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=space.p+2))
+    return bm.to_numpy(bform.assembly().to_dense())
+
+
+class TestOrdering:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("func", [morton_order, hilbert_order])
+    @pytest.mark.parametrize("GD", [2, 3])
+    def test_space_filling_curve(self, backend, func, GD):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(GD)
+        points = rng.uniform(0, 1, (500, GD))
+        perm = bm.to_numpy(func(bm.tensor(points)))
+        np.testing.assert_array_equal(np.sort(perm), np.arange(500))
+
+        # the curve through a grid visits neighbouring cells only
+        n = 8
+        grid = np.stack(np.meshgrid(*[np.arange(n)]*GD, indexing='ij'), axis=-1).reshape(-1, GD)
+        perm = bm.to_numpy(func(bm.tensor(grid, dtype=bm.float64)))
+        step = np.abs(np.diff(grid[perm], axis=0)).sum(axis=1)
+        if func is hilbert_order:
+            assert np.all(step == 1)
+        else:
+            assert np.all(step >= 1)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_rcm(self, backend):
+        bm.set_backend(backend)
+        mesh = _shuffled_mesh(TriangleMesh, nx=20, ny=20)
+        NN = mesh.number_of_nodes()
+        perm = rcm_order(*adjacency_graph(mesh.cell, NN))
+        np.testing.assert_array_equal(np.sort(bm.to_numpy(perm)), np.arange(NN))
+        inv = inverse_permutation(perm)
+        np.testing.assert_array_equal(bm.to_numpy(inv[perm]), np.arange(NN))
+        assert _bandwidth(mesh.cell) > 200
+        assert _bandwidth(inv[mesh.cell]) <= 2 * 21
+
+        # disconnected graphs are ordered component by component
+        cell = bm.tensor([[0, 3], [3, 5], [1, 2], [2, 4]], dtype=bm.int64)
+        perm = bm.to_numpy(rcm_order(*adjacency_graph(cell, 6)))
+        np.testing.assert_array_equal(np.sort(perm), np.arange(6))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh_type, kwargs", [
+        (TriangleMesh, {'nx': 6, 'ny': 5}),
+        (TetrahedronMesh, {'nx': 2, 'ny': 3, 'nz': 2})])
+    @pytest.mark.parametrize("method", ['rcm', 'hilbert', 'morton'])
+    def test_mesh_reorder(self, backend, mesh_type, kwargs, method):
+        bm.set_backend(backend)
+        mesh = _shuffled_mesh(mesh_type, **kwargs)
+        node, cell = bm.to_numpy(mesh.node), bm.to_numpy(mesh.cell)
+        measure = bm.to_numpy(mesh.entity_measure('cell'))
+        A = _stiffness(LagrangeFESpace(mesh, p=1))
+        mesh.nodedata['u'] = bm.tensor(node[:, 0])
+
+        node_perm, cell_perm = mesh.reorder(method)
+        node_perm, cell_perm = bm.to_numpy(node_perm), bm.to_numpy(cell_perm)
+        np.testing.assert_array_equal(bm.to_numpy(mesh.node), node[node_perm])
+        np.testing.assert_array_equal(node_perm[bm.to_numpy(mesh.cell)], cell[cell_perm])
+        np.testing.assert_allclose(bm.to_numpy(mesh.entity_measure('cell')), measure[cell_perm])
+        np.testing.assert_array_equal(bm.to_numpy(mesh.nodedata['u']), node[node_perm, 0])
+        assert mesh.number_of_faces() == mesh.face.shape[0]
+        np.testing.assert_allclose(_stiffness(LagrangeFESpace(mesh, p=1)),
+                                   A[np.ix_(node_perm, node_perm)], atol=1e-12)
+        if method == 'rcm':
+            assert _bandwidth(mesh.cell) < _bandwidth(bm.tensor(cell))
+
+        with pytest.raises(ValueError):
+            mesh.reorder('unknown')
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("method", ['rcm', 'hilbert'])
+    def test_space_reorder(self, backend, method):
+        bm.set_backend(backend)
+        mesh = _shuffled_mesh(TriangleMesh, nx=6, ny=6)
+        space = LagrangeFESpace(mesh, p=2)
+        f = lambda p: bm.sin(p[..., 0]) * p[..., 1]
+        uI = bm.to_numpy(space.interpolate(f))
+        A = _stiffness(space)
+        bd = bm.to_numpy(space.is_boundary_dof())
+
+        perm = bm.to_numpy(space.reorder(method))
+        np.testing.assert_allclose(bm.to_numpy(space.interpolate(f)), uI[perm])
+        np.testing.assert_allclose(_stiffness(space), A[np.ix_(perm, perm)], atol=1e-12)
+        np.testing.assert_array_equal(bm.to_numpy(space.is_boundary_dof()), bd[perm])
+        if method == 'rcm':
+            assert _bandwidth(space.cell_to_dof()) < _bandwidth(mesh.cell_to_ipoint(2))
+
+        mesh.uniform_refine()
+        with pytest.raises(RuntimeError):
+            space.cell_to_dof()
@@ -0,0 +1,82 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+
+
+def _mesh(TD):
+    if TD == 2:
+        mesh = TriangleMesh.from_box([0, 1, 0, 2], nx=6, ny=5)
+    else:
+        mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 2], nx=3, ny=3, nz=4)
+    # perturb interior nodes to get an unstructured mesh
+    node = bm.to_numpy(mesh.node).copy()
+    isBdNode = bm.to_numpy(mesh.boundary_node_flag())
+    rng = np.random.default_rng(0)
+    node[~isBdNode] += 0.05 * rng.uniform(-1, 1, node[~isBdNode].shape)
+    return mesh.__class__(bm.tensor(node), mesh.cell)
+
+
+class TestPointLocation:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("TD", [2, 3])
+    def test_location(self, backend, TD):
+        bm.set_backend(backend)
+        mesh = _mesh(TD)
+        rng = np.random.default_rng(1)
+        upper = np.array([1., 2.]) if TD == 2 else np.array([1., 1., 2.])
+        points = rng.uniform(0, 1, (500, TD)) * upper
+        points[:10] = bm.to_numpy(mesh.node)[:10] # on vertices
+        points[-5:] += 3.0 # outside
+        points = bm.tensor(points)
+
+        cell, bcs = mesh.location(points)
+        cell_np, bcs_np = bm.to_numpy(cell), bm.to_numpy(bcs)
+        assert np.all(cell_np[-5:] == -1)
+        assert np.all(cell_np[:-5] >= 0)
+        assert np.all(bcs_np[:-5] >= -1e-10)
+        np.testing.assert_allclose(bcs_np.sum(-1)[:-5], 1.0)
+
+        node, c2n = bm.to_numpy(mesh.node), bm.to_numpy(mesh.cell)
+        x = np.einsum('ni, nid -> nd', bcs_np[:-5], node[c2n[cell_np[:-5]]])
+        np.testing.assert_allclose(x, bm.to_numpy(points)[:-5], atol=1e-12)
+
+        # walk from the found cells after a small displacement
+        moved = points + bm.tensor(0.05 * rng.standard_normal((500, TD)))
+        cell2, bcs2 = mesh.location(moved, start=cell)
+        cell3, _ = mesh.location(moved)
+        assert np.all((bm.to_numpy(cell2) >= 0) == (bm.to_numpy(cell3) >= 0))
+        inside = bm.to_numpy(cell2) >= 0
+        x = np.einsum('ni, nid -> nd', bm.to_numpy(bcs2)[inside], node[c2n[bm.to_numpy(cell2)[inside]]])
+        np.testing.assert_allclose(x, bm.to_numpy(moved)[inside], atol=1e-12)
+
+    def test_cached_locator(self):
+        bm.set_backend('numpy')
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        locator = mesh.point_locator()
+        assert mesh.point_locator() is locator
+        assert mesh.relation_memory()['point_locator'] == locator.nbytes
+        mesh.uniform_refine()
+        assert mesh.point_locator() is not locator
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_moved_nodes(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        point = bm.tensor([[1.5, 1.5]], dtype=mesh.ftype)
+        locator = mesh.point_locator()
+        assert int(mesh.location(point)[0][0]) == -1
+
+        node = mesh.entity('node')
+        node *= 2 # in place, the topology is unchanged
+        cell, bcs = mesh.location(point)
+        assert int(cell[0]) >= 0
+        assert mesh.point_locator() is not locator
+        x = bm.einsum('ni, nid -> nd', bcs, node[mesh.entity('cell')[cell]])
+        np.testing.assert_allclose(bm.to_numpy(x), bm.to_numpy(point), atol=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -326,6 +326,23 @@ class TestTetrahedronMeshInterfaces:
         u = bm.array(data1['nodedata'][0],dtype=bm.float64)
         np.testing.assert_allclose(bm.to_numpy(u), data["u"],atol= 1e-6)
 
+    @pytest.mark.parametrize("backend", ["numpy"])
+    def test_bisect_topology(self, backend):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(1)
+        for build_edge in [True, False]:
+            mesh = TetrahedronMesh.from_box(nx=4, ny=4, nz=4)
+            if build_edge:
+                mesh.edge
+            for i in range(3):
+                NC = mesh.number_of_cells()
+                mesh.bisect(rng.random(NC) < 0.1, options={'disp': False, 'HB': None})
+                # 局部更新的拓扑关系与重新构造的完全一致
+                other = TetrahedronMesh(bm.copy(mesh.node), bm.copy(mesh.cell))
+                for name in ['face', 'face2cell', 'cell2face', 'edge', 'cell2edge']:
+                    np.testing.assert_array_equal(bm.to_numpy(getattr(mesh, name)),
+                                                  bm.to_numpy(getattr(other, name)))
+
     @pytest.mark.parametrize("backend", ["numpy", "pytorch", "jax"])
     @pytest.mark.parametrize("data", crack_box_data)
     def test_from_crack_box(self,data,backend):
@@ -375,6 +375,50 @@ class TestTriangleMeshInterfaces:
         np.testing.assert_array_equal(bm.to_numpy(face2cell), data["face2cell"])
         np.testing.assert_allclose(u , data['u'])
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_bisect_coarsen_topology(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        rng = np.random.default_rng(0)
+
+        def check(mesh):
+            # 局部更新的拓扑关系与重新构造的完全一致
+            other = TriangleMesh(bm.copy(mesh.node), bm.copy(mesh.cell))
+            for name in ['edge', 'face2cell', 'cell2edge', 'edge2cell']:
+                np.testing.assert_array_equal(bm.to_numpy(getattr(mesh, name)),
+                                              bm.to_numpy(getattr(other, name)))
+            np.testing.assert_array_equal(bm.to_numpy(mesh.boundary_node_flag()),
+                                          bm.to_numpy(other.boundary_node_flag()))
+            np.testing.assert_allclose(bm.to_numpy(bm.sum(mesh.entity_measure('cell'))), 1.0)
+
+        for i in range(4):
+            NC = mesh.number_of_cells()
+            mesh.bisect(bm.tensor(rng.random(NC) < 0.2), options={'disp': False})
+            check(mesh)
+
+        f = lambda p: 2*p[..., 0] + 3*p[..., 1] + 1
+        for i in range(3):
+            NC = mesh.number_of_cells()
+            bc = mesh.entity_barycenter('cell')
+            options = {'data': {'u': f(mesh.node[mesh.cell])}}
+            mesh.coarsen(bc[:, 0] < 0.7, options=options)
+            assert mesh.number_of_cells() < NC
+            check(mesh)
+            np.testing.assert_allclose(bm.to_numpy(options['data']['u']),
+                                       bm.to_numpy(f(mesh.node[mesh.cell])), atol=1e-12)
+
+        # 一致加密两次再粗化两次回到初始网格
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        cell = bm.to_numpy(mesh.cell)
+        for i in range(2):
+            mesh.bisect(None, options={'disp': False})
+        for i in range(2):
+            mesh.coarsen(bm.ones(mesh.number_of_cells(), dtype=bm.bool))
+        check(mesh)
+        assert mesh.number_of_nodes() == 25
+        np.testing.assert_array_equal(np.sort(np.sort(bm.to_numpy(mesh.cell), axis=1), axis=0),
+                                      np.sort(np.sort(cell, axis=1), axis=0))
+
     @pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
     @pytest.mark.parametrize("data", mesh_feom_domain_data)
     def test_mesh_feom_domain(self, data, backend):
@@ -331,3 +331,69 @@ class TestUniformMesh2dInterfaces:
         node_refined_true = meshdata['node_refined']
 
         np.testing.assert_allclose(node_refined, node_refined_true, atol=1e-8)
+
+
+class TestUniformMesh2dImplicit:
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_entity(self, backend):
+        bm.set_backend(backend)
+        mesh = UniformMesh2d((0, 4, 0, 3), h=(0.25, 0.5), origin=(1.0, -1.0))
+        imesh = UniformMesh2d((0, 4, 0, 3), h=(0.25, 0.5), origin=(1.0, -1.0), implicit=True)
+
+        for etype in ['node', 'edge', 'cell']:
+            assert imesh.count(etype) == mesh.count(etype)
+            np.testing.assert_array_equal(bm.to_numpy(imesh.entity(etype)),
+                                          bm.to_numpy(mesh.entity(etype)))
+            np.testing.assert_array_equal(bm.to_numpy(imesh.entity(etype, index=slice(3, 9))),
+                                          bm.to_numpy(mesh.entity(etype)[3:9]))
+        index = bm.array([[7, 0], [11, 5]])
+        np.testing.assert_array_equal(bm.to_numpy(imesh.entity('cell', index=index)),
+                                      bm.to_numpy(mesh.entity('cell'))[bm.to_numpy(index)])
+        np.testing.assert_array_equal(bm.to_numpy(imesh.cell[5]), bm.to_numpy(mesh.cell[5]))
+        assert len(imesh._entity_storage) == 0
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", [1, 2, 3])
+    def test_cell_to_ipoint(self, backend, p):
+        bm.set_backend(backend)
+        mesh = UniformMesh2d((0, 3, 0, 2), h=(0.5, 0.25), origin=(1.0, 2.0), implicit=True)
+
+        ipoints = bm.to_numpy(mesh.interpolation_points(p))
+        assert ipoints.shape == (mesh.number_of_global_ipoints(p), 2)
+        # the interpolation points of a cell are the tensor product points of its box
+        c2ip = bm.to_numpy(mesh.cell_to_ipoint(p))
+        cell = bm.to_numpy(mesh.entity('cell'))
+        node = bm.to_numpy(mesh.entity('node'))
+        t = np.linspace(0, 1, p+1)
+        lower, upper = node[cell[:, 0]], node[cell[:, -1]]
+        for i, (a, b) in enumerate(np.ndindex(p+1, p+1)):
+            point = lower + (upper - lower) * np.array([t[a], t[b]])
+            np.testing.assert_allclose(ipoints[c2ip[:, i]], point, atol=1e-12)
+
+        index = slice(2, 5)
+        np.testing.assert_array_equal(bm.to_numpy(mesh.cell_to_ipoint(p, index=index)),
+                                      c2ip[index])
+        np.testing.assert_allclose(bm.to_numpy(mesh.interpolation_points(p, index=index)),
+                                   ipoints[index], atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", [1, 2])
+    def test_assembly(self, backend, p):
+        from fealpy.functionspace import LagrangeFESpace
+        from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+        bm.set_backend(backend)
+
+        def matrix(implicit, chunk_size):
+            mesh = UniformMesh2d((0, 6, 0, 5), h=(0.1, 0.1), implicit=implicit)
+            bform = BilinearForm(LagrangeFESpace(mesh, p=p))
+            bform.add_integrator(ScalarDiffusionIntegrator(q=p+2))
+            bform.add_integrator(ScalarMassIntegrator(q=p+2))
+            A = bm.to_numpy(bform.assembly(chunk_size=chunk_size).to_dense())
+            if implicit:
+                assert len(mesh._entity_storage) == 0
+            return A
+
+        A = matrix(False, 0)
+        np.testing.assert_allclose(matrix(True, 0), A, atol=1e-12)
+        np.testing.assert_allclose(matrix(True, 7), A, atol=1e-12)
@@ -149,4 +149,93 @@ class TestUniformMesh3dInterfaces:
         node_refined = mesh.node
         node_refined_true = meshdata['node_refined']
 
-        np.testing.assert_allclose(node_refined, node_refined_true, atol=1e-8)
\ No newline at end of file
+        np.testing.assert_allclose(node_refined, node_refined_true, atol=1e-8)
+
+class TestUniformMesh3dImplicit:
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_entity(self, backend):
+        bm.set_backend(backend)
+        args = ((0, 3, 0, 2, 0, 4), (0.5, 0.25, 0.125), (1.0, -1.0, 0.5))
+        mesh = UniformMesh3d(*args)
+        imesh = UniformMesh3d(*args, implicit=True)
+
+        for etype in ['node', 'edge', 'face', 'cell']:
+            assert imesh.count(etype) == mesh.count(etype)
+            np.testing.assert_array_equal(bm.to_numpy(imesh.entity(etype)),
+                                          bm.to_numpy(mesh.entity(etype)))
+            np.testing.assert_array_equal(bm.to_numpy(imesh.entity(etype, index=slice(4, 17))),
+                                          bm.to_numpy(mesh.entity(etype)[4:17]))
+        np.testing.assert_array_equal(bm.to_numpy(imesh.face[9]), bm.to_numpy(mesh.face[9]))
+        assert len(imesh._entity_storage) == 0
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", [1, 2])
+    def test_cell_to_ipoint(self, backend, p):
+        bm.set_backend(backend)
+        mesh = UniformMesh3d((0, 2, 0, 3, 0, 2), h=(0.5, 0.25, 1.0), origin=(1.0, 2.0, 3.0),
+                             implicit=True)
+
+        ipoints = bm.to_numpy(mesh.interpolation_points(p))
+        assert ipoints.shape == (mesh.number_of_global_ipoints(p), 3)
+        c2ip = bm.to_numpy(mesh.cell_to_ipoint(p))
+        cell = bm.to_numpy(mesh.entity('cell'))
+        node = bm.to_numpy(mesh.entity('node'))
+        t = np.linspace(0, 1, p+1)
+        lower, upper = node[cell[:, 0]], node[cell[:, -1]]
+        for i, (a, b, c) in enumerate(np.ndindex(p+1, p+1, p+1)):
+            point = lower + (upper - lower) * np.array([t[a], t[b], t[c]])
+            np.testing.assert_allclose(ipoints[c2ip[:, i]], point, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_assembly(self, backend):
+        from fealpy.functionspace import LagrangeFESpace
+        from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+        bm.set_backend(backend)
+
+        def matrix(implicit, chunk_size):
+            mesh = UniformMesh3d((0, 4, 0, 3, 0, 5), h=(0.1, 0.1, 0.1), implicit=implicit)
+            bform = BilinearForm(LagrangeFESpace(mesh, p=2))
+            bform.add_integrator(ScalarDiffusionIntegrator(q=4))
+            bform.add_integrator(ScalarMassIntegrator(q=4))
+            A = bm.to_numpy(bform.assembly(chunk_size=chunk_size).to_dense())
+            if implicit:
+                assert len(mesh._entity_storage) == 0
+            return A
+
+        A = matrix(False, 0)
+        np.testing.assert_allclose(matrix(True, 0), A, atol=1e-12)
+        np.testing.assert_allclose(matrix(True, 7), A, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_chunked_assembly(self, backend):
+        from fealpy.functionspace import LagrangeFESpace
+        from fealpy.fem import (BilinearForm, ScalarDiffusionIntegrator,
+                                LinearForm, ScalarSourceIntegrator)
+        bm.set_backend(backend)
+        mesh = UniformMesh3d((0, 4, 0, 3, 0, 5), h=(0.1, 0.1, 0.1), implicit=True)
+        space = LagrangeFESpace(mesh, p=2)
+        NC = mesh.number_of_cells()
+        rows = []
+        cell_to_dof = space.dof.cell_to_dof
+
+        def recorded(index=slice(None)):
+            c2d = cell_to_dof(index)
+            rows.append(c2d.shape[0])
+            return c2d
+
+        space.dof.cell_to_dof = recorded
+        lform = LinearForm(space)
+        lform.add_integrator(ScalarSourceIntegrator(source=1.0))
+        F = lform.assembly(chunk_size=7)
+        # only the rows of each chunk are generated
+        assert max(rows) == 7
+        assert sum(rows) == NC
+
+        rows.clear()
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        A = bform.assembly(chunk_size=7)
+        assert rows == [NC] # for the sparsity pattern only
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense().sum(axis=1)), 0, atol=1e-10)
+        np.testing.assert_allclose(float(bm.sum(F)), 0.06, rtol=1e-12)
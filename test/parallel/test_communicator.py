@@ -0,0 +1,59 @@
+
+import time
+
+import pytest
+
+from fealpy.parallel import run_local
+from fealpy.parallel.communicator import MPICommunicator
+
+
+def _two_messages(comm):
+    if comm.rank == 0:
+        first = comm.exchange({}, [1, 2], tag=0)
+        second = comm.exchange({}, [1, 2], tag=0)
+        return first, second
+    if comm.rank == 1:
+        time.sleep(0.5) # rank 2 sends both messages before rank 1 sends any
+    comm.exchange({0: ('first', comm.rank)}, [], tag=0)
+    comm.exchange({0: ('second', comm.rank)}, [], tag=0)
+
+
+class _RecordingComm():
+    """Loops messages of one rank back to itself, recording the tags."""
+    def __init__(self):
+        self.tags = []
+        self.messages = {}
+
+    def Get_rank(self):
+        return 0
+
+    def Get_size(self):
+        return 1
+
+    def isend(self, obj, dest, tag):
+        self.tags.append(tag)
+        self.messages[tag] = obj
+        return self
+
+    def recv(self, source, tag):
+        return self.messages.pop(tag)
+
+    def wait(self):
+        pass
+
+
+class TestCommunicator:
+    def test_non_overtaking(self):
+        first, second = run_local(3, _two_messages)[0]
+        assert first == {1: ('first', 1), 2: ('first', 2)}
+        assert second == {1: ('second', 1), 2: ('second', 2)}
+
+    @pytest.mark.parametrize("tag", [0, 5, -1, -3])
+    def test_mpi_tags(self, tag):
+        comm = MPICommunicator(_RecordingComm())
+        assert comm.exchange({0: 'x'}, [0], tag=tag) == {0: 'x'}
+        assert 0 <= comm.comm.tags[0] < 32767
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -0,0 +1,96 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+from fealpy.parallel import rcb_partition, partition_mesh, run_local
+
+
+def _stiffness(mesh, index=None):
+    space = LagrangeFESpace(mesh, 1)
+    bform = BilinearForm(space)
+    if index is None:
+        bform.add_integrator(ScalarDiffusionIntegrator())
+    else:
+        bform.add_integrator(ScalarDiffusionIntegrator(index=index))
+    return bform.assembly(format='csr')
+
+
+def _distributed_matvec(comm, backend, nparts):
+    bm.set_backend(backend)
+    mesh = TriangleMesh.from_box(nx=6, ny=5)
+    part = partition_mesh(mesh, nparts)[comm.rank]
+    halo = part.halo(comm)
+
+    # assemble on owned cells, apply and sum shared rows
+    A = _stiffness(part.mesh, index=bm.arange(part.NOC))
+    x = bm.sin(part.mesh.entity('node')[:, 0] + 2*part.mesh.entity('node')[:, 1])
+    y = halo.assemble(A.matmul(x))
+    dot = comm.allreduce(float(bm.sum(x[:part.NON] * y[:part.NON])))
+
+    # ghost values agree with owners
+    z = bm.astype(bm.copy(part.node_l2g), bm.float64)
+    z[part.NON:] = -1.0
+    z = halo.update(z)
+    assert np.all(bm.to_numpy(z) == bm.to_numpy(part.node_l2g))
+    return bm.to_numpy(part.node_l2g), bm.to_numpy(y), dot
+
+
+class TestPartition:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("nparts", [3, 4])
+    def test_rcb(self, backend, nparts):
+        bm.set_backend(backend)
+        points = bm.tensor(np.random.default_rng(0).uniform(0, 1, (101, 2)))
+        parts = bm.to_numpy(rcb_partition(points, nparts))
+        counts = np.bincount(parts, minlength=nparts)
+        assert counts.max() - counts.min() <= 1
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("layers", [0, 1, 2])
+    def test_partition_mesh(self, backend, layers):
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=3, ny=3, nz=2)
+        node, cell = bm.to_numpy(mesh.node), bm.to_numpy(mesh.cell)
+        parts = partition_mesh(mesh, 3, layers=layers)
+
+        owned = np.concatenate([bm.to_numpy(p.cell_l2g)[:p.NOC] for p in parts])
+        np.testing.assert_array_equal(np.sort(owned), np.arange(cell.shape[0]))
+        owned = np.concatenate([bm.to_numpy(p.node_l2g)[:p.NON] for p in parts])
+        np.testing.assert_array_equal(np.sort(owned), np.arange(node.shape[0]))
+
+        for p in parts:
+            n2g, c2g = bm.to_numpy(p.node_l2g), bm.to_numpy(p.cell_l2g)
+            np.testing.assert_array_equal(bm.to_numpy(p.mesh.node), node[n2g])
+            np.testing.assert_array_equal(n2g[bm.to_numpy(p.mesh.cell)], cell[c2g])
+            assert np.all(bm.to_numpy(p.cell_owner)[:p.NOC] == p.rank)
+            assert np.all(bm.to_numpy(p.cell_owner)[p.NOC:] != p.rank)
+            for q, idx in p.node_pattern[1].items():
+                q_send = parts[q].node_pattern[0][p.rank]
+                np.testing.assert_array_equal(n2g[bm.to_numpy(idx)],
+                                              bm.to_numpy(parts[q].node_l2g)[bm.to_numpy(q_send)])
+                assert np.all(bm.to_numpy(p.node_owner)[bm.to_numpy(idx)] == q)
+            if layers == 0:
+                assert c2g.shape[0] == p.NOC
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("nparts", [1, 3])
+    def test_distributed_matvec(self, backend, nparts):
+        bm.set_backend(backend)
+        results = run_local(nparts, _distributed_matvec, backend, nparts)
+
+        mesh = TriangleMesh.from_box(nx=6, ny=5)
+        A = _stiffness(mesh)
+        node = mesh.entity('node')
+        x = bm.sin(node[:, 0] + 2*node[:, 1])
+        y = bm.to_numpy(A.matmul(x))
+        for l2g, y_local, dot in results:
+            np.testing.assert_allclose(y_local, y[l2g], atol=1e-12)
+            np.testing.assert_allclose(dot, float(bm.sum(x * A.matmul(x))), rtol=1e-12)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -0,0 +1,80 @@
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.solver import cg, AMGSolver
+
+
+def _laplace_2d(n):
+    T = sp.diags([-1., 2., -1.], [-1, 0, 1], shape=(n, n))
+    I = sp.eye(n)
+    return (sp.kron(I, T) + sp.kron(T, I)).tocsr()
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+class TestAMGSolver:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("method", ['rs', 'sa'])
+    @pytest.mark.parametrize("smoother", ['gs', 'jacobi'])
+    def test_standalone(self, backend, method, smoother):
+        _set_backend(backend)
+        As = _laplace_2d(24)
+        A = CSRTensor.from_scipy(As)
+        b = bm.from_numpy(np.random.rand(As.shape[0]))
+        M = AMGSolver(A, method=method, smoother=smoother, max_coarse=20)
+
+        assert M.number_of_levels() > 2
+        for P, R in zip(M.P, M.R):
+            np.testing.assert_allclose(P.to_scipy().T.toarray(), R.to_scipy().toarray())
+
+        x, info = M.solve(b, rtol=1e-8, maxiter=100, returninfo=True)
+        assert info['converged']
+        r = As @ bm.to_numpy(x) - bm.to_numpy(b)
+        assert np.linalg.norm(r) < 1e-7 * np.linalg.norm(bm.to_numpy(b))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("method", ['rs', 'sa'])
+    def test_preconditioner(self, backend, method):
+        _set_backend(backend)
+        niters = []
+
+        for n in (16, 48):
+            As = _laplace_2d(n)
+            A = CSRTensor.from_scipy(As)
+            b = bm.from_numpy(np.ones((As.shape[0], 2)))
+            M = AMGSolver(A, method=method, max_coarse=20)
+            x, info = cg(A, b, M=M, rtol=1e-8, returninfo=True)
+            assert info['converged']
+            r = As @ bm.to_numpy(x) - bm.to_numpy(b)
+            assert np.linalg.norm(r) < 1e-7 * np.linalg.norm(bm.to_numpy(b))
+            niters.append(info['niter'])
+
+        # nearly independent of the mesh size
+        assert niters[1] <= niters[0] + 6
+        if method == 'rs':
+            assert M.operator_complexity() < 3.0
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_block_near_null_space(self, backend):
+        _set_backend(backend)
+        As = sp.kron(_laplace_2d(20), np.array([[2., -1.], [-1., 2.]])).tocsr()
+        A = CSRTensor.from_scipy(As)
+        b = bm.from_numpy(np.random.rand(As.shape[0]))
+        B = bm.from_numpy(np.kron(np.ones((As.shape[0] // 2, 1)), np.eye(2)))
+
+        M = AMGSolver(A, method='sa', block_size=2, B=B, cycle='W', max_coarse=20)
+        x, info = cg(A, b, M=M, rtol=1e-8, returninfo=True)
+        assert info['converged']
+        assert info['niter'] < 20
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
@@ -4,7 +4,7 @@ import pytest
 import scipy.sparse as sp
 
 from fealpy.backend import backend_manager as bm
-from fealpy.solver import spsolve
+from fealpy.solver import spsolve, factorize, factorization_cache
 from fealpy.sparse import COOTensor, CSRTensor
 
 class TestDirectSolver:
@@ -50,6 +50,40 @@ class TestDirectSolver:
         assert self._check_solution(x0, x), "Pytorch GPU test failed!!!!!!!!!!!!!!!!!!!!!!!!"
         print("Pytorch GPU test passed!")
 
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_factorize(self, backend):
+        bm.set_backend(backend)
+        if backend == 'pytorch':
+            bm.set_default_device('cpu')
+        factorization_cache.clear()
+        A, x, b = self._get_cpu_data()
+        F = factorize(A)
+        assert factorize(A.tocsr()) is F # same content in another format
+        assert factorize(A, cache=False) is not F
+        assert factorization_cache.info()['hits'] == 1
+
+        X = bm.stack([x, 2*x, -x], axis=1)
+        B = bm.stack([b, 2*b, -b], axis=1)
+        assert self._check_solution(F.solve(B), X)
+        assert self._check_solution(F.solve(bm.swapaxes(B, 0, 1), batch_first=True),
+                                    bm.swapaxes(X, 0, 1))
+        assert self._check_solution(spsolve(A, b, 'scipy'), x)
+        assert factorization_cache.info()['hits'] == 1 # not cached by default
+        assert self._check_solution(spsolve(A, b, 'scipy', cache=True), x)
+        assert factorization_cache.info()['hits'] == 2
+
+        # the solution is not truncated to an integer right-hand side
+        ones = bm.ones((A.shape[0], ), dtype=bm.int64)
+        x1 = spsolve(A, ones, 'scipy')
+        assert x1.dtype == bm.float64
+        np.testing.assert_allclose(A.to_scipy() @ bm.to_numpy(x1), 1.0)
+
+        A2 = COOTensor(A.indices(), 2*A.values(), spshape=A.shape)
+        assert factorize(A2) is not F
+        assert self._check_solution(spsolve(A2, b, 'scipy'), x/2)
+        with pytest.raises(ValueError):
+            F.solve(bm.ones((3, ), dtype=bm.float64))
+
 if __name__ == '__main__':
     test = TestDirectSolver()
     #test.test_cpu('numpy', 'scipy')
@@ -0,0 +1,112 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, DirichletBC
+from fealpy.fem.dirichlet_bc_operator import DirichletBCOperator
+from fealpy.solver import cg, GMGSolver, lagrange_prolongation
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _assembled(space):
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    return DirichletBC(space, gd=0.0).apply_matrix(bform.assembly(format='csr'))
+
+
+def _matrix_free(space):
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator())
+    return DirichletBCOperator(bform, gd=0.0)
+
+
+class TestGMGSolver:
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", [1, 2, 3])
+    def test_prolongation(self, backend, p):
+        _set_backend(backend)
+        cmesh = TriangleMesh.from_box(nx=2, ny=2)
+        fmesh = TriangleMesh.from_box(nx=2, ny=2)
+        fmesh.uniform_refine()
+        cspace, fspace = LagrangeFESpace(cmesh, p=p), LagrangeFESpace(fmesh, p=p)
+        P = lagrange_prolongation(cspace, fspace)
+
+        def f(x):
+            return x[..., 0]**p + 2 * x[..., 0] * x[..., 1]**(p-1)
+
+        fc = f(cspace.interpolation_points())
+        ff = f(fspace.interpolation_points())
+        np.testing.assert_allclose(bm.to_numpy(P @ fc), bm.to_numpy(ff), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", [1, 2])
+    @pytest.mark.parametrize("cycle", ['V', 'W', 'F'])
+    @pytest.mark.parametrize("smoother", ['chebyshev', 'jacobi', 'gs'])
+    def test_preconditioner(self, backend, p, cycle, smoother):
+        _set_backend(backend)
+        niters = []
+        for nlevels in [3, 5]:
+            M = GMGSolver.from_mesh(TriangleMesh.from_box(nx=2, ny=2), nlevels, _assembled,
+                                    p=p, cycle=cycle, smoother=smoother)
+            A = M.A[0]
+            b = bm.ones((A.shape[0], ), dtype=bm.float64)
+            x, info = cg(A, b, M=M, rtol=1e-8, returninfo=True)
+            assert info['converged']
+            res = bm.to_numpy(b - A @ x)
+            assert np.linalg.norm(res) < 1e-7 * np.linalg.norm(bm.to_numpy(b))
+            niters.append(info['niter'])
+        assert niters[1] <= niters[0] + 3
+        assert niters[1] < 20
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_matrix_free(self, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        M = GMGSolver.from_mesh(mesh, 4, _matrix_free, p=1, smoother='jacobi')
+        A = _assembled(M.spaces[0])
+        b = bm.ones((A.shape[0], ), dtype=bm.float64)
+        x, info = M.solve(b, rtol=1e-8, returninfo=True)
+        assert info['converged']
+        assert info['niter'] < 50
+        np.testing.assert_allclose(bm.to_numpy(A @ x), bm.to_numpy(b), atol=1e-6)
+
+        assert np.isnan(M.operator_complexity())
+        X = bm.from_numpy(np.random.rand(A.shape[0], 3))
+        np.testing.assert_allclose(bm.to_numpy(M.A[0] @ X), bm.to_numpy(A @ X), atol=1e-12)
+
+        # the coarsest level is too large to invert, so it is smoothed
+        M = GMGSolver.from_mesh(mesh, 3, _matrix_free, p=1, smoother='jacobi',
+                                max_dense=5, coarse_sweeps=20)
+        assert M.coarse_inv is None and M.coarse_smoother is not None
+        x, info = M.solve(bm.ones((M.shape[0], ), dtype=bm.float64), rtol=1e-8,
+                          returninfo=True)
+        assert info['converged']
+
+        with pytest.raises(ValueError):
+            GMGSolver.from_mesh(mesh, 4, _matrix_free, p=1, cycle='X')
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_single_level(self, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=24, ny=24)
+        M = GMGSolver.from_mesh(mesh, 1, _assembled, p=1)
+        assert M.number_of_levels() == 1
+        assert M.coarse_factor is not None # too large to invert densely
+        assert M.operator_complexity() == 1.0
+        A = M.A[0]
+        b = bm.ones((A.shape[0], ), dtype=bm.float64)
+        x, info = M.solve(b, returninfo=True)
+        assert info['niter'] == 1
+        np.testing.assert_allclose(bm.to_numpy(A @ x), bm.to_numpy(b), atol=1e-8)
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
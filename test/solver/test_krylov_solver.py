@@ -0,0 +1,130 @@
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.solver import (
+    cg, minres, bicgstab,
+    JacobiPreconditioner, SSORPreconditioner,
+    ILU0Preconditioner, IC0Preconditioner,
+    BlockDiagonalPreconditioner
+)
+
+
+def _laplace_2d(n):
+    T = sp.diags([-1., 2., -1.], [-1, 0, 1], shape=(n, n))
+    I = sp.eye(n)
+    return (sp.kron(I, T) + sp.kron(T, I)).tocsr()
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+class TestKrylovSolver:
+    def _residual(self, A, x, b):
+        return np.linalg.norm(A @ bm.to_numpy(x) - bm.to_numpy(b)) / np.linalg.norm(bm.to_numpy(b))
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("precond", [None, 'jacobi', 'ssor', 'ilu0', 'ic0'])
+    def test_pcg(self, backend, precond):
+        _set_backend(backend)
+        As = _laplace_2d(20)
+        A = CSRTensor.from_scipy(As)
+        b = bm.from_numpy(np.random.rand(As.shape[0]))
+        M = {
+            None: lambda A: None,
+            'jacobi': JacobiPreconditioner,
+            'ssor': lambda A: SSORPreconditioner(A, omega=1.5),
+            'ilu0': ILU0Preconditioner,
+            'ic0': IC0Preconditioner
+        }[precond](A)
+
+        x, info = cg(A, b, M=M, rtol=1e-10, returninfo=True)
+        assert info['converged']
+        assert len(info['residual']) == info['niter']
+        assert self._residual(As, x, b) < 1e-9
+
+        if precond in ('ssor', 'ic0'):
+            _, info0 = cg(A, b, rtol=1e-10, returninfo=True)
+            assert info['niter'] < info0['niter']
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_block_jacobi(self, backend):
+        _set_backend(backend)
+        As = sp.kron(_laplace_2d(8), np.array([[2., 1.], [1., 2.]])).tocsr()
+        A = CSRTensor.from_scipy(As)
+        M = JacobiPreconditioner(A, block_size=2)
+        r = np.random.rand(As.shape[0], 3)
+        z = bm.to_numpy(M @ bm.from_numpy(r))
+        blocks = [As[i:i+2, i:i+2].toarray() for i in range(0, As.shape[0], 2)]
+        expected = sp.block_diag([np.linalg.inv(B) for B in blocks]) @ r
+        np.testing.assert_allclose(z, expected, atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_minres_saddle_point(self, backend):
+        _set_backend(backend)
+        As = _laplace_2d(12)
+        n, m = As.shape[0], 20
+        rng = np.random.default_rng(0)
+        Bs = sp.random(m, n, density=0.1, random_state=rng) + sp.eye(m, n)
+        Ks = sp.bmat([[As, Bs.T], [Bs, None]]).tocsr()
+        K = CSRTensor.from_scipy(Ks)
+        b = bm.from_numpy(rng.random(n + m))
+        M = BlockDiagonalPreconditioner(
+            [IC0Preconditioner(CSRTensor.from_scipy(As)),
+             JacobiPreconditioner(CSRTensor.from_scipy(sp.eye(m).tocsr()))],
+            [n, m]
+        )
+        x, info = minres(K, b, M=M, rtol=1e-12, returninfo=True)
+        assert info['converged']
+        assert self._residual(Ks, x, b) < 1e-8
+
+        M2 = BlockDiagonalPreconditioner.from_matrix(CSRTensor.from_scipy(As), [n//2, n - n//2])
+        x = minres(CSRTensor.from_scipy(As), b[:n], M=M2, rtol=1e-12)
+        assert self._residual(As, x, b[:n]) < 1e-8
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("precond", [None, 'ilu0'])
+    def test_bicgstab(self, backend, precond):
+        _set_backend(backend)
+        L = _laplace_2d(15)
+        U = sp.triu(L, 1)
+        As = (L + 0.5 * (U - U.T)).tocsr()
+        A = CSRTensor.from_scipy(As)
+        b = bm.from_numpy(np.random.rand(As.shape[0], 2))
+        M = None if precond is None else ILU0Preconditioner(A)
+
+        x, info = bicgstab(A, b, M=M, rtol=1e-10, returninfo=True)
+        assert info['converged']
+        assert self._residual(As, x, b) < 1e-8
+
+        xt = bicgstab(A, bm.swapaxes(b, 0, 1), M=M, rtol=1e-10, batch_first=True)
+        np.testing.assert_allclose(bm.to_numpy(xt).T, bm.to_numpy(x), atol=1e-8)
+
+    def test_ilu0_factors(self):
+        from fealpy.solver.preconditioner import _ilu0
+        rng = np.random.default_rng(0)
+        As = (sp.random(200, 200, density=0.03, random_state=rng) + 4 * sp.eye(200)).tocsr()
+        As.sort_indices()
+        n = As.shape[0]
+        crow, col = As.indptr.astype(np.int64), As.indices.astype(np.int64)
+        lu = _ilu0(crow, col, As.data, n)
+        LU = sp.csr_matrix((lu, col, crow), shape=As.shape).toarray()
+        L = np.tril(LU, -1) + np.eye(n)
+        U = np.triu(LU)
+        # the product matches A in the pattern of A
+        mask = As.toarray() != 0
+        np.testing.assert_allclose((L @ U)[mask], As.toarray()[mask], atol=1e-12)
+
+        As = sp.csr_matrix(np.array([[0., 1.], [1., 1.]]))
+        with pytest.raises(ValueError):
+            ILU0Preconditioner(CSRTensor.from_scipy(As))
+
+
+if __name__ == "__main__":
+    pytest.main(['-q', __file__])
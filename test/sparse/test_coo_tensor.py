@@ -232,6 +232,18 @@ class TestCOOTensorAdd:
         assert bm.allclose(result2._indices, expected_indices2)
         assert result2.values() is None
 
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_add_same_pattern(self, backend):
+        bm.set_backend(backend)
+        indices = bm.tensor([[0, 1, 2], [1, 0, 2]])
+        coo1 = COOTensor(indices, bm.tensor([1., 2., 3.]), (3, 3), is_coalesced=True)
+        coo2 = COOTensor(bm.copy(indices), bm.tensor([1., 1., 1.]), (3, 3), is_coalesced=True)
+        result = coo1.add(coo2, alpha=3)
+
+        assert result.nnz == 3
+        assert result.is_coalesced
+        assert bm.allclose(result.values(), bm.tensor([4., 5., 6.]))
+
     @pytest.mark.parametrize("backend", ALL_BACKENDS)
     def test_add_tensor(self, backend):
         bm.set_backend(backend)
@@ -1,4 +1,5 @@
 # test_csr_tensor.py
+import numpy as np
 import pytest
 
 from fealpy.sparse.csr_tensor import CSRTensor
@@ -122,6 +123,49 @@ class TestCSRTensorAdd:
         assert bm.allclose(result2._col, expected_col2)
         assert result2.values() is None
 
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_add_same_pattern(self, backend):
+        bm.set_backend(backend)
+        crow, col = bm.tensor([0, 2, 3, 3]), bm.tensor([0, 2, 1])
+        csr1 = create_csr_tensor(crow, col, bm.tensor([[1., 2., 3.], [4., 5., 6.]]), (3, 3))
+        csr2 = create_csr_tensor(bm.copy(crow), bm.copy(col),
+                                 bm.tensor([[1., 1., 1.], [2., 2., 2.]]), (3, 3))
+        result = csr1.add(csr2, alpha=0.5)
+
+        assert result.nnz == 3
+        assert bm.all(result.col() == col)
+        assert bm.allclose(result.values(), bm.tensor([[1.5, 2.5, 3.5], [5., 6., 7.]]))
+        assert bm.allclose(csr1.values(), bm.tensor([[1., 2., 3.], [4., 5., 6.]]))
+
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    @pytest.mark.parametrize("sorted_cols", [True, False])
+    def test_add_random(self, backend, sorted_cols):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(0)
+
+        def random_csr(nnz_per_row):
+            crow, col = [0], []
+            for n in nnz_per_row:
+                c = rng.choice(12, n, replace=False)
+                col.extend(np.sort(c) if sorted_cols else c)
+                crow.append(crow[-1] + n)
+            values = rng.random(len(col))
+            csr = create_csr_tensor(bm.tensor(crow), bm.tensor(col), bm.tensor(values), (len(nnz_per_row), 12))
+            dense = np.zeros((len(nnz_per_row), 12))
+            dense[np.repeat(np.arange(len(nnz_per_row)), nnz_per_row), col] = values
+            return csr, dense
+
+        csr1, dense1 = random_csr(rng.integers(0, 6, 10))
+        csr2, dense2 = random_csr(rng.integers(0, 6, 10))
+        result = csr1.add(csr2, alpha=-2)
+
+        expected = dense1 - 2 * dense2
+        np.testing.assert_allclose(bm.to_numpy(result.to_dense()), expected)
+        assert result.nnz == np.count_nonzero((dense1 != 0) | (dense2 != 0))
+        crow, col = bm.to_numpy(result.crow()), bm.to_numpy(result.col())
+        for i in range(10):
+            assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+
     @pytest.mark.parametrize("backend", ALL_BACKENDS)
     def test_add_tensor(self, backend):
         bm.set_backend(backend)
@@ -1,9 +1,10 @@
 
+import numpy as np
 import pytest
 
 from fealpy.backend import backend_manager as bm
-from fealpy.sparse._spspmm import spspmm_coo
-from fealpy.sparse import COOTensor
+from fealpy.sparse._spspmm import spspmm_coo, spspmm_csr
+from fealpy.sparse import COOTensor, CSRTensor
 
 ALL_BACKENDS = ['numpy', 'pytorch']
 
@@ -47,5 +48,95 @@ def test_spspmm_coo_valid_input(backend):
 
     assert bm.allclose(result, expected)
 
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_csr_valid_input(backend):
+    bm.set_backend(backend)
+    crow1 = bm.tensor([0, 2, 3, 4])
+    col1 = bm.tensor([0, 1, 1, 2])
+    values1 = bm.tensor([1., 3., 4., 2.], dtype=bm.float64)
+    spshape1 = (3, 3)
+
+    crow2 = bm.tensor([0, 1, 2, 3])
+    col2 = bm.tensor([1, 0, 0])
+    values2 = bm.tensor([2., 9., 3.], dtype=bm.float64)
+    spshape2 = (3, 2)
+
+    crow, col, values, output_shape = spspmm_csr(crow1, col1, values1, spshape1,
+                                                 crow2, col2, values2, spshape2)
+    result = CSRTensor(crow, col, values, output_shape).to_dense()
+
+    expected = bm.tensor([[27., 2.],
+                          [36., 0.],
+                          [6., 0.]], dtype=bm.float64)
+
+    assert bm.allclose(result, expected)
+    assert bm.all(crow == bm.tensor([0, 2, 3, 4], dtype=crow.dtype))
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+def test_spspmm_csr_empty_rows(backend):
+    bm.set_backend(backend)
+    # matrix1 has an empty row, and the product has another empty row.
+    crow1 = bm.tensor([0, 1, 1, 2])
+    col1 = bm.tensor([0, 1])
+    values1 = bm.tensor([2., 5.], dtype=bm.float64)
+    crow2 = bm.tensor([0, 2, 2])
+    col2 = bm.tensor([0, 2])
+    values2 = bm.tensor([1., 3.], dtype=bm.float64)
+
+    crow, col, values, output_shape = spspmm_csr(crow1, col1, values1, (3, 2),
+                                                 crow2, col2, values2, (2, 3))
+    result = CSRTensor(crow, col, values, output_shape).to_dense()
+    expected = bm.tensor([[2., 0., 6.],
+                          [0., 0., 0.],
+                          [0., 0., 0.]], dtype=bm.float64)
+
+    assert output_shape == (3, 3)
+    assert bm.allclose(result, expected)
+
+def _random_matrix(format, shape, nnz, batch=(), seed=0):
+    rng = np.random.default_rng(seed)
+    indices = np.stack([rng.integers(0, shape[0], nnz), rng.integers(0, shape[1], nnz)])
+    values = rng.random(batch + (nnz,))
+    dense = np.zeros(batch + shape)
+    for b in np.ndindex(*batch):
+        np.add.at(dense[b], (indices[0], indices[1]), values[b])
+
+    if format == 'coo':
+        return COOTensor(bm.tensor(indices), bm.tensor(values), shape), dense
+    order = np.argsort(indices[0], kind='stable')
+    crow = np.concatenate([[0], np.cumsum(np.bincount(indices[0], minlength=shape[0]))])
+    return CSRTensor(bm.tensor(crow), bm.tensor(indices[1, order]),
+                     bm.tensor(values[..., order]), shape), dense
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+@pytest.mark.parametrize("format", ['coo', 'csr'])
+@pytest.mark.parametrize("batch", [(), (2,)])
+def test_spspmm_random(backend, format, batch):
+    bm.set_backend(backend)
+    # unsorted and uncoalesced COO inputs, with empty rows and columns
+    A, A0 = _random_matrix(format, (30, 20), 80, batch, seed=0)
+    B, B0 = _random_matrix(format, (20, 25), 60, batch, seed=1)
+
+    C = A @ B
+    expected = A0 @ B0
+    assert C.sparse_shape == (30, 25)
+    np.testing.assert_allclose(bm.to_numpy(C.to_dense()), expected)
+    assert C.nnz == np.count_nonzero(np.any(expected != 0, axis=tuple(range(len(batch)))))
+
+    # numeric phase only, with new values on the same patterns
+    plan = A.matmul_plan(B)
+    A2, B2 = A.copy(), B.copy()
+    A2 = A2 * 2.0
+    B2 = B2 * 3.0
+    C2 = A2.matmul(B2, plan=plan)
+    np.testing.assert_allclose(bm.to_numpy(C2.to_dense()), 6.0 * expected)
+
+    with pytest.raises(ValueError):
+        B.matmul(A, plan=plan)
+
+
 # Additional tests can be added here to cover more edge cases, different shapes,
 # or to ensure consistency with other matrix multiplication methods under various conditions.